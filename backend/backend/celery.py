@@ -14,6 +14,30 @@ app.conf.beat_schedule = {
         'task': 'core.tasks.generate_weekly_api_report',
         'schedule': crontab(day_of_week=1, hour=9, minute=0),  # Every Monday at 9 AM
     },
+    'flush-api-usage-logs': {
+        'task': 'core.tasks.flush_api_usage_logs',
+        'schedule': crontab(minute='*'),  # Every minute
+    },
+    'process-geocode-queue': {
+        'task': 'core.tasks.process_geocode_queue',
+        'schedule': crontab(minute='*'),  # Every minute
+    },
+    'refresh-peer-benchmarks': {
+        'task': 'core.tasks.refresh_peer_benchmarks',
+        'schedule': crontab(minute=20, hour='*/6'),  # Every 6 hours
+    },
+    'recompute-stale-matches': {
+        'task': 'core.tasks.recompute_stale_matches',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
+    'process-scheduled-submissions': {
+        'task': 'core.tasks.process_scheduled_submissions',
+        'schedule': crontab(minute='*'),  # Every minute
+    },
+    'expire-stale-ai-generations': {
+        'task': 'core.tasks.expire_stale_ai_generations',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
 }
 
 @app.task(bind=True)
@@ -375,6 +375,53 @@ LOGGING = {
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
 GEMINI_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-2.5-flash')
 TECTONIC_BINARY = os.environ.get('TECTONIC_BINARY', 'tectonic')
+# Tectonic compiler pool (core.latex_compiler): bounded concurrency and a persistent
+# bundle cache shared by every compile on this host.
+TECTONIC_MAX_WORKERS = int(os.environ.get('TECTONIC_MAX_WORKERS', '0')) or None
+TECTONIC_CACHE_DIR = os.environ.get('TECTONIC_CACHE_DIR', str(BASE_DIR / 'var' / 'tectonic_cache'))
+TECTONIC_ONLY_CACHED = os.environ.get('TECTONIC_ONLY_CACHED', 'False') == 'True'
+TECTONIC_TIMEOUT = int(os.environ.get('TECTONIC_TIMEOUT', '60'))
+
+# Batch geocoder (core.geocoding): Nominatim allows one request per second, so the
+# queue is drained by a single worker in batches with this spacing between lookups.
+GEOCODING_MIN_INTERVAL = float(os.environ.get('GEOCODING_MIN_INTERVAL', '1.0'))
+GEOCODING_BATCH_SIZE = int(os.environ.get('GEOCODING_BATCH_SIZE', '50'))
+GEOCODING_MAX_ATTEMPTS = int(os.environ.get('GEOCODING_MAX_ATTEMPTS', '3'))
+GEOCODING_RETRY_AFTER = int(os.environ.get('GEOCODING_RETRY_AFTER', '600'))
+
+# Peer-cohort benchmark snapshots (core.peer_benchmarks): rebuilt by Celery beat;
+# competitive analysis requests a refresh when the snapshot is older than this.
+PEER_BENCHMARK_MAX_AGE = int(os.environ.get('PEER_BENCHMARK_MAX_AGE', str(6 * 60 * 60)))
+
+# Match/skills gap recompute worker (core.match_fingerprints): jobs scored per batch
+# and candidates handled per periodic sweep of stale analyses.
+MATCH_RECOMPUTE_BATCH_SIZE = int(os.environ.get('MATCH_RECOMPUTE_BATCH_SIZE', '50'))
+
+# Shared job-posting analysis cache (core.job_description_cache): entries kept before
+# least-recently-used eviction, and lifetime of extracted requirements in seconds.
+JOB_DESCRIPTION_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_DESCRIPTION_CACHE_MAX_ENTRIES', '20000'))
+JOB_DESCRIPTION_CACHE_TTL = int(os.environ.get('JOB_DESCRIPTION_CACHE_TTL', str(24 * 60 * 60)))
+
+# LLM gateway (core.llm_gateway): cached response lifetime in seconds, entries kept
+# before least-recently-used eviction, and how long identical in-flight calls wait
+# for the first one before calling the model themselves.
+LLM_GATEWAY_ENABLED = os.environ.get('LLM_GATEWAY_ENABLED', 'True') == 'True'
+LLM_GATEWAY_CACHE_TTL = int(os.environ.get('LLM_GATEWAY_CACHE_TTL', str(6 * 60 * 60)))
+LLM_GATEWAY_MAX_ENTRIES = int(os.environ.get('LLM_GATEWAY_MAX_ENTRIES', '5000'))
+LLM_GATEWAY_COALESCE_WAIT = float(os.environ.get('LLM_GATEWAY_COALESCE_WAIT', '60'))
+
+# Queued resume/cover letter generations (core.ai_generation): Gemini attempts per job,
+# rate limited attempts are retried by the task queue with backoff. Pending or running
+# jobs with no progress for AI_GENERATION_STALE_SECONDS are failed as orphaned.
+AI_GENERATION_MAX_ATTEMPTS = int(os.environ.get('AI_GENERATION_MAX_ATTEMPTS', '5'))
+AI_GENERATION_STALE_SECONDS = int(os.environ.get('AI_GENERATION_STALE_SECONDS', '600'))
+
+# Scheduled submission dispatcher (core.scheduled_submissions): submissions claimed per
+# delivery batch, concurrent sends within a batch, and seconds before a claim left by a
+# crashed worker is taken over by another dispatcher.
+SCHEDULED_SUBMISSION_BATCH_SIZE = int(os.environ.get('SCHEDULED_SUBMISSION_BATCH_SIZE', '20'))
+SCHEDULED_SUBMISSION_SEND_CONCURRENCY = int(os.environ.get('SCHEDULED_SUBMISSION_SEND_CONCURRENCY', '4'))
+SCHEDULED_SUBMISSION_CLAIM_TIMEOUT = int(os.environ.get('SCHEDULED_SUBMISSION_CLAIM_TIMEOUT', str(30 * 60)))
 
 # Email configuration
 # Priority: Explicit DJANGO_EMAIL_BACKEND overrides DEBUG logic.
@@ -405,6 +452,10 @@ else:
 # Uses environment variable if provided; otherwise falls back to the desired sender address
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'resumerocket123@gmail.com')
 
+# Reminder emails are sent over one SMTP connection per run (core.bulk_mail); rows are
+# marked sent once per chunk of this many messages.
+BULK_MAIL_CHUNK_SIZE = int(os.environ.get('BULK_MAIL_CHUNK_SIZE', '200'))
+
 # Frontend base URL for links in emails (used by reminder emails)
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
@@ -412,6 +463,10 @@ FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 GOOGLE_CLIENT_ID = os.environ.get('GOOGLE_CLIENT_ID', 'dummy-google-client-id')
 GOOGLE_CLIENT_SECRET = os.environ.get('GOOGLE_CLIENT_SECRET', 'dummy-google-client-secret')
 
+# Gmail scanning (UC-113): message bodies are fetched with this many concurrent
+# requests per scan, which keeps a scan inside Gmail's per-user quota.
+GMAIL_FETCH_CONCURRENCY = int(os.environ.get('GMAIL_FETCH_CONCURRENCY', '5'))
+
 # LinkedIn OAuth for Profile Integration (UC-089)
 LINKEDIN_CLIENT_ID = os.environ.get('LINKEDIN_CLIENT_ID', '')
 LINKEDIN_CLIENT_SECRET = os.environ.get('LINKEDIN_CLIENT_SECRET', '')
@@ -434,6 +489,36 @@ CACHES = {
     }
 }
 
+# Optional per-user outbound API rate limits, keyed by APIService name, enforced by
+# core.api_monitoring.check_rate_limit alongside the service-wide limits.
+# Example: {'gemini': {'minute': 10, 'hour': 100}}
+API_USER_RATE_LIMITS = {}
+
+# Outbound API usage logs are queued and bulk-inserted off the request path
+# (core.api_usage_buffer). BACKEND is 'sync' (write inline), 'memory' (per-process
+# queue) or 'redis' (shared list, also drained by the flush_api_usage_logs task).
+API_USAGE_LOG_BUFFER = {
+    'BACKEND': os.environ.get('API_USAGE_LOG_BUFFER_BACKEND', 'sync' if DEBUG else 'memory'),
+    'BATCH_SIZE': int(os.environ.get('API_USAGE_LOG_BATCH_SIZE', '200')),
+    'FLUSH_INTERVAL': float(os.environ.get('API_USAGE_LOG_FLUSH_INTERVAL', '5')),
+    'REDIS_URL': _redis_url,
+}
+
+# Company name resolution (core.company_resolution): resolved names kept per process,
+# and the minimum pg_trgm similarity for a near spelling to resolve to an existing company.
+COMPANY_RESOLUTION_CACHE_SIZE = int(os.environ.get('COMPANY_RESOLUTION_CACHE_SIZE', '2048'))
+COMPANY_RESOLUTION_SIMILARITY = float(os.environ.get('COMPANY_RESOLUTION_SIMILARITY', '0.8'))
+
+# Per-service overrides for the shared outbound HTTP client (core.http), e.g.
+# {'gmail': {'timeout': 20, 'max_retries': 3}}
+HTTP_CLIENT_POLICIES = {}
+
+# Compiled resume PDFs are cached on disk keyed by a hash of the LaTeX source and
+# the Tectonic version (core.pdf_cache); ResumeVersion saves pre-warm the cache.
+RESUME_PDF_CACHE_DIR = os.environ.get('RESUME_PDF_CACHE_DIR', str(BASE_DIR / 'var' / 'pdf_cache'))
+RESUME_PDF_CACHE_MAX_BYTES = int(os.environ.get('RESUME_PDF_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+RESUME_PDF_CACHE_PREWARM = os.environ.get('RESUME_PDF_CACHE_PREWARM', 'True') == 'True'
+
 # Sentry error tracking for production (UC-133)
 SENTRY_DSN = os.environ.get('SENTRY_DSN', '')
 if SENTRY_DSN and not DEBUG:
@@ -0,0 +1,218 @@
+"""
+Unified activity event log behind the productivity analytics.
+
+``ProductivityAnalyzer`` used to rebuild a candidate's time entries on every
+request by reading seven source tables (skill progress, prep sessions,
+question practice, mock interviews, interactions, networking events, and every
+job's ``application_history``). Each source record now writes its timed
+sessions to ``ActivityEvent`` through the signals in core.signals, and the
+analyzer aggregates that table with one grouped query.
+
+A source's rows are never updated in place: when the record changes its rows
+are replaced, and they are deleted with it. ``backfill`` (and the
+``backfill_activity_events`` command) rebuilds rows for existing records and
+marks each rebuilt user with an ``ActivityBackfill`` row; ``ensure_backfilled``
+does it lazily, once, for a user without one.
+"""
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.models import (
+    ActivityBackfill,
+    ActivityEvent,
+    Interaction,
+    InterviewPrepSession,
+    JobEntry,
+    JobQuestionPractice,
+    MockInterviewSession,
+    NetworkingEvent,
+    SkillDevelopmentProgress,
+)
+
+logger = logging.getLogger(__name__)
+
+# JobEntry fields that feed its events; saves touching none of them are ignored
+TRACKED_JOB_FIELDS = {'created_at', 'application_history'}
+
+Event = Tuple[Optional[datetime], float, str]
+
+
+def _safe_dt(dt):
+    """Normalize datetimes so downstream calculations don't choke on naive values."""
+    if not dt:
+        return None
+    if timezone.is_naive(dt):
+        try:
+            return timezone.make_aware(dt, timezone=timezone.get_current_timezone())
+        except Exception:
+            return timezone.now()
+    return dt
+
+
+def _skill_progress_events(record: SkillDevelopmentProgress) -> List[Event]:
+    minutes = float(record.hours_spent or 0) * 60
+    if minutes <= 0:
+        minutes = 30  # fallback estimate
+    return [(record.activity_date, minutes, 'skill_development')]
+
+
+def _prep_session_events(prep: InterviewPrepSession) -> List[Event]:
+    return [(prep.session_date, prep.duration_minutes or 30, 'interview_preparation')]
+
+
+def _question_practice_events(practice: JobQuestionPractice) -> List[Event]:
+    minutes = (practice.total_duration_seconds or 0) / 60.0
+    if minutes <= 0:
+        minutes = 15
+    return [(practice.last_practiced_at, minutes, 'interview_preparation')]
+
+
+def _mock_session_events(session: MockInterviewSession) -> List[Event]:
+    minutes = (session.total_duration_seconds or 0) / 60.0
+    if minutes <= 0 and session.started_at and session.completed_at:
+        minutes = max(0, (session.completed_at - session.started_at).total_seconds() / 60.0)
+    if minutes <= 0:
+        minutes = 20
+    return [(session.started_at, minutes, 'interview_preparation')]
+
+
+def _interaction_events(interaction: Interaction) -> List[Event]:
+    return [(interaction.date, interaction.duration_minutes or 15, 'networking')]
+
+
+def _networking_event_events(event: NetworkingEvent) -> List[Event]:
+    if event.end_date and event.event_date:
+        minutes = max(0, (event.end_date - event.event_date).total_seconds() / 60.0)
+    else:
+        minutes = 90
+    return [(event.event_date, minutes, 'networking')]
+
+
+def _job_events(job: JobEntry) -> List[Event]:
+    """One estimated application session per job, plus each explicit apply/submit event."""
+    dt = _safe_dt(job.created_at or job.updated_at)
+    events = [(dt, 25, 'applications')]
+    for item in job.application_history or []:
+        action = (item.get('action') or '').lower()
+        if 'apply' in action or 'submit' in action:
+            ts = item.get('timestamp') or item.get('at')
+            try:
+                event_dt = _safe_dt(datetime.fromisoformat(str(ts).replace('Z', '+00:00')))
+            except Exception:
+                event_dt = dt
+            events.append((event_dt, 25, 'applications'))
+    return events
+
+
+# model -> (source name, lookup path to the owning user's id, event builder)
+SOURCES = {
+    SkillDevelopmentProgress: ('skill_progress', 'candidate__user_id', _skill_progress_events),
+    InterviewPrepSession: ('prep_session', 'application__candidate__user_id', _prep_session_events),
+    JobQuestionPractice: ('question_practice', 'job__candidate__user_id', _question_practice_events),
+    MockInterviewSession: ('mock_interview', 'user_id', _mock_session_events),
+    Interaction: ('interaction', 'owner_id', _interaction_events),
+    NetworkingEvent: ('networking_event', 'owner_id', _networking_event_events),
+    JobEntry: ('job', 'candidate__user_id', _job_events),
+}
+
+
+def _owner_id(instance, path: str):
+    value = instance
+    for attr in path.split('__'):
+        value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def _build_rows(instance, source: str, user_id, builder) -> List[ActivityEvent]:
+    rows = []
+    for occurred_at, minutes, activity in builder(instance):
+        occurred_at = _safe_dt(occurred_at)
+        if occurred_at is None:
+            continue
+        rows.append(ActivityEvent(
+            user_id=user_id,
+            activity=activity,
+            occurred_at=occurred_at,
+            minutes=float(minutes),
+            source=source,
+            source_id=str(instance.pk),
+        ))
+    return rows
+
+
+def record_source(instance):
+    """Replace the events logged for one source record."""
+    source, path, builder = SOURCES[type(instance)]
+    user_id = _owner_id(instance, path)
+    with transaction.atomic():
+        ActivityEvent.objects.filter(source=source, source_id=str(instance.pk)).delete()
+        if user_id is not None:
+            ActivityEvent.objects.bulk_create(_build_rows(instance, source, user_id, builder))
+
+
+def forget_source(model, pk):
+    """Drop the events of a deleted source record."""
+    source = SOURCES[model][0]
+    ActivityEvent.objects.filter(source=source, source_id=str(pk)).delete()
+
+
+def backfill(user_ids: Optional[Iterable[int]] = None, batch_size: int = 1000) -> int:
+    """Rebuild the event log from the source tables (every user by default).
+
+    Returns:
+        Number of events written
+    """
+    user_ids = list(user_ids) if user_ids is not None else None
+    written = 0
+    with transaction.atomic():
+        existing = ActivityEvent.objects.all()
+        if user_ids is not None:
+            existing = existing.filter(user_id__in=user_ids)
+        existing.delete()
+
+        for model, (source, path, builder) in SOURCES.items():
+            qs = model.objects.annotate(activity_user_id=F(path))
+            if user_ids is not None:
+                qs = qs.filter(**{f'{path}__in': user_ids})
+            else:
+                qs = qs.filter(**{f'{path}__isnull': False})
+            batch = []
+            for instance in qs.order_by().iterator(chunk_size=batch_size):
+                batch.extend(_build_rows(instance, source, instance.activity_user_id, builder))
+                if len(batch) >= batch_size:
+                    ActivityEvent.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                ActivityEvent.objects.bulk_create(batch)
+                written += len(batch)
+
+        # Mark the rebuilt users so ensure_backfilled never repeats the work
+        markers = ActivityBackfill.objects.all()
+        if user_ids is None:
+            user_ids = list(get_user_model().objects.values_list('pk', flat=True))
+        else:
+            markers = markers.filter(user_id__in=user_ids)
+        markers.update(completed_at=timezone.now())
+        ActivityBackfill.objects.bulk_create(
+            [ActivityBackfill(user_id=user_id) for user_id in user_ids],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+    return written
+
+
+def ensure_backfilled(user) -> bool:
+    """Backfill a user whose activity predates the event log, once; True when it ran."""
+    if ActivityBackfill.objects.filter(user=user).exists():
+        return False
+    backfill([user.pk])
+    return True
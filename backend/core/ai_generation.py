@@ -0,0 +1,291 @@
+"""
+Queued Gemini generation jobs for resumes, cover letters and experience tailoring.
+
+These endpoints used to call Gemini on the request thread, and the pooled
+client's backoff could sleep there for minutes when Gemini answered 429. With
+only a few gunicorn sync workers, one rate-limited user stalled the API. The
+views now validate the request, record an ``AIGeneration`` and return its id.
+A Celery task (core.tasks.process_ai_generation) runs it, and the client polls
+``/api/ai-generations/<id>``.
+
+Workers make one Gemini attempt per call (``resume_ai.single_attempt``). A
+rate limited or unavailable attempt puts the job back to pending and the
+queue retries it after a backoff (``retry_delay``), honoring ``Retry-After``.
+After ``AI_GENERATION_MAX_ATTEMPTS`` attempts the job fails.
+
+A job whose worker died, or whose queued retry was lost, would stay pending
+or running forever, and identical requests would keep reusing it. Jobs with
+no progress for ``AI_GENERATION_STALE_SECONDS`` are failed instead: before
+the reuse lookup, when polled, and by the periodic
+``expire_stale_ai_generations`` sweep.
+"""
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core import cover_letter_ai, resume_ai
+from core.models import AIGeneration, CandidateProfile
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = (AIGeneration.STATUS_PENDING, AIGeneration.STATUS_RUNNING)
+
+# Backoff for rate limited attempts without Retry-After (mirrors the 'gemini' HTTP policy)
+RETRY_BASE_SECONDS = 15
+RETRY_MAX_SECONDS = 120
+
+UNEXPECTED_ERROR_MESSAGES = {
+    AIGeneration.KIND_RESUME: 'Unexpected error while generating resume content.',
+    AIGeneration.KIND_COVER_LETTER: 'Unexpected error while generating cover letter content.',
+    AIGeneration.KIND_EXPERIENCE_VARIATIONS: 'Unexpected error while tailoring experience.',
+    AIGeneration.KIND_EXPERIENCE_BULLET: 'Unexpected error while regenerating bullet.',
+}
+
+
+def _snapshots(generation: AIGeneration):
+    profile = CandidateProfile.objects.get(user_id=generation.user_id)
+    return (
+        resume_ai.collect_candidate_snapshot(profile),
+        resume_ai.build_job_snapshot(generation.job),
+    )
+
+
+def _run_resume(generation: AIGeneration) -> Dict[str, Any]:
+    params = generation.params
+    candidate_snapshot, job_snapshot = _snapshots(generation)
+    result = resume_ai.run_resume_generation(
+        candidate_snapshot,
+        job_snapshot,
+        tone=params['tone'],
+        variation_count=params['variation_count'],
+        api_key=getattr(settings, 'GEMINI_API_KEY', ''),
+        model=getattr(settings, 'GEMINI_MODEL', None),
+    )
+    return {
+        'job': job_snapshot,
+        'profile': resume_ai.build_profile_preview(candidate_snapshot),
+        'generated_at': timezone.now().isoformat(),
+        'tone': params['tone'],
+        'variation_count': result.get('variation_count'),
+        'shared_analysis': result.get('shared_analysis'),
+        'variations': result.get('variations'),
+    }
+
+
+def _run_cover_letter(generation: AIGeneration) -> Dict[str, Any]:
+    params = dict(generation.params)
+    tone = params.pop('tone')
+    variation_count = params.pop('variation_count')
+    candidate_snapshot, job_snapshot = _snapshots(generation)
+    research_snapshot = cover_letter_ai.build_company_research_snapshot(generation.job.company_name)
+    result = cover_letter_ai.run_cover_letter_generation(
+        candidate_snapshot,
+        job_snapshot,
+        research_snapshot,
+        tone=tone,
+        variation_count=variation_count,
+        api_key=getattr(settings, 'GEMINI_API_KEY', ''),
+        model=getattr(settings, 'GEMINI_MODEL', None),
+        **params,
+    )
+    return {
+        'job': job_snapshot,
+        'profile': resume_ai.build_profile_preview(candidate_snapshot),
+        'research': research_snapshot,
+        'generated_at': timezone.now().isoformat(),
+        'tone': tone,
+        'variation_count': result.get('variation_count'),
+        'shared_analysis': result.get('shared_analysis'),
+        'variations': result.get('variations'),
+    }
+
+
+def _run_experience_variations(generation: AIGeneration) -> Dict[str, Any]:
+    params = generation.params
+    candidate_snapshot, job_snapshot = _snapshots(generation)
+    return resume_ai.generate_experience_variations(
+        candidate_snapshot,
+        job_snapshot,
+        params['experience_id'],
+        tone=params['tone'],
+        variation_count=params['variation_count'],
+        bullet_index=params.get('bullet_index'),
+    )
+
+
+def _run_experience_bullet(generation: AIGeneration) -> Dict[str, Any]:
+    params = generation.params
+    candidate_snapshot, job_snapshot = _snapshots(generation)
+    payload = resume_ai.generate_experience_bullet(
+        candidate_snapshot,
+        job_snapshot,
+        params['experience_id'],
+        params['bullet_index'],
+        params['tone'],
+    )
+    return {
+        'experience_id': params['experience_id'],
+        'variant_id': params.get('variant_id'),
+        'bullet_index': payload.get('bullet_index', params['bullet_index']),
+        'bullet': payload.get('bullet'),
+    }
+
+
+RUNNERS = {
+    AIGeneration.KIND_RESUME: _run_resume,
+    AIGeneration.KIND_COVER_LETTER: _run_cover_letter,
+    AIGeneration.KIND_EXPERIENCE_VARIATIONS: _run_experience_variations,
+    AIGeneration.KIND_EXPERIENCE_BULLET: _run_experience_bullet,
+}
+
+
+def expire_stale_generations(**filters) -> int:
+    """Fail pending or running generations with no progress for ``AI_GENERATION_STALE_SECONDS``.
+
+    Args:
+        filters: Narrow the sweep (``user=``, ``id=``, ...); every active generation by default
+
+    Returns:
+        Number of generations failed
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=settings.AI_GENERATION_STALE_SECONDS)
+    expired = AIGeneration.objects.filter(status__in=ACTIVE_STATUSES, **filters).filter(
+        Q(last_progress_at__lt=cutoff) | Q(last_progress_at__isnull=True, created_at__lt=cutoff)
+    ).update(
+        status=AIGeneration.STATUS_FAILED,
+        finished_at=now,
+        last_progress_at=now,
+        error_code='ai_generation_expired',
+        error_message='Generation stopped responding. Please try again.',
+    )
+    if expired:
+        logger.warning('Expired %s stale AI generation(s)', expired)
+    return expired
+
+
+def start_generation(user, job, kind: str, params: Dict[str, Any]) -> AIGeneration:
+    """Queue a generation, reusing an identical one that is still pending or running."""
+    from core import tasks
+
+    expire_stale_generations(user=user, job=job, kind=kind)
+    existing = (
+        AIGeneration.objects
+        .filter(user=user, job=job, kind=kind, params=params, status__in=ACTIVE_STATUSES)
+        .order_by('-created_at')
+        .first()
+    )
+    if existing:
+        return existing
+    generation = AIGeneration.objects.create(user=user, job=job, kind=kind, params=params)
+    try:
+        tasks.enqueue_ai_generation(generation.id)
+    except Exception as exc:  # pragma: no cover - best effort logging
+        logger.error('Failed to enqueue AI generation %s: %s', generation.id, exc, exc_info=True)
+    return generation
+
+
+def retry_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Seconds to wait before attempt ``attempt + 1``."""
+    if retry_after:
+        return min(float(retry_after), RETRY_MAX_SECONDS)
+    return min(RETRY_BASE_SECONDS * (2 ** max(attempt - 1, 0)), RETRY_MAX_SECONDS)
+
+
+def run_generation(generation_id) -> Optional[float]:
+    """
+    Make one attempt at a queued generation.
+
+    Returns:
+        Seconds after which the queue should retry, or None when the
+        generation finished (or was already running or finished)
+    """
+    generation = AIGeneration.objects.select_related('job').filter(id=generation_id).first()
+    if generation is None or generation.status != AIGeneration.STATUS_PENDING:
+        return None
+    now = timezone.now()
+    claimed = AIGeneration.objects.filter(id=generation_id, status=AIGeneration.STATUS_PENDING).update(
+        status=AIGeneration.STATUS_RUNNING,
+        started_at=now,
+        last_progress_at=now,
+        next_attempt_at=None,
+        attempt_count=F('attempt_count') + 1,
+    )
+    if not claimed:
+        return None
+    generation.refresh_from_db()
+
+    try:
+        with resume_ai.single_attempt():
+            result = RUNNERS[generation.kind](generation)
+    except resume_ai.GeminiRetryableError as exc:
+        if generation.attempt_count < settings.AI_GENERATION_MAX_ATTEMPTS:
+            delay = retry_delay(generation.attempt_count, exc.retry_after)
+            logger.info('AI generation %s attempt %s deferred %.0fs: %s',
+                        generation_id, generation.attempt_count, delay, exc)
+            AIGeneration.objects.filter(id=generation_id).update(
+                status=AIGeneration.STATUS_PENDING,
+                next_attempt_at=timezone.now() + timedelta(seconds=delay),
+                last_progress_at=timezone.now(),
+                error_code='retrying',
+                error_message=str(exc)[:2000],
+            )
+            return delay
+        _fail(generation_id, 'ai_generation_failed', str(exc))
+        return None
+    except (resume_ai.ResumeAIError, cover_letter_ai.CoverLetterAIError) as exc:
+        logger.warning('AI generation %s failed: %s', generation_id, exc)
+        _fail(generation_id, 'ai_generation_failed', str(exc))
+        return None
+    except Exception as exc:
+        logger.exception('Unexpected AI generation %s failure: %s', generation_id, exc)
+        message = UNEXPECTED_ERROR_MESSAGES.get(generation.kind, 'Unexpected error while generating content.')
+        _fail(generation_id, 'ai_generation_failed', message)
+        return None
+
+    AIGeneration.objects.filter(id=generation_id).update(
+        status=AIGeneration.STATUS_SUCCEEDED,
+        result=result,
+        finished_at=timezone.now(),
+        last_progress_at=timezone.now(),
+        error_code='',
+        error_message='',
+    )
+    return None
+
+
+def _fail(generation_id, code: str, message: str):
+    AIGeneration.objects.filter(id=generation_id).update(
+        status=AIGeneration.STATUS_FAILED,
+        finished_at=timezone.now(),
+        last_progress_at=timezone.now(),
+        error_code=code,
+        error_message=message[:2000],
+    )
+
+
+def serialize_generation(generation: AIGeneration) -> Dict[str, Any]:
+    def _iso(value):
+        return value.isoformat() if value else None
+
+    data = {
+        'generation_id': generation.id,
+        'kind': generation.kind,
+        'job_id': generation.job_id,
+        'state': generation.status,
+        'attempt_count': generation.attempt_count,
+        'requested_at': _iso(generation.created_at),
+        'started_at': _iso(generation.started_at),
+        'finished_at': _iso(generation.finished_at),
+        'next_attempt_at': _iso(generation.next_attempt_at),
+        'status_url': f'/api/ai-generations/{generation.id}',
+    }
+    if generation.status == AIGeneration.STATUS_SUCCEEDED:
+        data['result'] = generation.result
+    elif generation.status == AIGeneration.STATUS_FAILED:
+        data['error'] = {'code': generation.error_code, 'message': generation.error_message}
+    return data
@@ -0,0 +1,328 @@
+"""
+Incrementally maintained pipeline rollups for the job analytics dashboards.
+
+``jobs_stats`` and the analytics views used to replay every job's status
+history on each request. Each job now contributes a handful of additive
+"cells" keyed by (month, stage) to its candidate's ``JobStatsRollup`` rows:
+
+* ``job_count``: the job, under the month it was created and its current stage
+* ``stage_seconds``/``stage_exits``: each finished stay in a stage, under the
+  month it ended
+* ``open_count``/``open_entered_total``: the ongoing stay, under the month it
+  began; its duration is ``now - entered`` so it is resolved at read time
+* ``offer_count``/``offer_days``: days from applying to the first offer
+
+What a job last contributed is kept in ``JobStatsContribution``; when the job
+or its history changes, only the difference is applied to the rollup rows.
+``rebuild_candidate`` (and the ``rebuild_job_stats_rollups`` command) recompute
+everything from scratch, and ``load_rollups`` rebuilds a candidate whose rows
+no longer match their job count (e.g. after ``bulk_create``).
+"""
+import logging
+import statistics
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import JobEntry, JobStatsContribution, JobStatsRollup, JobStatusChange
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FIELDS = (
+    'job_count', 'stage_seconds', 'stage_exits', 'open_count', 'open_entered_total',
+    'offer_count', 'offer_days_total',
+)
+
+# JobEntry fields that feed the rollup; saves touching none of them are ignored
+TRACKED_JOB_FIELDS = {'status', 'created_at', 'updated_at', 'last_status_change', 'application_history'}
+
+
+def month_start(value: datetime):
+    """First day of ``value``'s month in the active timezone (matches TruncMonth)."""
+    return timezone.localtime(value).date().replace(day=1)
+
+
+def applied_at_from_history(job):
+    """When the candidate applied, from ``application_history`` (falls back to created_at)."""
+    try:
+        hist = job.application_history or []
+        for item in hist:
+            a = (item.get('action') or '').lower()
+            if 'apply' in a:
+                ts = item.get('timestamp') or item.get('at')
+                if ts:
+                    try:
+                        return timezone.datetime.fromisoformat(ts.replace('Z', '+00:00'))
+                    except Exception:
+                        try:
+                            return timezone.make_aware(timezone.datetime.fromtimestamp(float(ts)))
+                        except Exception:
+                            continue
+        return job.created_at
+    except Exception:
+        return job.created_at
+
+
+def _cell_key(month, stage) -> str:
+    return f"{month.isoformat()}|{stage}"
+
+
+def _split_key(key: str):
+    month, stage = key.split('|', 1)
+    return datetime.strptime(month, '%Y-%m-%d').date(), stage
+
+
+def job_cells(job: JobEntry, changes: Iterable[JobStatusChange]) -> Dict[str, Dict]:
+    """
+    Compute what ``job`` adds to its candidate's rollup.
+
+    Args:
+        job: The job entry
+        changes: Its status changes, oldest first
+
+    Returns:
+        Mapping of "YYYY-MM-DD|stage" -> field deltas
+    """
+    changes = list(changes)
+    cells: Dict[str, Dict] = defaultdict(lambda: defaultdict(int))
+    created = job.created_at or job.updated_at or timezone.now()
+    status = job.status or (changes[-1].new_status if changes else 'interested')
+    cells[_cell_key(month_start(created), status)]['job_count'] += 1
+
+    # Time in each stage, from creation through every recorded change
+    entered = created
+    for change in changes:
+        cell = cells[_cell_key(month_start(change.changed_at), change.old_status)]
+        cell['stage_seconds'] += max(0.0, (change.changed_at - entered).total_seconds())
+        cell['stage_exits'] += 1
+        entered = change.changed_at
+    cell = cells[_cell_key(month_start(entered), status)]
+    cell['open_count'] += 1
+    cell['open_entered_total'] += entered.timestamp()
+
+    # Time to offer: first move to 'offer', else the current offer's last status change
+    offer_at = next((c.changed_at for c in changes if c.new_status == 'offer'), None)
+    if offer_at is None and job.status == 'offer':
+        offer_at = job.last_status_change or job.updated_at
+    applied_at = applied_at_from_history(job) or job.created_at
+    if offer_at and applied_at:
+        try:
+            days = (offer_at - applied_at).total_seconds() / 86400
+        except Exception:
+            days = None
+        if days is not None and days >= 0:
+            days = round(days, 2)
+            cell = cells[_cell_key(month_start(offer_at), 'offer')]
+            cell['offer_count'] += 1
+            cell['offer_days_total'] += days
+            cell.setdefault('offer_days', defaultdict(int))[str(days)] += 1
+
+    return {
+        key: {name: (dict(value) if isinstance(value, dict) else value) for name, value in fields.items()}
+        for key, fields in cells.items()
+    }
+
+
+def _cells_delta(old: Dict, new: Dict) -> Dict[str, Dict]:
+    """Field-wise ``new - old`` for every cell that differs."""
+    delta = {}
+    for key in set(old) | set(new):
+        before, after = old.get(key, {}), new.get(key, {})
+        fields = {}
+        for name in NUMERIC_FIELDS:
+            diff = after.get(name, 0) - before.get(name, 0)
+            if diff:
+                fields[name] = diff
+        histogram = defaultdict(int)
+        for days, count in after.get('offer_days', {}).items():
+            histogram[days] += count
+        for days, count in before.get('offer_days', {}).items():
+            histogram[days] -= count
+        histogram = {days: count for days, count in histogram.items() if count}
+        if histogram:
+            fields['offer_days'] = histogram
+        if fields:
+            delta[key] = fields
+    return delta
+
+
+def _apply_delta(candidate_id, delta: Dict[str, Dict], create: bool = True) -> None:
+    """Add ``delta`` to the candidate's rollup rows, creating missing rows unless ``create`` is False."""
+    if not delta:
+        return
+    keys = {_split_key(key): fields for key, fields in delta.items()}
+    if create:
+        JobStatsRollup.objects.bulk_create(
+            [JobStatsRollup(candidate_id=candidate_id, month=month, stage=stage) for month, stage in keys],
+            ignore_conflicts=True,
+        )
+    rows = JobStatsRollup.objects.select_for_update().filter(
+        candidate_id=candidate_id,
+        month__in={month for month, _ in keys},
+        stage__in={stage for _, stage in keys},
+    )
+    changed = []
+    now = timezone.now()
+    for row in rows:
+        fields = keys.get((row.month, row.stage))
+        if not fields:
+            continue
+        for name in NUMERIC_FIELDS:
+            if name in fields:
+                setattr(row, name, getattr(row, name) + fields[name])
+        if 'offer_days' in fields:
+            histogram = dict(row.offer_days or {})
+            for days, count in fields['offer_days'].items():
+                histogram[days] = histogram.get(days, 0) + count
+                if histogram[days] <= 0:
+                    del histogram[days]
+            row.offer_days = histogram
+        row.updated_at = now
+        changed.append(row)
+    JobStatsRollup.objects.bulk_update(changed, list(NUMERIC_FIELDS) + ['offer_days', 'updated_at'])
+
+
+def refresh_job(job: JobEntry) -> None:
+    """Bring the rollup in line with ``job``'s current state and history."""
+    changes = JobStatusChange.objects.filter(job_id=job.pk).order_by('changed_at', 'id')
+    new_cells = job_cells(job, changes)
+    with transaction.atomic():
+        contribution, _ = JobStatsContribution.objects.select_for_update().get_or_create(
+            job_id=job.pk, defaults={'candidate_id': job.candidate_id},
+        )
+        delta = _cells_delta(contribution.cells or {}, new_cells)
+        if not delta:
+            return
+        _apply_delta(job.candidate_id, delta)
+        contribution.cells = new_cells
+        contribution.candidate_id = job.candidate_id
+        contribution.save(update_fields=['cells', 'candidate', 'updated_at'])
+
+
+def refresh_job_id(job_id) -> None:
+    job = JobEntry.objects.filter(pk=job_id).first()
+    if job is not None:
+        refresh_job(job)
+
+
+def remove_job(job: JobEntry) -> None:
+    """Take a job that is being deleted back out of the rollup."""
+    with transaction.atomic():
+        contribution = JobStatsContribution.objects.select_for_update().filter(job_id=job.pk).first()
+        if contribution is None or not contribution.cells:
+            return
+        # Never create rows here: the candidate itself may be mid-delete
+        _apply_delta(contribution.candidate_id, _cells_delta(contribution.cells, {}), create=False)
+        contribution.cells = {}
+        contribution.save(update_fields=['cells', 'updated_at'])
+
+
+def rebuild_candidate(candidate_id) -> int:
+    """
+    Recompute a candidate's rollup from their jobs and status history.
+
+    Returns:
+        Number of jobs processed
+    """
+    jobs = list(JobEntry.objects.filter(candidate_id=candidate_id).order_by('id'))
+    changes_by_job = defaultdict(list)
+    for change in JobStatusChange.objects.filter(job__candidate_id=candidate_id).order_by('changed_at', 'id'):
+        changes_by_job[change.job_id].append(change)
+
+    totals: Dict[str, Dict] = {}
+    contributions = []
+    for job in jobs:
+        cells = job_cells(job, changes_by_job.get(job.pk, []))
+        contributions.append(JobStatsContribution(job_id=job.pk, candidate_id=candidate_id, cells=cells))
+        for key, fields in _cells_delta({}, cells).items():
+            total = totals.setdefault(key, {})
+            for name, value in fields.items():
+                if name == 'offer_days':
+                    histogram = total.setdefault('offer_days', {})
+                    for days, count in value.items():
+                        histogram[days] = histogram.get(days, 0) + count
+                else:
+                    total[name] = total.get(name, 0) + value
+
+    rows = []
+    for key, fields in totals.items():
+        month, stage = _split_key(key)
+        rows.append(JobStatsRollup(candidate_id=candidate_id, month=month, stage=stage, **fields))
+
+    with transaction.atomic():
+        JobStatsContribution.objects.filter(candidate_id=candidate_id).delete()
+        JobStatsRollup.objects.filter(candidate_id=candidate_id).delete()
+        JobStatsContribution.objects.bulk_create(contributions, batch_size=500)
+        JobStatsRollup.objects.bulk_create(rows, batch_size=500)
+    return len(jobs)
+
+
+def load_rollups(candidate) -> List[JobStatsRollup]:
+    """
+    Return the candidate's rollup rows, rebuilding them if they are out of date.
+
+    Writes that bypass model signals (bulk_create, queryset deletes of
+    contributions) show up as a job count mismatch and trigger a rebuild.
+    """
+    rows = list(JobStatsRollup.objects.filter(candidate=candidate))
+    if sum(row.job_count for row in rows) != JobEntry.objects.filter(candidate=candidate).count():
+        logger.info(f"Rebuilding job stats rollup for candidate {candidate.pk}")
+        rebuild_candidate(candidate.pk)
+        rows = list(JobStatsRollup.objects.filter(candidate=candidate))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+def status_counts(rows: Iterable[JobStatsRollup]) -> Dict[str, int]:
+    counts = {status: 0 for status, _label in JobEntry.STATUS_CHOICES}
+    for row in rows:
+        counts[row.stage] = counts.get(row.stage, 0) + row.job_count
+    return counts
+
+
+def monthly_counts(rows: Iterable[JobStatsRollup], stages: Optional[Iterable[str]] = None) -> Dict:
+    """Jobs created per month (optionally only those currently in ``stages``)."""
+    stages = set(stages) if stages is not None else None
+    counts = defaultdict(int)
+    for row in rows:
+        if stages is None or row.stage in stages:
+            counts[row.month] += row.job_count
+    return counts
+
+
+def avg_time_in_stage(rows: Iterable[JobStatsRollup], now: Optional[datetime] = None) -> Dict[str, float]:
+    """Average days per stay in each stage, counting ongoing stays up to ``now``."""
+    now_ts = (now or timezone.now()).timestamp()
+    seconds = defaultdict(float)
+    stays = defaultdict(int)
+    for row in rows:
+        open_seconds = row.open_count * now_ts - row.open_entered_total
+        seconds[row.stage] += row.stage_seconds + max(0.0, open_seconds)
+        stays[row.stage] += row.stage_exits + row.open_count
+    return {
+        stage: round((seconds[stage] / count) / 86400, 2)
+        for stage, count in stays.items()
+        if count > 0
+    }
+
+
+def time_to_offer(rows: Iterable[JobStatsRollup]) -> Optional[Dict]:
+    """Count/avg/median/min/max days from applying to the first offer."""
+    values = []
+    for row in rows:
+        for days, count in (row.offer_days or {}).items():
+            values.extend([float(days)] * int(count))
+    if not values:
+        return None
+    return {
+        'count': len(values),
+        'avg_days': round(statistics.mean(values), 2),
+        'median_days': round(statistics.median(values), 2),
+        'min_days': min(values),
+        'max_days': max(values),
+    }
@@ -6,7 +6,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from core.models import CandidateProfile, JobEntry, Document, JobStatusChange
-from core.models import CandidateSkill, Skill
+from core.models import Skill
+from core import analytics_rollups, peer_benchmarks
 from core.productivity_analytics import ProductivityAnalyzer
 from django.db import models
 from django.db.models import Count, Q, F, Case, When, Value, IntegerField, Avg, FloatField, ExpressionWrapper
@@ -229,12 +230,14 @@ def cover_letter_analytics_view(request):
     try:
         profile = CandidateProfile.objects.get(user=request.user)
         qs, filters_applied = _build_filtered_queryset(profile, request.query_params)
+        # Unfiltered requests read the pre-aggregated pipeline rollup
+        rollups = analytics_rollups.load_rollups(profile) if not filters_applied else None
 
         # 1. GENERAL ANALYTICS
-        funnel_stats = _calculate_funnel_analytics(qs)
+        funnel_stats = _calculate_funnel_analytics(qs, rollups)
         industry_benchmarks = _calculate_industry_benchmarks(qs)
-        response_trends = _calculate_response_trends(qs)
-        volume_patterns = _calculate_volume_patterns(qs)
+        response_trends = _calculate_response_trends(qs, rollups)
+        volume_patterns = _calculate_volume_patterns(qs, rollups)
         goal_progress = _calculate_goal_progress(profile)
         insights_recommendations = _calculate_insights_recommendations(qs)
         time_to_response = _calculate_time_to_response(profile, qs)
@@ -310,20 +313,27 @@ def competitive_analysis_view(request):
         params = request.query_params
         user_qs, filters_applied = _build_filtered_queryset(profile, params)
 
-        # Peer cohort for benchmarks: same industry + same experience level
-        peer_same_level = CandidateProfile.objects.filter(
-            industry=profile.industry,
-            experience_level=profile.experience_level,
-        ).exclude(id=profile.id)
-        peer_same_ids = list(peer_same_level.values_list('id', flat=True))
-
-        peer_qs = JobEntry.objects.filter(candidate_id__in=peer_same_ids)
-        peer_qs, _ = _build_filtered_queryset_for_peers(peer_qs, params)
-
-        # Progression cohort: same industry, higher experience level than current user
-        progression_profiles = CandidateProfile.objects.filter(industry=profile.industry).exclude(id=profile.id)
-
-        analysis = _calculate_competitive_analysis(profile, user_qs, peer_qs, peer_same_level, progression_profiles)
+        # Peer cohort for benchmarks: same industry + same experience level, read from
+        # the periodic snapshot (core.peer_benchmarks) instead of scanning every peer.
+        location = peer_benchmarks.ALL_LOCATIONS
+        if params.get('peer_scope') == 'local':
+            location = peer_benchmarks.location_key(profile.state)
+        cohorts, computed_at = peer_benchmarks.load_cohorts(profile.industry, location)
+
+        # Snapshot totals are unfiltered; date/type/salary filters need the peers' jobs live
+        peer_qs = None
+        if filters_applied:
+            peer_qs = JobEntry.objects.filter(
+                candidate__industry=profile.industry,
+                candidate__experience_level=profile.experience_level,
+            ).exclude(candidate=profile)
+            if location:
+                peer_qs = peer_qs.filter(candidate__state__iexact=location)
+            peer_qs, _ = _build_filtered_queryset_for_peers(peer_qs, params)
+
+        analysis = _calculate_competitive_analysis(profile, user_qs, cohorts, peer_qs)
+        analysis['cohort']['location'] = location or 'all'
+        analysis['cohort']['computed_at'] = computed_at.isoformat() if computed_at else None
         analysis['filters'] = filters_applied
         return Response(analysis)
     except Exception as e:
@@ -529,18 +539,18 @@ def _calculate_time_to_response(profile, qs):
     }
 
 
-def _calculate_funnel_analytics(qs):
-    """Calculate application funnel statistics."""
-    total_applications = qs.count()
+def _calculate_funnel_analytics(qs, rollups=None):
+    """Calculate application funnel statistics (from ``rollups`` when given)."""
+    if rollups is not None:
+        by_status = analytics_rollups.status_counts(rollups)
+    else:
+        by_status = {row['status']: row['c'] for row in qs.order_by().values('status').annotate(c=Count('id'))}
+    total_applications = sum(by_status.values())
     
     # Status counts
     status_counts = {
-        'interested': qs.filter(status='interested').count(),
-        'applied': qs.filter(status='applied').count(),
-        'phone_screen': qs.filter(status='phone_screen').count(),
-        'interview': qs.filter(status='interview').count(),
-        'offer': qs.filter(status='offer').count(),
-        'rejected': qs.filter(status='rejected').count()
+        stage: by_status.get(stage, 0)
+        for stage in ('interested', 'applied', 'phone_screen', 'interview', 'offer', 'rejected')
     }
     
     # Calculate conversion rates
@@ -573,21 +583,36 @@ def _calculate_industry_benchmarks(qs):
     }
 
 
-def _calculate_response_trends(qs):
+def _monthly_status_counts(qs, rollups=None):
+    """Jobs per (created month, current status), from ``rollups`` or one grouped query."""
+    counts = {}
+    if rollups is not None:
+        for row in rollups:
+            counts[(row.month, row.stage)] = counts.get((row.month, row.stage), 0) + row.job_count
+        return counts
+    rows = qs.order_by().annotate(month=TruncMonth('created_at')).values('month', 'status').annotate(c=Count('id'))
+    for row in rows:
+        month = row['month']
+        if month is None:
+            continue
+        if isinstance(month, datetime):
+            month = month.date()
+        counts[(month, row['status'])] = counts.get((month, row['status']), 0) + row['c']
+    return counts
+
+
+def _calculate_response_trends(qs, rollups=None):
     """Calculate response rate trends over time."""
     # Group by month and calculate response rates
-    from django.db.models.functions import TruncMonth
-    
     monthly_data = []
     today = timezone.now().date()
+    month_status = _monthly_status_counts(qs, rollups)
     
     for i in range(11, -1, -1):
         month_start = (today.replace(day=1) - timedelta(days=30 * i)).replace(day=1)
-        month_end = (month_start.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
         
-        month_jobs = qs.filter(created_at__date__gte=month_start, created_at__date__lte=month_end)
-        applied = month_jobs.filter(status__in=['applied', 'phone_screen', 'interview', 'offer']).count()
-        responded = month_jobs.filter(status__in=['phone_screen', 'interview', 'offer']).count()
+        applied = sum(month_status.get((month_start, s), 0) for s in ('applied', 'phone_screen', 'interview', 'offer'))
+        responded = sum(month_status.get((month_start, s), 0) for s in ('phone_screen', 'interview', 'offer'))
         
         response_rate = round((responded / applied) * 100, 1) if applied > 0 else 0
         
@@ -601,19 +626,30 @@ def _calculate_response_trends(qs):
     return {'monthly_trends': monthly_data}
 
 
-def _calculate_volume_patterns(qs):
+def _calculate_volume_patterns(qs, rollups=None):
     """Calculate application volume patterns."""
-    total = qs.count()
+    total = sum(row.job_count for row in rollups) if rollups is not None else qs.count()
     
-    # Weekly volume (last 8 weeks)
+    # Weekly volume (last 8 weeks), from one grouped query
     weekly_data = []
     today = timezone.now().date()
+    first_week = today - timedelta(days=today.weekday() + 7 * 7)
+    per_day = {}
+    daily = (
+        qs.order_by().filter(created_at__date__gte=first_week)
+        .annotate(day=TruncDate('created_at')).values('day').annotate(c=Count('id'))
+    )
+    for row in daily:
+        day = row['day']
+        if isinstance(day, datetime):
+            day = day.date()
+        per_day[day] = per_day.get(day, 0) + row['c']
     
     for i in range(7, -1, -1):
         week_start = today - timedelta(days=today.weekday() + 7 * i)
         week_end = week_start + timedelta(days=6)
         
-        week_count = qs.filter(created_at__date__gte=week_start, created_at__date__lte=week_end).count()
+        week_count = sum(count for day, count in per_day.items() if week_start <= day <= week_end)
         weekly_data.append({
             'week': week_start.strftime('%Y-%m-%d'),
             'count': week_count
@@ -943,83 +979,40 @@ def _empty_industry_benchmarks():
     }
 
 
-def _calculate_competitive_analysis(profile, user_qs, peer_qs, peer_profiles_same_level, progression_profiles_all):
-    """Compute user vs peer benchmarks, skill gaps, and recommendations."""
+def _calculate_competitive_analysis(profile, user_qs, cohorts, peer_qs=None):
+    """Compute user vs peer benchmarks, skill gaps, and recommendations.
+
+    ``cohorts`` maps experience level to core.peer_benchmarks totals for the
+    user's industry and location. The user's own contribution is removed from
+    their level's cohort; ``peer_qs`` (filtered peer jobs) replaces the snapshot
+    job metrics when the request carries filters.
+    """
     level_order = ['entry', 'mid', 'senior', 'executive']
     def _is_higher_level(level):
         if not profile.experience_level or level not in level_order or profile.experience_level not in level_order:
             return False
         return level_order.index(level) > level_order.index(profile.experience_level)
 
-    def _metrics(qs):
-        total = qs.count()
-        phone = qs.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-        interview = qs.filter(status__in=['interview', 'offer']).count()
-        offer = qs.filter(status='offer').count()
-        apps_per_week = 0
-        if total:
-            earliest = qs.order_by('created_at').first().created_at
-            latest = qs.order_by('-created_at').first().created_at
-            days = max((latest - earliest).days + 1, 7)
-            apps_per_week = round(total / (days / 7), 1)
-        # Employment stats for this cohort
-        return {
-            'applications': total,
-            'response_rate': round((phone / total) * 100, 1) if total else 0,
-            'interview_rate': round((interview / total) * 100, 1) if total else 0,
-            'offer_rate': round((offer / total) * 100, 1) if total else 0,
-            'apps_per_week': apps_per_week,
-            'funnel': {
-                'interested': qs.filter(status='interested').count(),
-                'applied': qs.filter(status='applied').count(),
-                'phone_screen': qs.filter(status='phone_screen').count(),
-                'interview': qs.filter(status='interview').count(),
-                'offer': offer,
-                'rejected': qs.filter(status='rejected').count(),
-            }
-        }
+    own = peer_benchmarks.candidate_stats(profile)
+    peers = peer_benchmarks.subtract_stats(
+        cohorts.get(profile.experience_level or '', peer_benchmarks.empty_stats()), own,
+    )
 
-    user_metrics = _metrics(user_qs)
-    peer_metrics = _metrics(peer_qs)
+    user_metrics = peer_benchmarks.job_metrics(peer_benchmarks.queryset_job_stats(user_qs))
+    if peer_qs is not None:
+        peer_metrics = peer_benchmarks.job_metrics(peer_benchmarks.queryset_job_stats(peer_qs))
+    else:
+        peer_metrics = peer_benchmarks.job_metrics(peers)
 
     # Employment comparison (positions held, total years) for peers at same level
-    def _employment_stats(profiles):
-        """Compute average positions and years for a list of CandidateProfile instances."""
-        if not profiles:
-            return {'avg_positions': 0, 'avg_years': 0}
-        position_counts = []
-        years_list = []
-        for p in profiles:
-            emps = getattr(p, 'work_experiences', None)
-            if not emps:
-                continue
-            emp_qs = emps.all()
-            position_counts.append(emp_qs.count())
-            years_total = 0
-            for job in emp_qs:
-                start = job.start_date or None
-                end = job.end_date or timezone.now().date()
-                if start:
-                    years_total += max((end - start).days, 0) / 365.0
-            years_list.append(years_total)
-        avg_positions = round(sum(position_counts) / len(position_counts), 1) if position_counts else 0
-        avg_years = round(sum(years_list) / len(years_list), 1) if years_list else 0
-        return {'avg_positions': avg_positions, 'avg_years': avg_years}
-
-    user_positions = _employment_stats([profile])
-    peer_positions = _employment_stats(peer_profiles_same_level)
+    user_positions = peer_benchmarks.employment_stats(own)
+    peer_positions = peer_benchmarks.employment_stats(peers)
 
     # Skill gap analysis
-    user_skills = set(profile.skills.select_related('skill').values_list('skill__name', flat=True))
-    peer_ids = list(peer_profiles_same_level.values_list('id', flat=True))
-    peer_skill_rows = CandidateSkill.objects.filter(candidate_id__in=peer_ids).select_related('skill')
-    freq = {}
-    for row in peer_skill_rows:
-        name = row.skill.name
-        freq[name] = freq.get(name, 0) + 1
-    peer_count = max(len(set(peer_ids)), 1)
-    peer_skill_freq = [{ 'name': k, 'prevalence': round((v / peer_count) * 100, 1) } for k, v in freq.items()]
-    peer_skill_freq.sort(key=lambda x: x['prevalence'], reverse=True)
+    user_skills = set(own['skills'])
+    freq = peers['skills']
+    peer_count = max(peers['candidates'], 1)
+    peer_skill_freq = peer_benchmarks.skill_prevalence(peers)
     top_peer_skills = [s for s in peer_skill_freq if s['prevalence'] >= 10][:10]
     gaps = [s for s in top_peer_skills if s['name'] not in user_skills]
     differentiators = [{'name': s, 'note': 'Less common peer skill to highlight'} for s in user_skills if freq.get(s, 0) < max(1, peer_count * 0.2)]
@@ -1037,20 +1030,13 @@ def _calculate_competitive_analysis(profile, user_qs, peer_qs, peer_profiles_sam
         deterministic_recs.append(f"Highlight differentiators in your profile: {diff_names}.")
 
     # Progression cohort: same industry, higher experience levels
-    progression_profiles = [p for p in progression_profiles_all if _is_higher_level(p.experience_level)]
-    progression_ids = [p.id for p in progression_profiles]
-    progression_qs = JobEntry.objects.filter(candidate_id__in=progression_ids) if progression_ids else JobEntry.objects.none()
-    progression_metrics = _metrics(progression_qs) if progression_ids else None
+    progression = peer_benchmarks.merge_stats(
+        stats for level, stats in cohorts.items() if _is_higher_level(level)
+    )
+    progression_metrics = peer_benchmarks.job_metrics(progression) if progression['candidates'] else None
     progression_gaps = []
-    if progression_ids:
-        freq_prog = {}
-        for row in CandidateSkill.objects.filter(candidate_id__in=progression_ids).select_related('skill'):
-            name = row.skill.name
-            freq_prog[name] = freq_prog.get(name, 0) + 1
-        prog_count = max(len(set(progression_ids)), 1)
-        prog_skill_freq = [{ 'name': k, 'prevalence': round((v / prog_count) * 100, 1) } for k, v in freq_prog.items()]
-        prog_skill_freq.sort(key=lambda x: x['prevalence'], reverse=True)
-        top_prog_skills = [s for s in prog_skill_freq if s['prevalence'] >= 10][:10]
+    if progression['candidates']:
+        top_prog_skills = [s for s in peer_benchmarks.skill_prevalence(progression) if s['prevalence'] >= 10][:10]
         progression_gaps = [s for s in top_prog_skills if s['name'] not in user_skills]
 
     ai_recs = _generate_competitive_ai_recs(profile, user_metrics, peer_metrics, gaps, differentiators)
@@ -1059,7 +1045,7 @@ def _calculate_competitive_analysis(profile, user_qs, peer_qs, peer_profiles_sam
         'cohort': {
             'industry': profile.industry or 'unspecified',
             'experience_level': profile.experience_level or 'unspecified',
-            'sample_size': len(set(peer_ids)),
+            'sample_size': peers['candidates'],
         },
         'user_metrics': user_metrics,
         'peer_benchmarks': peer_metrics,
@@ -1070,7 +1056,7 @@ def _calculate_competitive_analysis(profile, user_qs, peer_qs, peer_profiles_sam
         'skill_gaps': gaps,
         'differentiators': differentiators[:5],
         'progression': {
-          'sample_size': len(set(progression_ids)),
+          'sample_size': progression['candidates'],
           'metrics': progression_metrics,
           'skill_gaps': progression_gaps,
         },
@@ -31,6 +31,7 @@ import time
 import logging
 import traceback
 from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from django.utils import timezone
@@ -40,6 +41,7 @@ from django.conf import settings
 from core.models import (
     APIService, APIUsageLog, APIQuotaUsage, APIError, APIAlert
 )
+from core.api_usage_buffer import record_api_usage
 
 logger = logging.getLogger(__name__)
 
@@ -80,10 +82,120 @@ def get_or_create_service(service_name: str, service_type: str, **kwargs) -> API
     return service
 
 
+# Windows checked by the rate limiter: (name, length in seconds, APIService limit field)
+RATE_LIMIT_WINDOWS = (
+    ('minute', 60, 'requests_per_minute'),
+    ('hour', 3600, 'requests_per_hour'),
+    ('day', 86400, 'requests_per_day'),
+)
+
+# After a cache failure, skip the cache for this long and count from the DB instead
+RATE_LIMIT_CACHE_RETRY_SECONDS = 30
+_rate_limit_cache_down_until = 0.0
+
+
+class SlidingWindowRateLimiter:
+    """
+    Approximate sliding-window request counters stored in the Django cache.
+    
+    Each window keeps one counter per fixed bucket. The request count for the
+    trailing window is the current bucket plus the previous bucket weighted by
+    how much of it still overlaps the window, so checks cost one cache read
+    instead of a COUNT(*) over APIUsageLog.
+    """
+    
+    KEY_PREFIX = 'api_rl'
+    
+    def _bucket_keys(self, scope: str, window: str, seconds: int, now: float):
+        bucket = int(now // seconds)
+        prefix = f"{self.KEY_PREFIX}:{scope}:{window}"
+        return f"{prefix}:{bucket}", f"{prefix}:{bucket - 1}", (now % seconds) / seconds
+    
+    def counts(self, scope: str, limits: Dict[str, int], now: Optional[float] = None) -> Dict[str, float]:
+        """Return the estimated request count for each window in ``limits``."""
+        now = time.time() if now is None else now
+        keys = {}
+        for window, seconds, _ in RATE_LIMIT_WINDOWS:
+            if window in limits:
+                keys[window] = self._bucket_keys(scope, window, seconds, now)
+        
+        values = cache.get_many([k for cur, prev, _ in keys.values() for k in (cur, prev)])
+        estimates = {}
+        for window, (cur, prev, elapsed) in keys.items():
+            estimates[window] = int(values.get(cur) or 0) + int(values.get(prev) or 0) * (1 - elapsed)
+        return estimates
+    
+    def exceeded(self, scope: str, limits: Dict[str, int], now: Optional[float] = None) -> Optional[str]:
+        """Return the first window whose limit is reached, or None."""
+        estimates = self.counts(scope, limits, now)
+        for window, _, _ in RATE_LIMIT_WINDOWS:
+            if window in estimates and estimates[window] >= limits[window]:
+                return window
+        return None
+    
+    def hit(self, scope: str, limits: Dict[str, int], now: Optional[float] = None):
+        """Count one request against every window in ``limits``."""
+        now = time.time() if now is None else now
+        for window, seconds, _ in RATE_LIMIT_WINDOWS:
+            if window not in limits:
+                continue
+            key, _, _ = self._bucket_keys(scope, window, seconds, now)
+            # Keep the bucket alive while it can still be the "previous" bucket
+            if not cache.add(key, 1, timeout=seconds * 2):
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.add(key, 1, timeout=seconds * 2)
+
+
+rate_limiter = SlidingWindowRateLimiter()
+
+
+def _service_limits(service: APIService) -> Dict[str, int]:
+    return {
+        window: getattr(service, field)
+        for window, _, field in RATE_LIMIT_WINDOWS
+        if getattr(service, field)
+    }
+
+
+def _user_limits(service: APIService, user) -> Dict[str, int]:
+    """Per-user limits from settings.API_USER_RATE_LIMITS, e.g. {'gemini': {'hour': 50}}."""
+    if user is None or not getattr(user, 'pk', None):
+        return {}
+    configured = getattr(settings, 'API_USER_RATE_LIMITS', {}).get(service.name) or {}
+    return {window: limit for window, limit in configured.items() if limit}
+
+
+def _rate_limit_scopes(service: APIService, user):
+    scopes = []
+    limits = _service_limits(service)
+    if limits:
+        scopes.append((f"svc:{service.id}", limits, 'requests'))
+    user_limits = _user_limits(service, user)
+    if user_limits:
+        scopes.append((f"svc:{service.id}:user:{user.pk}", user_limits, 'requests per user'))
+    return scopes
+
+
+def _rate_limit_cache_available() -> bool:
+    return time.time() >= _rate_limit_cache_down_until
+
+
+def _mark_rate_limit_cache_down(exc: Exception):
+    global _rate_limit_cache_down_until
+    _rate_limit_cache_down_until = time.time() + RATE_LIMIT_CACHE_RETRY_SECONDS
+    logger.warning(f"Rate limit cache unavailable, counting from the database: {exc}")
+
+
 def check_rate_limit(service: APIService, user=None) -> tuple[bool, Optional[str]]:
     """
     Check if rate limit allows making a request.
     
+    Uses sliding-window counters in the cache, keyed per service and (when
+    API_USER_RATE_LIMITS configures it) per user. Falls back to counting
+    APIUsageLog rows when the cache is unreachable.
+    
     Args:
         service: APIService instance
         user: Optional user making the request
@@ -94,44 +206,76 @@ def check_rate_limit(service: APIService, user=None) -> tuple[bool, Optional[str
     if not service.rate_limit_enabled:
         return True, None
     
-    now = timezone.now()
+    scopes = _rate_limit_scopes(service, user)
+    if not scopes:
+        return True, None
     
-    # Check minute limit
-    if service.requests_per_minute:
-        minute_ago = now - timedelta(minutes=1)
-        count = APIUsageLog.objects.filter(
-            service=service,
-            request_at__gte=minute_ago
-        ).count()
-        
-        if count >= service.requests_per_minute:
-            return False, f"Rate limit exceeded: {service.requests_per_minute} requests/minute"
+    if _rate_limit_cache_available():
+        try:
+            for scope, limits, label in scopes:
+                window = rate_limiter.exceeded(scope, limits)
+                if window:
+                    return False, f"Rate limit exceeded: {limits[window]} {label}/{window}"
+            return True, None
+        except Exception as exc:
+            _mark_rate_limit_cache_down(exc)
     
-    # Check hour limit
-    if service.requests_per_hour:
-        hour_ago = now - timedelta(hours=1)
-        count = APIUsageLog.objects.filter(
-            service=service,
-            request_at__gte=hour_ago
-        ).count()
-        
-        if count >= service.requests_per_hour:
-            return False, f"Rate limit exceeded: {service.requests_per_hour} requests/hour"
+    return _check_rate_limit_db(service)
+
+
+def record_rate_limit_hit(service: APIService, user=None):
+    """Count an outbound request against the service (and user) rate limit windows."""
+    if not service.rate_limit_enabled or not _rate_limit_cache_available():
+        return
+    try:
+        for scope, limits, _ in _rate_limit_scopes(service, user):
+            rate_limiter.hit(scope, limits)
+    except Exception as exc:
+        _mark_rate_limit_cache_down(exc)
+
+
+def _check_rate_limit_db(service: APIService) -> tuple[bool, Optional[str]]:
+    """Count-based rate limit check against APIUsageLog (cache fallback)."""
+    from core.api_usage_buffer import buffered_usage_count
+
+    now = timezone.now()
     
-    # Check day limit
-    if service.requests_per_day:
-        day_ago = now - timedelta(days=1)
+    for window, seconds, field in RATE_LIMIT_WINDOWS:
+        limit = getattr(service, field)
+        if not limit:
+            continue
+        since = now - timedelta(seconds=seconds)
         count = APIUsageLog.objects.filter(
             service=service,
-            request_at__gte=day_ago
+            request_at__gte=since
         ).count()
+        # Calls still waiting in the usage-log buffer are not in the table yet
+        count += buffered_usage_count(service.pk, since)
         
-        if count >= service.requests_per_day:
-            return False, f"Rate limit exceeded: {service.requests_per_day} requests/day"
+        if count >= limit:
+            return False, f"Rate limit exceeded: {limit} requests/{window}"
     
     return True, None
 
 
+_call_metadata: ContextVar[Optional[Dict[str, Any]]] = ContextVar('api_call_metadata', default=None)
+
+
+@contextmanager
+def call_metadata(**metadata):
+    """
+    Add ``metadata`` to every call tracked inside the block.
+    
+    Lets a caller tag calls made on its behalf, e.g. each retry attempt
+    core.http tracks for one LLM gateway miss.
+    """
+    token = _call_metadata.set({**(_call_metadata.get() or {}), **metadata})
+    try:
+        yield
+    finally:
+        _call_metadata.reset(token)
+
+
 @contextmanager
 def track_api_call(
     service: APIService,
@@ -156,7 +300,7 @@ def track_api_call(
         metadata: Additional tracking data
     """
     start_time = time.time()
-    usage_log = None
+    metadata = {**(_call_metadata.get() or {}), **(metadata or {})}
     
     try:
         # Check rate limit before making request
@@ -164,35 +308,34 @@ def track_api_call(
         if not allowed:
             logger.warning(f"Rate limit check failed for {service.name}: {message}")
             # Still track the attempt
-            usage_log = APIUsageLog.objects.create(
-                service=service,
-                user=user,
-                endpoint=endpoint,
-                method=method,
-                success=False,
-                error_message=message,
-                error_type='RateLimitExceeded',
-                metadata=metadata or {}
-            )
+            record_api_usage({
+                'service': service,
+                'user': user,
+                'endpoint': endpoint,
+                'method': method,
+                'success': False,
+                'error_message': message,
+                'error_type': 'RateLimitExceeded',
+                'metadata': metadata,
+            })
             raise RateLimitException(message)
         
+        record_rate_limit_hit(service, user)
+        
         yield  # Execute the API call
         
-        # Success path
+        # Success path (log row and quota usage are written by the usage buffer)
         response_time_ms = int((time.time() - start_time) * 1000)
-        usage_log = APIUsageLog.objects.create(
-            service=service,
-            user=user,
-            endpoint=endpoint,
-            method=method,
-            response_time_ms=response_time_ms,
-            success=True,
-            status_code=200,
-            metadata=metadata or {}
-        )
-        
-        # Update quota usage
-        update_quota_usage(service)
+        record_api_usage({
+            'service': service,
+            'user': user,
+            'endpoint': endpoint,
+            'method': method,
+            'response_time_ms': response_time_ms,
+            'success': True,
+            'status_code': 200,
+            'metadata': metadata,
+        })
         
     except RateLimitException:
         raise  # Re-raise rate limit exceptions
@@ -203,35 +346,27 @@ def track_api_call(
         error_type = type(e).__name__
         error_message = str(e)
         
-        usage_log = APIUsageLog.objects.create(
-            service=service,
-            user=user,
-            endpoint=endpoint,
-            method=method,
-            response_time_ms=response_time_ms,
-            success=False,
-            error_message=error_message[:5000],
-            error_type=error_type,
-            metadata=metadata or {}
-        )
-        
-        # Log detailed error
-        log_api_error(
-            service=service,
-            usage_log=usage_log,
-            error_type=error_type,
-            error_message=error_message,
-            endpoint=endpoint,
-            method=method,
-            stack_trace=traceback.format_exc()
+        # The APIError row, service.last_error_at and alert checks are handled
+        # when the usage record is written (see core.api_usage_buffer)
+        record_api_usage(
+            {
+                'service': service,
+                'user': user,
+                'endpoint': endpoint,
+                'method': method,
+                'response_time_ms': response_time_ms,
+                'success': False,
+                'error_message': error_message[:5000],
+                'error_type': error_type,
+                'metadata': metadata,
+            },
+            error={
+                'error_type': error_type,
+                'error_message': error_message,
+                'stack_trace': traceback.format_exc(),
+            },
         )
-        
-        # Update service last error
         service.last_error_at = timezone.now()
-        service.save(update_fields=['last_error_at'])
-        
-        # Check if we should create an alert
-        check_and_create_alerts(service)
         
         raise  # Re-raise the original exception
 
@@ -274,24 +409,130 @@ def log_api_error(
     return error
 
 
-def update_quota_usage(service: APIService):
+def _quota_periods(now):
+    """Yield (period_type, period_start, period_end) for the tracked quota periods."""
+    hour_start = now.replace(minute=0, second=0, microsecond=0)
+    yield 'hour', hour_start, hour_start + timedelta(hours=1)
+    
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    yield 'day', day_start, day_start + timedelta(days=1)
+
+
+def record_quota_usage(service: APIService, success: bool = True, response_time_ms: Optional[int] = None):
+    """Incrementally add one request to the current hourly and daily quota rows."""
+    record_quota_usage_batch(service, [(timezone.now(), success, response_time_ms)])
+
+
+def record_quota_usage_batch(service: APIService, requests):
     """
-    Update quota usage aggregations for a service.
-    This should be called after successful API calls.
+    Add ``(request_at, success, response_time_ms)`` tuples to the quota rows.
+    
+    Requests are grouped per hourly/daily period and each period is updated
+    with a single F()-based UPDATE, so the cost does not grow with the number
+    of requests already recorded in the period.
     """
-    now = timezone.now()
+    grouped = {}
+    for request_at, success, response_time_ms in requests:
+        for period in _quota_periods(request_at):
+            grouped.setdefault(period, []).append((success, response_time_ms))
     
-    # Update hourly quota
-    hour_start = now.replace(minute=0, second=0, microsecond=0)
-    hour_end = hour_start + timedelta(hours=1)
+    try:
+        for (period_type, period_start, period_end), items in grouped.items():
+            _increment_quota_period(service, period_type, period_start, period_end, items)
+    except Exception as e:
+        # Quota bookkeeping must never break the tracked API call
+        logger.warning(f"Failed to record quota usage for {service.name}: {e}")
+
+
+def _increment_quota_period(service: APIService, period_type: str, period_start, period_end, items):
+    """Apply ``(success, response_time_ms)`` items to a quota period with a single UPDATE."""
+    from django.db.models import FloatField
+    from django.db.models.functions import Cast, Coalesce, Greatest, Least
     
-    _update_quota_period(service, 'hour', hour_start, hour_end)
+    quota_usage, created = APIQuotaUsage.objects.get_or_create(
+        service=service,
+        period_type=period_type,
+        period_start=period_start,
+        defaults={'period_end': period_end}
+    )
     
-    # Update daily quota
-    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    day_end = day_start + timedelta(days=1)
+    count = len(items)
+    successes = sum(1 for success, _ in items if success)
+    timings = [ms for _, ms in items if ms is not None]
     
-    _update_quota_period(service, 'day', day_start, day_end)
+    updates = {
+        'total_requests': F('total_requests') + count,
+        'successful_requests': F('successful_requests') + successes,
+        'failed_requests': F('failed_requests') + (count - successes),
+        'updated_at': timezone.now(),
+    }
+    if timings:
+        batch_mean = sum(timings) / len(timings)
+        # Running mean over all requests in the period
+        updates['avg_response_time_ms'] = (
+            Coalesce(F('avg_response_time_ms'), Cast(batch_mean, FloatField()))
+            * Cast(F('total_requests'), FloatField())
+            + sum(timings)
+        ) / Cast(F('total_requests') + len(timings), FloatField())
+        updates['max_response_time_ms'] = Greatest(Coalesce(F('max_response_time_ms'), max(timings)), max(timings))
+        updates['min_response_time_ms'] = Least(Coalesce(F('min_response_time_ms'), min(timings)), min(timings))
+    
+    APIQuotaUsage.objects.filter(pk=quota_usage.pk).update(**updates)
+    
+    # Quota percentage and alert level only depend on the new total, which
+    # includes increments from other workers since get_or_create
+    quota_usage.refresh_from_db(fields=['total_requests', 'alert_level'])
+    previous_level = quota_usage.alert_level
+    if _apply_quota_limits(service, quota_usage):
+        APIQuotaUsage.objects.filter(pk=quota_usage.pk).update(
+            quota_limit=quota_usage.quota_limit,
+            quota_remaining=quota_usage.quota_remaining,
+            quota_percentage_used=quota_usage.quota_percentage_used,
+            alert_level=quota_usage.alert_level,
+        )
+        if quota_usage.alert_level != previous_level and quota_usage.alert_level in ['warning', 'critical', 'exceeded']:
+            _create_quota_alert(service, quota_usage)
+
+
+def _apply_quota_limits(service: APIService, quota_usage: APIQuotaUsage) -> bool:
+    """Set quota limit/remaining/percentage and alert level from total_requests.
+    
+    Returns True if a limit is configured for the period.
+    """
+    limit = {
+        'minute': service.requests_per_minute,
+        'hour': service.requests_per_hour,
+        'day': service.requests_per_day,
+    }.get(quota_usage.period_type)
+    if not limit:
+        return False
+    
+    quota_usage.quota_limit = limit
+    quota_usage.quota_remaining = max(0, limit - quota_usage.total_requests)
+    quota_usage.quota_percentage_used = (quota_usage.total_requests / limit) * 100
+    
+    # Set alert level based on quota percentage
+    if quota_usage.quota_percentage_used:
+        if quota_usage.quota_percentage_used >= 100:
+            quota_usage.alert_level = 'exceeded'
+        elif quota_usage.quota_percentage_used >= service.alert_threshold_critical:
+            quota_usage.alert_level = 'critical'
+        elif quota_usage.quota_percentage_used >= service.alert_threshold_warning:
+            quota_usage.alert_level = 'warning'
+        else:
+            quota_usage.alert_level = 'normal'
+    return True
+
+
+def update_quota_usage(service: APIService):
+    """
+    Rebuild quota usage aggregations for a service from APIUsageLog.
+    
+    track_api_call maintains the quota rows incrementally via
+    record_quota_usage(); this full re-aggregation is for reconciling them.
+    """
+    for period_type, period_start, period_end in _quota_periods(timezone.now()):
+        _update_quota_period(service, period_type, period_start, period_end)
 
 
 def _update_quota_period(service: APIService, period_type: str, period_start, period_end):
@@ -310,7 +551,7 @@ def _update_quota_period(service: APIService, period_type: str, period_start, pe
         service=service,
         request_at__gte=period_start,
         request_at__lt=period_end
-    )
+    ).exclude(metadata__has_key='served_from_cache')  # answered by the LLM gateway, not the API
     
     stats = logs.aggregate(
         total=Count('id'),
@@ -328,30 +569,7 @@ def _update_quota_period(service: APIService, period_type: str, period_start, pe
     quota_usage.max_response_time_ms = stats['max_time']
     quota_usage.min_response_time_ms = stats['min_time']
     
-    # Calculate quota percentage if limit is configured
-    if period_type == 'minute' and service.requests_per_minute:
-        quota_usage.quota_limit = service.requests_per_minute
-        quota_usage.quota_remaining = max(0, service.requests_per_minute - quota_usage.total_requests)
-        quota_usage.quota_percentage_used = (quota_usage.total_requests / service.requests_per_minute) * 100
-    elif period_type == 'hour' and service.requests_per_hour:
-        quota_usage.quota_limit = service.requests_per_hour
-        quota_usage.quota_remaining = max(0, service.requests_per_hour - quota_usage.total_requests)
-        quota_usage.quota_percentage_used = (quota_usage.total_requests / service.requests_per_hour) * 100
-    elif period_type == 'day' and service.requests_per_day:
-        quota_usage.quota_limit = service.requests_per_day
-        quota_usage.quota_remaining = max(0, service.requests_per_day - quota_usage.total_requests)
-        quota_usage.quota_percentage_used = (quota_usage.total_requests / service.requests_per_day) * 100
-    
-    # Set alert level based on quota percentage
-    if quota_usage.quota_percentage_used:
-        if quota_usage.quota_percentage_used >= 100:
-            quota_usage.alert_level = 'exceeded'
-        elif quota_usage.quota_percentage_used >= service.alert_threshold_critical:
-            quota_usage.alert_level = 'critical'
-        elif quota_usage.quota_percentage_used >= service.alert_threshold_warning:
-            quota_usage.alert_level = 'warning'
-        else:
-            quota_usage.alert_level = 'normal'
+    _apply_quota_limits(service, quota_usage)
     
     quota_usage.save()
     
@@ -0,0 +1,413 @@
+"""
+UC-117: Buffered APIUsageLog writer.
+
+track_api_call() hands every usage record to record_api_usage(). Depending on
+settings.API_USAGE_LOG_BUFFER['BACKEND'] the record is:
+
+* ``sync``   - written immediately (one INSERT per call, the historical behavior)
+* ``memory`` - appended to an in-process queue drained by a background thread,
+               or inline by the recording process once a batch fills up or
+               the oldest record has waited twice ``FLUSH_INTERVAL`` (the
+               Celery task runs in the worker and cannot reach these queues)
+* ``redis``  - pushed onto a Redis list drained by the same background thread
+               and by the ``flush_api_usage_logs`` Celery task
+
+Queued records are written with ``bulk_create`` in batches of ``BATCH_SIZE``
+at most every ``FLUSH_INTERVAL`` seconds. A batch whose write fails is put back
+at the head of the queue and retried up to ``MAX_FLUSH_ATTEMPTS`` times.
+Records still queued are counted by the database rate-limit fallback
+(``buffered_usage_count``). Error records carry their APIError
+details; the flush links them to the created log rows, bumps
+``APIService.last_error_at`` once per service, adds the batch to the hourly and
+daily quota rows and runs the error-rate alert check once per service per batch.
+
+If a queue is unavailable (Redis down, memory queue full) the record is
+written directly so no telemetry is lost.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SETTINGS = {
+    'BACKEND': 'sync',
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL': 5.0,
+    'MAX_BUFFERED': 10000,
+    'REDIS_URL': None,
+    'REDIS_KEY': 'api_usage_log_buffer',
+}
+# Flush attempts before a batch that keeps failing is dropped
+MAX_FLUSH_ATTEMPTS = 3
+
+
+def buffer_settings() -> Dict:
+    return {**DEFAULT_BUFFER_SETTINGS, **getattr(settings, 'API_USAGE_LOG_BUFFER', {})}
+
+
+class MemoryUsageLogBuffer:
+    """Bounded in-process queue of usage records."""
+
+    def __init__(self, max_buffered: int):
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._max_buffered = max_buffered
+        self._oldest_at: Optional[float] = None
+
+    def enqueue(self, record: Dict) -> bool:
+        with self._lock:
+            if len(self._queue) >= self._max_buffered:
+                return False
+            if not self._queue:
+                self._oldest_at = time.monotonic()
+            self._queue.append(record)
+            return True
+
+    def drain(self, limit: int) -> List[Dict]:
+        with self._lock:
+            count = min(limit, len(self._queue))
+            records = [self._queue.popleft() for _ in range(count)]
+            # Approximate: what remains was queued no later than now
+            self._oldest_at = time.monotonic() if self._queue else None
+            return records
+
+    def requeue(self, records: List[Dict]):
+        """Put records back at the head of the queue, ahead of newer ones."""
+        with self._lock:
+            self._queue.extendleft(reversed(records))
+            self._oldest_at = min(self._oldest_at or time.monotonic(), time.monotonic())
+
+    def pending(self) -> List[Dict]:
+        with self._lock:
+            return list(self._queue)
+
+    def oldest_age(self) -> float:
+        """Seconds the oldest queued record has waited (0 when empty)."""
+        oldest = self._oldest_at
+        return time.monotonic() - oldest if oldest is not None and self._queue else 0.0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class RedisUsageLogBuffer:
+    """Usage records queued as JSON on a Redis list shared by all processes."""
+
+    def __init__(self, url: str, key: str, max_buffered: int):
+        import redis
+
+        self._client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._key = key
+        self._max_buffered = max_buffered
+
+    def enqueue(self, record: Dict) -> bool:
+        length = self._client.rpush(self._key, json.dumps(record, cls=DjangoJSONEncoder))
+        if length > self._max_buffered:
+            # Keep the newest records; the flusher is clearly not keeping up
+            self._client.ltrim(self._key, -self._max_buffered, -1)
+        return True
+
+    def drain(self, limit: int) -> List[Dict]:
+        pipe = self._client.pipeline(transaction=True)
+        pipe.lrange(self._key, 0, limit - 1)
+        pipe.ltrim(self._key, limit, -1)
+        raw, _ = pipe.execute()
+        return self._decode(raw)
+
+    def requeue(self, records: List[Dict]):
+        """Put records back at the head of the list, ahead of newer ones."""
+        if records:
+            self._client.lpush(self._key, *[json.dumps(record, cls=DjangoJSONEncoder) for record in reversed(records)])
+
+    def pending(self) -> List[Dict]:
+        return self._decode(self._client.lrange(self._key, 0, -1))
+
+    @staticmethod
+    def _decode(raw) -> List[Dict]:
+        records = []
+        for item in raw:
+            try:
+                records.append(json.loads(item))
+            except (TypeError, ValueError):
+                logger.warning("Dropping malformed API usage record from buffer")
+        return records
+
+    def __len__(self) -> int:
+        return int(self._client.llen(self._key))
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_usage_log_buffer():
+    """Return the configured buffer, or None when writes are synchronous."""
+    global _buffer
+    config = buffer_settings()
+    backend = config['BACKEND']
+    if backend not in ('memory', 'redis'):
+        return None
+    with _buffer_lock:
+        if _buffer is None:
+            if backend == 'redis':
+                url = config['REDIS_URL'] or settings.CACHES['default']['LOCATION']
+                _buffer = RedisUsageLogBuffer(url, config['REDIS_KEY'], config['MAX_BUFFERED'])
+            else:
+                _buffer = MemoryUsageLogBuffer(config['MAX_BUFFERED'])
+        return _buffer
+
+
+def record_api_usage(log: Dict, error: Optional[Dict] = None):
+    """
+    Queue (or write) one APIUsageLog record.
+
+    Args:
+        log: APIUsageLog field values; ``service``/``user`` may be instances or ids
+        error: Optional APIError field values for failed calls
+
+    Returns:
+        The created APIUsageLog when written synchronously, otherwise None
+    """
+    record = _serialize_record(log, error)
+    buffer = get_usage_log_buffer()
+    if buffer is not None:
+        try:
+            if buffer.enqueue(record):
+                _flusher.notify(len(buffer))
+                return None
+        except Exception as exc:
+            logger.warning(f"API usage buffer unavailable, writing directly: {exc}")
+    created = write_usage_records([record])
+    return created[0] if created else None
+
+
+def buffered_usage_count(service_id: int, since) -> int:
+    """Queued (not yet written) usage records for ``service_id`` made at or after ``since``."""
+    buffer = get_usage_log_buffer()
+    if buffer is None:
+        return 0
+    try:
+        records = buffer.pending()
+    except Exception as exc:
+        logger.warning(f"Could not count buffered API usage records: {exc}")
+        return 0
+    count = 0
+    for record in records:
+        fields = record.get('log') or {}
+        if fields.get('service_id') != service_id:
+            continue
+        request_at = fields.get('request_at')
+        if isinstance(request_at, str):
+            request_at = parse_datetime(request_at)
+        if request_at is None or request_at >= since:
+            count += 1
+    return count
+
+
+def _serialize_record(log: Dict, error: Optional[Dict]) -> Dict:
+    fields = dict(log)
+    for name in ('service', 'user'):
+        value = fields.pop(name, None)
+        if value is not None and not isinstance(value, int):
+            value = getattr(value, 'pk', None)
+        fields[f'{name}_id'] = value
+    fields.setdefault('request_at', timezone.now())
+    return {'log': fields, 'error': error}
+
+
+def write_usage_records(records: List[Dict]) -> List:
+    """Bulk-insert usage records and their error details."""
+    from core.models import APIService, APIUsageLog, APIError
+    from core.api_monitoring import check_and_create_alerts, record_quota_usage_batch, sanitize_data
+
+    if not records:
+        return []
+
+    logs = []
+    for record in records:
+        fields = dict(record['log'])
+        if isinstance(fields.get('request_at'), str):
+            fields['request_at'] = parse_datetime(fields['request_at'])
+        logs.append(APIUsageLog(**fields))
+
+    error_services = {}
+    with transaction.atomic():
+        created = APIUsageLog.objects.bulk_create(logs)
+
+        errors = []
+        for usage_log, record in zip(created, records):
+            error = record.get('error')
+            if not error:
+                continue
+            errors.append(APIError(
+                service_id=usage_log.service_id,
+                usage_log=usage_log if usage_log.pk else None,
+                error_type=error.get('error_type', ''),
+                error_message=(error.get('error_message') or '')[:5000],
+                endpoint=usage_log.endpoint,
+                request_method=usage_log.method,
+                status_code=error.get('status_code'),
+                stack_trace=(error.get('stack_trace') or '')[:10000],
+                request_data=sanitize_data(error.get('request_data') or {}),
+                response_data=sanitize_data(error.get('response_data') or {}),
+            ))
+            error_services[usage_log.service_id] = max(
+                usage_log.request_at, error_services.get(usage_log.service_id, usage_log.request_at)
+            )
+            logger.error(
+                f"API Error logged: service={usage_log.service_id} - {error.get('error_type')} - "
+                f"{(error.get('error_message') or '')[:100]}"
+            )
+        if errors:
+            APIError.objects.bulk_create(errors)
+
+        for service_id, last_error_at in error_services.items():
+            APIService.objects.filter(pk=service_id).update(last_error_at=last_error_at)
+
+    quota_requests = {}
+    for usage_log in created:
+        if 'served_from_cache' in (usage_log.metadata or {}):
+            continue  # answered by the LLM gateway without calling the API
+        quota_requests.setdefault(usage_log.service_id, []).append(
+            (usage_log.request_at, usage_log.success, usage_log.response_time_ms)
+        )
+    services = APIService.objects.in_bulk(list(quota_requests))
+    for service_id, requests in quota_requests.items():
+        service = services.get(service_id)
+        if service is None:
+            continue
+        record_quota_usage_batch(service, requests)
+        if service_id in error_services:
+            try:
+                check_and_create_alerts(service)
+            except Exception as exc:
+                logger.warning(f"Alert check failed for {service.name}: {exc}")
+
+    return created
+
+
+def flush_usage_log_buffer(max_batches: Optional[int] = None) -> int:
+    """
+    Drain queued records into the database in batches.
+
+    Returns:
+        Number of usage records written
+    """
+    buffer = get_usage_log_buffer()
+    if buffer is None:
+        return 0
+    batch_size = max(1, int(buffer_settings()['BATCH_SIZE']))
+    written = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        records = buffer.drain(batch_size)
+        if not records:
+            break
+        try:
+            write_usage_records(records)
+            written += len(records)
+        except Exception as exc:
+            _requeue_failed(buffer, records, exc)
+            break
+        batches += 1
+        if len(records) < batch_size:
+            break
+    if written:
+        logger.debug(f"Flushed {written} API usage records in {batches} batch(es)")
+    return written
+
+
+def _requeue_failed(buffer, records: List[Dict], exc: Exception):
+    retry = []
+    for record in records:
+        record['attempts'] = record.get('attempts', 0) + 1
+        if record['attempts'] < MAX_FLUSH_ATTEMPTS:
+            retry.append(record)
+    dropped = len(records) - len(retry)
+    logger.error(
+        f"Failed to flush {len(records)} API usage records ({len(retry)} re-queued, {dropped} dropped): {exc}"
+    )
+    try:
+        buffer.requeue(retry)
+    except Exception as requeue_exc:
+        logger.error(f"Could not re-queue {len(retry)} API usage records: {requeue_exc}")
+
+
+class _BackgroundFlusher:
+    """Daemon thread flushing the buffer every FLUSH_INTERVAL or once a batch fills up."""
+
+    def __init__(self):
+        self._thread = None
+        self._pid = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._inline_lock = threading.Lock()
+
+    def notify(self, buffered: int):
+        self._ensure_running()
+        config = buffer_settings()
+        full = buffered >= int(config['BATCH_SIZE'])
+        buffer = _buffer
+        if isinstance(buffer, MemoryUsageLogBuffer):
+            # Only this process can drain its queue; don't rely on the thread alone
+            if full or buffer.oldest_age() >= 2 * float(config['FLUSH_INTERVAL']):
+                self._flush_inline()
+        elif full:
+            self._wakeup.set()
+
+    def _flush_inline(self):
+        # Inside a request transaction the flushed rows would roll back with it
+        if connection.in_atomic_block or not self._inline_lock.acquire(blocking=False):
+            return  # another request in this process is already flushing
+        try:
+            flush_usage_log_buffer(max_batches=1)
+        except Exception as exc:
+            logger.error(f"Inline API usage log flush failed: {exc}")
+        finally:
+            self._inline_lock.release()
+
+    def _ensure_running(self):
+        # Threads don't survive fork(); restart in each gunicorn worker
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='api-usage-log-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(float(buffer_settings()['FLUSH_INTERVAL']))
+            self._wakeup.clear()
+            try:
+                flush_usage_log_buffer()
+            except Exception as exc:
+                logger.error(f"API usage log flusher error: {exc}")
+            finally:
+                close_old_connections()
+
+
+_flusher = _BackgroundFlusher()
+
+
+@atexit.register
+def _flush_on_exit():
+    if isinstance(_buffer, MemoryUsageLogBuffer) and len(_buffer):
+        try:
+            flush_usage_log_buffer()
+        except Exception:
+            pass
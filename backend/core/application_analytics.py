@@ -2,10 +2,16 @@
 """
 UC-097: Application Success Rate Analysis
 Analytics service for analyzing job application success patterns
+
+The analyzer loads the candidate's job entries (and their status history) once
+into pandas frames and computes every breakdown from those frames, so a full
+dashboard costs a handful of queries regardless of how many jobs are tracked.
 """
 
-from django.db.models import Count, Avg, Q, F, ExpressionWrapper, fields
-from django.db.models.functions import TruncDate, Coalesce, TruncMonth
+from django.db.models import Count, Q
+from functools import cached_property, wraps
+import numpy as np
+import pandas as pd
 import os, json, logging, requests
 from django.utils import timezone
 from datetime import timedelta, date
@@ -15,7 +21,90 @@ from core.api_monitoring import track_api_call, get_or_create_service, SERVICE_G
 logger = logging.getLogger(__name__)
 
 
-from core.models import JobEntry
+from core.models import JobEntry, JobStatusChange
+
+
+PRE_RESPONSE_STATUSES = ('interested', 'applied')
+INTERVIEW_STATUSES = ('phone_screen', 'interview', 'offer')
+
+# Columns loaded for every non-archived job of the candidate
+FRAME_FIELDS = (
+    'id', 'title', 'industry', 'company_size', 'application_source', 'application_method', 'job_type',
+    'status', 'resume_customized', 'cover_letter_customized',
+    'application_submitted_at', 'first_response_at', 'days_to_response', 'created_at',
+    'resume_doc_id', 'resume_doc__document_name', 'resume_doc__version',
+    'cover_letter_doc_id', 'cover_letter_doc__document_name', 'cover_letter_doc__version',
+)
+TEXT_FIELDS = ('title', 'industry', 'company_size', 'application_source', 'application_method', 'job_type', 'status')
+DATETIME_FIELDS = ('application_submitted_at', 'first_response_at', 'created_at')
+ID_FIELDS = ('resume_doc_id', 'resume_doc__version', 'cover_letter_doc_id', 'cover_letter_doc__version')
+
+APPLY_SPEED_BUCKETS = ((1, '0-1 days'), (3, '2-3 days'), (7, '4-7 days'), (None, '8+ days'))
+RESPONSE_SPEED_BUCKETS = ((3, '0-3 days'), (7, '4-7 days'), (14, '8-14 days'), (None, '15+ days'))
+
+
+def _memoized(method):
+    """Cache a method's result on the analyzer; every breakdown reads the same snapshot."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        if key not in self._memo:
+            self._memo[key] = method(self, *args, **kwargs)
+        return self._memo[key]
+    return wrapper
+
+
+def _pct(part, whole):
+    return round((part / whole * 100), 2) if whole else 0
+
+
+def _stage_counts(frame):
+    """Outcome counts for a slice of the job frame, as plain ints."""
+    return {
+        'total': len(frame),
+        'applied': int(frame['applied'].sum()),
+        'responded': int(frame['responded'].sum()),
+        'interviews': int(frame['interviewed'].sum()),
+        'offers': int(frame['offer'].sum()),
+    }
+
+
+def _grouped_counts(frame, column):
+    """Per-value outcome counts for ``column`` in first-appearance order."""
+    if frame.empty:
+        return {}
+    grouped = frame.groupby(column, sort=False)
+    stats = pd.DataFrame({
+        'total': grouped.size(),
+        'applied': grouped['applied'].sum(),
+        'responded': grouped['responded'].sum(),
+        'interviews': grouped['interviewed'].sum(),
+        'offers': grouped['offer'].sum(),
+        'avg_days': grouped['days_to_response'].mean(),
+    })
+    results = {}
+    for key, row in stats.iterrows():
+        results[key] = {
+            'total': int(row['total']),
+            'applied': int(row['applied']),
+            'responded': int(row['responded']),
+            'interviews': int(row['interviews']),
+            'offers': int(row['offers']),
+            'avg_days': 0 if pd.isna(row['avg_days']) else float(row['avg_days']),
+        }
+    return results
+
+
+def _rank_rows(rows):
+    """Order grouped rows by offers, then responses, then volume (all descending)."""
+    return sorted(rows, key=lambda item: (-item[1]['offers'], -item[1]['responded'], -item[1]['total']))
+
+
+def _bucket_days(days, buckets):
+    """Label each day delta with the first bucket whose upper bound it fits."""
+    bounded = [(upper, label) for upper, label in buckets if upper is not None]
+    labels = np.select([days <= upper for upper, _ in bounded], [label for _, label in bounded], default=buckets[-1][1])
+    return pd.Series(labels, index=days.index)
 
 
 class ApplicationSuccessAnalyzer:
@@ -24,10 +113,47 @@ class ApplicationSuccessAnalyzer:
     def __init__(self, candidate_profile):
         self.candidate = candidate_profile
         self.applications = JobEntry.objects.filter(candidate=candidate_profile, is_archived=False)
+        self._memo = {}
     
+    @cached_property
+    def frame(self):
+        """One row per job (newest activity first) with outcome flags precomputed."""
+        rows = list(self.applications.values_list(*FRAME_FIELDS))
+        frame = pd.DataFrame.from_records(rows, columns=FRAME_FIELDS)
+        for field in TEXT_FIELDS:
+            frame[field] = frame[field].fillna('').astype(object)
+        for field in DATETIME_FIELDS:
+            frame[field] = pd.to_datetime(frame[field], utc=True)
+        for field in ID_FIELDS:
+            frame[field] = frame[field].astype('Int64')
+        for field in ('resume_customized', 'cover_letter_customized'):
+            frame[field] = frame[field].fillna(False).astype(bool)
+        frame['days_to_response'] = pd.to_numeric(frame['days_to_response'], errors='coerce')
+        status = frame['status']
+        frame['applied'] = status != 'interested'
+        frame['responded'] = ~status.isin(PRE_RESPONSE_STATUSES)
+        frame['interviewed'] = status.isin(INTERVIEW_STATUSES)
+        frame['offer'] = status == 'offer'
+        return frame
+
+    @cached_property
+    def status_changes(self):
+        """Status history of the candidate's jobs, oldest change first."""
+        rows = list(
+            JobStatusChange.objects
+            .filter(job__candidate=self.candidate, job__is_archived=False)
+            .order_by('changed_at')
+            .values_list('job_id', 'new_status', 'changed_at')
+        )
+        changes = pd.DataFrame.from_records(rows, columns=('job_id', 'new_status', 'changed_at'))
+        changes['changed_at'] = pd.to_datetime(changes['changed_at'], utc=True)
+        return changes
+
+    @_memoized
     def get_overall_metrics(self):
         """Get overall application success metrics."""
-        total = self.applications.count()
+        frame = self.frame
+        total = len(frame)
         
         if total == 0:
             return {
@@ -46,76 +172,56 @@ class ApplicationSuccessAnalyzer:
                 }
             }
         
-        # Count applications that got responses (moved beyond 'applied' status)
-        responded = self.applications.exclude(status__in=['interested', 'applied']).count()
-        
-        # Count by stage
-        stage_counts = self.applications.values('status').annotate(count=Count('id'))
-        stages = {stage['status']: stage['count'] for stage in stage_counts}
-        
-        # Calculate rates
-        applied_count = self.applications.exclude(status='interested').count()
-        interview_count = self.applications.filter(
-            status__in=['phone_screen', 'interview', 'offer']
-        ).count()
-        offer_count = self.applications.filter(status='offer').count()
-        
-        # Average days to response
-        avg_days = self.applications.filter(
-            days_to_response__isnull=False
-        ).aggregate(avg=Avg('days_to_response'))['avg'] or 0
+        counts = _stage_counts(frame)
+        stages = frame['status'].value_counts()
+        avg_days = frame['days_to_response'].mean()
+        applied_count = counts['applied']
         
         return {
             'total_applications': total,
             'applied_count': applied_count,
-            'response_rate': round((responded / applied_count * 100) if applied_count > 0 else 0, 2),
-            'interview_rate': round((interview_count / applied_count * 100) if applied_count > 0 else 0, 2),
-            'offer_rate': round((offer_count / applied_count * 100) if applied_count > 0 else 0, 2),
-            'avg_days_to_response': round(avg_days, 1),
+            'response_rate': _pct(counts['responded'], applied_count),
+            'interview_rate': _pct(counts['interviews'], applied_count),
+            'offer_rate': _pct(counts['offers'], applied_count),
+            'avg_days_to_response': round(0 if pd.isna(avg_days) else float(avg_days), 1),
             'success_stages': {
-                'interested': stages.get('interested', 0),
-                'applied': stages.get('applied', 0),
-                'phone_screen': stages.get('phone_screen', 0),
-                'interview': stages.get('interview', 0),
-                'offer': stages.get('offer', 0),
-                'rejected': stages.get('rejected', 0),
+                stage: int(stages.get(stage, 0))
+                for stage in ('interested', 'applied', 'phone_screen', 'interview', 'offer', 'rejected')
             }
         }
     
+    def _breakdown_row(self, counts):
+        applied = counts['applied']
+        return {
+            'total_applications': counts['total'],
+            'applied_count': applied,
+            'response_rate': _pct(counts['responded'], applied),
+            'interview_rate': _pct(counts['interviews'], applied),
+            'offer_rate': _pct(counts['offers'], applied),
+            'avg_days_to_response': round(counts['avg_days'], 1),
+        }
+
+    def _breakdown_by_choices(self, column, choices, label_key, code_key):
+        """Rates per choice value in ``choices`` order, sorted by offer rate."""
+        grouped = _grouped_counts(self.frame, column)
+        results = []
+        for code, label in choices:
+            counts = grouped.get(code)
+            if not counts or counts['applied'] == 0:
+                continue
+            results.append({label_key: label, code_key: code, **self._breakdown_row(counts)})
+        results.sort(key=lambda x: x['offer_rate'], reverse=True)
+        return results
+
+    @_memoized
     def analyze_by_industry(self):
         """Analyze success rates by industry."""
-        industries = self.applications.exclude(industry='').values('industry').distinct()
+        frame = self.frame
         results = []
-        
-        for industry_obj in industries:
-            industry = industry_obj['industry']
-            apps = self.applications.filter(industry=industry)
-            total = apps.count()
-            
-            if total == 0:
+        for industry, counts in _grouped_counts(frame[frame['industry'] != ''], 'industry').items():
+            if counts['applied'] == 0:
                 continue
-            
-            applied = apps.exclude(status='interested').count()
-            if applied == 0:
-                continue
-                
-            responded = apps.exclude(status__in=['interested', 'applied']).count()
-            interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-            offers = apps.filter(status='offer').count()
-            
-            results.append({
-                'industry': industry,
-                'total_applications': total,
-                'applied_count': applied,
-                'response_rate': round((responded / applied * 100), 2),
-                'interview_rate': round((interviews / applied * 100), 2),
-                'offer_rate': round((offers / applied * 100), 2),
-                'avg_days_to_response': round(
-                    apps.filter(days_to_response__isnull=False).aggregate(
-                        avg=Avg('days_to_response')
-                    )['avg'] or 0, 1
-                ),
-            })
+            results.append({'industry': industry, **self._breakdown_row(counts)})
         
         # Sort by success (offer rate)
         results.sort(key=lambda x: x['offer_rate'], reverse=True)
@@ -123,193 +229,65 @@ class ApplicationSuccessAnalyzer:
     
     def analyze_by_company_size(self):
         """Analyze success rates by company size."""
-        results = []
-        
-        for size_code, size_label in JobEntry.COMPANY_SIZES:
-            apps = self.applications.filter(company_size=size_code)
-            total = apps.count()
-            
-            if total == 0:
-                continue
-            
-            applied = apps.exclude(status='interested').count()
-            if applied == 0:
-                continue
-                
-            responded = apps.exclude(status__in=['interested', 'applied']).count()
-            interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-            offers = apps.filter(status='offer').count()
-            
-            results.append({
-                'company_size': size_label,
-                'company_size_code': size_code,
-                'total_applications': total,
-                'applied_count': applied,
-                'response_rate': round((responded / applied * 100), 2),
-                'interview_rate': round((interviews / applied * 100), 2),
-                'offer_rate': round((offers / applied * 100), 2),
-                'avg_days_to_response': round(
-                    apps.filter(days_to_response__isnull=False).aggregate(
-                        avg=Avg('days_to_response')
-                    )['avg'] or 0, 1
-                ),
-            })
-        
-        # Sort by offer rate
-        results.sort(key=lambda x: x['offer_rate'], reverse=True)
-        return results
+        return self._breakdown_by_choices('company_size', JobEntry.COMPANY_SIZES, 'company_size', 'company_size_code')
     
     def analyze_by_application_source(self):
         """Analyze success rates by application source."""
-        results = []
-        
-        for source_code, source_label in JobEntry.APPLICATION_SOURCES:
-            apps = self.applications.filter(application_source=source_code)
-            total = apps.count()
-            
-            if total == 0:
-                continue
-            
-            applied = apps.exclude(status='interested').count()
-            if applied == 0:
-                continue
-                
-            responded = apps.exclude(status__in=['interested', 'applied']).count()
-            interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-            offers = apps.filter(status='offer').count()
-            
-            results.append({
-                'source': source_label,
-                'source_code': source_code,
-                'total_applications': total,
-                'applied_count': applied,
-                'response_rate': round((responded / applied * 100), 2),
-                'interview_rate': round((interviews / applied * 100), 2),
-                'offer_rate': round((offers / applied * 100), 2),
-                'avg_days_to_response': round(
-                    apps.filter(days_to_response__isnull=False).aggregate(
-                        avg=Avg('days_to_response')
-                    )['avg'] or 0, 1
-                ),
-            })
-        
-        # Sort by offer rate
-        results.sort(key=lambda x: x['offer_rate'], reverse=True)
-        return results
+        return self._breakdown_by_choices('application_source', JobEntry.APPLICATION_SOURCES, 'source', 'source_code')
     
     def analyze_by_application_method(self):
         """Analyze success rates by application method."""
-        results = []
-        
-        for method_code, method_label in JobEntry.APPLICATION_METHODS:
-            apps = self.applications.filter(application_method=method_code)
-            total = apps.count()
-            
-            if total == 0:
-                continue
-            
-            applied = apps.exclude(status='interested').count()
-            if applied == 0:
-                continue
-                
-            responded = apps.exclude(status__in=['interested', 'applied']).count()
-            interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-            offers = apps.filter(status='offer').count()
-            
-            results.append({
-                'method': method_label,
-                'method_code': method_code,
-                'total_applications': total,
-                'applied_count': applied,
-                'response_rate': round((responded / applied * 100), 2),
-                'interview_rate': round((interviews / applied * 100), 2),
-                'offer_rate': round((offers / applied * 100), 2),
-                'avg_days_to_response': round(
-                    apps.filter(days_to_response__isnull=False).aggregate(
-                        avg=Avg('days_to_response')
-                    )['avg'] or 0, 1
-                ),
-            })
+        return self._breakdown_by_choices('application_method', JobEntry.APPLICATION_METHODS, 'method', 'method_code')
         
-        # Sort by offer rate
-        results.sort(key=lambda x: x['offer_rate'], reverse=True)
-        return results
-    
+    @_memoized
     def analyze_customization_impact(self):
         """Analyze impact of resume/cover letter customization."""
+        frame = self.frame
         results = {
             'resume_customization': {},
             'cover_letter_customization': {},
             'both_customized': {},
         }
         
-        # Analyze resume customization
-        for customized in [True, False]:
-            apps = self.applications.filter(resume_customized=customized)
-            applied = apps.exclude(status='interested').count()
-            
-            if applied > 0:
-                responded = apps.exclude(status__in=['interested', 'applied']).count()
-                interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-                offers = apps.filter(status='offer').count()
-                
-                key = 'customized' if customized else 'not_customized'
-                results['resume_customization'][key] = {
-                    'total_applications': applied,
-                    'response_rate': round((responded / applied * 100), 2),
-                    'interview_rate': round((interviews / applied * 100), 2),
-                    'offer_rate': round((offers / applied * 100), 2),
-                }
-        
-        # Analyze cover letter customization
-        for customized in [True, False]:
-            apps = self.applications.filter(cover_letter_customized=customized)
-            applied = apps.exclude(status='interested').count()
-            
-            if applied > 0:
-                responded = apps.exclude(status__in=['interested', 'applied']).count()
-                interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-                offers = apps.filter(status='offer').count()
-                
-                key = 'customized' if customized else 'not_customized'
-                results['cover_letter_customization'][key] = {
-                    'total_applications': applied,
-                    'response_rate': round((responded / applied * 100), 2),
-                    'interview_rate': round((interviews / applied * 100), 2),
-                    'offer_rate': round((offers / applied * 100), 2),
-                }
-        
-        # Analyze both customized
-        both_customized = self.applications.filter(resume_customized=True, cover_letter_customized=True)
-        neither_customized = self.applications.filter(resume_customized=False, cover_letter_customized=False)
-        
-        for apps, key in [(both_customized, 'both_customized'), (neither_customized, 'neither_customized')]:
-            applied = apps.exclude(status='interested').count()
+        def _rates(mask):
+            counts = _stage_counts(frame[mask])
+            applied = counts['applied']
+            if applied == 0:
+                return None
+            return {
+                'total_applications': applied,
+                'response_rate': _pct(counts['responded'], applied),
+                'interview_rate': _pct(counts['interviews'], applied),
+                'offer_rate': _pct(counts['offers'], applied),
+            }
             
-            if applied > 0:
-                responded = apps.exclude(status__in=['interested', 'applied']).count()
-                interviews = apps.filter(status__in=['phone_screen', 'interview', 'offer']).count()
-                offers = apps.filter(status='offer').count()
-                
-                results['both_customized'][key] = {
-                    'total_applications': applied,
-                    'response_rate': round((responded / applied * 100), 2),
-                    'interview_rate': round((interviews / applied * 100), 2),
-                    'offer_rate': round((offers / applied * 100), 2),
-                }
+        resume = frame['resume_customized']
+        cover = frame['cover_letter_customized']
+        variants = [
+            ('resume_customization', 'customized', resume),
+            ('resume_customization', 'not_customized', ~resume),
+            ('cover_letter_customization', 'customized', cover),
+            ('cover_letter_customization', 'not_customized', ~cover),
+            ('both_customized', 'both_customized', resume & cover),
+            ('both_customized', 'neither_customized', ~resume & ~cover),
+        ]
+        for group, key, mask in variants:
+            rates = _rates(mask)
+            if rates:
+                results[group][key] = rates
         
         return results
     
+    @_memoized
     def analyze_timing_patterns(self):
         """Analyze optimal application submission timing."""
-        # Get applications with submission dates (fallback to created_at)
-        apps_with_dates = (
-            self.applications.annotate(submitted_at=Coalesce('application_submitted_at', 'created_at'))
-            .filter(submitted_at__isnull=False)
-            .exclude(status='interested')
-        )
+        # Submitted applications, dated by submission (fallback to created_at)
+        frame = self.frame
+        apps = frame[frame['applied']]
+        submitted_at = apps['application_submitted_at'].fillna(apps['created_at'])
+        apps = apps.assign(submitted_at=submitted_at)[submitted_at.notna()]
         
-        if apps_with_dates.count() == 0:
+        if apps.empty:
             return {
                 'by_day_of_week': [],
                 'by_time_of_day': [],
@@ -317,66 +295,35 @@ class ApplicationSuccessAnalyzer:
                 'best_time': None,
             }
         
+        def _rates(total, counts):
+            return {
+                'total_applications': total,
+                'response_rate': _pct(counts['responded'], total),
+                'interview_rate': _pct(counts['interviews'], total),
+                'offer_rate': _pct(counts['offers'], total),
+            }
+
         # Analyze by day of week (0=Monday, 6=Sunday)
-        day_stats = defaultdict(lambda: {'total': 0, 'responded': 0, 'interviewed': 0, 'offers': 0})
-        
-        for app in apps_with_dates:
-            day = app.submitted_at.weekday()
-            day_stats[day]['total'] += 1
-            
-            if app.status not in ['interested', 'applied']:
-                day_stats[day]['responded'] += 1
-            if app.status in ['phone_screen', 'interview', 'offer']:
-                day_stats[day]['interviewed'] += 1
-            if app.status == 'offer':
-                day_stats[day]['offers'] += 1
-        
         day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+        day_stats = _grouped_counts(apps.assign(day=apps['submitted_at'].dt.weekday), 'day')
         by_day = []
-        
         for day_num in range(7):
-            if day_stats[day_num]['total'] > 0:
-                total = day_stats[day_num]['total']
-                by_day.append({
-                    'day': day_names[day_num],
-                    'day_num': day_num,
-                    'total_applications': total,
-                    'response_rate': round((day_stats[day_num]['responded'] / total * 100), 2),
-                    'interview_rate': round((day_stats[day_num]['interviewed'] / total * 100), 2),
-                    'offer_rate': round((day_stats[day_num]['offers'] / total * 100), 2),
-                })
+            counts = day_stats.get(day_num)
+            if counts:
+                by_day.append({'day': day_names[day_num], 'day_num': day_num, **_rates(counts['total'], counts)})
         
         # Find best day
         best_day = max(by_day, key=lambda x: (x['offer_rate'], x['response_rate'], x['total_applications'])) if by_day else None
         
         # Analyze by time of day (4-hour buckets)
-        time_stats = defaultdict(lambda: {'total': 0, 'responded': 0, 'interviewed': 0, 'offers': 0})
         slot_labels = ['overnight', 'early_morning', 'morning', 'midday', 'afternoon', 'evening']
-
-        for app in apps_with_dates:
-            hour = app.submitted_at.hour
-            slot_idx = min(hour // 4, len(slot_labels) - 1)
-            time_slot = slot_labels[slot_idx]
-            time_stats[time_slot]['total'] += 1
-            
-            if app.status not in ['interested', 'applied']:
-                time_stats[time_slot]['responded'] += 1
-            if app.status in ['phone_screen', 'interview', 'offer']:
-                time_stats[time_slot]['interviewed'] += 1
-            if app.status == 'offer':
-                time_stats[time_slot]['offers'] += 1
-        
+        slots = (apps['submitted_at'].dt.hour // 4).clip(upper=len(slot_labels) - 1)
+        time_stats = _grouped_counts(apps.assign(slot=slots), 'slot')
         by_time = []
-        for time_slot in slot_labels:
-            if time_stats[time_slot]['total'] > 0:
-                total = time_stats[time_slot]['total']
-                by_time.append({
-                    'time_slot': time_slot,
-                    'total_applications': total,
-                    'response_rate': round((time_stats[time_slot]['responded'] / total * 100), 2),
-                    'interview_rate': round((time_stats[time_slot]['interviewed'] / total * 100), 2),
-                    'offer_rate': round((time_stats[time_slot]['offers'] / total * 100), 2),
-                })
+        for slot_idx, time_slot in enumerate(slot_labels):
+            counts = time_stats.get(slot_idx)
+            if counts:
+                by_time.append({'time_slot': time_slot, **_rates(counts['total'], counts)})
         
         # Find best time
         best_time = max(by_time, key=lambda x: (x['offer_rate'], x['response_rate'], x['total_applications'])) if by_time else None
@@ -392,58 +339,52 @@ class ApplicationSuccessAnalyzer:
         }
 
     def analyze_apply_and_response_speed(self):
-        """Buckets for apply speed (interestedâ†’applied) and response speed (appliedâ†’response)."""
-        apply_buckets = defaultdict(lambda: {'count': 0, 'success': 0})
-        response_buckets = defaultdict(lambda: {'count': 0, 'success': 0})
-        response_durations = []
-
-        for app in self.applications:
-            if getattr(app, 'interested_at', None) and getattr(app, 'applied_at', None):
-                delta_days = (app.applied_at.date() - app.interested_at.date()).days
-                if delta_days <= 1:
-                    bucket = '0-1 days'
-                elif delta_days <= 3:
-                    bucket = '2-3 days'
-                elif delta_days <= 7:
-                    bucket = '4-7 days'
-                else:
-                    bucket = '8+ days'
-                apply_buckets[bucket]['count'] += 1
-                if app.status in ['phone_screen', 'interview', 'offer']:
-                    apply_buckets[bucket]['success'] += 1
-
-            if getattr(app, 'applied_at', None) and getattr(app, 'response_at', None):
-                delta_days = (app.response_at.date() - app.applied_at.date()).days
-                response_durations.append(delta_days)
-                if delta_days <= 3:
-                    bucket = '0-3 days'
-                elif delta_days <= 7:
-                    bucket = '4-7 days'
-                elif delta_days <= 14:
-                    bucket = '8-14 days'
-                else:
-                    bucket = '15+ days'
-                response_buckets[bucket]['count'] += 1
-                if app.status in ['phone_screen', 'interview', 'offer']:
-                    response_buckets[bucket]['success'] += 1
-
-        def format_bucket(b):
+        """
+        Buckets for apply speed (interested→applied) and response speed (applied→response).
+
+        A job counts as applied at ``application_submitted_at`` or its first move to
+        'applied', and as answered at ``first_response_at`` or its first move past it.
+        """
+        frame = self.frame
+        changes = self.status_changes
+        first_applied = changes[changes['new_status'] == 'applied'].groupby('job_id')['changed_at'].min()
+        first_response = changes[~changes['new_status'].isin(PRE_RESPONSE_STATUSES)].groupby('job_id')['changed_at'].min()
+
+        interested_at = frame['created_at']
+        applied_at = frame['application_submitted_at'].fillna(pd.to_datetime(frame['id'].map(first_applied), utc=True))
+        response_at = frame['first_response_at'].fillna(pd.to_datetime(frame['id'].map(first_response), utc=True))
+
+        def _days(start, end):
+            return (end.dt.normalize() - start.dt.normalize()).dt.days
+
+        def format_bucket(days, buckets):
+            known = days.notna()
+            if not known.any():
+                return []
+            labels = _bucket_days(days[known], buckets)
+            grouped = frame.loc[known, 'interviewed'].groupby(labels)
+            counts = grouped.size()
+            success = grouped.sum()
             out = []
-            for bucket, vals in b.items():
-                total = vals['count']
-                success_rate = (vals['success'] / total) if total else 0
-                out.append({'bucket': bucket, 'count': total, 'success_rate': round(success_rate, 3)})
+            for _, bucket in buckets:
+                total = int(counts.get(bucket, 0))
+                if total:
+                    out.append({'bucket': bucket, 'count': total, 'success_rate': round(int(success[bucket]) / total, 3)})
             return out
 
+        apply_days = _days(interested_at, applied_at)
+        response_days = _days(applied_at, response_at)
+
         median_resp = None
-        if response_durations:
-            arr = sorted(response_durations)
+        response_durations = response_days.dropna()
+        if not response_durations.empty:
+            arr = sorted(int(days) for days in response_durations)
             mid = len(arr) // 2
             median_resp = arr[mid] if len(arr) % 2 else round((arr[mid - 1] + arr[mid]) / 2, 1)
 
         return {
-            'apply_speed': format_bucket(apply_buckets),
-            'response_speed': format_bucket(response_buckets),
+            'apply_speed': format_bucket(apply_days, APPLY_SPEED_BUCKETS),
+            'response_speed': format_bucket(response_days, RESPONSE_SPEED_BUCKETS),
             'medians': {'apply_to_response_days': median_resp} if median_resp is not None else {},
         }
 
@@ -451,6 +392,7 @@ class ApplicationSuccessAnalyzer:
         """Alias for UI naming."""
         return self.analyze_by_industry()
 
+    @_memoized
     def analyze_keyword_signals(self):
         """
         Keyword/skill signals weighted by outcome.
@@ -467,7 +409,7 @@ class ApplicationSuccessAnalyzer:
         # 1) CandidateSkill relation (preferred, uses related_name="skills")
         try:
             if hasattr(self.candidate, 'skills'):
-                related = self.candidate.skills.all()
+                related = self.candidate.skills.select_related('skill')
                 if related is not None:
                     candidate_skills.update({getattr(cs.skill, 'name', str(cs.skill)) for cs in related if getattr(cs, 'skill', None)})
         except Exception:
@@ -488,16 +430,19 @@ class ApplicationSuccessAnalyzer:
                     except Exception:
                         candidate_skills = set()
                     break
-        # If the candidate has no recorded skills, we cannot determine â€œkey skillsâ€
+        # If the candidate has no recorded skills, we cannot determine “key skills”
         if not candidate_skills:
             return []
 
         weights = {'offer': 3, 'interview': 2, 'phone_screen': 1}
         signals = defaultdict(lambda: {'count': 0, 'score': 0})
 
-        for app in self.applications:
-            if app.status not in ['phone_screen', 'interview', 'offer']:
-                continue
+        # Only successful jobs need their text; one matcher and one parse per distinct posting
+        stage_jobs = self.applications.filter(status__in=INTERVIEW_STATUSES).only('id', 'title', 'description', 'status')
+        matcher = None
+        parsed_postings = {}
+
+        for app in stage_jobs:
             # pull skills from the first available field on the job
             raw_skills = []
             for field in job_skill_fields:
@@ -519,13 +464,18 @@ class ApplicationSuccessAnalyzer:
 
             # If still empty, fall back to parsing job requirements/description via SkillsGapAnalyzer
             if not skills:
-                try:
-                    from core.skills_gap_analysis import SkillsGapAnalyzer
+                posting = (app.title or '', app.description or '')
+                if posting not in parsed_postings:
+                    try:
+                        from core.skill_matcher import get_skill_matcher
+                        from core.skills_gap_analysis import SkillsGapAnalyzer
 
-                    parsed = SkillsGapAnalyzer._extract_job_requirements(app)
-                    skills = [req.get('name') for req in parsed if req.get('name')]
-                except Exception:
-                    skills = []
+                        matcher = matcher or get_skill_matcher()
+                        parsed = SkillsGapAnalyzer._extract_job_requirements(app, matcher=matcher)
+                        parsed_postings[posting] = [req.get('name') for req in parsed if req.get('name')]
+                    except Exception:
+                        parsed_postings[posting] = []
+                skills = parsed_postings[posting]
 
             # Only keep overlaps with candidate skills
             skills = [s for s in skills if s in candidate_skills]
@@ -561,6 +511,7 @@ class ApplicationSuccessAnalyzer:
             })
         return simplified
 
+    @_memoized
     def analyze_prep_correlations(self):
         """
         Correlate practice activity with interview success.
@@ -569,16 +520,20 @@ class ApplicationSuccessAnalyzer:
         from core.models import JobQuestionPractice
 
         prep = []
-        qs = JobQuestionPractice.objects.filter(job__candidate=self.candidate)
-        total_logs = qs.count()
+        logs = JobQuestionPractice.objects.filter(job__candidate=self.candidate).aggregate(
+            total=Count('id'),
+            success=Count('id', filter=Q(job__status__in=INTERVIEW_STATUSES)),
+        )
+        total_logs = logs['total']
         if total_logs == 0:
             return prep
 
-        success_logs = qs.filter(job__status__in=['phone_screen', 'interview', 'offer']).count()
+        success_logs = logs['success']
         rate = success_logs / total_logs if total_logs else 0
         # baseline: overall interview rate for this candidate
-        applied_count = self.applications.exclude(status='interested').count() or 1
-        overall_interview = self.applications.filter(status__in=['phone_screen', 'interview', 'offer']).count() / applied_count
+        counts = _stage_counts(self.frame)
+        applied_count = counts['applied'] or 1
+        overall_interview = counts['interviews'] / applied_count
 
         prep.append({
             'prep_type': 'question_practice',
@@ -616,37 +571,26 @@ class ApplicationSuccessAnalyzer:
             })
         return result
 
+    @_memoized
     def analyze_success_trend(self, months_back=6):
         """Monthly trend of response/offer rates (unique months) for the last N months."""
         end_date = timezone.now().date().replace(day=1)
         start_date = (end_date - timedelta(days=months_back * 31)).replace(day=1)
-        qs = self.applications.filter(created_at__date__gte=start_date)
-        month_counts = (
-            qs.annotate(month=TruncMonth('created_at'))
-            .values('month')
-            .annotate(
-                total=Count('id'),
-                applied=Count('id', filter=~Q(status='interested')),
-                responded=Count('id', filter=~Q(status__in=['interested', 'applied'])),
-                offers=Count('id', filter=Q(status='offer')),
-            )
-            .order_by('month')
-        )
+        frame = self.frame
+        # Months and the cutoff follow the active timezone, like TruncMonth/__date lookups
+        local_created = frame['created_at'].dt.tz_convert(timezone.get_current_timezone())
+        recent = local_created.dt.date >= start_date
+        months = local_created[recent].dt.strftime('%Y-%m')
+        month_counts = _grouped_counts(frame[recent].assign(month=months), 'month')
         trend = []
-        seen = set()
-        for row in month_counts:
-            month_key = row['month'].strftime('%Y-%m') if row['month'] else ''
-            if month_key in seen:
-                continue
-            seen.add(month_key)
-            applied = row['applied'] or 0
-            responded = row['responded'] or 0
-            offers = row['offers'] or 0
+        for month_key in sorted(month_counts):
+            row = month_counts[month_key]
+            applied = row['applied']
             trend.append({
                 'month': month_key + '-01',  # normalize to first of month ISO
-                'response_rate': round((responded / applied * 100), 2) if applied else 0,
-                'offer_rate': round((offers / applied * 100), 2) if applied else 0,
-                'total': row['total'] or 0,
+                'response_rate': _pct(row['responded'], applied),
+                'offer_rate': _pct(row['offers'], applied),
+                'total': row['total'],
             })
         return trend
 
@@ -655,15 +599,15 @@ class ApplicationSuccessAnalyzer:
         chances = []
         prediction = self.predict_success()
         base_score = prediction['score']
-        stage_fields = ['phone_screen', 'interview', 'offer']
-        jobs = self.applications.filter(status__in=stage_fields)
-        for job in jobs:
+        frame = self.frame
+        jobs = frame[frame['interviewed']]
+        for job in jobs.itertuples(index=False):
             match = getattr(job, 'match_percentage', None)
             if match is None:
                 match = getattr(job, 'match_score', None) or 0
             chance = max(15, min(80, int((match or 0) * 0.6 + base_score * 0.15)))
             chances.append({
-                'job_id': job.id,
+                'job_id': int(job.id),
                 'status': job.status,
                 'match': match,
                 'chance': chance,
@@ -682,9 +626,10 @@ class ApplicationSuccessAnalyzer:
         }
 
     def forecast_salary(self):
-        offers = self.applications.filter(status='offer')
+        frame = self.frame
+        offers = frame[frame['offer']]
         salary_vals = []
-        for job in offers:
+        for job in offers.itertuples(index=False):
             lower = getattr(job, 'salary_lower', None)
             upper = getattr(job, 'salary_upper', None)
             if lower:
@@ -754,6 +699,7 @@ class ApplicationSuccessAnalyzer:
             factors['key_skills'] = key_skills[:5]
         return factors
 
+    @_memoized
     def predict_success(self):
         """
         Conservative heuristic score curved to 0-100 (original 0-80)
@@ -1041,35 +987,28 @@ class ApplicationSuccessAnalyzer:
         """Success metrics grouped by resume and cover letter documents."""
 
         def _format_stats(field, label_prefix):
-            field_name = field
+            field_name = f"{field}_id"
             label_field = f"{field}__document_name"
             version_field = f"{field}__version"
-            subset = (
-                self.applications
-                .filter(**{f"{field_name}__isnull": False})
-                .values(field_name, label_field, version_field)
-                .annotate(
-                    total=Count('id'),
-                    applied=Count('id', filter=~Q(status='interested')),
-                    responded=Count('id', filter=~Q(status__in=['interested', 'applied'])),
-                    interviews=Count('id', filter=Q(status__in=['phone_screen', 'interview', 'offer'])),
-                    offers=Count('id', filter=Q(status='offer')),
-                )
-                .order_by('-offers', '-responded', '-total')
-            )
+            frame = self.frame
+            subset = frame[frame[field_name].notna()]
+            labels = subset.drop_duplicates(field_name).set_index(field_name)
             results = []
-            for row in subset:
-                applied = row['applied'] or 0
+            for document_id, row in _rank_rows(_grouped_counts(subset, field_name).items()):
+                applied = row['applied']
                 if applied == 0:
                     continue
-                label = row.get(label_field) or f"{label_prefix} v{row.get(version_field) or 1}"
+                label = labels.at[document_id, label_field]
+                if pd.isna(label) or not label:
+                    version = labels.at[document_id, version_field]
+                    label = f"{label_prefix} v{1 if pd.isna(version) or not version else int(version)}"
                 results.append({
-                    'document_id': str(row[field_name]),
+                    'document_id': str(document_id),
                     'label': label,
                     'applications': row['total'],
-                    'response_rate': round((row['responded'] / applied) * 100, 2) if applied else 0,
-                    'interview_rate': round((row['interviews'] / applied) * 100, 2) if applied else 0,
-                    'offer_rate': round((row['offers'] / applied) * 100, 2) if applied else 0,
+                    'response_rate': _pct(row['responded'], applied),
+                    'interview_rate': _pct(row['interviews'], applied),
+                    'offer_rate': _pct(row['offers'], applied),
                 })
             return results
 
@@ -1082,34 +1021,19 @@ class ApplicationSuccessAnalyzer:
         """Effectiveness of different application sources/methods."""
 
         def _aggregate(field, mapping):
-            stats = (
-                self.applications
-                .exclude(**{field: ''})
-                .values(field)
-                .annotate(
-                    total=Count('id'),
-                    applied=Count('id', filter=~Q(status='interested')),
-                    responded=Count('id', filter=~Q(status__in=['interested', 'applied'])),
-                    interviews=Count('id', filter=Q(status__in=['phone_screen', 'interview', 'offer'])),
-                    offers=Count('id', filter=Q(status='offer')),
-                )
-                .order_by('-offers', '-responded', '-total')
-            )
+            frame = self.frame
             formatted = []
-            for row in stats:
-                key = row[field]
-                if not key:
-                    continue
-                applied = row['applied'] or 0
+            for key, row in _rank_rows(_grouped_counts(frame[frame[field] != ''], field).items()):
+                applied = row['applied']
                 if applied == 0:
                     continue
                 formatted.append({
                     'code': key,
                     'label': dict(mapping).get(key, (key or '').replace('_', ' ').title()),
                     'applications': row['total'],
-                    'response_rate': round((row['responded'] / applied) * 100, 2) if applied else 0,
-                    'interview_rate': round((row['interviews'] / applied) * 100, 2) if applied else 0,
-                    'offer_rate': round((row['offers'] / applied) * 100, 2) if applied else 0,
+                    'response_rate': _pct(row['responded'], applied),
+                    'interview_rate': _pct(row['interviews'], applied),
+                    'offer_rate': _pct(row['offers'], applied),
                 })
             return formatted
 
@@ -1125,53 +1049,33 @@ class ApplicationSuccessAnalyzer:
     def analyze_role_fit_summary(self):
         """Highlight job types/industries with best response rates."""
         job_type_map = dict(JobEntry.JOB_TYPES)
-        job_type_rows = (
-            self.applications
-            .values('job_type')
-            .annotate(
-                total=Count('id'),
-                applied=Count('id', filter=~Q(status='interested')),
-                responded=Count('id', filter=~Q(status__in=['interested', 'applied'])),
-                offers=Count('id', filter=Q(status='offer')),
-            )
-            .order_by('-offers', '-responded', '-total')
-        )
         job_types = []
-        for row in job_type_rows:
-            code = row['job_type']
-            applied = row['applied'] or 0
+        for code, row in _rank_rows(_grouped_counts(self.frame, 'job_type').items()):
+            applied = row['applied']
             if not code or applied == 0:
                 continue
             job_types.append({
                 'code': code,
                 'label': job_type_map.get(code, code.title()),
                 'applications': row['total'],
-                'response_rate': round((row['responded'] / applied) * 100, 2),
-                'offer_rate': round((row['offers'] / applied) * 100, 2),
+                'response_rate': _pct(row['responded'], applied),
+                'offer_rate': _pct(row['offers'], applied),
             })
 
-        title_rows = (
-            self.applications
-            .values('title')
-            .annotate(
-                total=Count('id'),
-                applied=Count('id', filter=~Q(status='interested')),
-                responded=Count('id', filter=~Q(status__in=['interested', 'applied'])),
-                offers=Count('id', filter=Q(status='offer')),
-            )
-            .filter(total__gte=2)
-            .order_by('-offers', '-responded', '-total')[:5]
-        )
+        title_rows = [
+            item for item in _rank_rows(_grouped_counts(self.frame, 'title').items())
+            if item[1]['total'] >= 2
+        ][:5]
         role_examples = []
-        for row in title_rows:
-            applied = row['applied'] or 0
+        for title, row in title_rows:
+            applied = row['applied']
             if applied == 0:
                 continue
             role_examples.append({
-                'title': row['title'] or 'Role',
+                'title': title or 'Role',
                 'applications': row['total'],
-                'response_rate': round((row['responded'] / applied) * 100, 2),
-                'offer_rate': round((row['offers'] / applied) * 100, 2),
+                'response_rate': _pct(row['responded'], applied),
+                'offer_rate': _pct(row['offers'], applied),
             })
 
         return {
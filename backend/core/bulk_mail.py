@@ -0,0 +1,249 @@
+"""
+Batched delivery for reminder and notification emails.
+
+The reminder commands and tasks used to render their templates and call
+``msg.send()`` for every row, so each email opened its own SMTP connection,
+and each sent row was marked with its own ``save()``. ``BulkMailer`` collects
+the messages for one run and:
+
+* renders each template through one compiled ``Template`` per mailer, and
+  renders identical contexts only once;
+* sends everything over a single ``get_connection()``, in chunks of
+  ``BULK_MAIL_CHUNK_SIZE``. Messages go out one at a time on that connection so
+  a refused recipient marks only its own row as failed, and a dropped
+  connection is reopened before the next message;
+* hands the keys of each chunk's delivered messages to ``on_sent`` once per
+  chunk, so callers mark rows with one ``update()``/``bulk_update()`` per chunk.
+
+Per-chunk throughput and failure counts are logged, and the last run of each
+mailer is kept in the cache for the health endpoint (``bulk_mail_stats``).
+
+    mailer = BulkMailer('deadline_reminders')
+    plain, html = mailer.render('emails/deadline_reminder', context)
+    msg = EmailMultiAlternatives(subject, plain, from_email, [user.email])
+    msg.attach_alternative(html, 'text/html')
+    mailer.add(job.id, msg)
+    result = mailer.send(on_sent=lambda ids: JobEntry.objects.filter(id__in=ids).update(...))
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.db import transaction
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = 'bulk_mail:stats'
+STATS_TTL = 7 * 24 * 60 * 60
+# Rendered bodies kept per mailer for contexts that repeat (most contexts are per-row)
+RENDER_MEMO_SIZE = 256
+
+
+@dataclass
+class BulkMailResult:
+    name: str
+    sent: List[Hashable] = field(default_factory=list)
+    failed: List[Hashable] = field(default_factory=list)
+    batches: List[Dict[str, Any]] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        seconds = self.elapsed_ms / 1000
+        return {
+            'sent': len(self.sent),
+            'failed': len(self.failed),
+            'batches': len(self.batches),
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'messages_per_second': round(len(self.sent) / seconds, 1) if seconds else None,
+            'finished_at': timezone.now().isoformat(),
+        }
+
+
+def _freeze(value):
+    """Hashable form of a template context; raises TypeError for unhashable values."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+class BulkMailer:
+    """Collect messages for one run and send them over one connection."""
+
+    def __init__(self, name: str, *, chunk_size: Optional[int] = None, connection=None):
+        self.name = name
+        self.chunk_size = max(1, chunk_size or getattr(settings, 'BULK_MAIL_CHUNK_SIZE', 200))
+        self.connection = connection
+        self._messages: List[Tuple[Hashable, Any]] = []
+        self._templates: Dict[str, Any] = {}
+        self._rendered: Dict[Tuple[str, Any], Tuple[str, Optional[str]]] = {}
+
+    def __len__(self):
+        return len(self._messages)
+
+    def _template(self, name: str):
+        if name not in self._templates:
+            try:
+                self._templates[name] = get_template(name)
+            except TemplateDoesNotExist:
+                self._templates[name] = None
+        return self._templates[name]
+
+    def render(self, template_base: str, context: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """
+        Render ``<template_base>.txt`` and, if it exists, ``<template_base>.html``.
+
+        Returns:
+            (plain text, html or None)
+        """
+        try:
+            memo_key = (template_base, _freeze(context))
+        except TypeError:
+            memo_key = None
+        if memo_key in self._rendered:
+            return self._rendered[memo_key]
+        plain = self._template(f'{template_base}.txt').render(context)
+        html_template = self._template(f'{template_base}.html')
+        rendered = (plain, html_template.render(context) if html_template else None)
+        if memo_key is not None and len(self._rendered) < RENDER_MEMO_SIZE:
+            self._rendered[memo_key] = rendered
+        return rendered
+
+    def add(self, key: Hashable, message) -> None:
+        """Queue an ``EmailMessage``; ``key`` is what ``on_sent`` receives once it is delivered."""
+        self._messages.append((key, message))
+
+    def send(
+        self,
+        on_sent: Optional[Callable[[List[Hashable]], None]] = None,
+        on_failed: Optional[Callable[[List[Hashable]], None]] = None,
+    ) -> BulkMailResult:
+        """Send the queued messages; ``on_sent``/``on_failed`` run once per chunk."""
+        result = BulkMailResult(self.name)
+        messages, self._messages = self._messages, []
+        if not messages:
+            return result
+
+        started = time.monotonic()
+        connection = self.connection or get_connection(fail_silently=False)
+        try:
+            try:
+                connection.open()
+            except Exception as exc:
+                # Each message retries the connection and is counted as failed if it cannot
+                logger.warning(f"Bulk mail {self.name} could not open a mail connection: {exc}")
+            for start in range(0, len(messages), self.chunk_size):
+                chunk = messages[start:start + self.chunk_size]
+                sent, failed, chunk_ms = self._send_chunk(connection, chunk)
+                if sent and on_sent:
+                    on_sent(sent)
+                if failed and on_failed:
+                    on_failed(failed)
+                result.sent.extend(sent)
+                result.failed.extend(failed)
+                batch = {
+                    'size': len(chunk),
+                    'sent': len(sent),
+                    'failed': len(failed),
+                    'elapsed_ms': round(chunk_ms, 1),
+                    'messages_per_second': round(len(sent) / (chunk_ms / 1000), 1) if chunk_ms else None,
+                }
+                result.batches.append(batch)
+                logger.info(
+                    f"Bulk mail {self.name} batch {len(result.batches)}: sent {batch['sent']}/{batch['size']}, "
+                    f"failed {batch['failed']}, {batch['messages_per_second']} msg/s"
+                )
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                pass
+            result.elapsed_ms = (time.monotonic() - started) * 1000
+            _record_stats(self.name, result)
+        return result
+
+    def _send_chunk(self, connection, chunk: Sequence[Tuple[Hashable, Any]]):
+        sent: List[Hashable] = []
+        failed: List[Hashable] = []
+        started = time.monotonic()
+        for key, message in chunk:
+            message.connection = connection
+            try:
+                if message.send(fail_silently=False):
+                    sent.append(key)
+                else:
+                    failed.append(key)
+            except Exception as exc:
+                logger.warning(f"Bulk mail {self.name} failed for {key}: {exc}")
+                failed.append(key)
+                _reopen(connection)
+        return sent, failed, (time.monotonic() - started) * 1000
+
+
+def _reopen(connection):
+    """Replace a connection the server may have dropped after a failed send."""
+    try:
+        connection.close()
+    except Exception:
+        pass
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning(f"Could not reopen mail connection: {exc}")
+
+
+def _record_stats(name: str, result: BulkMailResult):
+    try:
+        stats = cache.get(STATS_CACHE_KEY) or {}
+        stats[name] = result.summary()
+        cache.set(STATS_CACHE_KEY, stats, STATS_TTL)
+    except Exception as exc:
+        logger.debug(f"Could not record bulk mail stats: {exc}")
+
+
+def bulk_mail_stats() -> Dict[str, Any]:
+    """Last run summary for each mailer, for the health endpoint."""
+    return cache.get(STATS_CACHE_KEY) or {}
+
+
+_pending = threading.local()
+
+
+def send_on_commit(name: str, message, key: Hashable = None) -> None:
+    """
+    Send ``message`` once the current transaction commits.
+
+    Messages queued inside one transaction (e.g. interviews created in bulk)
+    share one mailer, and with it one SMTP connection. Outside a transaction
+    the message is sent immediately; on rollback it is dropped.
+    """
+    mailers = getattr(_pending, 'mailers', None)
+    if mailers is None:
+        mailers = _pending.mailers = {}
+    pending = mailers.get(name)
+    queued = transaction.get_connection().run_on_commit
+    if pending is not None and any(entry[1] is pending[1] for entry in queued):
+        pending[0].add(key, message)
+        return
+
+    # Nothing queued yet, or the transaction that queued it was rolled back
+    mailer = BulkMailer(name)
+
+    def _flush():
+        if mailers.get(name, (None,))[0] is mailer:
+            mailers.pop(name)
+        mailer.send()
+
+    mailers[name] = (mailer, _flush)
+    mailer.add(key, message)
+    transaction.on_commit(_flush)
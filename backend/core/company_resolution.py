@@ -0,0 +1,266 @@
+"""
+Resolve free-text company names to ``Company`` rows.
+
+Company research, job entries, cover letters and the company import commands
+each used to look companies up with ``name__iexact`` (or ``get_or_create`` by a
+guessed domain) and create a new row on a miss, so "Google", "Google LLC" and
+"google, inc." became three companies, each researched separately. Every one
+of them now resolves through this module, which tries in order:
+
+1. an in-process LRU of recently resolved names (``COMPANY_RESOLUTION_CACHE_SIZE``);
+2. ``Company.normalized_name`` (``core.utils.company_matching.normalize_name``);
+3. ``CompanyAlias``, the other spellings previously resolved to a company;
+4. the domain, when the caller knows it (or the one a new row would get);
+5. on PostgreSQL, the closest ``normalized_name`` by trigram similarity of at
+   least ``COMPANY_RESOLUTION_SIMILARITY``. The ``%`` operator bounds the
+   candidates through the GIN index from migration 0030, so only near matches
+   are ranked instead of the whole table.
+
+A name that resolves to a company under a different normalized name is stored
+as an alias, so the next lookup is an exact one. When several rows share a
+normalized name (duplicates from before this module) the oldest one wins, so
+research converges on a single row.
+
+    company, created = get_or_create_company('Google LLC')
+    companies = resolve_many(['Stripe', 'stripe inc', 'Datadog'])   # one query per step
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.text import slugify
+
+from core.models import Company, CompanyAlias
+from core.research.enrichment import fallback_domain
+from core.utils.company_matching import normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+def resolution_key(name: str) -> str:
+    """Lookup key for ``name``: its normalized form, or the lowercased name if that is empty."""
+    return normalize_name(name) or ' '.join((name or '').lower().split())
+
+
+class _ResolvedNames:
+    """LRU of resolution key -> (company id, that company's normalized name)."""
+
+    def __init__(self):
+        self._entries: 'OrderedDict[str, Tuple[int, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[int, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, company: Company) -> None:
+        size = getattr(settings, 'COMPANY_RESOLUTION_CACHE_SIZE', 2048)
+        with self._lock:
+            self._entries[key] = (company.pk, company.normalized_name)
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+resolved_names = _ResolvedNames()
+
+
+def _guessed_domain(name: str) -> str:
+    """The domain ``fallback_domain`` guesses for ``name``, or '' when the name has no ASCII slug."""
+    # fallback_domain turns every such name (e.g. CJK-only ones) into "company.com"
+    return fallback_domain(name) if slugify(name) else ''
+
+
+def _new_company_domain(name: str, key: str) -> str:
+    """Domain for a new company: the guessed one, else a stand-in unique to the name."""
+    guessed = _guessed_domain(name)
+    if guessed:
+        return guessed
+    slug = slugify(name, allow_unicode=True).replace('-', '') or hashlib.sha1(key.encode()).hexdigest()[:12]
+    return f"{slug}.com"
+
+
+def _similar_company(key: str) -> Optional[Company]:
+    """Closest company by trigram similarity above the resolution threshold (PostgreSQL only)."""
+    if connection.vendor != 'postgresql' or len(key) < 3:
+        return None
+    threshold = getattr(settings, 'COMPANY_RESOLUTION_SIMILARITY', 0.8)
+    return (
+        _trigram_candidates(Company.objects.all(), key)
+        .filter(similarity__gte=threshold)
+        .order_by('-similarity', 'id')
+        .first()
+    )
+
+
+def _trigram_candidates(qs, key: str):
+    column = f'{connection.ops.quote_name(Company._meta.db_table)}.{connection.ops.quote_name("normalized_name")}'
+    # ``%`` keeps the lookup on the gin_trgm_ops index; %% escapes the operator's percent sign
+    return qs.filter(RawSQL(f'{column} %% %s', (key,), output_field=BooleanField())).annotate(
+        similarity=RawSQL(f'similarity({column}, %s)', (key,), output_field=FloatField())
+    )
+
+
+def _record_aliases(aliases: Mapping[str, Tuple[str, Company]]) -> None:
+    rows = [
+        CompanyAlias(company=company, name=name[:180], normalized_name=key[:200])
+        for key, (name, company) in aliases.items()
+        if key and key != company.normalized_name
+    ]
+    if rows:
+        CompanyAlias.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def _resolve(
+    names: Iterable[str],
+    domains: Optional[Mapping[str, str]] = None,
+    create: bool = True,
+) -> Tuple[Dict[str, Company], set]:
+    domains = domains or {}
+    keys: Dict[str, str] = {}
+    for name in names:
+        if name and name.strip() and name not in keys:
+            keys[name] = resolution_key(name)
+    by_key: Dict[str, Company] = {}
+    created_ids = set()
+
+    # 1. LRU; entries are re-checked against the row so a stale id never resolves
+    cached = {key: resolved_names.get(key) for key in set(keys.values())}
+    cached = {key: entry for key, entry in cached.items() if entry}
+    if cached:
+        rows = Company.objects.in_bulk({company_id for company_id, _ in cached.values()})
+        for key, (company_id, normalized) in cached.items():
+            company = rows.get(company_id)
+            if company is not None and company.normalized_name == normalized:
+                by_key[key] = company
+
+    # 2. Normalized name; the oldest of several duplicates wins
+    pending = set(keys.values()) - set(by_key)
+    if pending:
+        for company in Company.objects.filter(normalized_name__in=pending).order_by('id'):
+            by_key.setdefault(company.normalized_name, company)
+
+    # 3. Aliases
+    pending -= set(by_key)
+    if pending:
+        for alias in CompanyAlias.objects.filter(normalized_name__in=pending).select_related('company'):
+            by_key[alias.normalized_name] = alias.company
+
+    # Keys resolved from here on are stored as aliases
+    exact = set(by_key)
+
+    # 4. Domains the caller knows, or would create the company with
+    wanted_domains = {}
+    for name, key in keys.items():
+        if key not in by_key:
+            domain = (domains.get(name) or (_guessed_domain(name) if create else '')).strip().lower()
+            if domain:
+                wanted_domains.setdefault(domain, key)
+    if wanted_domains:
+        for company in Company.objects.filter(domain__in=list(wanted_domains)):
+            by_key.setdefault(wanted_domains[company.domain.lower()], company)
+
+    # 5. Near spellings
+    for key in set(keys.values()) - set(by_key):
+        company = _similar_company(key)
+        if company is not None:
+            by_key[key] = company
+
+    if create:
+        missing = {}
+        for name, key in keys.items():
+            if key not in by_key and key not in missing:
+                missing[key] = name
+        for key, name in missing.items():
+            domain = (domains.get(name) or _new_company_domain(name, key)).strip().lower()
+            try:
+                with transaction.atomic():
+                    company = Company.objects.create(name=name.strip(), domain=domain)
+                created_ids.add(company.pk)
+            except IntegrityError:
+                # Created concurrently under the same domain
+                company = Company.objects.filter(domain=domain).first()
+                if company is None:
+                    raise
+            by_key[key] = company
+            logger.info(f"Created new company: {name}")
+
+    aliases = {}
+    for name, key in keys.items():
+        company = by_key.get(key)
+        if company is not None:
+            resolved_names.put(key, company)
+            if key not in exact:
+                aliases.setdefault(key, (name, company))
+    try:
+        _record_aliases(aliases)
+    except Exception as exc:
+        logger.warning(f"Could not record company aliases: {exc}")
+
+    return {name: by_key[key] for name, key in keys.items() if key in by_key}, created_ids
+
+
+def resolve_company(name: str, domain: str = '') -> Optional[Company]:
+    """The ``Company`` for ``name`` (and ``domain``, if known), or None; never creates."""
+    return _resolve([name], {name: domain} if domain else None, create=False)[0].get(name)
+
+
+def get_or_create_company(name: str, domain: str = '') -> Tuple[Company, bool]:
+    """Resolve ``name`` or create a company for it, like ``get_or_create``."""
+    if not (name or '').strip():
+        raise ValueError('A company name is required.')
+    resolved, created_ids = _resolve([name], {name: domain} if domain else None)
+    company = resolved[name]
+    return company, company.pk in created_ids
+
+
+def resolve_many(
+    names: Iterable[str],
+    domains: Optional[Mapping[str, str]] = None,
+    create: bool = True,
+) -> Dict[str, Company]:
+    """
+    Resolve many names at once for imports: each step is one query for the
+    whole batch, and names that normalize the same share one company.
+
+    Args:
+        names: company names as they appear in the source
+        domains: optional name -> domain for names whose domain is known
+        create: create companies for names that do not resolve
+
+    Returns:
+        name -> Company for every name that resolved (every non-blank name when ``create``)
+    """
+    return _resolve(list(names), domains, create=create)[0]
+
+
+def search_companies(query: str, limit: int = 10, domain: str = '') -> List[Tuple[Company, Optional[float]]]:
+    """
+    Companies whose name is close to ``query``, best first, with their trigram
+    similarity (None when ranked without pg_trgm).
+    """
+    qs = Company.objects.all()
+    if domain:
+        qs = qs.filter(domain__icontains=domain)
+    key = resolution_key(query) if query else ''
+    if not key:
+        return [(company, None) for company in qs.order_by('name')[:limit]]
+    if connection.vendor == 'postgresql':
+        return [
+            (company, float(company.similarity))
+            for company in _trigram_candidates(qs, key).order_by('-similarity', 'id')[:limit]
+        ]
+    return [(company, None) for company in qs.filter(name__icontains=query).order_by('name')[:limit]]
@@ -10,13 +10,14 @@ from __future__ import annotations
 import json
 import logging
 import re
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
 
 from django.conf import settings
 from django.utils import timezone
 from django.utils.text import slugify
 
-from core.models import CandidateProfile, JobEntry, Company, CompanyResearch
+from core.company_resolution import get_or_create_company
+from core.models import CandidateProfile, JobEntry, CompanyResearch
 from core import resume_ai
 
 logger = logging.getLogger(__name__)
@@ -89,11 +90,9 @@ def build_company_research_snapshot(company_name: str | None) -> Dict[str, Any]:
     if not company_name:
         return {"company_name": "", "culture_keywords": [], "recent_news": [], "mission_statement": ""}
     try:
-        company = Company.objects.filter(name__iexact=company_name).first()
-        if not company:
-            # Create with minimal data to allow later enrichment
-            domain = company_name.lower().replace(' ', '').replace(',', '').replace('.', '') + '.com'
-            company = Company.objects.create(name=company_name, domain=domain)
+        company, created = get_or_create_company(company_name)
+        if created:
+            # Minimal research row to allow later enrichment
             CompanyResearch.objects.create(company=company)
         # Try to fetch research
         research = getattr(company, 'research', None)
@@ -214,6 +213,57 @@ def parse_payload(raw_text: str) -> Dict[str, Any]:
         raise CoverLetterAIError('Gemini returned an unreadable response.') from exc
 
 
+def _normalize_variation(
+    idx: int,
+    raw: Dict[str, Any],
+    job_snapshot: Dict[str, Any],
+    achievements_pool: Sequence[str],
+    taken_ids: set,
+) -> Dict[str, Any]:
+    label = raw.get('label') or f'Variation {idx + 1}'
+    var_id = slugify(label) or f'variation-{idx + 1}'
+    tone = raw.get('tone') or 'balanced'
+
+    opening = (raw.get('opening_paragraph') or '').strip()
+    bodies = [
+        (p or '').strip() for p in (raw.get('body_paragraphs') or []) if (p or '').strip()
+    ][:MAX_PARAGRAPHS]
+    closing = (raw.get('closing_paragraph') or '').strip()
+
+    # Ensure we don't leak fabricated company or role names by lightly enforcing mentions
+    # If company name is present, ensure it appears in opening paragraph
+    company = job_snapshot.get('company_name') or ''
+    if company and company.lower() not in opening.lower():
+        # Soft prepend a reference
+        opening = f"{company} — {opening}" if opening else company
+
+    ach_ref = _dedupe(raw.get('achievements_referenced') or achievements_pool[:5])
+    kw_used = _dedupe(raw.get('keywords_used') or job_snapshot.get('derived_keywords', []))
+    news_refs = raw.get('news_citations') or []
+    if not isinstance(news_refs, list):
+        news_refs = []
+
+    full_text = '\n\n'.join([p for p in [opening, *bodies, closing] if p])
+
+    variation = {
+        'id': var_id if var_id not in taken_ids else f'{var_id}-{idx}',
+        'label': label,
+        'tone': tone,
+        'opening_paragraph': opening,
+        'body_paragraphs': bodies,
+        'closing_paragraph': closing,
+        'full_text': full_text,
+        'highlights': {
+            'achievements': ach_ref[:8],
+            'keywords_used': kw_used[:12],
+            'news_citations': news_refs[:MAX_NEWS],
+        },
+        'generated_at': timezone.now().isoformat(),
+    }
+    taken_ids.add(variation['id'])
+    return variation
+
+
 def _normalize_variations(
     parsed: Dict[str, Any],
     candidate_snapshot: Dict[str, Any],
@@ -223,53 +273,35 @@ def _normalize_variations(
     if not isinstance(variations, list):
         variations = []
     achievements_pool = _collect_achievements(candidate_snapshot)
-    news_pool = job_snapshot.get('company_name') and [] or []  # retained for potential future constraints
-
-    normalized: List[Dict[str, Any]] = []
-    for idx, raw in enumerate(variations):
-        label = raw.get('label') or f'Variation {idx + 1}'
-        var_id = slugify(label) or f'variation-{idx + 1}'
-        tone = raw.get('tone') or 'balanced'
-
-        opening = (raw.get('opening_paragraph') or '').strip()
-        bodies = [
-            (p or '').strip() for p in (raw.get('body_paragraphs') or []) if (p or '').strip()
-        ][:MAX_PARAGRAPHS]
-        closing = (raw.get('closing_paragraph') or '').strip()
-
-        # Ensure we don't leak fabricated company or role names by lightly enforcing mentions
-        # If company name is present, ensure it appears in opening paragraph
-        company = job_snapshot.get('company_name') or ''
-        title = job_snapshot.get('title') or ''
-        if company and company.lower() not in opening.lower():
-            # Soft prepend a reference
-            opening = f"{company} — {opening}" if opening else company
-
-        ach_ref = _dedupe(raw.get('achievements_referenced') or achievements_pool[:5])
-        kw_used = _dedupe(raw.get('keywords_used') or job_snapshot.get('derived_keywords', []))
-        news_refs = raw.get('news_citations') or []
-        if not isinstance(news_refs, list):
-            news_refs = []
-
-        full_text = '\n\n'.join([p for p in [opening, *bodies, closing] if p])
-
-        normalized.append({
-            'id': var_id if var_id not in {v.get('id') for v in normalized} else f'{var_id}-{idx}',
-            'label': label,
-            'tone': tone,
-            'opening_paragraph': opening,
-            'body_paragraphs': bodies,
-            'closing_paragraph': closing,
-            'full_text': full_text,
-            'highlights': {
-                'achievements': ach_ref[:8],
-                'keywords_used': kw_used[:12],
-                'news_citations': news_refs[:MAX_NEWS],
-            },
-            'generated_at': timezone.now().isoformat(),
-        })
-
-    return normalized
+    taken_ids: set = set()
+    return [
+        _normalize_variation(idx, raw, job_snapshot, achievements_pool, taken_ids)
+        for idx, raw in enumerate(variations)
+    ]
+
+
+def _fallback_variations(candidate_snapshot: Dict[str, Any], job_snapshot: Dict[str, Any], tone: str) -> List[Dict[str, Any]]:
+    # Minimal fallback: synthesize a tiny generic letter using candidate and job info
+    company = job_snapshot.get('company_name') or 'the company'
+    title = job_snapshot.get('title') or 'the role'
+    opening = f"I’m excited to apply for the {title} role at {company}."
+    bodies = [
+        "My background aligns closely with your needs, and I’ve delivered measurable results in similar contexts.",
+    ]
+    closing = "I’d welcome the chance to discuss how I can contribute. Thank you for your time."
+    return _normalize_variations(
+        {
+            'variations': [{
+                'label': 'Balanced',
+                'tone': tone,
+                'opening_paragraph': opening,
+                'body_paragraphs': bodies,
+                'closing_paragraph': closing,
+            }]
+        },
+        candidate_snapshot,
+        job_snapshot,
+    )
 
 
 def run_cover_letter_generation(
@@ -300,33 +332,12 @@ def run_cover_letter_generation(
         industry=industry,
         custom_instructions=custom_instructions,
     )
-    raw_text = resume_ai.call_gemini_api(prompt, api_key, model=model)
+    raw_text = resume_ai.call_gemini_api(prompt, api_key, model=model, use_cache=False)
     parsed = parse_payload(raw_text)
     shared_analysis = parsed.get('shared_analysis') or {}
     variations = _normalize_variations(parsed, candidate_snapshot, job_snapshot)
     if not variations:
-        # Minimal fallback: synthesize a tiny generic letter using candidate and job info
-        name = candidate_snapshot.get('name') or 'Candidate'
-        company = job_snapshot.get('company_name') or 'the company'
-        title = job_snapshot.get('title') or 'the role'
-        opening = f"I’m excited to apply for the {title} role at {company}."
-        bodies = [
-            "My background aligns closely with your needs, and I’ve delivered measurable results in similar contexts.",
-        ]
-        closing = "I’d welcome the chance to discuss how I can contribute. Thank you for your time."
-        variations = _normalize_variations(
-            {
-                'variations': [{
-                    'label': 'Balanced',
-                    'tone': tone,
-                    'opening_paragraph': opening,
-                    'body_paragraphs': bodies,
-                    'closing_paragraph': closing,
-                }]
-            },
-            candidate_snapshot,
-            job_snapshot,
-        )
+        variations = _fallback_variations(candidate_snapshot, job_snapshot, tone)
     return {
         'shared_analysis': shared_analysis,
         'variations': variations,
@@ -335,6 +346,46 @@ def run_cover_letter_generation(
     }
 
 
+def stream_cover_letter_generation(
+    candidate_snapshot: Dict[str, Any],
+    job_snapshot: Dict[str, Any],
+    research_snapshot: Dict[str, Any],
+    *,
+    tone: str,
+    variation_count: int,
+    api_key: str,
+    model: str | None = None,
+    **options,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming counterpart of run_cover_letter_generation.
+
+    Accepts the same UC-058 customization options and yields the same events
+    as ``resume_ai.stream_resume_generation``.
+    """
+    prompt = build_generation_prompt(
+        candidate_snapshot, job_snapshot, research_snapshot, tone, variation_count, **options,
+    )
+    achievements_pool = _collect_achievements(candidate_snapshot)
+    taken_ids: set = set()
+    count = 0
+    chunks = resume_ai.stream_gemini_api(prompt, api_key, model=model)
+    for kind, value in resume_ai.stream_json_variations(chunks, error_class=CoverLetterAIError):
+        if kind == 'shared_analysis':
+            yield kind, value
+            continue
+        index, raw = value
+        count += 1
+        yield 'variation', _normalize_variation(index, raw, job_snapshot, achievements_pool, taken_ids)
+
+    if not count:
+        variations = _fallback_variations(candidate_snapshot, job_snapshot, tone)
+        count = len(variations)
+        for variation in variations:
+            yield 'variation', variation
+    yield 'done', {'variation_count': count}
+
+
 def generate_cover_letter_latex(
     candidate_name: str,
     candidate_email: str,
@@ -0,0 +1,337 @@
+"""
+Cached batch geocoder for job locations.
+
+Saving a ``JobEntry`` used to block on a Nominatim request, and the job map
+geocoded missing coordinates inline for every request. Location strings are
+now resolved once into the shared ``GeocodedLocation`` table, keyed by a
+normalized form of the query, so "New York, NY" and "new york,  ny" share one
+lookup across all users.
+
+* ``queue_job_geocode`` (called from the ``JobEntry`` post_save signal) copies
+  cached coordinates onto the job, or records a ``pending`` cache row and marks
+  the job as waiting for coordinates. It never touches the network.
+* ``process_geocode_queue`` drains pending rows in a single worker at a time,
+  spacing requests by ``GEOCODING_MIN_INTERVAL`` seconds to stay inside
+  Nominatim's usage policy (1 request/second), then copies the results onto
+  every job waiting for them. It runs from Celery beat, after job saves, and
+  from the ``geocode_jobs`` management command.
+"""
+import logging
+import os
+import re
+import time
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+
+from core import http
+from core.models import GeocodedLocation, JobEntry
+
+logger = logging.getLogger(__name__)
+
+NOMINATIM_BASE_URL = os.environ.get('NOMINATIM_BASE_URL', 'https://nominatim.openstreetmap.org')
+NOMINATIM_USER_AGENT = os.environ.get('NOMINATIM_USER_AGENT', 'cs-490-project/1.0 (local-dev)')
+
+DRAIN_LOCK_KEY = 'geocoding:drain-lock'
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_COMMA_RE = re.compile(r'\s*,\s*')
+
+
+class GeocodingError(Exception):
+    """Raised when the geocoding service cannot be reached or returns an error."""
+    pass
+
+
+def normalize_location(text: Optional[str]) -> str:
+    """Return the cache key for a location string (case, spacing and comma insensitive)."""
+    value = _WHITESPACE_RE.sub(' ', (text or '').strip().lower())
+    value = _COMMA_RE.sub(', ', value).strip(' ,.')
+    return value[:255]
+
+
+def job_location_query(job: JobEntry) -> str:
+    return (getattr(job, 'location', '') or '').strip()
+
+
+def lookup_cached(queries: Iterable[str]) -> Dict[str, GeocodedLocation]:
+    """
+    Return resolved cache rows for ``queries`` in a single query.
+
+    Returns:
+        Mapping of normalized query -> resolved GeocodedLocation
+    """
+    keys = {normalize_location(q) for q in queries}
+    keys.discard('')
+    if not keys:
+        return {}
+    rows = GeocodedLocation.objects.filter(normalized_query__in=keys, status='resolved')
+    return {row.normalized_query: row for row in rows}
+
+
+def request_geocode(query: str, refresh: bool = False) -> Optional[GeocodedLocation]:
+    """
+    Ensure a cache row exists for ``query``, creating it as ``pending``.
+
+    Args:
+        query: Raw location text
+        refresh: Re-queue the row even if it was already resolved
+
+    Returns:
+        The cache row, or None when the query is blank
+    """
+    key = normalize_location(query)
+    if not key:
+        return None
+    try:
+        entry, created = GeocodedLocation.objects.get_or_create(
+            normalized_query=key,
+            defaults={'query': query.strip()[:255]},
+        )
+    except IntegrityError:
+        # Another request created the same row concurrently
+        entry, created = GeocodedLocation.objects.get(normalized_query=key), False
+    if refresh and not created and entry.status != 'pending':
+        GeocodedLocation.objects.filter(pk=entry.pk).update(status='pending', attempts=0, last_error='')
+        entry.status = 'pending'
+    return entry
+
+
+def _geo_values(entry: GeocodedLocation) -> Dict:
+    return {
+        'location_lat': entry.lat,
+        'location_lon': entry.lon,
+        'location_geo_precision': entry.precision or 'city',
+        'location_geo_updated_at': timezone.now(),
+    }
+
+
+def _unresolved_values() -> Dict:
+    """Job fields for a location the geocoder gave up on; stamped so the job stops waiting."""
+    return {
+        'location_lat': None,
+        'location_lon': None,
+        'location_geo_precision': 'unknown',
+        'location_geo_updated_at': timezone.now(),
+    }
+
+
+def queue_job_geocode(job: JobEntry) -> bool:
+    """
+    Give ``job`` coordinates from the cache, or queue its location for the batch geocoder.
+
+    Uses queryset updates so the JobEntry post_save signal does not fire again.
+
+    Returns:
+        True when the job's location is waiting for a network lookup
+    """
+    query = job_location_query(job)
+    if not query:
+        return False
+    entry = lookup_cached([query]).get(normalize_location(query))
+    if entry is not None:
+        unchanged = (
+            job.location_lat is not None and job.location_lon is not None
+            and abs(job.location_lat - entry.lat) < 1e-5 and abs(job.location_lon - entry.lon) < 1e-5
+            and job.location_geo_updated_at is not None
+        )
+        if not unchanged:
+            values = _geo_values(entry)
+            JobEntry.objects.filter(pk=job.pk).update(**values)
+            for field, value in values.items():
+                setattr(job, field, value)
+        return False
+
+    entry = request_geocode(query)
+    # A null timestamp marks the job as waiting for the geocoder; existing
+    # coordinates stay visible until the new location resolves.
+    if job.location_geo_updated_at is not None:
+        JobEntry.objects.filter(pk=job.pk).update(location_geo_updated_at=None)
+        job.location_geo_updated_at = None
+    return entry is not None and entry.status == 'pending'
+
+
+def apply_cached_coordinates() -> int:
+    """
+    Copy finished cache rows onto jobs waiting for the geocoder.
+
+    Jobs whose location was not found (e.g. "Remote") or failed every attempt
+    are stamped without coordinates, so they drop out of this scan.
+
+    Returns:
+        Number of jobs updated
+    """
+    jobs = JobEntry.objects.filter(location_geo_updated_at__isnull=True).exclude(location='')
+    by_key: Dict[str, list] = {}
+    for job_id, location in jobs.values_list('id', 'location').iterator(chunk_size=2000):
+        key = normalize_location(location)
+        if key:
+            by_key.setdefault(key, []).append(job_id)
+    if not by_key:
+        return 0
+
+    max_attempts = getattr(settings, 'GEOCODING_MAX_ATTEMPTS', 3)
+    finished = Q(status__in=['resolved', 'not_found']) | Q(status='failed', attempts__gte=max_attempts)
+    updated = 0
+    keys = list(by_key)
+    for start in range(0, len(keys), 500):
+        for entry in GeocodedLocation.objects.filter(finished, normalized_query__in=keys[start:start + 500]):
+            values = _geo_values(entry) if entry.status == 'resolved' else _unresolved_values()
+            updated += JobEntry.objects.filter(pk__in=by_key[entry.normalized_query]).update(**values)
+    return updated
+
+
+def geocode_query(query: str) -> Optional[Dict]:
+    """
+    Resolve one location with Nominatim.
+
+    Returns:
+        Dict with lat, lon, precision and display_name, or None when nothing matched
+
+    Raises:
+        GeocodingError: On network errors or non-2xx responses
+    """
+    try:
+        response = http.get(
+            f"{NOMINATIM_BASE_URL}/search",
+            policy='geocoding',
+            params={'q': query, 'format': 'json', 'limit': '1'},
+            headers={'User-Agent': NOMINATIM_USER_AGENT},
+        )
+        response.raise_for_status()
+        data = response.json() if response.content else []
+    except Exception as exc:
+        raise GeocodingError(str(exc)) from exc
+    if not data:
+        return None
+    item = data[0]
+    return {
+        'lat': float(item.get('lat')),
+        'lon': float(item.get('lon')),
+        # Matched a house/place: mark as address; else city
+        'precision': 'address' if item.get('class') == 'place' and item.get('type') == 'house' else 'city',
+        'display_name': (item.get('display_name') or '')[:500],
+    }
+
+
+def resolve_entry(entry: GeocodedLocation) -> GeocodedLocation:
+    """Look ``entry`` up with Nominatim and persist the outcome on the cache row."""
+    now = timezone.now()
+    entry.attempts += 1
+    entry.last_attempt_at = now
+    try:
+        result = geocode_query(entry.query)
+    except GeocodingError as exc:
+        entry.status = 'failed'
+        entry.last_error = str(exc)[:255]
+    else:
+        if result is None:
+            entry.status = 'not_found'
+        else:
+            entry.status = 'resolved'
+            entry.lat = result['lat']
+            entry.lon = result['lon']
+            entry.precision = result['precision']
+            entry.display_name = result['display_name']
+            entry.resolved_at = now
+        entry.last_error = ''
+    entry.save()
+    return entry
+
+
+def _due_entries(limit: int):
+    max_attempts = getattr(settings, 'GEOCODING_MAX_ATTEMPTS', 3)
+    retry_after = timezone.now() - timedelta(seconds=getattr(settings, 'GEOCODING_RETRY_AFTER', 600))
+    pending = list(GeocodedLocation.objects.filter(status='pending').order_by('created_at')[:limit])
+    if len(pending) < limit:
+        pending += list(
+            GeocodedLocation.objects.filter(
+                status='failed', attempts__lt=max_attempts, last_attempt_at__lt=retry_after,
+            ).order_by('last_attempt_at')[:limit - len(pending)]
+        )
+    return pending
+
+
+def process_geocode_queue(limit: Optional[int] = None) -> Dict:
+    """
+    Resolve queued locations at Nominatim's rate limit and update waiting jobs.
+
+    Only one worker drains the queue at a time (cache lock), so concurrent
+    Celery workers or management commands never exceed the request rate.
+
+    Args:
+        limit: Max lookups in this run (default ``GEOCODING_BATCH_SIZE``)
+
+    Returns:
+        Counts of lookups by outcome and of jobs updated
+    """
+    limit = limit or getattr(settings, 'GEOCODING_BATCH_SIZE', 50)
+    interval = float(getattr(settings, 'GEOCODING_MIN_INTERVAL', 1.0))
+    lock_timeout = int(limit * (interval + 10)) + 60
+    try:
+        if not cache.add(DRAIN_LOCK_KEY, os.getpid(), lock_timeout):
+            return {'skipped': True}
+    except Exception as exc:
+        # Without a shared cache we still drain, spaced within this worker
+        logger.debug(f"Geocoder lock unavailable: {exc}")
+
+    counts = {'resolved': 0, 'not_found': 0, 'failed': 0}
+    try:
+        last_request = None
+        for entry in _due_entries(limit):
+            if last_request is not None:
+                wait = interval - (time.monotonic() - last_request)
+                if wait > 0:
+                    time.sleep(wait)
+            last_request = time.monotonic()
+            resolve_entry(entry)
+            counts[entry.status] += 1
+        counts['jobs_updated'] = apply_cached_coordinates()
+    finally:
+        try:
+            cache.delete(DRAIN_LOCK_KEY)
+        except Exception:
+            pass
+    if counts['resolved'] or counts['failed']:
+        logger.info(f"Geocoder processed queue: {counts}")
+    return counts
+
+
+def queue_missing_jobs(limit: int = 200, force: bool = False):
+    """
+    Queue cache lookups for jobs without coordinates (or all jobs with ``force``).
+
+    Jobs with no location fall back to the candidate profile's city/state.
+
+    Returns:
+        List of (job, query) pairs that were considered
+    """
+    qs = JobEntry.objects.select_related('candidate').order_by('-id')
+    if not force:
+        qs = qs.filter(location_lat__isnull=True, location_lon__isnull=True)
+    pairs = []
+    for job in qs[:limit]:
+        query = job_location_query(job)
+        if not query and job.candidate:
+            query = (job.candidate.get_full_location() or '').strip()
+        if not query:
+            continue
+        request_geocode(query, refresh=force)
+        pairs.append((job, query))
+    return pairs
+
+
+def apply_to_jobs(pairs) -> int:
+    """Copy cached coordinates onto explicit (job, query) pairs from ``queue_missing_jobs``."""
+    cached = lookup_cached(query for _, query in pairs)
+    updated = 0
+    for job, query in pairs:
+        entry = cached.get(normalize_location(query))
+        if entry is not None:
+            updated += JobEntry.objects.filter(pk=job.pk).update(**_geo_values(entry))
+    return updated
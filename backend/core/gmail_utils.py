@@ -4,13 +4,12 @@ import logging
 import requests
 import base64
 import re
-import time
 from datetime import datetime, timedelta
 from email.utils import parsedate_to_datetime
 from django.conf import settings
 from django.utils import timezone
-from core import google_import
-from core.api_monitoring import track_api_call, get_or_create_service, SERVICE_GMAIL
+from core import google_import, http
+from core.api_monitoring import get_or_create_service, SERVICE_GMAIL
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +88,7 @@ def ensure_valid_token(integration):
 
 
 def fetch_messages(access_token, query='', max_results=50, page_token=None, max_retries=3):
-    """Fetch messages from Gmail API with retry logic for rate limits"""
+    """Fetch messages from Gmail API (retries and backoff handled by core.http)"""
     url = f"{GMAIL_API_BASE}/users/me/messages"
     headers = {'Authorization': f'Bearer {access_token}'}
     params = {
@@ -99,133 +98,199 @@ def fetch_messages(access_token, query='', max_results=50, page_token=None, max_
     if page_token:
         params['pageToken'] = page_token
     
-    for attempt in range(max_retries):
-        try:
-            service = get_or_create_service(SERVICE_GMAIL, 'Gmail API')
-            with track_api_call(service, endpoint='/users/me/messages', method='GET'):
-                resp = requests.get(url, headers=headers, params=params, timeout=15)
-            
-            # Handle authentication errors
-            if resp.status_code == 401:
-                logger.error('Gmail API authentication failed: token may be expired or invalid')
-                raise GmailAuthError('Authentication failed. Please reconnect your Gmail account.')
-            
-            # Handle rate limiting
-            if resp.status_code == 429:
-                retry_after = int(resp.headers.get('Retry-After', 60))
-                logger.warning(f'Gmail API rate limit hit. Retry after {retry_after} seconds')
-                
-                if attempt < max_retries - 1:
-                    time.sleep(retry_after)
-                    continue
-                else:
-                    raise GmailRateLimitError(
-                        f'Rate limit exceeded. Try again in {retry_after} seconds.',
-                        retry_after=retry_after
-                    )
-            
-            # Handle other client errors
-            if resp.status_code == 403:
-                error_data = resp.json() if resp.content else {}
-                error_message = error_data.get('error', {}).get('message', 'Permission denied')
-                logger.error(f'Gmail API permission error: {error_message}')
-                raise GmailAPIError(f'Gmail API permission error: {error_message}')
-            
-            # Handle server errors with exponential backoff
-            if resp.status_code >= 500:
-                if attempt < max_retries - 1:
-                    delay = (2 ** attempt) * 1  # Exponential backoff: 1s, 2s, 4s
-                    logger.warning(f'Gmail API server error {resp.status_code}. Retrying in {delay}s...')
-                    time.sleep(delay)
-                    continue
-                else:
-                    raise GmailAPIError(f'Gmail API server error: {resp.status_code}')
-            
-            # Success
-            if resp.status_code == 200:
-                return resp.json()
-            
-            # Other errors
-            raise GmailAPIError(f"Gmail API returned {resp.status_code}: {resp.text[:500]}")
-            
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                logger.warning(f'Gmail API timeout. Retrying... (attempt {attempt + 1}/{max_retries})')
-                time.sleep(2 ** attempt)
-                continue
-            else:
-                raise GmailAPIError('Gmail API request timed out after multiple retries')
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Gmail API request failed: {e}')
-            raise GmailAPIError(f'Network error: {str(e)}')
-    
-    raise GmailAPIError('Failed to fetch messages after maximum retries')
+    service = get_or_create_service(SERVICE_GMAIL, 'Gmail API')
+    resp = _gmail_get(url, service, '/users/me/messages', headers, params, max_retries)
+    
+    # Handle authentication errors
+    if resp.status_code == 401:
+        logger.error('Gmail API authentication failed: token may be expired or invalid')
+        raise GmailAuthError('Authentication failed. Please reconnect your Gmail account.')
+    
+    # Rate limiting persisted through every retry
+    if resp.status_code == 429:
+        retry_after = int(resp.headers.get('Retry-After', 60))
+        raise GmailRateLimitError(
+            f'Rate limit exceeded. Try again in {retry_after} seconds.',
+            retry_after=retry_after
+        )
+    
+    # Handle other client errors
+    if resp.status_code == 403:
+        error_data = resp.json() if resp.content else {}
+        error_message = error_data.get('error', {}).get('message', 'Permission denied')
+        logger.error(f'Gmail API permission error: {error_message}')
+        raise GmailAPIError(f'Gmail API permission error: {error_message}')
+    
+    if resp.status_code >= 500:
+        raise GmailAPIError(f'Gmail API server error: {resp.status_code}')
+    
+    # Success
+    if resp.status_code == 200:
+        return resp.json()
+    
+    # Other errors
+    raise GmailAPIError(f"Gmail API returned {resp.status_code}: {resp.text[:500]}")
 
 
 def get_message_detail(access_token, message_id, max_retries=3):
-    """Get full message details with retry logic"""
+    """Get full message details (retries and backoff handled by core.http)"""
     url = f"{GMAIL_API_BASE}/users/me/messages/{message_id}"
     headers = {'Authorization': f'Bearer {access_token}'}
     params = {'format': 'full'}
     
-    for attempt in range(max_retries):
+    service = get_or_create_service(SERVICE_GMAIL, 'Gmail API')
+    resp = _gmail_get(url, service, f'/users/me/messages/{message_id}', headers, params, max_retries)
+    
+    # Handle authentication errors
+    if resp.status_code == 401:
+        raise GmailAuthError('Authentication failed. Please reconnect your Gmail account.')
+    
+    # Rate limiting persisted through every retry
+    if resp.status_code == 429:
+        retry_after = int(resp.headers.get('Retry-After', 60))
+        raise GmailRateLimitError(
+            f'Rate limit exceeded. Try again in {retry_after} seconds.',
+            retry_after=retry_after
+        )
+    
+    # Handle not found
+    if resp.status_code == 404:
+        logger.warning(f'Message {message_id} not found')
+        raise GmailAPIError(f'Message not found: {message_id}')
+    
+    if resp.status_code >= 500:
+        raise GmailAPIError(f'Server error: {resp.status_code}')
+    
+    # Success
+    if resp.status_code == 200:
+        return resp.json()
+    
+    raise GmailAPIError(f"Failed to fetch message: {resp.status_code}")
+
+
+class GmailHistoryExpiredError(GmailAPIError):
+    """Raised when a stored historyId is too old for incremental sync"""
+    pass
+
+
+def _check_gmail_response(resp):
+    """Map Gmail error statuses to the exceptions above and return the JSON body."""
+    if resp.status_code == 401:
+        raise GmailAuthError('Authentication failed. Please reconnect your Gmail account.')
+    if resp.status_code == 429:
+        retry_after = int(resp.headers.get('Retry-After', 60))
+        raise GmailRateLimitError(
+            f'Rate limit exceeded. Try again in {retry_after} seconds.',
+            retry_after=retry_after
+        )
+    if resp.status_code >= 500:
+        raise GmailAPIError(f'Gmail API server error: {resp.status_code}')
+    if resp.status_code != 200:
+        raise GmailAPIError(f"Gmail API returned {resp.status_code}: {resp.text[:500]}")
+    return resp.json()
+
+
+def get_profile(access_token, max_retries=3):
+    """Get the mailbox profile, including the current ``historyId``"""
+    url = f"{GMAIL_API_BASE}/users/me/profile"
+    headers = {'Authorization': f'Bearer {access_token}'}
+    service = get_or_create_service(SERVICE_GMAIL, 'Gmail API')
+    resp = _gmail_get(url, service, '/users/me/profile', headers, {}, max_retries)
+    return _check_gmail_response(resp)
+
+
+def list_history(access_token, start_history_id, page_token=None, max_retries=3):
+    """
+    List mailbox changes since ``start_history_id`` (messages added only).
+
+    Raises:
+        GmailHistoryExpiredError: Gmail no longer has history that far back
+            and the caller must fall back to a full sync
+    """
+    url = f"{GMAIL_API_BASE}/users/me/history"
+    headers = {'Authorization': f'Bearer {access_token}'}
+    params = {
+        'startHistoryId': start_history_id,
+        'historyTypes': 'messageAdded',
+        'maxResults': 500,
+    }
+    if page_token:
+        params['pageToken'] = page_token
+    
+    service = get_or_create_service(SERVICE_GMAIL, 'Gmail API')
+    resp = _gmail_get(url, service, '/users/me/history', headers, params, max_retries)
+    if resp.status_code == 404:
+        raise GmailHistoryExpiredError(f'History {start_history_id} is no longer available')
+    return _check_gmail_response(resp)
+
+
+def get_message_details(access_token, message_ids, max_workers=None):
+    """
+    Fetch full message details for several messages through a bounded thread pool.
+
+    Concurrency is capped by ``settings.GMAIL_FETCH_CONCURRENCY`` so a scan
+    stays inside Gmail's per-user quota. Auth and rate limit errors abort the
+    batch; other per-message failures are logged and the message is skipped.
+
+    Returns:
+        Dict of message id -> message detail for the messages that were fetched
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connection
+    
+    message_ids = list(message_ids)
+    if not message_ids:
+        return {}
+    workers = max_workers or getattr(settings, 'GMAIL_FETCH_CONCURRENCY', 5)
+    workers = max(1, min(int(workers), len(message_ids)))
+    
+    def _fetch(message_id, pooled):
         try:
-            service = get_or_create_service(SERVICE_GMAIL, 'Gmail API')
-            with track_api_call(service, endpoint=f'/users/me/messages/{message_id}', method='GET'):
-                resp = requests.get(url, headers=headers, params=params, timeout=10)
-            
-            # Handle authentication errors
-            if resp.status_code == 401:
-                raise GmailAuthError('Authentication failed. Please reconnect your Gmail account.')
-            
-            # Handle rate limiting
-            if resp.status_code == 429:
-                retry_after = int(resp.headers.get('Retry-After', 60))
-                if attempt < max_retries - 1:
-                    logger.warning(f'Rate limit hit for message {message_id}. Waiting {retry_after}s...')
-                    time.sleep(retry_after)
-                    continue
-                else:
-                    raise GmailRateLimitError(
-                        f'Rate limit exceeded. Try again in {retry_after} seconds.',
-                        retry_after=retry_after
-                    )
-            
-            # Handle not found
-            if resp.status_code == 404:
-                logger.warning(f'Message {message_id} not found')
-                raise GmailAPIError(f'Message not found: {message_id}')
-            
-            # Handle server errors with exponential backoff
-            if resp.status_code >= 500:
-                if attempt < max_retries - 1:
-                    delay = (2 ** attempt) * 1
-                    logger.warning(f'Server error fetching message {message_id}. Retrying in {delay}s...')
-                    time.sleep(delay)
-                    continue
-                else:
-                    raise GmailAPIError(f'Server error: {resp.status_code}')
-            
-            # Success
-            if resp.status_code == 200:
-                return resp.json()
-            
-            raise GmailAPIError(f"Failed to fetch message: {resp.status_code}")
-            
-        except requests.exceptions.Timeout:
-            if attempt < max_retries - 1:
-                logger.warning(f'Timeout fetching message {message_id}. Retrying...')
-                time.sleep(2 ** attempt)
-                continue
-            else:
-                raise GmailAPIError('Request timed out after multiple retries')
-        
-        except requests.exceptions.RequestException as e:
-            logger.error(f'Request failed for message {message_id}: {e}')
-            raise GmailAPIError(f'Network error: {str(e)}')
-    
-    raise GmailAPIError('Failed to get message after maximum retries')
+            return get_message_detail(access_token, message_id)
+        except (GmailAuthError, GmailRateLimitError):
+            raise
+        except Exception as e:
+            logger.warning(f'Error fetching message {message_id}: {e}')
+            return None
+        finally:
+            if pooled:
+                connection.close()
+    
+    if workers == 1:
+        details = [_fetch(message_id, False) for message_id in message_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gmail-fetch') as executor:
+            futures = [executor.submit(_fetch, message_id, True) for message_id in message_ids]
+            try:
+                details = [future.result() for future in futures]
+            except (GmailAuthError, GmailRateLimitError):
+                for future in futures:
+                    future.cancel()
+                raise
+    return {
+        message_id: detail
+        for message_id, detail in zip(message_ids, details)
+        if detail is not None
+    }
+
+
+def _gmail_get(url, service, endpoint, headers, params, max_retries):
+    """GET through the pooled Gmail session, mapping transport failures to GmailAPIError."""
+    try:
+        return http.get(
+            url,
+            policy='gmail',
+            service=service,
+            endpoint=endpoint,
+            headers=headers,
+            params=params,
+            max_retries=max_retries - 1,
+        )
+    except requests.exceptions.Timeout:
+        raise GmailAPIError('Gmail API request timed out after multiple retries')
+    except requests.exceptions.RequestException as e:
+        logger.error(f'Gmail API request failed for {endpoint}: {e}')
+        raise GmailAPIError(f'Network error: {str(e)}')
 
 
 def parse_email_headers(message_data):
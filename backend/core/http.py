@@ -0,0 +1,274 @@
+"""
+Shared outbound HTTP client.
+
+Integrations (Gemini, Gmail, market data providers, the company research
+scrapers, remote file storage) used to call ``requests.get/post`` directly,
+paying a fresh TCP + TLS handshake per call and each carrying its own retry
+loop. This module keeps one keep-alive ``requests.Session`` per service policy
+and process, with a bounded urllib3 connection pool per host, and applies the
+policy's timeout, retry and backoff budget in one place.
+
+Usage::
+
+    from core import http
+
+    resp = http.get(url, policy='gmail', service=gmail_service,
+                    endpoint='/users/me/messages', headers=headers)
+
+When ``service`` is given every attempt is recorded through
+``core.api_monitoring.track_api_call``, so retries show up in the usage logs
+and count against the service's rate limits.
+
+Connections are HTTP/1.1 keep-alive: callers depend on ``requests`` response
+and exception types, and urllib3 does not negotiate HTTP/2.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, FrozenSet, Optional
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Timeout, retry and connection pool settings for one class of integration."""
+    timeout: float = 10.0
+    max_retries: int = 2            # retries after the first attempt
+    backoff_base: float = 1.0       # delay before retry n is backoff_base * 2**n (with jitter)
+    backoff_max: float = 30.0       # cap for a single delay, including Retry-After
+    rate_limit_backoff: Optional[float] = None  # base delay for 429s without Retry-After
+    max_elapsed: float = 120.0      # total time budget for all attempts and delays
+    retry_statuses: FrozenSet[int] = field(default=RETRYABLE_STATUSES)
+    pool_connections: int = 10      # hosts kept in the pool
+    pool_maxsize: int = 10          # connections kept per host
+
+
+DEFAULT_POLICIES: Dict[str, RetryPolicy] = {
+    'default': RetryPolicy(),
+    'gemini': RetryPolicy(
+        timeout=40.0, max_retries=4, backoff_base=2.0, backoff_max=120.0,
+        rate_limit_backoff=15.0, max_elapsed=300.0,
+    ),
+    'gmail': RetryPolicy(
+        timeout=15.0, max_retries=2, backoff_base=1.0, backoff_max=60.0,
+        max_elapsed=180.0, pool_maxsize=20,
+    ),
+    # Nominatim allows ~1 request/second; core.geocoding spaces requests itself
+    'geocoding': RetryPolicy(
+        timeout=8.0, max_retries=1, backoff_base=2.0, backoff_max=30.0,
+        max_elapsed=40.0, pool_maxsize=2,
+    ),
+    'market_data': RetryPolicy(timeout=10.0, max_retries=1, backoff_base=1.0, backoff_max=5.0, max_elapsed=30.0),
+    'research': RetryPolicy(
+        timeout=10.0, max_retries=1, backoff_base=0.5, backoff_max=5.0,
+        max_elapsed=30.0, pool_connections=50, pool_maxsize=20,
+    ),
+    'storage': RetryPolicy(timeout=30.0, max_retries=2, backoff_base=0.5, backoff_max=5.0, max_elapsed=90.0),
+}
+
+
+class RetryableStatusError(requests.HTTPError):
+    """Raised inside ``track_api_call`` so retryable responses are logged as failures."""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code}", response=response)
+
+
+class FailedStatusError(requests.HTTPError):
+    """Raised inside ``track_api_call`` so other error responses are logged as failures, then returned."""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code}", response=response)
+
+
+def get_policy(name: str = 'default') -> RetryPolicy:
+    """
+    Return the retry policy for ``name``.
+
+    ``settings.HTTP_CLIENT_POLICIES`` may override individual fields, e.g.
+    ``{'gmail': {'timeout': 20}}``.
+    """
+    base = DEFAULT_POLICIES.get(name) or DEFAULT_POLICIES['default']
+    overrides = getattr(settings, 'HTTP_CLIENT_POLICIES', {}).get(name)
+    if overrides:
+        base = replace(base, **overrides)
+    return base
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_pid: Optional[int] = None
+_sessions_lock = threading.Lock()
+
+
+def _build_session(policy: RetryPolicy) -> requests.Session:
+    session = requests.Session()
+    # Retries are handled in request() so each attempt can be tracked
+    adapter = HTTPAdapter(
+        pool_connections=policy.pool_connections,
+        pool_maxsize=policy.pool_maxsize,
+        max_retries=0,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # Sessions are shared between users; never carry cookies from one call to the next
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session(policy_name: str = 'default') -> requests.Session:
+    """Return the pooled session for ``policy_name`` in this process."""
+    global _sessions_pid
+    pid = os.getpid()
+    session = _sessions.get(policy_name) if _sessions_pid == pid else None
+    if session is not None:
+        return session
+    with _sessions_lock:
+        if _sessions_pid != pid:
+            # Pooled sockets must not be shared with a forked parent
+            _sessions.clear()
+            _sessions_pid = pid
+        session = _sessions.get(policy_name)
+        if session is None:
+            session = _build_session(get_policy(policy_name))
+            _sessions[policy_name] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close every pooled session (used by tests and worker shutdown)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _retry_delay(policy: RetryPolicy, retry_number: int, response: Optional[requests.Response]) -> float:
+    if response is not None and response.status_code == 429:
+        retry_after = response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(float(retry_after), policy.backoff_max)
+            except ValueError:
+                pass
+        base = policy.rate_limit_backoff or policy.backoff_base
+    else:
+        base = policy.backoff_base
+    delay = base * (2 ** retry_number) * (0.5 + random.random() * 0.5)
+    return min(delay, policy.backoff_max)
+
+
+def request(
+    method: str,
+    url: str,
+    *,
+    policy: str = 'default',
+    service=None,
+    endpoint: Optional[str] = None,
+    user=None,
+    max_retries: Optional[int] = None,
+    **kwargs,
+) -> requests.Response:
+    """
+    Send a request through the pooled session for ``policy``.
+
+    Connection errors, timeouts and responses with a retryable status are
+    retried with exponential backoff (``Retry-After`` is honored for 429s)
+    until the policy's retry count or time budget runs out.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        policy: Name of the retry policy / connection pool to use
+        service: Optional APIService; every attempt is wrapped in track_api_call
+        endpoint: Endpoint recorded in the usage log (defaults to the URL path)
+        user: Optional user for per-user tracking and rate limits
+        max_retries: Override the policy's retry count
+        **kwargs: Passed to ``requests.Session.request`` (``timeout`` defaults to the policy's)
+
+    Returns:
+        The last response received; callers handle non-retryable statuses
+
+    Raises:
+        requests.RequestException: When the last attempt failed without a response
+        RateLimitException: When track_api_call rejects the attempt
+    """
+    rules = get_policy(policy)
+    session = get_session(policy)
+    retries = rules.max_retries if max_retries is None else max(0, max_retries)
+    kwargs.setdefault('timeout', rules.timeout)
+    method = method.upper()
+    started = time.monotonic()
+
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = _send(session, method, url, service, endpoint, user, rules, kwargs)
+            return response
+        except RetryableStatusError as exc:
+            response = exc.response
+            failure = exc
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            failure = exc
+
+        if attempt >= retries:
+            if response is not None:
+                return response
+            raise failure
+
+        delay = _retry_delay(rules, attempt, response)
+        if time.monotonic() - started + delay > rules.max_elapsed:
+            logger.warning(f"HTTP {method} {url} out of retry budget after {attempt + 1} attempt(s)")
+            if response is not None:
+                return response
+            raise failure
+
+        if response is not None:
+            response.close()
+        logger.warning(
+            f"HTTP {method} {urlparse(url).netloc} failed ({failure}); "
+            f"retry {attempt + 1}/{retries} in {delay:.1f}s"
+        )
+        time.sleep(delay)
+        attempt += 1
+
+
+def _send(session, method, url, service, endpoint, user, rules, kwargs) -> requests.Response:
+    if service is None:
+        response = session.request(method, url, **kwargs)
+        if response.status_code in rules.retry_statuses:
+            raise RetryableStatusError(response)
+        return response
+
+    from core.api_monitoring import track_api_call
+
+    try:
+        with track_api_call(service, endpoint=endpoint or urlparse(url).path, method=method, user=user):
+            response = session.request(method, url, **kwargs)
+            if response.status_code in rules.retry_statuses:
+                raise RetryableStatusError(response)
+            if response.status_code >= 400:
+                raise FailedStatusError(response)
+    except FailedStatusError as exc:
+        return exc.response
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
@@ -12,6 +12,9 @@ import json
 import requests
 import os
 
+from core import llm_gateway
+from core.api_monitoring import SERVICE_GEMINI, get_or_create_service, track_api_call
+
 logger = logging.getLogger(__name__)
 
 
@@ -356,7 +359,7 @@ class InterviewInsightsGenerator:
             }
         }
         
-        try:
+        def _request():
             service = get_or_create_service(SERVICE_GEMINI, 'Google Gemini AI')
             with track_api_call(service, endpoint=f'/models/{model}:generateContent', method='POST'):
                 response = requests.post(url, json=payload, timeout=30)
@@ -368,32 +371,15 @@ class InterviewInsightsGenerator:
             if 'candidates' not in result or not result['candidates']:
                 raise ValueError("No content generated by AI")
             
-            content = result['candidates'][0]['content']['parts'][0]['text']
-            
-            # Clean the content - remove markdown code blocks if present
-            content = content.strip()
-            if content.startswith('```json'):
-                content = content[7:]  # Remove ```json
-            if content.startswith('```'):
-                content = content[3:]  # Remove ```
-            if content.endswith('```'):
-                content = content[:-3]  # Remove trailing ```
-            content = content.strip()
-            
-            # Log the raw content for debugging
-            logger.debug(f"Raw AI response (first 500 chars): {content[:500]}")
-            
-            # Parse JSON response
-            try:
-                insights_data = json.loads(content)
-            except json.JSONDecodeError as json_err:
-                # Log the problematic content area
-                logger.error(f"JSON parsing failed at position {json_err.pos}")
-                if json_err.pos and len(content) > json_err.pos:
-                    start = max(0, json_err.pos - 100)
-                    end = min(len(content), json_err.pos + 100)
-                    logger.error(f"Context around error: ...{content[start:end]}...")
-                raise
+            return result['candidates'][0]['content']['parts'][0]['text'], llm_gateway.rest_response_tokens(result)
+        
+        try:
+            # Identical requests (retries, other tabs) share one cached response
+            content = llm_gateway.generate(
+                prompt, model=model, config=payload['generationConfig'], call=_request,
+                validate=cls._parse_ai_content,
+            )
+            insights_data = cls._parse_ai_content(content)
             
             # Add metadata
             insights_data['has_data'] = True
@@ -410,6 +396,34 @@ class InterviewInsightsGenerator:
             logger.error(f"Failed to parse AI response: {e}")
             raise Exception(f"Invalid response from AI service: {str(e)}")
     
+    @staticmethod
+    def _parse_ai_content(content: str) -> Dict[str, Any]:
+        """Parse the JSON insights out of a Gemini response."""
+        # Clean the content - remove markdown code blocks if present
+        content = content.strip()
+        if content.startswith('```json'):
+            content = content[7:]  # Remove ```json
+        if content.startswith('```'):
+            content = content[3:]  # Remove ```
+        if content.endswith('```'):
+            content = content[:-3]  # Remove trailing ```
+        content = content.strip()
+        
+        # Log the raw content for debugging
+        logger.debug(f"Raw AI response (first 500 chars): {content[:500]}")
+        
+        # Parse JSON response
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError as json_err:
+            # Log the problematic content area
+            logger.error(f"JSON parsing failed at position {json_err.pos}")
+            if json_err.pos and len(content) > json_err.pos:
+                start = max(0, json_err.pos - 100)
+                end = min(len(content), json_err.pos + 100)
+                logger.error(f"Context around error: ...{content[start:end]}...")
+            raise
+    
     @classmethod
     def _build_ai_prompt(cls, job_title: str, company_name: str) -> str:
         """Build a structured prompt for Gemini to generate interview insights."""
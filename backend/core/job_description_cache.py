@@ -0,0 +1,230 @@
+"""
+Shared, content-addressed cache of candidate-independent job posting analysis.
+
+The per-job caches (``SkillGapAnalysisCache``, ``InterviewInsightsCache``,
+``QuestionBankCache``, ``TechnicalPrepCache``) are keyed by ``JobEntry``, so a
+posting imported by 200 users was parsed, and sent to Gemini, 200 times. The
+parts that do not depend on the candidate now live in ``JobDescriptionAnalysis``
+rows keyed by a hash of the normalized text they are computed from:
+
+* ``requirements``: extracted skills, required years of experience and
+  education requirements (from the title, description and notes)
+* ``interview_insights``: Gemini interview insights (from the title, company
+  and model); template fallbacks are cheap and are not stored
+
+Per-candidate scoring reads these rows (``job_requirements_many`` loads a whole
+batch in one query) and only compares them against the candidate.
+
+Requirement rows expire after ``JOB_DESCRIPTION_CACHE_TTL`` so skills added to
+the vocabulary reach postings analyzed earlier. Past
+``JOB_DESCRIPTION_CACHE_MAX_ENTRIES`` rows the least recently used are evicted.
+Hits and misses are counted per kind in the Django cache (``cache_stats``).
+"""
+import copy
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from core.models import JobDescriptionAnalysis
+
+logger = logging.getLogger(__name__)
+
+REQUIREMENTS = JobDescriptionAnalysis.KIND_REQUIREMENTS
+INTERVIEW_INSIGHTS = JobDescriptionAnalysis.KIND_INTERVIEW_INSIGHTS
+
+METRICS_PREFIX = 'jd-cache:'
+
+
+def normalize_text(value) -> str:
+    """Lowercase and collapse whitespace; the analyses are insensitive to both."""
+    return ' '.join(str(value or '').lower().split())
+
+
+def content_hash(*parts) -> str:
+    joined = '\x1f'.join(normalize_text(part) for part in parts)
+    return hashlib.sha256(joined.encode('utf-8')).hexdigest()
+
+
+def requirements_hash(job) -> str:
+    return content_hash(
+        getattr(job, 'title', ''), getattr(job, 'description', ''), getattr(job, 'personal_notes', ''),
+    )
+
+
+def _record(kind: str, hits: int = 0, misses: int = 0):
+    for outcome, count in (('hits', hits), ('misses', misses)):
+        if not count:
+            continue
+        key = f'{METRICS_PREFIX}{kind}:{outcome}'
+        try:
+            if not cache.add(key, count, timeout=None):
+                cache.incr(key, count)
+        except Exception as exc:
+            logger.debug(f"Job description cache metrics unavailable: {exc}")
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """Hits, misses, hit rate and stored entries per kind."""
+    kinds = [kind for kind, _ in JobDescriptionAnalysis.KIND_CHOICES]
+    keys = [f'{METRICS_PREFIX}{kind}:{outcome}' for kind in kinds for outcome in ('hits', 'misses')]
+    try:
+        counters = cache.get_many(keys)
+    except Exception as exc:
+        logger.debug(f"Job description cache metrics unavailable: {exc}")
+        counters = {}
+    entries = dict(
+        JobDescriptionAnalysis.objects.values('kind').annotate(total=Count('id')).values_list('kind', 'total')
+    )
+    stats = {}
+    for kind in kinds:
+        hits = int(counters.get(f'{METRICS_PREFIX}{kind}:hits') or 0)
+        misses = int(counters.get(f'{METRICS_PREFIX}{kind}:misses') or 0)
+        stats[kind] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+            'entries': entries.get(kind, 0),
+        }
+    return stats
+
+
+def _lookup(kind: str, hashes) -> Dict[str, JobDescriptionAnalysis]:
+    """Load unexpired entries and mark them used."""
+    rows = JobDescriptionAnalysis.objects.filter(kind=kind, content_hash__in=list(hashes))
+    ttl = settings.JOB_DESCRIPTION_CACHE_TTL
+    if kind == REQUIREMENTS and ttl:
+        rows = rows.filter(created_at__gte=timezone.now() - timedelta(seconds=ttl))
+    found = {row.content_hash: row for row in rows}
+    if found:
+        JobDescriptionAnalysis.objects.filter(pk__in=[row.pk for row in found.values()]).update(
+            hit_count=F('hit_count') + 1, last_used_at=timezone.now(),
+        )
+    return found
+
+
+def _store(kind: str, payloads: Dict[str, Dict]):
+    """Insert (or replace expired) entries, then evict past the size limit."""
+    with transaction.atomic():
+        JobDescriptionAnalysis.objects.filter(kind=kind, content_hash__in=list(payloads)).delete()
+        JobDescriptionAnalysis.objects.bulk_create(
+            [JobDescriptionAnalysis(kind=kind, content_hash=digest, payload=payload)
+             for digest, payload in payloads.items()],
+            ignore_conflicts=True,
+        )
+        evict()
+
+
+def evict(max_entries: Optional[int] = None) -> int:
+    """Drop the least recently used entries beyond ``max_entries``.
+
+    Returns:
+        Number of entries evicted
+    """
+    max_entries = settings.JOB_DESCRIPTION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    stale_ids = list(
+        JobDescriptionAnalysis.objects.order_by('-last_used_at', '-id').values_list('id', flat=True)[max_entries:]
+    )
+    if stale_ids:
+        JobDescriptionAnalysis.objects.filter(pk__in=stale_ids).delete()
+    return len(stale_ids)
+
+
+def _compute_requirements(job, matcher=None) -> Dict:
+    from core.job_matching import JobMatchingEngine
+    from core.skills_gap_analysis import SkillsGapAnalyzer
+
+    return {
+        'skills': SkillsGapAnalyzer._extract_job_requirements(job, matcher=matcher),
+        'experience_years': str(JobMatchingEngine._extract_experience_requirements(job)),
+        'education': JobMatchingEngine._extract_education_requirements(job),
+    }
+
+
+def job_requirements_many(jobs: Iterable, matcher=None) -> Dict[int, Dict]:
+    """Candidate-independent requirements for each job, with one lookup for the batch.
+
+    Returns:
+        ``{job.id: {'skills': [...], 'experience_years': '3', 'education': {...}}}``;
+        each job gets its own copy
+    """
+    by_hash = {}
+    for job in jobs:
+        by_hash.setdefault(requirements_hash(job), []).append(job)
+    if not by_hash:
+        return {}
+
+    try:
+        with transaction.atomic():
+            found = _lookup(REQUIREMENTS, by_hash)
+    except Exception as exc:
+        logger.warning(f"Job description cache lookup failed: {exc}")
+        found = {}
+
+    computed = {}
+    results = {}
+    for digest, group in by_hash.items():
+        if digest in found:
+            payload = found[digest].payload
+        else:
+            payload = computed[digest] = _compute_requirements(group[0], matcher=matcher)
+        for job in group:
+            results[job.id] = copy.deepcopy(payload)
+
+    if computed:
+        try:
+            _store(REQUIREMENTS, computed)
+        except Exception as exc:
+            # Caching failures shouldn't break analysis
+            logger.warning(f"Failed to store job requirements: {exc}")
+    _record(REQUIREMENTS, hits=len(found), misses=len(computed))
+    return results
+
+
+def job_requirements(job, matcher=None) -> Dict:
+    return job_requirements_many([job], matcher=matcher)[job.id]
+
+
+def interview_insights(job_title: str, company_name: str, api_key: Optional[str] = None,
+                       model: Optional[str] = None, refresh: bool = False) -> Dict:
+    """``InterviewInsightsGenerator.generate_for_job`` backed by the shared cache.
+
+    Args:
+        refresh: Regenerate and replace the shared entry
+    """
+    from core.interview_insights import InterviewInsightsGenerator
+
+    def generate():
+        return InterviewInsightsGenerator.generate_for_job(
+            job_title=job_title, company_name=company_name, api_key=api_key, model=model,
+        )
+
+    if not api_key:
+        return generate()
+
+    digest = content_hash(model, job_title, company_name)
+    if not refresh:
+        try:
+            with transaction.atomic():
+                row = _lookup(INTERVIEW_INSIGHTS, [digest]).get(digest)
+        except Exception as exc:
+            logger.warning(f"Job description cache lookup failed: {exc}")
+            row = None
+        if row is not None:
+            _record(INTERVIEW_INSIGHTS, hits=1)
+            return copy.deepcopy(row.payload)
+
+    insights = generate()
+    _record(INTERVIEW_INSIGHTS, misses=1)
+    if insights.get('generated_by') == 'ai':
+        try:
+            _store(INTERVIEW_INSIGHTS, {digest: copy.deepcopy(insights)})
+        except Exception as exc:
+            logger.warning(f"Failed to store interview insights: {exc}")
+    return insights
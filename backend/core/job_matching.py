@@ -69,6 +69,211 @@ class JobMatchingEngine:
             'weights_used': {k: float(v) for k, v in weights.items()},
         }
     
+    @classmethod
+    def score_many(
+        cls,
+        jobs,
+        candidate_profile,
+        user_weights: Optional[Dict] = None,
+        use_cache: bool = True,
+        candidate_fingerprint: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Score many jobs for one candidate with a fixed number of queries.
+        
+        Cached ``JobMatchAnalysis`` rows are loaded in one query, the candidate's
+        skills, experience, education and certifications are loaded once, the
+        jobs' candidate-independent requirements come from the shared
+        content-addressed cache (core.job_description_cache), and new or stale
+        analyses are written back with one ``bulk_create`` and one ``bulk_update``.
+        
+        Args:
+            jobs: Iterable of JobEntry instances belonging to the candidate
+            candidate_profile: CandidateProfile instance
+            user_weights: Custom scoring weights (optional; stale rows otherwise
+                keep the weights they were scored with)
+            use_cache: Reuse fresh cached analyses instead of recomputing them
+            candidate_fingerprint: Candidate inputs fingerprint taken before the
+                candidate data is loaded (computed here when omitted)
+            
+        Returns:
+            List of score dicts in the same order as ``jobs``
+        """
+        from django.utils import timezone
+        from core.job_description_cache import job_requirements_many
+        from core.match_fingerprints import candidate_fingerprint as fingerprint_candidate, is_fresh
+        from core.models import JobMatchAnalysis
+        from core.skill_matcher import get_skill_matcher
+        
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        
+        existing = {
+            analysis.job_id: analysis
+            for analysis in JobMatchAnalysis.objects.filter(
+                candidate=candidate_profile,
+                job_id__in=[job.id for job in jobs],
+            )
+        }
+        
+        pending = [
+            job for job in jobs
+            if not (use_cache and job.id in existing and is_fresh(existing[job.id], job))
+        ]
+        
+        computed = {}
+        if pending:
+            if candidate_fingerprint is None:
+                candidate_fingerprint = fingerprint_candidate(candidate_profile.pk)
+            snapshot = CandidateSnapshot.load(candidate_profile)
+            matcher = get_skill_matcher()
+            requirements = job_requirements_many(pending, matcher=matcher)
+            for job in pending:
+                row = existing.get(job.id)
+                weights = cls._normalize_weights(
+                    user_weights or (row.user_weights if row else None) or cls.DEFAULT_WEIGHTS
+                )
+                computed[job.id] = cls._score_with_snapshot(job, snapshot, weights, matcher, requirements[job.id])
+            cls._store_analyses(
+                pending, candidate_profile, computed, existing, timezone.now(), candidate_fingerprint,
+            )
+        
+        results = []
+        for job in jobs:
+            analysis = existing.get(job.id)
+            if job.id in computed:
+                result = dict(computed[job.id])
+                result['match_grade'] = analysis.match_grade if analysis else 'N/A'
+                result['cached'] = False
+            else:
+                result = cls.stored_result(analysis)
+            result['job_id'] = job.id
+            results.append(result)
+        
+        return results
+    
+    @classmethod
+    def stored_result(cls, analysis) -> Dict:
+        """Score dict for a stored ``JobMatchAnalysis`` row."""
+        return {
+            'overall_score': float(analysis.overall_score),
+            'skills_score': float(analysis.skills_score),
+            'experience_score': float(analysis.experience_score),
+            'education_score': float(analysis.education_score),
+            'breakdown': (analysis.match_data or {}).get('breakdown', {}),
+            'generated_at': analysis.generated_at.isoformat(),
+            'weights_used': analysis.user_weights or {k: float(v) for k, v in cls.DEFAULT_WEIGHTS.items()},
+            'match_grade': analysis.match_grade,
+            'cached': True,
+        }
+    
+    @classmethod
+    def _score_with_snapshot(
+        cls, job, snapshot: 'CandidateSnapshot', weights: Dict, matcher=None, requirements: Optional[Dict] = None,
+    ) -> Dict:
+        """Score one job against a preloaded candidate snapshot (no candidate queries).
+        
+        ``requirements`` is the job's entry from ``job_requirements_many``; it is
+        looked up (or computed) when omitted.
+        """
+        if requirements is None:
+            from core.job_description_cache import job_requirements
+            requirements = job_requirements(job, matcher=matcher)
+        try:
+            required_skills = requirements['skills']
+            skills_data = SkillsGapAnalyzer._compare_skills(required_skills, snapshot.skills)
+            skills_analysis = {
+                'skills': skills_data,
+                'summary': SkillsGapAnalyzer._summarize_skills(skills_data),
+            }
+            skills_score = cls._score_skills_analysis(skills_analysis['skills'], skills_analysis['summary'])
+        except Exception as e:
+            logger.error(f"Error calculating skills score: {e}")
+            skills_analysis = {'skills': [], 'summary': {}}
+            skills_score = Decimal('40')
+        
+        experience_score = cls._score_experience(
+            job, snapshot.candidate_profile, snapshot.experiences,
+            required_years=Decimal(requirements['experience_years']),
+        )
+        education_score = cls._score_education(job, snapshot.educations, snapshot.certifications)
+        
+        overall_score = (
+            skills_score * weights['skills'] +
+            experience_score * weights['experience'] +
+            education_score * weights['education']
+        ).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        
+        breakdown = cls._build_match_breakdown(
+            job,
+            snapshot.candidate_profile,
+            skills_analysis,
+            experiences=snapshot.experiences,
+            education_count=len(snapshot.educations),
+        )
+        
+        return {
+            'overall_score': float(overall_score),
+            'skills_score': float(skills_score),
+            'experience_score': float(experience_score),
+            'education_score': float(education_score),
+            'breakdown': breakdown,
+            'generated_at': datetime.now().isoformat(),
+            'weights_used': {k: float(v) for k, v in weights.items()},
+        }
+    
+    @classmethod
+    def _store_analyses(
+        cls, jobs, candidate_profile, computed: Dict, existing: Dict, now, candidate_fingerprint: str = '',
+    ) -> None:
+        """Persist freshly computed analyses, updating stale rows in place."""
+        from core.match_fingerprints import job_fingerprint
+        from core.models import JobMatchAnalysis
+        
+        to_create = []
+        to_update = []
+        for job in jobs:
+            analysis = computed[job.id]
+            values = {
+                'overall_score': Decimal(str(analysis['overall_score'])),
+                'skills_score': Decimal(str(analysis['skills_score'])),
+                'experience_score': Decimal(str(analysis['experience_score'])),
+                'education_score': Decimal(str(analysis['education_score'])),
+                'match_data': {'breakdown': analysis['breakdown']},
+                'user_weights': analysis['weights_used'],
+                'candidate_fingerprint': candidate_fingerprint,
+                'job_fingerprint': job_fingerprint(job),
+            }
+            row = existing.get(job.id)
+            if row is None:
+                row = JobMatchAnalysis(job=job, candidate=candidate_profile, **values)
+                to_create.append(row)
+            else:
+                for field, value in values.items():
+                    setattr(row, field, value)
+                row.is_valid = True
+                row.generated_at = now
+                row.updated_at = now
+                to_update.append(row)
+            existing[job.id] = row
+        
+        try:
+            if to_create:
+                JobMatchAnalysis.objects.bulk_create(to_create, ignore_conflicts=True)
+            if to_update:
+                JobMatchAnalysis.objects.bulk_update(
+                    to_update,
+                    [
+                        'overall_score', 'skills_score', 'experience_score', 'education_score',
+                        'match_data', 'user_weights', 'candidate_fingerprint', 'job_fingerprint',
+                        'is_valid', 'generated_at', 'updated_at',
+                    ],
+                )
+        except Exception as e:
+            # Caching failures shouldn't break scoring
+            logger.warning(f"Failed to cache bulk match analyses: {e}")
+    
     @classmethod
     def calculate_skills_score(cls, job, candidate_profile) -> Decimal:
         """
@@ -79,9 +284,15 @@ class JobMatchingEngine:
         try:
             # Get skills gap analysis - this is the same data shown in Skills Gap Analysis
             analysis = SkillsGapAnalyzer.analyze_job(job, candidate_profile)
-            skills_data = analysis.get('skills', [])
-            summary = analysis.get('summary', {})
-            
+            return cls._score_skills_analysis(analysis.get('skills', []), analysis.get('summary', {}))
+        except Exception as e:
+            logger.error(f"Error calculating skills score: {e}")
+            return Decimal('40')  # More reasonable default than 0
+    
+    @classmethod
+    def _score_skills_analysis(cls, skills_data: List[Dict], summary: Dict) -> Decimal:
+        """Turn a skills gap analysis (skills list + summary) into a 0-100 score."""
+        try:
             if not skills_data:
                 return Decimal('40')  # Base score when no skills detected
             
@@ -171,6 +382,20 @@ class JobMatchingEngine:
         try:
             from core.models import WorkExperience
             
+            # Get candidate's work experience
+            experiences = WorkExperience.objects.filter(
+                candidate=candidate_profile
+            ).order_by('-start_date')
+            
+            return cls._score_experience(job, candidate_profile, experiences)
+        except Exception as e:
+            logger.error(f"Error calculating experience score: {e}")
+            return Decimal('60')  # Reasonable default
+    
+    @classmethod
+    def _score_experience(cls, job, candidate_profile, experiences, required_years: Optional[Decimal] = None) -> Decimal:
+        """Score experience against ``experiences`` (newest first; queryset or list)."""
+        try:
             # Analyze job title for level indicators
             job_title_lower = job.title.lower()
             job_text = f"{job.title} {job.description or ''}".lower()
@@ -178,17 +403,12 @@ class JobMatchingEngine:
             is_internship = any(keyword in job_text for keyword in ['intern', 'internship'])
             is_senior = any(keyword in job_title_lower for keyword in ['senior', 'lead', 'principal', 'staff', 'architect'])
             
-            # Get candidate's work experience
-            experiences = WorkExperience.objects.filter(
-                candidate=candidate_profile
-            ).order_by('-start_date')
-            
             # Handle internship positions - experience not weighted
             if is_internship:
                 return Decimal('90')  # High score since experience doesn't matter for internships
             
             # Check if candidate has any experience
-            has_any_experience = experiences.exists()
+            has_any_experience = bool(experiences)
             
             if not has_any_experience:
                 if is_senior:
@@ -198,7 +418,8 @@ class JobMatchingEngine:
             
             # Calculate experience metrics
             total_years = cls._calculate_total_experience_years(experiences)
-            required_years = cls._extract_experience_requirements(job)
+            if required_years is None:
+                required_years = cls._extract_experience_requirements(job)
             
             # Adjust required years based on job level
             if is_senior:
@@ -259,7 +480,19 @@ class JobMatchingEngine:
             educations = Education.objects.filter(
                 candidate=candidate_profile
             ).order_by('-end_date')  # Use end_date instead of graduation_date
+            certifications = Certification.objects.filter(
+                candidate=candidate_profile
+            )
             
+            return cls._score_education(job, educations, certifications)
+        except Exception as e:
+            logger.error(f"Error calculating education score: {e}")
+            return Decimal('50')  # Neutral score on error
+    
+    @classmethod
+    def _score_education(cls, job, educations, certifications) -> Decimal:
+        """Score education and certifications (querysets or lists) for ``job``."""
+        try:
             # Check if this is an internship position
             job_text = f"{job.title} {job.description or ''}".lower()
             is_internship = any(keyword in job_text for keyword in ['intern', 'internship'])
@@ -291,10 +524,6 @@ class JobMatchingEngine:
                 base_score = Decimal('30')
             
             # Add bonuses for field relevance and certifications
-            certifications = Certification.objects.filter(
-                candidate=candidate_profile
-            )
-            
             field_bonus = cls._score_field_relevance(job, educations)
             cert_bonus = cls._score_certifications(job, certifications)
             
@@ -327,7 +556,32 @@ class JobMatchingEngine:
         try:
             # Get skills gap analysis for detailed breakdown
             skills_analysis = SkillsGapAnalyzer.analyze_job(job, candidate_profile)
-            
+        except Exception as e:
+            logger.error(f"Error generating match breakdown: {e}")
+            return {
+                'strengths': [],
+                'top_gaps': [],
+                'recommendations': [],
+                'skills_summary': {}
+            }
+        return cls._build_match_breakdown(job, candidate_profile, skills_analysis)
+    
+    @classmethod
+    def _build_match_breakdown(
+        cls,
+        job,
+        candidate_profile,
+        skills_analysis: Dict,
+        experiences=None,
+        education_count: Optional[int] = None,
+    ) -> Dict:
+        """
+        Build the match breakdown from an existing skills gap analysis.
+        
+        ``experiences`` (with ``skills_used`` prefetched) and ``education_count``
+        may be supplied by batch callers to avoid per-job queries.
+        """
+        try:
             # Build set of required skills from this job
             required_skill_ids = set()
             required_skill_names = set()
@@ -385,8 +639,9 @@ class JobMatchingEngine:
             # Cross-reference candidate employment for overlapping skills
             experience_skill_matches = []
             try:
-                from core.models import WorkExperience
-                experiences = WorkExperience.objects.filter(candidate=candidate_profile).prefetch_related('skills_used')
+                if experiences is None:
+                    from core.models import WorkExperience
+                    experiences = WorkExperience.objects.filter(candidate=candidate_profile).prefetch_related('skills_used')
                 for exp in experiences:
                     for sk in exp.skills_used.all():
                         if (sk.id in required_skill_ids) or ((sk.name or '').lower() in required_skill_names):
@@ -405,7 +660,13 @@ class JobMatchingEngine:
                 pass
 
             # Generate recommendations
-            recommendations = cls._generate_recommendations(job, candidate_profile, top_gaps)
+            recommendations = cls._generate_recommendations(
+                job,
+                candidate_profile,
+                top_gaps,
+                exp_count=len(experiences) if isinstance(experiences, list) else None,
+                edu_count=education_count,
+            )
             
             return {
                 'strengths': strengths,
@@ -695,7 +956,7 @@ class JobMatchingEngine:
     @classmethod
     def _score_certifications(cls, job, certifications) -> Decimal:
         """Score relevant certifications."""
-        if not certifications.exists():
+        if not certifications:
             return Decimal('0')
         
         # Basic bonus for having certifications
@@ -715,7 +976,14 @@ class JobMatchingEngine:
         return min(Decimal('25'), base_bonus + relevant_bonus)
     
     @classmethod
-    def _generate_recommendations(cls, job, candidate_profile, top_gaps) -> List[str]:
+    def _generate_recommendations(
+        cls,
+        job,
+        candidate_profile,
+        top_gaps,
+        exp_count: Optional[int] = None,
+        edu_count: Optional[int] = None,
+    ) -> List[str]:
         """Generate improvement recommendations."""
         recommendations = []
         
@@ -729,8 +997,9 @@ class JobMatchingEngine:
                 recommendations.append(f"Raise {skill_name} to {level_label} level")
         
         # Experience recommendations
-        from core.models import WorkExperience
-        exp_count = WorkExperience.objects.filter(candidate=candidate_profile).count()
+        if exp_count is None:
+            from core.models import WorkExperience
+            exp_count = WorkExperience.objects.filter(candidate=candidate_profile).count()
         
         if exp_count == 0:
             recommendations.append("Consider gaining relevant experience through internships or projects")
@@ -738,10 +1007,40 @@ class JobMatchingEngine:
             recommendations.append("Build more diverse experience in your field")
         
         # Education recommendations  
-        from core.models import Education
-        edu_count = Education.objects.filter(candidate=candidate_profile).count()
+        if edu_count is None:
+            from core.models import Education
+            edu_count = Education.objects.filter(candidate=candidate_profile).count()
         
         if edu_count == 0:
             recommendations.append("Consider pursuing relevant education or certifications")
         
-        return recommendations
\ No newline at end of file
+        return recommendations
+
+
+class CandidateSnapshot:
+    """Candidate data needed for match scoring, loaded once per batch."""
+    
+    def __init__(self, candidate_profile, skills, experiences, educations, certifications):
+        self.candidate_profile = candidate_profile
+        self.skills = skills
+        self.experiences = experiences
+        self.educations = educations
+        self.certifications = certifications
+    
+    @classmethod
+    def load(cls, candidate_profile) -> 'CandidateSnapshot':
+        from core.models import WorkExperience, Education, Certification
+        
+        return cls(
+            candidate_profile=candidate_profile,
+            skills=SkillsGapAnalyzer._get_candidate_skills(candidate_profile),
+            experiences=list(
+                WorkExperience.objects.filter(candidate=candidate_profile)
+                .order_by('-start_date')
+                .prefetch_related('skills_used')
+            ),
+            educations=list(
+                Education.objects.filter(candidate=candidate_profile).order_by('-end_date')
+            ),
+            certifications=list(Certification.objects.filter(candidate=candidate_profile)),
+        )
@@ -0,0 +1,271 @@
+"""
+Ranked keyword search over a candidate's ``JobEntry`` rows (UC-039).
+
+The jobs list used to filter with ``icontains`` on title, company and
+description, which is a sequential scan of ``core_jobentry`` on every keystroke
+and returns matches in ``updated_at`` order regardless of how well they match.
+
+On PostgreSQL migration 0134 adds:
+
+* ``core_jobentry.search_vector``, a ``tsvector`` kept up to date by a trigger
+  (title weighted A, company B, industry/location C, description D) with a GIN
+  index. ``search_vector`` is not a model field: the ORM never writes it and it
+  is only read through ``RawSQL`` here;
+* ``pg_trgm`` GIN indexes on title, company, industry and location, which serve
+  the ``ILIKE`` substring filters and the fuzzy ``<%`` (word similarity)
+  matches, so "Gogle" still finds "Google" and "San Fransisco" finds
+  "San Francisco, CA". Substring filters are written as ``ILIKE`` rather than
+  ``icontains``, which compiles to ``UPPER(col) LIKE UPPER(...)`` and can't use
+  these indexes. With every branch of the keyword match index-backed,
+  PostgreSQL combines them with a ``BitmapOr`` instead of scanning the table
+  (``benchmark_job_search --explain`` prints the plans).
+
+Every query term is matched as a prefix (``term:*``) so search-as-you-type
+works, and results are ranked by ``ts_rank`` plus company word similarity.
+
+Other databases (the SQLite dev/test setup) and PostgreSQL test databases built
+without migrations use ``JobSearchIndex``, an in-process inverted index over
+the candidate's jobs with the same field weights. It is cached per candidate
+and rebuilt when the candidate's job count, newest ``updated_at`` or highest id
+changes.
+
+    qs = apply_job_search(qs, profile, query='backend eng', location='new york')
+    qs = qs.order_by('-search_rank', '-updated_at')
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import connections
+from django.db.models import BooleanField, Case, Count, FloatField, Max, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from core.models import JobEntry
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CONFIG = 'english'
+# Matches pg_trgm's default pg_trgm.word_similarity_threshold used by ``<%``
+WORD_SIMILARITY_THRESHOLD = 0.6
+# Same defaults as PostgreSQL's ts_rank for weights D, C, B, A
+FIELD_WEIGHTS = {
+    'title': 1.0,
+    'company_name': 0.4,
+    'industry': 0.2,
+    'location': 0.2,
+    'description': 0.1,
+}
+# Candidates whose fallback index is kept in memory
+INDEX_CACHE_SIZE = 128
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased word terms of ``query``; punctuation never reaches to_tsquery."""
+    return _TOKEN_RE.findall((query or '').lower())
+
+
+def prefix_tsquery(terms: Iterable[str]) -> str:
+    """``to_tsquery`` input matching every term as a prefix, e.g. ``backend:* & eng:*``."""
+    return ' & '.join(f'{term}:*' for term in terms)
+
+
+def _trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in search_terms(text):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(needle: str, haystack: str) -> float:
+    """
+    Approximation of pg_trgm ``word_similarity``: the best trigram similarity
+    between ``needle`` and any run of consecutive words in ``haystack``.
+    """
+    needle_grams = _trigrams(needle)
+    words = search_terms(haystack)
+    if not needle_grams or not words:
+        return 0.0
+    best = 0.0
+    width = max(1, len(search_terms(needle)))
+    for size in {max(1, width - 1), width, width + 1}:
+        for start in range(0, max(1, len(words) - size + 1)):
+            grams = _trigrams(' '.join(words[start:start + size]))
+            if grams:
+                best = max(best, len(needle_grams & grams) / len(needle_grams | grams))
+    return best
+
+
+class JobSearchIndex:
+    """Inverted index over one candidate's jobs, used where PostgreSQL search is unavailable."""
+
+    def __init__(self, rows: Iterable[Tuple]):
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._fields: Dict[int, Dict[str, str]] = {}
+        names = list(FIELD_WEIGHTS)
+        for row in rows:
+            job_id, values = row[0], dict(zip(names, row[1:]))
+            self._fields[job_id] = {name: value or '' for name, value in values.items()}
+            for name, value in self._fields[job_id].items():
+                for token in search_terms(value):
+                    postings = self._postings[token]
+                    postings[job_id] = postings.get(job_id, 0.0) + FIELD_WEIGHTS[name]
+
+    def __len__(self):
+        return len(self._fields)
+
+    def search(self, query: str) -> Dict[int, float]:
+        """Job id -> rank for jobs matching every term of ``query`` (or its company fuzzily)."""
+        terms = search_terms(query)
+        needle = (query or '').strip().lower()
+        scores: Optional[Dict[int, float]] = None
+        for term in terms:
+            term_scores: Dict[int, float] = defaultdict(float)
+            # Substring rather than prefix match keeps the old icontains behaviour
+            for token, postings in self._postings.items():
+                if term in token:
+                    weight = 1.0 if token.startswith(term) else 0.5
+                    for job_id, field_weight in postings.items():
+                        term_scores[job_id] += field_weight * weight
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {job_id: score + term_scores[job_id] for job_id, score in scores.items() if job_id in term_scores}
+        scores = scores or {}
+
+        for job_id, fields in self._fields.items():
+            if needle and (needle in fields['title'].lower() or needle in fields['company_name'].lower()):
+                scores.setdefault(job_id, FIELD_WEIGHTS['company_name'])
+            similarity = word_similarity(query, fields['company_name']) if needle else 0.0
+            if similarity >= WORD_SIMILARITY_THRESHOLD:
+                scores[job_id] = scores.get(job_id, 0.0) + similarity
+        return scores
+
+    def filter_field(self, name: str, value: str) -> Set[int]:
+        """Ids whose ``name`` contains ``value`` or is word-similar to it."""
+        needle = value.strip().lower()
+        return {
+            job_id for job_id, fields in self._fields.items()
+            if needle in fields[name].lower() or word_similarity(needle, fields[name]) >= WORD_SIMILARITY_THRESHOLD
+        }
+
+
+_index_cache: 'OrderedDict[int, Tuple[Tuple, JobSearchIndex]]' = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_search_index(candidate) -> JobSearchIndex:
+    """Cached ``JobSearchIndex`` for ``candidate``, rebuilt when their jobs change."""
+    jobs = JobEntry.objects.filter(candidate=candidate)
+    signature = tuple(jobs.aggregate(count=Count('id'), updated=Max('updated_at'), last_id=Max('id')).values())
+    with _index_lock:
+        cached = _index_cache.get(candidate.pk)
+        if cached and cached[0] == signature:
+            _index_cache.move_to_end(candidate.pk)
+            return cached[1]
+
+    index = JobSearchIndex(jobs.values_list('id', *FIELD_WEIGHTS).iterator())
+    with _index_lock:
+        _index_cache[candidate.pk] = (signature, index)
+        _index_cache.move_to_end(candidate.pk)
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+
+_search_vector_available: Dict[str, bool] = {}
+
+
+def postgres_search_available(using: str = 'default') -> bool:
+    """True when ``using`` is PostgreSQL and migration 0134 created ``search_vector``."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return False
+    if using not in _search_vector_available:
+        try:
+            with connection.cursor() as cursor:
+                columns = connection.introspection.get_table_description(cursor, JobEntry._meta.db_table)
+            _search_vector_available[using] = any(column.name == 'search_vector' for column in columns)
+        except Exception as exc:
+            logger.warning(f"Could not inspect {JobEntry._meta.db_table} for search_vector: {exc}")
+            _search_vector_available[using] = False
+    return _search_vector_available[using]
+
+
+def _column(connection, name: str) -> str:
+    quote = connection.ops.quote_name
+    return f'{quote(JobEntry._meta.db_table)}.{quote(name)}'
+
+
+def _contains(connection, field: str, value: str) -> RawSQL:
+    # Case-insensitive substring match the gin_trgm_ops index can serve, unlike icontains
+    pattern = '%' + re.sub(r'([\\%_])', r'\\\1', value) + '%'
+    return RawSQL(f'{_column(connection, field)} ILIKE %s', (pattern,), output_field=BooleanField())
+
+
+def _word_similar(connection, field: str, value: str) -> RawSQL:
+    # ``<%`` is served by the gin_trgm_ops index; %% escapes the operator's percent sign
+    return RawSQL(f'%s <%% {_column(connection, field)}', (value,), output_field=BooleanField())
+
+
+def _postgres_search(qs, query: str, industry: str, location: str):
+    connection = connections[qs.db]
+    if query:
+        terms = search_terms(query)
+        matches = (
+            Q(_contains(connection, 'title', query))
+            | Q(_contains(connection, 'company_name', query))
+            | Q(_word_similar(connection, 'company_name', query))
+        )
+        rank_sql = f'word_similarity(%s, {_column(connection, "company_name")})'
+        rank_params: Tuple = (query,)
+        if terms:
+            vector = f'coalesce({_column(connection, "search_vector")}, \'\'::tsvector)'
+            tsquery = prefix_tsquery(terms)
+            matches |= Q(RawSQL(f'{vector} @@ to_tsquery(%s, %s)', (SEARCH_CONFIG, tsquery), output_field=BooleanField()))
+            rank_sql = f'ts_rank({vector}, to_tsquery(%s, %s)) + {rank_sql}'
+            rank_params = (SEARCH_CONFIG, tsquery) + rank_params
+        qs = qs.filter(matches).annotate(search_rank=RawSQL(rank_sql, rank_params, output_field=FloatField()))
+    if industry:
+        qs = qs.filter(Q(_contains(connection, 'industry', industry)) | Q(_word_similar(connection, 'industry', industry)))
+    if location:
+        qs = qs.filter(Q(_contains(connection, 'location', location)) | Q(_word_similar(connection, 'location', location)))
+    return qs
+
+
+def _fallback_search(qs, candidate, query: str, industry: str, location: str):
+    index = get_search_index(candidate)
+    if industry:
+        qs = qs.filter(id__in=index.filter_field('industry', industry))
+    if location:
+        qs = qs.filter(id__in=index.filter_field('location', location))
+    if query:
+        scores = index.search(query)
+        by_score: Dict[float, List[int]] = defaultdict(list)
+        for job_id, score in scores.items():
+            by_score[round(score, 4)].append(job_id)
+        qs = qs.filter(id__in=list(scores)).annotate(search_rank=Case(
+            *[When(id__in=ids, then=Value(score)) for score, ids in by_score.items()],
+            default=Value(0.0),
+            output_field=FloatField(),
+        ))
+    return qs
+
+
+def apply_job_search(qs, candidate, query: str = '', industry: str = '', location: str = ''):
+    """
+    Filter ``qs`` (the candidate's jobs) by keyword ``query`` and fuzzy
+    ``industry``/``location``. When ``query`` is given, matches are annotated
+    with ``search_rank`` (higher is better); ordering is left to the caller.
+    """
+    query, industry, location = (query or '').strip(), (industry or '').strip(), (location or '').strip()
+    if not (query or industry or location):
+        return qs
+    if postgres_search_available(qs.db):
+        return _postgres_search(qs, query, industry, location)
+    return _fallback_search(qs, candidate, query, industry, location)
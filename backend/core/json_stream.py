@@ -0,0 +1,156 @@
+"""
+Incremental parsing of a JSON object that arrives in chunks.
+
+Gemini's ``streamGenerateContent`` returns the model output a few tokens at a
+time. The resume and cover letter prompts ask for one object of the shape
+``{"shared_analysis": {...}, "variations": [{...}, {...}]}``, so waiting for
+the closing brace means waiting for every variation. ``JSONStreamParser``
+scans the text as it arrives and reports each top-level field, and each
+element of a top-level array, as soon as its closing bracket is seen::
+
+    parser = JSONStreamParser()
+    for chunk in chunks:
+        for event in parser.feed(chunk):
+            if event.kind == 'item' and event.key == 'variations':
+                ...
+
+Text before the opening brace (e.g. a ```json fence) is ignored. Every value
+is decoded with ``json.loads`` once it is complete, so a value that fails to
+parse raises ``json.JSONDecodeError`` like a non-streamed response would.
+"""
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+
+@dataclass
+class JSONStreamEvent:
+    kind: str                      # 'item' (array element) or 'field' (complete top-level value)
+    key: str                       # top-level field name
+    value: Any
+    index: Optional[int] = None    # position within the array for 'item' events
+
+
+class JSONStreamParser:
+    """Scan a streamed JSON object, emitting fields and array items as they complete."""
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._stack: List[str] = []   # open containers: '{' or '['
+        self._in_string = False
+        self._escaped = False
+        self._done = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+
+    @property
+    def complete(self) -> bool:
+        """True once the root object's closing brace has been read."""
+        return self._done
+
+    def feed(self, text: str) -> List[JSONStreamEvent]:
+        self._buffer += text
+        events: List[JSONStreamEvent] = []
+        buf = self._buffer
+        while self._pos < len(buf) and not self._done:
+            i = self._pos
+            ch = buf[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(buf[self._key_start:i + 1])
+                        self._key_start = None
+                continue
+
+            if not self._stack:
+                if ch == '{':
+                    self._stack.append('{')
+                    self._expect_key = True
+                continue
+
+            depth = len(self._stack)
+            if ch.isspace():
+                continue
+
+            if depth == 1:
+                # Between fields of the root object
+                if ch == '"' and self._expect_key:
+                    self._in_string = True
+                    self._key_start = i
+                    self._expect_key = False
+                elif ch == ':':
+                    self._value_start = None
+                elif ch in ',}':
+                    if self._value_start is not None:
+                        # Scalar value ended
+                        events.append(self._field(buf[self._value_start:i]))
+                    if ch == ',':
+                        self._expect_key = True
+                    else:
+                        self._stack.pop()
+                        self._done = True
+                elif self._value_start is None:
+                    self._value_start = i
+                    self._open(ch)
+                continue
+
+            if depth == 2 and self._stack[1] == '[':
+                # Between elements of a top-level array
+                if ch in ',]':
+                    if self._item_start is not None:
+                        events.append(self._item(buf[self._item_start:i]))
+                    if ch == ']':
+                        self._stack.pop()
+                        events.append(self._field(buf[self._value_start:i + 1]))
+                    continue
+                if self._item_start is None:
+                    self._item_start = i
+                    if self._open(ch):
+                        continue
+
+            if ch in '{[':
+                self._stack.append(ch)
+            elif ch in '}]':
+                self._stack.pop()
+                if len(self._stack) == 1:
+                    events.append(self._field(buf[self._value_start:i + 1]))
+                elif len(self._stack) == 2 and self._stack[1] == '[':
+                    events.append(self._item(buf[self._item_start:i + 1]))
+            elif ch == '"':
+                self._in_string = True
+        return events
+
+    def _open(self, ch: str) -> bool:
+        """Track a value's first character; returns True if it opened a container or string."""
+        if ch in '{[':
+            self._stack.append(ch)
+            if ch == '[' and len(self._stack) == 2:
+                self._item_start = None
+                self._item_index = 0
+            return True
+        if ch == '"':
+            self._in_string = True
+            return True
+        return False
+
+    def _field(self, raw: str) -> JSONStreamEvent:
+        self._value_start = None
+        return JSONStreamEvent('field', self._key, json.loads(raw))
+
+    def _item(self, raw: str) -> JSONStreamEvent:
+        self._item_start = None
+        index = self._item_index
+        self._item_index += 1
+        return JSONStreamEvent('item', self._key, json.loads(raw), index=index)
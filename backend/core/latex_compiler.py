@@ -0,0 +1,206 @@
+"""
+Bounded Tectonic worker pool for LaTeX -> PDF compilation.
+
+Each compile used to cold-start ``tectonic`` with no shared state, so every
+run re-resolved the TeX bundle. The pool here:
+
+* points every run at one persistent ``TECTONIC_CACHE_DIR`` so bundle files
+  are downloaded and indexed once per host,
+* bounds concurrent compiler processes with ``TECTONIC_MAX_WORKERS`` threads
+  (the subprocess releases the GIL, so threads are enough),
+* returns raw PDF bytes and supports compiling several documents at once,
+* keeps queue depth and compile-time metrics for the health endpoint.
+
+Callers normally go through ``resume_ai.compile_latex_pdf_bytes``, which
+consults the PDF cache (``core.pdf_cache``) first.
+"""
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from shutil import which
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LatexCompileError(RuntimeError):
+    """Raised when Tectonic is missing or fails to produce a PDF."""
+    pass
+
+
+def tectonic_binary() -> Optional[str]:
+    binary = getattr(settings, 'TECTONIC_BINARY', 'tectonic')
+    binary_path = binary if os.path.sep in binary else which(binary)
+    if not binary_path or not Path(binary_path).exists():
+        return None
+    return binary_path
+
+
+def tectonic_cache_dir() -> Path:
+    return Path(getattr(settings, 'TECTONIC_CACHE_DIR', Path(settings.BASE_DIR) / 'var' / 'tectonic_cache'))
+
+
+def _read_latex_log_excerpt(tmpdir: str, stem: str) -> Optional[str]:
+    log_path = Path(tmpdir) / f'{stem}.log'
+    if not log_path.exists():
+        return None
+    try:
+        lines = log_path.read_text(encoding='utf-8', errors='ignore').splitlines()
+    except Exception:
+        return None
+    tail = '\n'.join(lines[-25:])
+    return tail.strip() or None
+
+
+def run_tectonic(latex_document: str) -> bytes:
+    """Compile one document with Tectonic in the calling thread and return PDF bytes."""
+    binary_path = tectonic_binary()
+    if not binary_path:
+        raise LatexCompileError(
+            'Tectonic LaTeX engine not found. Install it and set TECTONIC_BINARY or add it to PATH.'
+        )
+
+    cache_dir = tectonic_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    env = {**os.environ, 'TECTONIC_CACHE_DIR': str(cache_dir)}
+
+    with tempfile.TemporaryDirectory(prefix='resumerocket-tex-') as tmpdir:
+        tex_path = Path(tmpdir) / 'resume.tex'
+        tex_path.write_text(latex_document, encoding='utf-8')
+        cmd = [binary_path, '--chatter', 'minimal', '--outdir', tmpdir]
+        if getattr(settings, 'TECTONIC_ONLY_CACHED', False):
+            # Never touch the network once the bundle cache is warm
+            cmd.append('--only-cached')
+        cmd.append(tex_path.name)
+        try:
+            result = subprocess.run(
+                cmd,
+                cwd=tmpdir,
+                env=env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
+                text=True,
+                timeout=getattr(settings, 'TECTONIC_TIMEOUT', 60),
+            )
+            logger.debug('Tectonic output: %s', result.stdout.strip())
+        except subprocess.TimeoutExpired as exc:
+            raise LatexCompileError('LaTeX compilation timed out.') from exc
+        except subprocess.CalledProcessError as exc:
+            log_excerpt = _read_latex_log_excerpt(tmpdir, tex_path.stem)
+            message = log_excerpt or exc.stderr or 'Unknown LaTeX compilation error.'
+            raise LatexCompileError(f'Failed to compile LaTeX resume: {message}') from exc
+
+        pdf_path = tex_path.with_suffix('.pdf')
+        if not pdf_path.exists():
+            raise LatexCompileError('Latex compilation completed without producing a PDF.')
+        return pdf_path.read_bytes()
+
+
+class TectonicPool:
+    """Fixed-size pool of compiler threads with queue and timing metrics."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tectonic')
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._compiled = 0
+        self._failed = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._recent_ms = deque(maxlen=100)
+
+    def submit(self, latex_document: str) -> Future:
+        with self._lock:
+            self._queued += 1
+        return self._executor.submit(self._compile, latex_document)
+
+    def compile(self, latex_document: str) -> bytes:
+        return self.submit(latex_document).result()
+
+    def compile_many(self, latex_documents: Sequence[str]) -> List[bytes]:
+        """Compile documents concurrently, preserving order; raises the first failure."""
+        futures = [self.submit(doc) for doc in latex_documents]
+        return [future.result() for future in futures]
+
+    def _compile(self, latex_document: str) -> bytes:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        started = time.monotonic()
+        ok = False
+        try:
+            pdf_bytes = run_tectonic(latex_document)
+            ok = True
+            return pdf_bytes
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            with self._lock:
+                self._running -= 1
+                if ok:
+                    self._compiled += 1
+                    self._total_ms += elapsed_ms
+                    self._max_ms = max(self._max_ms, elapsed_ms)
+                    self._recent_ms.append(elapsed_ms)
+                else:
+                    self._failed += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            recent = sorted(self._recent_ms)
+            return {
+                'max_workers': self.max_workers,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'compiled': self._compiled,
+                'failed': self._failed,
+                'avg_compile_ms': round(self._total_ms / self._compiled, 1) if self._compiled else None,
+                'max_compile_ms': round(self._max_ms, 1) if self._compiled else None,
+                'p95_recent_compile_ms': round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 1) if recent else None,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_pool: Optional[TectonicPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def get_compiler_pool() -> TectonicPool:
+    """Return this process's pool (recreated after fork)."""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            workers = getattr(settings, 'TECTONIC_MAX_WORKERS', None) or min(4, os.cpu_count() or 1)
+            _pool = TectonicPool(max(1, int(workers)))
+            _pool_pid = pid
+        return _pool
+
+
+def compile_pdf(latex_document: str) -> bytes:
+    return get_compiler_pool().compile(latex_document)
+
+
+def compile_pdfs(latex_documents: Sequence[str]) -> List[bytes]:
+    return get_compiler_pool().compile_many(latex_documents)
+
+
+def compiler_stats() -> Dict:
+    stats = get_compiler_pool().stats()
+    stats['status'] = 'available' if tectonic_binary() else 'missing'
+    return stats
@@ -6,6 +6,9 @@ import logging
 from typing import Dict, List, Optional
 from django.conf import settings
 
+from core import llm_gateway
+from core.api_monitoring import SERVICE_GEMINI, get_or_create_service
+
 try:
     from google import genai
 except ImportError:
@@ -29,6 +32,25 @@ class LinkedInAI:
         if not self.client:
             logger.warning("Gemini client not initialized - missing API key or genai module")
     
+    def _generate_text(self, prompt: str, config: Dict) -> str:
+        """Gemini response text for ``prompt``, through the shared LLM gateway.
+        
+        Every caller is user-initiated generation, so cached responses are skipped.
+        """
+        def _request():
+            response = self.client.models.generate_content(model=self.model, contents=prompt, config=config)
+            return llm_gateway.sdk_response_text(response)
+        
+        return llm_gateway.generate(
+            prompt,
+            model=self.model,
+            config=config,
+            call=_request,
+            service=get_or_create_service(SERVICE_GEMINI, 'gemini'),
+            validate=llm_gateway.require_text,
+            use_cache=False,
+        )
+    
     def generate_profile_optimization_suggestions(
         self,
         current_headline: str = '',
@@ -72,26 +94,7 @@ Provide:
 Format as structured, actionable advice with clear sections."""
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config={
-                    'temperature': 0.7,
-                    'max_output_tokens': 1500
-                }
-            )
-            
-            # Extract text from response robustly
-            content = getattr(response, 'text', None) or getattr(response, 'output_text', None)
-            if not content:
-                candidates = getattr(response, 'candidates', None) or []
-                if candidates:
-                    try:
-                        first_part = candidates[0].content.parts[0]
-                        content = getattr(first_part, 'text', '') or str(first_part)
-                    except (IndexError, AttributeError, TypeError) as e:
-                        logger.error(f"Error extracting from candidates: {e}")
-                        content = ''
+            content = self._generate_text(prompt, {'temperature': 0.7, 'max_output_tokens': 1500})
             
             if not content:
                 logger.error("No content in Gemini response for profile optimization")
@@ -182,40 +185,7 @@ Generate ONLY the message text - no subject line, no additional commentary, no q
         logger.debug(f"Prompt: {prompt}")
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt,
-                config={
-                    'temperature': 0.9,
-                    'max_output_tokens': 200
-                }
-            )
-            
-            # Extract text from response robustly (same method as mock_interview.py)
-            message = getattr(response, 'text', None) or getattr(response, 'output_text', None)
-            
-            logger.debug(f"Response.text value: {message}")
-            logger.debug(f"Response has candidates: {hasattr(response, 'candidates')}")
-            
-            if not message:
-                candidates = getattr(response, 'candidates', None) or []
-                logger.debug(f"Number of candidates: {len(candidates)}")
-                
-                if candidates:
-                    try:
-                        logger.debug(f"First candidate: {candidates[0]}")
-                        logger.debug(f"Candidate content: {candidates[0].content if hasattr(candidates[0], 'content') else 'N/A'}")
-                        
-                        first_part = candidates[0].content.parts[0]
-                        logger.debug(f"First part: {first_part}")
-                        logger.debug(f"First part type: {type(first_part)}")
-                        
-                        message = getattr(first_part, 'text', '') or str(first_part)
-                        logger.debug(f"Extracted message from parts: {message[:100] if message else 'empty'}")
-                    except (IndexError, AttributeError, TypeError) as e:
-                        logger.error(f"Error extracting from candidates: {e}")
-                        logger.exception("Candidate extraction error:")
-                        message = ''
+            message = self._generate_text(prompt, {'temperature': 0.9, 'max_output_tokens': 200})
             
             if not message:
                 logger.error("No content in Gemini response")
@@ -0,0 +1,365 @@
+"""
+Shared gateway for LLM calls: response cache and request coalescing.
+
+Resume generation, technical prep, interview insights, mock interviews, the
+response coach, LinkedIn guidance and referral messages each called their
+model independently, so a retry after a frontend timeout or two tabs
+generating the same insights paid full latency and quota twice. Every call
+now goes through ``generate``:
+
+* Responses are cached in the Django cache (Redis) keyed by a hash of the
+  model, prompt and generation settings, for ``LLM_GATEWAY_CACHE_TTL``
+  seconds. With a Redis cache a sorted-set index keeps the entries in
+  least-recently-used order and trims them to ``LLM_GATEWAY_MAX_ENTRIES``.
+* Identical requests already in flight are shared: threads in this process
+  wait for the leader's result, other processes wait on a cache lock and pick
+  the response up from the cache. Waiting stops after
+  ``LLM_GATEWAY_COALESCE_WAIT`` seconds, and the waiter calls the model
+  itself.
+* Hits and coalesced calls are logged to ``APIUsageLog`` with a
+  ``served_from_cache`` marker and the tokens they saved. Such rows don't
+  count towards quota usage. Upstream calls made for a miss are tagged
+  ``llm_cache='miss'`` (see ``usage_summary``).
+
+Failed calls and responses rejected by the caller's ``validate`` are never
+cached.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, Sum
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+
+from core.api_monitoring import SERVICE_GEMINI, call_metadata, get_or_create_service, track_api_call
+from core.api_usage_buffer import record_api_usage
+from core.models import APIUsageLog
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_PREFIX = 'llm:response:'
+INFLIGHT_PREFIX = 'llm:inflight:'
+INDEX_KEY = 'llm:index'
+POLL_INTERVAL = 0.2
+
+SERVED_HIT = 'hit'
+SERVED_COALESCED = 'coalesced'
+
+
+class _Flight:
+    """An upstream call other threads in this process can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.text: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+_inflight: Dict[str, _Flight] = {}
+_inflight_lock = threading.Lock()
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def request_key(model: str, prompt: str, config: Optional[Dict] = None) -> str:
+    payload = json.dumps([model or '', prompt or '', config or {}], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def sdk_response_text(response) -> Tuple[str, int]:
+    """Text and total token count of a google-genai ``generate_content`` response."""
+    content = getattr(response, 'text', None) or getattr(response, 'output_text', None)
+    if not content:
+        candidates = getattr(response, 'candidates', None) or []
+        if candidates:
+            try:
+                first_part = candidates[0].content.parts[0]
+                content = getattr(first_part, 'text', '') or str(first_part)
+            except (IndexError, AttributeError, TypeError):
+                content = ''
+    usage = getattr(response, 'usage_metadata', None)
+    tokens = getattr(usage, 'total_token_count', None) or 0
+    return content or '', int(tokens) if isinstance(tokens, int) else 0
+
+
+def require_text(text: str):
+    """``validate`` for callers that only need a non-empty response."""
+    if not (text or '').strip():
+        raise ValueError("No content in model response")
+
+
+def rest_response_tokens(data: Dict) -> int:
+    """Total token count of a Gemini REST ``generateContent`` response body."""
+    try:
+        return int((data.get('usageMetadata') or {}).get('totalTokenCount') or 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def _endpoint(provider: str, model: str) -> str:
+    return f'/models/{model}:generateContent' if provider == SERVICE_GEMINI else f'/models/{model}'
+
+
+def _redis():
+    """Raw client for the Redis cache backend, or None for other backends."""
+    global _redis_client
+    config = settings.CACHES.get('default', {})
+    if not config.get('BACKEND', '').endswith('RedisCache'):
+        return None
+    with _redis_lock:
+        if _redis_client is None:
+            import redis
+
+            location = config['LOCATION']
+            url = location[0] if isinstance(location, (list, tuple)) else location
+            _redis_client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        return _redis_client
+
+
+def _touch(key: str, evict: bool = False):
+    """Move ``key`` to the recent end of the LRU index, trimming it after stores."""
+    client = _redis()
+    if client is None:
+        return
+    ttl = settings.LLM_GATEWAY_CACHE_TTL
+    max_entries = settings.LLM_GATEWAY_MAX_ENTRIES
+    raw_key = cache.make_key(f'{RESPONSE_PREFIX}{key}')
+    now = time.time()
+    try:
+        client.zadd(INDEX_KEY, {raw_key: now})
+        if not evict:
+            return
+        client.zremrangebyscore(INDEX_KEY, '-inf', now - ttl)
+        overflow = client.zcard(INDEX_KEY) - max_entries
+        if overflow > 0:
+            evicted = [member for member, _ in client.zpopmin(INDEX_KEY, overflow)]
+            if evicted:
+                client.delete(*evicted)
+    except Exception as exc:
+        logger.debug(f"LLM response index unavailable: {exc}")
+
+
+def _cached(key: str) -> Optional[Dict]:
+    try:
+        entry = cache.get(f'{RESPONSE_PREFIX}{key}')
+    except Exception as exc:
+        logger.debug(f"LLM response cache unavailable: {exc}")
+        return None
+    return entry if isinstance(entry, dict) and 'text' in entry else None
+
+
+def _store(key: str, text: str, tokens: int):
+    try:
+        cache.set(
+            f'{RESPONSE_PREFIX}{key}',
+            {'text': text, 'tokens': tokens, 'created_at': time.time()},
+            timeout=settings.LLM_GATEWAY_CACHE_TTL,
+        )
+    except Exception as exc:
+        logger.debug(f"LLM response cache unavailable: {exc}")
+        return
+    _touch(key, evict=True)
+
+
+def _record_served(served: str, key: str, model: str, provider: str, tokens: int, started: float, user=None):
+    """Log a response served without an upstream call."""
+    try:
+        record_api_usage({
+            'service': get_or_create_service(provider, provider),
+            'user': user if getattr(user, 'is_authenticated', False) else None,
+            'endpoint': _endpoint(provider, model),
+            'method': 'POST',
+            'response_time_ms': int((time.monotonic() - started) * 1000),
+            'success': True,
+            'status_code': 200,
+            'metadata': {
+                'served_from_cache': served,
+                'model': model,
+                'request_key': key[:16],
+                'tokens_saved': tokens,
+            },
+        })
+    except Exception as exc:
+        logger.warning(f"Failed to log LLM cache {served}: {exc}")
+
+
+def _call_upstream(key: str, call: Callable[[], Tuple[str, int]], model: str, provider: str, service, user,
+                   validate: Optional[Callable[[str], Any]]) -> Tuple[str, int]:
+    with call_metadata(llm_cache='miss', request_key=key[:16], llm_call=uuid.uuid4().hex[:16]):
+        if service is not None:
+            with track_api_call(service, endpoint=_endpoint(provider, model), method='POST', user=user):
+                text, tokens = call()
+        else:
+            text, tokens = call()
+    if validate is not None:
+        validate(text)
+    return text, tokens
+
+
+def _wait_for_other_process(key: str, since: float) -> Optional[Dict]:
+    """Poll for the response of an identical call another process is making."""
+    deadline = time.monotonic() + settings.LLM_GATEWAY_COALESCE_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = _cached(key)
+        if entry is not None and entry.get('created_at', 0) >= since:
+            return entry
+        try:
+            if not cache.get(f'{INFLIGHT_PREFIX}{key}'):
+                return None  # the other call failed or wasn't cached
+        except Exception:
+            return None
+    return None
+
+
+def _lead(key: str, call, model: str, provider: str, service, user, validate, started: float) -> str:
+    """Make the upstream call, unless another process is already making it."""
+    since = time.time()
+    lock_key = f'{INFLIGHT_PREFIX}{key}'
+    try:
+        acquired = cache.add(lock_key, 1, timeout=settings.LLM_GATEWAY_COALESCE_WAIT)
+    except Exception as exc:
+        logger.debug(f"LLM coalescing lock unavailable: {exc}")
+        acquired = None
+    if acquired is False:
+        entry = _wait_for_other_process(key, since)
+        if entry is not None:
+            _record_served(SERVED_COALESCED, key, model, provider, entry.get('tokens', 0), started, user)
+            return entry['text']
+    try:
+        text, tokens = _call_upstream(key, call, model, provider, service, user, validate)
+        _store(key, text, tokens)
+        return text
+    finally:
+        if acquired:
+            try:
+                cache.delete(lock_key)
+            except Exception:
+                pass
+
+
+def generate(
+    prompt: str,
+    *,
+    model: str,
+    call: Callable[[], Tuple[str, int]],
+    config: Optional[Dict] = None,
+    provider: str = SERVICE_GEMINI,
+    service=None,
+    user=None,
+    use_cache: bool = True,
+    validate: Optional[Callable[[str], Any]] = None,
+) -> str:
+    """
+    Return the model's response to ``prompt``, from the cache when possible.
+
+    Args:
+        prompt: Full prompt text (including any system instructions)
+        model: Model name
+        call: Makes the upstream request and returns ``(text, total_tokens)``
+        config: Generation settings that affect the output (temperature, token limit, ...)
+        provider: APIService name cache hits are logged under
+        service: APIService to track the upstream call under, for callers that
+            don't track it themselves
+        user: User the call is made for
+        use_cache: False to skip a cached response (the new one is still stored)
+        validate: Raises for unusable output, which is then not cached
+
+    Returns:
+        Response text
+
+    Raises:
+        Whatever ``call`` or ``validate`` raise; coalesced callers get the
+        leader's exception
+    """
+    if not settings.LLM_GATEWAY_ENABLED:
+        return _call_upstream(request_key(model, prompt, config), call, model, provider, service, user, validate)[0]
+
+    key = request_key(model, prompt, config)
+    started = time.monotonic()
+    if use_cache:
+        entry = _cached(key)
+        if entry is not None:
+            _touch(key)
+            _record_served(SERVED_HIT, key, model, provider, entry.get('tokens', 0), started, user)
+            return entry['text']
+
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _inflight[key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(settings.LLM_GATEWAY_COALESCE_WAIT):
+            if flight.error is not None:
+                raise flight.error
+            entry = _cached(key) or {}
+            _record_served(SERVED_COALESCED, key, model, provider, entry.get('tokens', 0), started, user)
+            return flight.text
+        return _call_upstream(key, call, model, provider, service, user, validate)[0]
+
+    try:
+        flight.text = _lead(key, call, model, provider, service, user, validate, started)
+        return flight.text
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        flight.done.set()
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def usage_summary(since=None) -> Dict[str, Dict]:
+    """Calls answered from the cache, coalesced and sent upstream, per provider.
+
+    Args:
+        since: Only count calls from this datetime on
+
+    Returns:
+        ``{provider: {'hits', 'coalesced', 'misses', 'hit_rate', 'tokens_saved'}}``
+    """
+    logs = APIUsageLog.objects.all()
+    if since is not None:
+        logs = logs.filter(request_at__gte=since)
+
+    summary = {}
+
+    def bucket(provider):
+        return summary.setdefault(provider, {'hits': 0, 'coalesced': 0, 'misses': 0, 'tokens_saved': 0})
+
+    served = (
+        logs.filter(metadata__has_key='served_from_cache')
+        .annotate(served=KeyTextTransform('served_from_cache', 'metadata'),
+                  saved=Cast(KeyTextTransform('tokens_saved', 'metadata'), IntegerField()))
+        .values('service__name', 'served')
+        .annotate(total=Count('id'), tokens=Sum('saved'))
+    )
+    for row in served:
+        stats = bucket(row['service__name'])
+        stats['hits' if row['served'] == SERVED_HIT else 'coalesced'] += row['total']
+        stats['tokens_saved'] += row['tokens'] or 0
+
+    # Retried attempts share their call id; count each upstream call once
+    misses = (
+        logs.filter(metadata__llm_cache='miss')
+        .annotate(call_id=KeyTextTransform('llm_call', 'metadata'))
+        .values('service__name').annotate(total=Count('call_id', distinct=True))
+    )
+    for row in misses:
+        bucket(row['service__name'])['misses'] += row['total']
+
+    for stats in summary.values():
+        served_total = stats['hits'] + stats['coalesced']
+        calls = served_total + stats['misses']
+        stats['hit_rate'] = round(served_total / calls, 4) if calls else None
+    return summary
@@ -0,0 +1,32 @@
+"""
+Management command to rebuild the activity event log used by productivity analytics.
+
+Usage:
+    python manage.py backfill_activity_events
+    python manage.py backfill_activity_events --user 42
+
+Events are normally written by signals on the source models; run this once
+after deploying the event log, and after bulk imports or queryset updates
+that bypass signals.
+"""
+from django.core.management.base import BaseCommand
+
+from core.activity_log import backfill
+
+
+class Command(BaseCommand):
+    help = 'Rebuild ActivityEvent rows from jobs, interactions, prep/practice sessions, events, and skill progress'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            help='User id to rebuild (repeatable; default: every user)'
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options.get('user')
+        written = backfill(user_ids)
+        scope = f"{len(user_ids)} users" if user_ids else "all users"
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {written} activity events for {scope}"))
@@ -0,0 +1,142 @@
+"""
+Benchmark the jobs list keyword search (core.job_search) against the old
+``icontains`` filters.
+
+Usage:
+    python manage.py benchmark_job_search --jobs 1000000 --candidates 2000
+    python manage.py benchmark_job_search --jobs 200000 --explain
+
+Creates ``--jobs`` synthetic jobs spread over ``--candidates`` throwaway
+candidates inside a transaction that is rolled back, then reports the median
+wall time and result count of each query for one candidate, with the legacy
+filters and with ``apply_job_search``. On PostgreSQL the search_vector trigger
+and GIN indexes from migration 0134 are exercised; elsewhere the in-process
+fallback index is (its first, uncached build is reported separately).
+``--explain`` also prints each search query's plan (``EXPLAIN ANALYZE`` on
+PostgreSQL), to check that the keyword match is a ``BitmapOr`` of index scans.
+"""
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from core import job_search
+from core.models import CandidateProfile, JobEntry
+
+TITLES = ['Software Engineer', 'Backend Developer', 'Data Scientist', 'Product Manager', 'Frontend Engineer',
+          'Site Reliability Engineer', 'Machine Learning Engineer', 'Business Analyst', 'DevOps Engineer']
+COMPANIES = ['Google', 'Microsoft', 'Amazon', 'Stripe', 'Datadog', 'Shopify', 'Atlassian', 'Netflix', 'Spotify', 'Airbnb']
+LOCATIONS = ['San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Remote', 'Boston, MA', 'Chicago, IL']
+INDUSTRIES = ['Software', 'Finance', 'Healthcare', 'Retail', 'Education', 'Media', '']
+WORDS = ('python django postgres kubernetes react typescript aws terraform kafka spark airflow graphql '
+         'microservices observability mentoring leadership roadmap stakeholders experimentation').split()
+
+# (label, q, industry, location)
+QUERIES = [
+    ('title word', 'engineer', '', ''),
+    ('prefix', 'eng', '', ''),
+    ('two terms', 'backend python', '', ''),
+    ('description term', 'kubernetes', '', ''),
+    ('company typo', 'Gogle', '', ''),
+    ('location typo', '', '', 'San Fransisco'),
+    ('combined', 'data', 'software', 'new york'),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Time the jobs list search over a synthetic dataset (default 1M jobs)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=1_000_000, help='Total synthetic jobs (default: 1000000)')
+        parser.add_argument('--candidates', type=int, default=2000, help='Candidates to spread the jobs over')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=39, help='Random seed for the synthetic data')
+        parser.add_argument('--explain', action='store_true', help='Print the query plan of each search')
+
+    def handle(self, *args, **options):
+        backend = 'postgres' if job_search.postgres_search_available() else 'fallback index'
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                profile = self._build_dataset(options['jobs'], max(1, options['candidates']), random.Random(options['seed']))
+                self.stdout.write(f"Created {options['jobs']} jobs in {time.perf_counter() - started:.1f}s "
+                                  f"({connection.vendor}, search: {backend})")
+                if backend == 'fallback index':
+                    started = time.perf_counter()
+                    index = job_search.get_search_index(profile)
+                    self.stdout.write(f"Built fallback index over {len(index)} jobs in "
+                                      f"{(time.perf_counter() - started) * 1000:.1f}ms")
+                self._report(profile, options['repeat'])
+                if options['explain']:
+                    self._explain(profile)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _report(self, profile, repeat):
+        self.stdout.write(f"{'query':<18} {'legacy ms':>10} {'rows':>6} {'search ms':>10} {'rows':>6}")
+        base = JobEntry.objects.filter(candidate=profile)
+        for label, q, industry, location in QUERIES:
+            legacy_ms, legacy_rows = self._time(lambda: self._legacy(base, q, industry, location), repeat)
+            search_ms, search_rows = self._time(
+                lambda: job_search.apply_job_search(base, profile, query=q, industry=industry, location=location),
+                repeat,
+            )
+            self.stdout.write(f"{label:<18} {legacy_ms:>10.2f} {legacy_rows:>6} {search_ms:>10.2f} {search_rows:>6}")
+
+    def _explain(self, profile):
+        base = JobEntry.objects.filter(candidate=profile)
+        for label, q, industry, location in QUERIES:
+            qs = job_search.apply_job_search(base, profile, query=q, industry=industry, location=location)
+            plan = qs.explain(analyze=True) if connection.vendor == 'postgresql' else qs.explain()
+            self.stdout.write(f"\n-- {label}\n{plan}")
+
+    def _legacy(self, qs, q, industry, location):
+        if q:
+            qs = qs.filter(Q(title__icontains=q) | Q(company_name__icontains=q) | Q(description__icontains=q))
+        if industry:
+            qs = qs.filter(industry__icontains=industry)
+        if location:
+            qs = qs.filter(location__icontains=location)
+        return qs
+
+    def _time(self, build, repeat):
+        timings = []
+        rows = 0
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            rows = len(list(build().values_list('id', flat=True)))
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), rows
+
+    def _build_dataset(self, total, candidates, rng):
+        User = get_user_model()
+        suffix = int(time.time() * 1000)
+        profiles = [
+            CandidateProfile.objects.create(user=User.objects.create_user(
+                username=f'search-bench-{suffix}-{idx}', email=f'search-bench-{suffix}-{idx}@example.com'))
+            for idx in range(candidates)
+        ]
+        batch = []
+        for idx in range(total):
+            batch.append(JobEntry(
+                candidate=profiles[idx % candidates],
+                title=rng.choice(TITLES),
+                company_name=rng.choice(COMPANIES),
+                location=rng.choice(LOCATIONS),
+                industry=rng.choice(INDUSTRIES),
+                description=' '.join(rng.sample(WORDS, 6)),
+            ))
+            if len(batch) >= 5000:
+                JobEntry.objects.bulk_create(batch, batch_size=1000)
+                batch = []
+        JobEntry.objects.bulk_create(batch, batch_size=1000)
+        return profiles[0]
@@ -0,0 +1,121 @@
+"""
+Benchmark ApplicationSuccessAnalyzer.get_complete_analysis (UC-097).
+
+Usage:
+    python manage.py benchmark_success_analysis --sizes 50 500 5000
+
+Creates a throwaway candidate with N synthetic jobs (and status history) per
+size inside a transaction that is rolled back, then reports the number of SQL
+queries and wall time of one full analysis.
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from core.application_analytics import ApplicationSuccessAnalyzer
+from core.models import CandidateProfile, CandidateSkill, JobEntry, JobStatusChange, Skill
+
+STATUS_PATHS = [
+    ['interested'],
+    ['interested', 'applied'],
+    ['interested', 'applied', 'rejected'],
+    ['interested', 'applied', 'phone_screen'],
+    ['interested', 'applied', 'phone_screen', 'interview'],
+    ['interested', 'applied', 'phone_screen', 'interview', 'offer'],
+]
+INDUSTRIES = ['Software', 'Finance', 'Healthcare', 'Retail', 'Education', 'Energy', 'Media', '']
+TITLES = ['Software Engineer', 'Backend Developer', 'Data Scientist', 'Product Manager', 'Frontend Engineer', 'Analyst']
+DESCRIPTION = 'We use Python, Django, SQL, React, Docker and AWS. Experience with Kubernetes and Git is a plus.'
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Report query count and wall time of the application success analysis for synthetic candidates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000],
+                            help='Number of jobs per synthetic candidate (default: 50 500 5000)')
+        parser.add_argument('--seed', type=int, default=97, help='Random seed for the synthetic data')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'jobs':>6} {'queries':>8} {'seconds':>9}")
+        for size in options['sizes']:
+            result = {}
+            try:
+                with transaction.atomic():
+                    profile = self._build_candidate(size, random.Random(options['seed']))
+                    result = self._measure(profile)
+                    raise _Rollback()
+            except _Rollback:
+                pass
+            self.stdout.write(f"{size:>6} {result['queries']:>8} {result['seconds']:>9.3f}")
+
+    def _measure(self, profile):
+        # Keep the run offline and deterministic
+        with override_settings(GEMINI_API_KEY=''):
+            analyzer = ApplicationSuccessAnalyzer(profile)
+            # Count with an execute wrapper; the debug query log is capped at 9000 entries
+            queries = []
+            with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+                started = time.perf_counter()
+                analyzer.get_complete_analysis()
+                elapsed = time.perf_counter() - started
+        return {'queries': len(queries), 'seconds': elapsed}
+
+    def _build_candidate(self, size, rng):
+        User = get_user_model()
+        suffix = f'{size}-{int(time.time() * 1000)}'
+        user = User.objects.create_user(username=f'bench-{suffix}', email=f'bench-{suffix}@example.com')
+        profile = CandidateProfile.objects.create(user=user)
+        for name in ('Python', 'SQL', 'React', 'Docker'):
+            skill, _ = Skill.objects.get_or_create(name=name, defaults={'category': 'Technical'})
+            CandidateSkill.objects.create(candidate=profile, skill=skill)
+
+        now = timezone.now()
+        jobs = []
+        paths = []
+        for idx in range(size):
+            path = rng.choice(STATUS_PATHS)
+            paths.append(path)
+            jobs.append(JobEntry(
+                candidate=profile,
+                title=rng.choice(TITLES),
+                company_name=f'Company {idx % 200}',
+                description=DESCRIPTION if idx % 3 else '',
+                industry=rng.choice(INDUSTRIES),
+                company_size=rng.choice([code for code, _ in JobEntry.COMPANY_SIZES] + ['']),
+                application_source=rng.choice([code for code, _ in JobEntry.APPLICATION_SOURCES] + ['']),
+                application_method=rng.choice([code for code, _ in JobEntry.APPLICATION_METHODS] + ['']),
+                resume_customized=rng.random() < 0.5,
+                cover_letter_customized=rng.random() < 0.4,
+                days_to_response=rng.randint(1, 30) if len(path) > 2 else None,
+                status=path[-1],
+            ))
+        jobs = JobEntry.objects.bulk_create(jobs, batch_size=1000)
+
+        changes = []
+        for job, path in zip(jobs, paths):
+            created = now - timedelta(days=rng.randint(0, 240), hours=rng.randint(0, 23))
+            job.created_at = created
+            job.application_submitted_at = created + timedelta(days=rng.randint(0, 5)) if len(path) > 1 else None
+            changed_at = created
+            for old, new in zip(path, path[1:]):
+                changed_at += timedelta(days=rng.randint(1, 10))
+                changes.append(JobStatusChange(job=job, old_status=old, new_status=new, changed_at=changed_at))
+        JobEntry.objects.bulk_update(jobs, ['created_at', 'application_submitted_at'], batch_size=1000)
+        timeline = [change.changed_at for change in changes]
+        changes = JobStatusChange.objects.bulk_create(changes, batch_size=1000)
+        # changed_at is auto_now_add; restore the synthetic timeline
+        for change, changed_at in zip(changes, timeline):
+            change.changed_at = changed_at
+        JobStatusChange.objects.bulk_update(changes, ['changed_at'], batch_size=1000)
+        return profile
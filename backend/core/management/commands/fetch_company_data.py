@@ -16,6 +16,7 @@ import requests
 import yfinance as yf
 from django.core.management.base import BaseCommand
 
+from core.company_resolution import get_or_create_company
 from core.models import Company, CompanyResearch
 
 
@@ -314,17 +315,11 @@ class Command(BaseCommand):
             'linkedin_url': self.generate_linkedin_url(company_name),
         }
 
-        # Get or create company
-        company, created = Company.objects.get_or_create(
-            domain=domain,
-            defaults=company_defaults
-        )
-
-        if not created:
-            # Update existing
-            for key, value in company_defaults.items():
-                setattr(company, key, value)
-            company.save()
+        # Resolve by normalized name, alias or domain before creating a new row
+        company, created = get_or_create_company(company_name, domain=domain)
+        for key, value in company_defaults.items():
+            setattr(company, key, value)
+        company.save()
 
         # Create research data with complete information
         default_description = f'{company.name} is a leading company in the {industry} industry.'
@@ -458,7 +453,7 @@ class Command(BaseCommand):
                 hq_location = self._format_location(info)
                 size = self._format_size(info.get('fullTimeEmployees'))
 
-                company, _ = Company.objects.get_or_create(domain=domain, defaults={'name': company_name})
+                company, _ = get_or_create_company(company_name, domain=domain)
                 company.name = company_name
                 company.industry = info.get('industry') or info.get('sector') or company.industry
                 company.hq_location = hq_location or company.hq_location
@@ -1,14 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from core.models import JobEntry, CandidateProfile
-import requests
-import os
-
-NOMINATIM_BASE_URL = os.environ.get('NOMINATIM_BASE_URL', 'https://nominatim.openstreetmap.org')
-NOMINATIM_USER_AGENT = os.environ.get('NOMINATIM_USER_AGENT', 'cs-490-project/1.0 (local-dev)')
+from core import geocoding
 
 class Command(BaseCommand):
-    help = "Geocode JobEntry locations and store lat/lon to avoid runtime lookups"
+    help = "Geocode JobEntry locations through the shared location cache and store lat/lon"
 
     def add_arguments(self, parser):
         parser.add_argument('--limit', type=int, default=200, help='Max jobs to process')
@@ -17,31 +11,20 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         limit = options['limit']
         force = options['force']
-        headers = {'User-Agent': NOMINATIM_USER_AGENT}
-        qs = JobEntry.objects.all().order_by('-id')
-        if not force:
-            qs = qs.filter(location_lat__isnull=True, location_lon__isnull=True)
-        count = 0
-        for job in qs[:limit]:
-            loc = (job.location or '').strip()
-            if not loc:
-                # fallback to candidate profile city/state
-                profile = job.candidate
-                loc = profile.get_full_location() if profile else ''
-            if not loc:
-                continue
-            try:
-                resp = requests.get(f"{NOMINATIM_BASE_URL}/search", params={'q': loc, 'format': 'json', 'limit': '1'}, headers=headers, timeout=8)
-                resp.raise_for_status()
-                data = resp.json() or []
-                if data:
-                    job.location_lat = float(data[0].get('lat'))
-                    job.location_lon = float(data[0].get('lon'))
-                    job.location_geo_precision = 'city'
-                    job.location_geo_updated_at = timezone.now()
-                    job.save(update_fields=['location_lat','location_lon','location_geo_precision','location_geo_updated_at'])
-                    count += 1
-            except Exception:
-                # skip on error, continue
-                continue
-        self.stdout.write(self.style.SUCCESS(f"Geocoded {count} job entries"))
\ No newline at end of file
+        pairs = geocoding.queue_missing_jobs(limit=limit, force=force)
+        lookups = {'resolved': 0, 'not_found': 0, 'failed': 0}
+        # Drain the same queue the background worker uses, at the same request rate
+        while True:
+            result = geocoding.process_geocode_queue(limit)
+            if result.get('skipped'):
+                self.stdout.write(self.style.WARNING("Another geocoder is draining the queue; applying cached results only"))
+                break
+            for key in lookups:
+                lookups[key] += result[key]
+            if not any(result[key] for key in lookups):
+                break
+        count = geocoding.apply_to_jobs(pairs)
+        self.stdout.write(self.style.SUCCESS(
+            f"Geocoded {count} job entries ({lookups['resolved']} new lookups, "
+            f"{lookups['not_found']} not found, {lookups['failed']} failed)"
+        ))
@@ -0,0 +1,30 @@
+"""
+Management command to report hit rates of the shared job-posting analysis cache.
+
+Usage:
+    python manage.py job_description_cache_stats
+    python manage.py job_description_cache_stats --evict
+
+Counters live in the Django cache (core.job_description_cache); ``--evict`` trims
+the table to JOB_DESCRIPTION_CACHE_MAX_ENTRIES first, e.g. after lowering the limit.
+"""
+from django.core.management.base import BaseCommand
+
+from core.job_description_cache import cache_stats, evict
+
+
+class Command(BaseCommand):
+    help = 'Show hits, misses, hit rate and entries of the shared JobDescriptionAnalysis cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evict', action='store_true', help='Evict least recently used entries past the limit')
+
+    def handle(self, *args, **options):
+        if options['evict']:
+            self.stdout.write(f"Evicted {evict()} entries")
+        for kind, stats in cache_stats().items():
+            hit_rate = 'n/a' if stats['hit_rate'] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(
+                f"{kind}: {stats['entries']} entries, {stats['hits']} hits, "
+                f"{stats['misses']} misses, hit rate {hit_rate}"
+            )
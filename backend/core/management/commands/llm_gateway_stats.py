@@ -0,0 +1,34 @@
+"""
+Management command to report LLM gateway cache hit rates and token savings.
+
+Usage:
+    python manage.py llm_gateway_stats
+    python manage.py llm_gateway_stats --days 1
+
+Figures are aggregated from APIUsageLog (see core.llm_gateway.usage_summary).
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.llm_gateway import usage_summary
+
+
+class Command(BaseCommand):
+    help = 'Show cache hits, coalesced calls, upstream calls and tokens saved per LLM provider'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Look back this many days (default: 7)')
+
+    def handle(self, *args, **options):
+        summary = usage_summary(since=timezone.now() - timedelta(days=options['days']))
+        if not summary:
+            self.stdout.write('No LLM gateway calls recorded')
+            return
+        for provider, stats in sorted(summary.items()):
+            hit_rate = 'n/a' if stats['hit_rate'] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(
+                f"{provider}: {stats['hits']} hits, {stats['coalesced']} coalesced, {stats['misses']} upstream calls, "
+                f"hit rate {hit_rate}, {stats['tokens_saved']} tokens saved"
+            )
@@ -5,6 +5,7 @@ or: docker-compose exec backend python manage.py populate_companies
 """
 
 from django.core.management.base import BaseCommand
+from core.company_resolution import resolve_many
 from core.models import Company, CompanyResearch
 
 
@@ -286,25 +287,29 @@ class Command(BaseCommand):
         created_count = 0
         updated_count = 0
 
+        # Resolve the whole list in one pass; spellings already known map onto their existing rows
+        names = [company_data['name'] for company_data in companies_data]
+        domains = {company_data['name']: company_data['domain'] for company_data in companies_data}
+        existing = resolve_many(names, domains=domains, create=False)
+        resolved = {**existing, **resolve_many([name for name in names if name not in existing], domains=domains)}
+
         for company_data in companies_data:
             research_data = company_data.pop('research')
-            
-            # Get or create company
-            company, created = Company.objects.get_or_create(
-                domain=company_data['domain'],
-                defaults=company_data
-            )
-            
+            company = resolved[company_data['name']]
+            created = company_data['name'] not in existing
+
+            # The resolved row keeps its domain, which another company may not share
+            for key, value in company_data.items():
+                if key != 'domain':
+                    setattr(company, key, value)
+            company.save()
+
             if created:
                 created_count += 1
                 self.stdout.write(
                     self.style.SUCCESS(f'Created company: {company.name}')
                 )
             else:
-                # Update existing company
-                for key, value in company_data.items():
-                    setattr(company, key, value)
-                company.save()
                 updated_count += 1
                 self.stdout.write(
                     self.style.WARNING(f'Updated company: {company.name}')
@@ -0,0 +1,40 @@
+"""
+Management command to rebuild the job pipeline rollups used by the analytics dashboards.
+
+Usage:
+    python manage.py rebuild_job_stats_rollups
+    python manage.py rebuild_job_stats_rollups --candidate 42
+
+Rollups are normally kept current by JobEntry/JobStatusChange signals; run this
+after bulk imports, queryset updates of job status, or a TIME_ZONE change.
+"""
+from django.core.management.base import BaseCommand
+
+from core.analytics_rollups import rebuild_candidate
+from core.models import CandidateProfile
+
+
+class Command(BaseCommand):
+    help = 'Recompute JobStatsRollup rows from job entries and their status history'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--candidate',
+            type=int,
+            action='append',
+            help='CandidateProfile id to rebuild (repeatable; default: every candidate with jobs)'
+        )
+
+    def handle(self, *args, **options):
+        candidate_ids = options.get('candidate')
+        if not candidate_ids:
+            candidate_ids = list(
+                CandidateProfile.objects.filter(job_entries__isnull=False).distinct().values_list('id', flat=True)
+            )
+
+        jobs = 0
+        for candidate_id in candidate_ids:
+            jobs += rebuild_candidate(candidate_id)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt job stats rollups for {len(candidate_ids)} candidates ({jobs} jobs)"
+        ))
@@ -0,0 +1,20 @@
+"""
+Management command to rebuild the peer-cohort benchmark snapshots used by competitive analysis.
+
+Usage:
+    python manage.py refresh_peer_benchmarks
+
+Snapshots are normally refreshed by Celery beat (core.tasks.refresh_peer_benchmarks);
+run this on deployments without beat or right after a bulk import of profiles.
+"""
+from django.core.management.base import BaseCommand
+
+from core.peer_benchmarks import refresh_peer_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Recompute PeerCohortBenchmark rows from candidate profiles, jobs, skills, and work history'
+
+    def handle(self, *args, **options):
+        cohorts = refresh_peer_benchmarks()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {cohorts} peer cohort benchmarks"))
@@ -4,12 +4,18 @@ from datetime import timedelta
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
 from django.core.management.base import BaseCommand
-from django.template.loader import render_to_string
 from django.utils import timezone
 
 from core import interview_followup
+from core.bulk_mail import BulkMailer
 from core.models import InterviewEvent, InterviewSchedule, Notification
 
+# Flags set on InterviewEvent / InterviewSchedule once each reminder is delivered
+REMINDER_FLAGS = {
+    '24h': ({'reminder_24h_sent': True}, {'show_24h_reminder': True, 'reminder_24h_dismissed': False}),
+    '2h': ({'reminder_2h_sent': True}, {'show_1h_reminder': True, 'reminder_1h_dismissed': False}),
+}
+
 
 class Command(BaseCommand):
     help = 'Send 24h/2h interview reminders and thank-you follow-up nudges.'
@@ -25,6 +31,10 @@ class Command(BaseCommand):
         dry_run = options.get('dry_run', False)
         now = timezone.now()
         stats = Counter()
+        self._reminders = BulkMailer('interview_reminders')
+        self._followups = BulkMailer('interview_followup_reminders')
+        # Notification to create for each queued message, by mailer key
+        self._notifications = {}
 
         upcoming = InterviewSchedule.objects.filter(
             status__in=['scheduled', 'rescheduled'],
@@ -72,6 +82,15 @@ class Command(BaseCommand):
             if self._send_followup_reminder(event_meta, dry_run):
                 stats['followup'] += 1
 
+        if not dry_run:
+            # Only delivered messages count; each chunk is marked with one query per table
+            stats['24h'] = stats['2h'] = 0
+            result = self._reminders.send(on_sent=self._mark_reminders_sent, on_failed=self._report_failures)
+            for _, _, reminder_type in result.sent:
+                stats[reminder_type] += 1
+            result = self._followups.send(on_sent=self._mark_followups_sent, on_failed=self._report_failures)
+            stats['followup'] = len(result.sent)
+
         summary = (
             f"Sent 24h={stats['24h']}, 2h={stats['2h']} reminders, "
             f"follow-up nudges={stats['followup']}"
@@ -108,29 +127,21 @@ class Command(BaseCommand):
             'cta_url': context['interview_url'],
         })
 
-        plain = render_to_string('emails/interview_reminder.txt', context)
-        html = render_to_string('emails/interview_reminder.html', context)
+        plain, html = self._reminders.render('emails/interview_reminder', context)
 
         if dry_run:
             return True
 
-        try:
-            msg = EmailMultiAlternatives(
-                subject,
-                plain,
-                getattr(settings, 'DEFAULT_FROM_EMAIL', 'no-reply@example.com'),
-                [user.email],
-            )
-            msg.attach_alternative(html, 'text/html')
-            msg.send(fail_silently=False)
-        except Exception as exc:  # pragma: no cover - logged in command output
-            self.stderr.write(self.style.ERROR(
-                f"Failed to send {reminder_type} reminder for interview {interview.id}: {exc}"
-            ))
-            return False
-
-        self._mark_reminder_sent(interview, event_meta, reminder_type)
-        Notification.objects.create(
+        msg = EmailMultiAlternatives(
+            subject,
+            plain,
+            getattr(settings, 'DEFAULT_FROM_EMAIL', 'no-reply@example.com'),
+            [user.email],
+        )
+        msg.attach_alternative(html, 'text/html')
+        key = (event_meta.id, interview.id, reminder_type)
+        self._reminders.add(key, msg)
+        self._notifications[key] = Notification(
             user=user,
             title=subject_prefix,
             message=f"{subject_prefix} for {interview.job.title} at {interview.job.company_name}.",
@@ -175,30 +186,21 @@ class Command(BaseCommand):
             'cta_url': f"{context['interview_url']}#follow-up",
         })
 
-        plain = render_to_string('emails/interview_followup_reminder.txt', context)
-        html = render_to_string('emails/interview_followup_reminder.html', context)
+        plain, html = self._followups.render('emails/interview_followup_reminder', context)
 
         if dry_run:
             return True
 
-        try:
-            msg = EmailMultiAlternatives(
-                subject,
-                plain,
-                getattr(settings, 'DEFAULT_FROM_EMAIL', 'no-reply@example.com'),
-                [user.email],
-            )
-            msg.attach_alternative(html, 'text/html')
-            msg.send(fail_silently=False)
-        except Exception as exc:  # pragma: no cover - logged in command output
-            self.stderr.write(self.style.ERROR(
-                f"Failed to send follow-up reminder for interview {interview.id}: {exc}"
-            ))
-            return False
-
-        event_meta.follow_up_status = 'scheduled'
-        event_meta.save(update_fields=['follow_up_status', 'updated_at'])
-        Notification.objects.create(
+        msg = EmailMultiAlternatives(
+            subject,
+            plain,
+            getattr(settings, 'DEFAULT_FROM_EMAIL', 'no-reply@example.com'),
+            [user.email],
+        )
+        msg.attach_alternative(html, 'text/html')
+        key = (event_meta.id, interview.id, 'followup')
+        self._followups.add(key, msg)
+        self._notifications[key] = Notification(
             user=user,
             title='Send your thank-you note',
             message=f"Follow up with {interview.job.company_name} while the conversation is fresh.",
@@ -225,22 +227,27 @@ class Command(BaseCommand):
             'interview_url': f"{frontend_base}/interviews?highlight={interview.id}",
         }
 
-    def _mark_reminder_sent(self, interview, event_meta, reminder_type):
-        event_fields = ['updated_at']
-        interview_fields = []
-        if reminder_type == '24h':
-            event_meta.reminder_24h_sent = True
-            event_fields.append('reminder_24h_sent')
-            interview.show_24h_reminder = True
-            interview.reminder_24h_dismissed = False
-            interview_fields.extend(['show_24h_reminder', 'reminder_24h_dismissed'])
-        else:
-            event_meta.reminder_2h_sent = True
-            event_fields.append('reminder_2h_sent')
-            interview.show_1h_reminder = True
-            interview.reminder_1h_dismissed = False
-            interview_fields.extend(['show_1h_reminder', 'reminder_1h_dismissed'])
-
-        event_meta.save(update_fields=event_fields)
-        if interview_fields:
-            interview.save(update_fields=interview_fields + ['updated_at'])
+    def _mark_reminders_sent(self, keys):
+        now = timezone.now()
+        for reminder_type, (event_flags, interview_flags) in REMINDER_FLAGS.items():
+            sent = [key for key in keys if key[2] == reminder_type]
+            if not sent:
+                continue
+            InterviewEvent.objects.filter(id__in=[key[0] for key in sent]).update(**event_flags, updated_at=now)
+            InterviewSchedule.objects.filter(id__in=[key[1] for key in sent]).update(**interview_flags, updated_at=now)
+        Notification.objects.bulk_create([self._notifications.pop(key) for key in keys])
+
+    def _mark_followups_sent(self, keys):
+        InterviewEvent.objects.filter(id__in=[key[0] for key in keys]).update(
+            follow_up_status='scheduled', updated_at=timezone.now(),
+        )
+        Notification.objects.bulk_create([self._notifications.pop(key) for key in keys])
+
+    def _report_failures(self, keys):
+        for key in keys:
+            self._notifications.pop(key, None)
+            _, interview_id, reminder_type = key
+            label = 'follow-up' if reminder_type == 'followup' else reminder_type
+            self.stderr.write(self.style.ERROR(
+                f"Failed to send {label} reminder for interview {interview_id}"
+            ))
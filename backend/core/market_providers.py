@@ -1,7 +1,7 @@
 import logging
-import requests
 from urllib.parse import urlencode
-from core.api_monitoring import track_api_call, get_or_create_service
+from core import http
+from core.api_monitoring import get_or_create_service
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +21,8 @@ def fetch_remotive_jobs(search=None, category=None, location=None, limit=200):
         if params:
             url = f"{url}?{urlencode(params)}"
         service = get_or_create_service('market_data_remotive', 'Remotive Jobs API')
-        with track_api_call(service, endpoint='/api/remote-jobs', method='GET'):
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
+        resp = http.get(url, policy='market_data', service=service, endpoint='/api/remote-jobs')
+        resp.raise_for_status()
         data = resp.json()
         jobs = data.get('jobs') or []
         return jobs[:limit]
@@ -45,9 +44,8 @@ def fetch_arbeitnow_jobs(search=None, location=None, limit=200):
         if location:
             params['location'] = location
         service = get_or_create_service('market_data_arbeitnow', 'ArbeitNow Jobs API')
-        with track_api_call(service, endpoint='/api/job-board-api', method='GET'):
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
+        resp = http.get(url, policy='market_data', service=service, endpoint='/api/job-board-api', params=params)
+        resp.raise_for_status()
         data = resp.json()
         # API returns data under 'data' key
         jobs = data.get('data') or []
@@ -0,0 +1,277 @@
+"""
+Dependency tracking for cached job match and skills gap analyses.
+
+``JobMatchAnalysis`` and ``SkillGapAnalysisCache`` rows used to stay valid
+until someone forced a refresh, so a new skill or an edited job description
+never reached the stored scores. Each row now records fingerprints of the
+inputs it was computed from:
+
+* ``job_fingerprint``: the job fields the scorers read (``JOB_INPUT_FIELDS``)
+* ``candidate_fingerprint``: for match analyses, the candidate's skills, work
+  experience, education, certifications and experience level; for skills gap
+  analyses, the candidate's skills only
+
+Signals in core.signals re-fingerprint the inputs a save or delete touched and
+mark only the rows computed from different inputs stale (``is_valid=False``),
+so a no-op save invalidates nothing. Stale and missing analyses are recomputed
+off the request thread by ``recompute_candidate`` (queued per candidate, see
+``request_recompute``) and the periodic ``recompute_stale`` sweep; request
+handlers serve the stored row flagged as stale in the meantime.
+
+At most one recompute is queued per candidate: while one is queued, the jobs
+later requests ask for wait in the cache and the queued run picks them up.
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    CandidateProfile,
+    CandidateSkill,
+    Certification,
+    Education,
+    JobEntry,
+    JobMatchAnalysis,
+    SkillGapAnalysisCache,
+    WorkExperience,
+)
+
+logger = logging.getLogger(__name__)
+
+# JobEntry fields read by JobMatchingEngine and SkillsGapAnalyzer
+JOB_INPUT_FIELDS = ('title', 'description', 'personal_notes', 'industry')
+
+# CandidateProfile fields read by JobMatchingEngine
+PROFILE_INPUT_FIELDS = {'experience_level'}
+
+RECOMPUTE_LOCK_PREFIX = 'match-recompute:'
+RECOMPUTE_PENDING_PREFIX = 'match-recompute-jobs:'
+RECOMPUTE_LOCK_TIMEOUT = 10 * 60
+
+
+def _digest(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def job_fingerprint(job: JobEntry) -> str:
+    return _digest([getattr(job, field) or '' for field in JOB_INPUT_FIELDS])
+
+
+def skills_fingerprint(candidate_id) -> str:
+    """Fingerprint of the candidate skills a skills gap analysis compares against."""
+    return _digest(list(
+        CandidateSkill.objects.filter(candidate_id=candidate_id)
+        .order_by('skill_id')
+        .values_list('skill_id', 'skill__name', 'level', 'years')
+    ))
+
+
+def candidate_fingerprint(candidate_id) -> str:
+    """Fingerprint of everything ``JobMatchingEngine`` reads about a candidate."""
+    return _digest({
+        'skills': skills_fingerprint(candidate_id),
+        'experience_level': CandidateProfile.objects.filter(pk=candidate_id)
+        .values_list('experience_level', flat=True).first(),
+        'experiences': list(
+            WorkExperience.objects.filter(candidate_id=candidate_id).order_by('id')
+            .values_list('id', 'job_title', 'company_name', 'description', 'start_date', 'end_date', 'is_current')
+        ),
+        'experience_skills': list(
+            WorkExperience.skills_used.through.objects.filter(workexperience__candidate_id=candidate_id)
+            .order_by('workexperience_id', 'skill_id')
+            .values_list('workexperience_id', 'skill_id')
+        ),
+        'educations': list(
+            Education.objects.filter(candidate_id=candidate_id).order_by('id')
+            .values_list('id', 'degree_type', 'field_of_study', 'start_date', 'end_date', 'currently_enrolled')
+        ),
+        'certifications': list(
+            Certification.objects.filter(candidate_id=candidate_id).order_by('id').values_list('id', 'name')
+        ),
+    })
+
+
+def is_fresh(analysis, job: JobEntry) -> bool:
+    """True when ``analysis`` is valid and was computed from the job's current fields.
+
+    Rows written before fingerprints existed have no job fingerprint and rely on
+    ``is_valid`` alone.
+    """
+    if not analysis.is_valid:
+        return False
+    return not analysis.job_fingerprint or analysis.job_fingerprint == job_fingerprint(job)
+
+
+def request_recompute(candidate_id, job_ids: Optional[Iterable[int]] = None):
+    """Queue a recompute of the candidate's stale analyses once the transaction commits.
+
+    Args:
+        job_ids: Jobs with no analysis yet to score as well
+    """
+    job_ids = sorted(set(job_ids or []))
+
+    def _enqueue():
+        from core.tasks import enqueue_match_recompute
+
+        # One queued recompute per candidate; jobs requested meanwhile wait for it in the cache
+        try:
+            if job_ids:
+                pending_key = f'{RECOMPUTE_PENDING_PREFIX}{candidate_id}'
+                pending = set(cache.get(pending_key) or []) | set(job_ids)
+                cache.set(pending_key, sorted(pending), timeout=RECOMPUTE_LOCK_TIMEOUT)
+            if not cache.add(f'{RECOMPUTE_LOCK_PREFIX}{candidate_id}', 1, timeout=RECOMPUTE_LOCK_TIMEOUT):
+                return
+        except Exception as exc:
+            logger.debug(f"Match recompute lock unavailable: {exc}")
+        enqueue_match_recompute(candidate_id, job_ids)
+
+    transaction.on_commit(_enqueue, robust=True)
+
+
+def mark_candidate_stale(candidate_id) -> int:
+    """Mark the candidate's analyses computed from other candidate inputs stale.
+
+    Returns:
+        Number of rows marked stale
+    """
+    matches = JobMatchAnalysis.objects.filter(candidate_id=candidate_id, is_valid=True)
+    gaps = SkillGapAnalysisCache.objects.filter(job__candidate_id=candidate_id, is_valid=True)
+    if not matches.exists() and not gaps.exists():
+        return 0
+    marked = matches.exclude(candidate_fingerprint=candidate_fingerprint(candidate_id)).update(is_valid=False)
+    marked += gaps.exclude(candidate_fingerprint=skills_fingerprint(candidate_id)).update(is_valid=False)
+    if marked:
+        request_recompute(candidate_id)
+    return marked
+
+
+def mark_job_stale(job: JobEntry) -> int:
+    """Mark the job's analyses computed from other job fields stale.
+
+    Returns:
+        Number of rows marked stale
+    """
+    fingerprint = job_fingerprint(job)
+    marked = JobMatchAnalysis.objects.filter(job=job, is_valid=True).exclude(
+        job_fingerprint=fingerprint).update(is_valid=False)
+    marked += SkillGapAnalysisCache.objects.filter(job=job, is_valid=True).exclude(
+        job_fingerprint=fingerprint).update(is_valid=False)
+    if marked:
+        request_recompute(job.candidate_id)
+    return marked
+
+
+def store_skills_gap(job: JobEntry, analysis: Dict, fingerprint: str) -> SkillGapAnalysisCache:
+    """Replace the job's current skills gap analysis, keeping older rows as history."""
+    SkillGapAnalysisCache.objects.filter(job=job).update(is_valid=False)
+    return SkillGapAnalysisCache.objects.create(
+        job=job,
+        job_title=job.title,
+        company_name=job.company_name,
+        analysis_data=analysis,
+        source=analysis.get('source', 'parsed'),
+        candidate_fingerprint=fingerprint,
+        job_fingerprint=job_fingerprint(job),
+    )
+
+
+def recompute_candidate(candidate_id, job_ids: Optional[Iterable[int]] = None,
+                        batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Recompute a candidate's stale analyses, plus any listed jobs with none yet.
+
+    Fingerprints are taken before the inputs are loaded and checked again
+    afterwards, so an edit that lands mid-recompute leaves its rows stale (and
+    queued) rather than valid with outdated scores.
+
+    Returns:
+        Counts of recomputed match and skills gap analyses
+    """
+    from core.job_matching import JobMatchingEngine
+    from core.skills_gap_analysis import SkillsGapAnalyzer
+
+    # Release the lock before taking the pending jobs, so jobs requested from here on queue another run
+    job_ids = set(job_ids or [])
+    try:
+        cache.delete(f'{RECOMPUTE_LOCK_PREFIX}{candidate_id}')
+        job_ids.update(cache.get(f'{RECOMPUTE_PENDING_PREFIX}{candidate_id}') or [])
+        cache.delete(f'{RECOMPUTE_PENDING_PREFIX}{candidate_id}')
+    except Exception as exc:
+        logger.debug(f"Match recompute lock unavailable: {exc}")
+
+    counts = {'matches': 0, 'skills_gaps': 0}
+    profile = CandidateProfile.objects.filter(pk=candidate_id).first()
+    if profile is None:
+        return counts
+    batch_size = batch_size or settings.MATCH_RECOMPUTE_BATCH_SIZE
+    match_fingerprint = candidate_fingerprint(candidate_id)
+    gap_fingerprint = skills_fingerprint(candidate_id)
+
+    stale_ids = set(
+        JobMatchAnalysis.objects.filter(candidate_id=candidate_id, is_valid=False).values_list('job_id', flat=True)
+    )
+    jobs = list(
+        JobEntry.objects.filter(candidate_id=candidate_id, id__in=stale_ids | set(job_ids or [])).order_by('id')
+    )
+    for start in range(0, len(jobs), batch_size):
+        results = JobMatchingEngine.score_many(
+            jobs[start:start + batch_size], profile, candidate_fingerprint=match_fingerprint,
+        )
+        counts['matches'] += sum(1 for result in results if not result['cached'])
+
+    gap_jobs = (
+        JobEntry.objects.filter(candidate_id=candidate_id, skills_gap_cache__is_valid=False)
+        .exclude(skills_gap_cache__is_valid=True)
+        .distinct()
+        .order_by('id')
+    )
+    for job in gap_jobs:
+        previous = SkillGapAnalysisCache.objects.filter(job=job).first()
+        include_trends = bool(previous and 'trends' in (previous.analysis_data or {}))
+        try:
+            analysis = SkillsGapAnalyzer.analyze_job(
+                job=job, candidate_profile=profile, include_similar_trends=include_trends,
+            )
+            analysis['generated_at'] = timezone.now().isoformat()
+            store_skills_gap(job, analysis, gap_fingerprint)
+            counts['skills_gaps'] += 1
+        except Exception as exc:
+            logger.warning(f"Failed to recompute skills gap analysis for job {job.id}: {exc}")
+
+    if candidate_fingerprint(candidate_id) != match_fingerprint:
+        mark_candidate_stale(candidate_id)
+    return counts
+
+
+def recompute_stale(limit: Optional[int] = None) -> Dict[str, int]:
+    """Recompute stale analyses for up to ``limit`` candidates.
+
+    Returns:
+        Candidates processed and recomputed row counts
+    """
+    limit = limit or settings.MATCH_RECOMPUTE_BATCH_SIZE
+    candidate_ids = set(
+        JobMatchAnalysis.objects.filter(is_valid=False)
+        .order_by('candidate_id').values_list('candidate_id', flat=True).distinct()[:limit]
+    )
+    candidate_ids.update(
+        JobEntry.objects.filter(skills_gap_cache__is_valid=False)
+        .exclude(skills_gap_cache__is_valid=True)
+        .order_by('candidate_id').values_list('candidate_id', flat=True).distinct()[:limit]
+    )
+    totals = {'candidates': 0, 'matches': 0, 'skills_gaps': 0}
+    for candidate_id in sorted(candidate_ids)[:limit]:
+        try:
+            counts = recompute_candidate(candidate_id)
+        except Exception as exc:
+            logger.warning(f"Failed to recompute match analyses for candidate {candidate_id}: {exc}")
+            continue
+        totals['candidates'] += 1
+        totals['matches'] += counts['matches']
+        totals['skills_gaps'] += counts['skills_gaps']
+    return totals
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0123_add_oauth_state_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apiusagelog',
+            name='request_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0124_apiusagelog_request_at_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodedLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('normalized_query', models.CharField(max_length=255, unique=True)),
+                ('query', models.CharField(max_length=255)),
+                ('lat', models.FloatField(blank=True, null=True)),
+                ('lon', models.FloatField(blank=True, null=True)),
+                ('precision', models.CharField(blank=True, default='unknown', max_length=20)),
+                ('display_name', models.CharField(blank=True, max_length=500)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('resolved', 'Resolved'), ('not_found', 'Not Found'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.CharField(blank=True, max_length=255)),
+                ('last_attempt_at', models.DateTimeField(blank=True, null=True)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_geocod_status_460a11_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0125_geocodedlocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('stage', models.CharField(choices=[('interested', 'Interested'), ('applied', 'Applied'), ('phone_screen', 'Phone Screen'), ('interview', 'Interview'), ('offer', 'Offer'), ('rejected', 'Rejected')], max_length=20)),
+                ('job_count', models.IntegerField(default=0)),
+                ('stage_seconds', models.FloatField(default=0)),
+                ('stage_exits', models.IntegerField(default=0)),
+                ('open_count', models.IntegerField(default=0)),
+                ('open_entered_total', models.FloatField(default=0, help_text='Sum of entry timestamps (epoch seconds) of ongoing stays')),
+                ('offer_count', models.IntegerField(default=0)),
+                ('offer_days_total', models.FloatField(default=0)),
+                ('offer_days', models.JSONField(blank=True, default=dict, help_text='Histogram of days to offer: {"12.5": 1}')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_stats_rollups', to='core.candidateprofile')),
+            ],
+            options={
+                'ordering': ['candidate', 'month', 'stage'],
+                'unique_together': {('candidate', 'month', 'stage')},
+            },
+        ),
+        migrations.CreateModel(
+            name='JobStatsContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cells', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_stats_contributions', to='core.candidateprofile')),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats_contribution', to='core.jobentry')),
+            ],
+        ),
+    ]
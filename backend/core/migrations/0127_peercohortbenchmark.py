@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0126_jobstatsrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PeerCohortBenchmark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('experience_level', models.CharField(blank=True, max_length=20)),
+                ('industry', models.CharField(blank=True, max_length=120)),
+                ('location', models.CharField(blank=True, max_length=100)),
+                ('candidate_count', models.IntegerField(default=0)),
+                ('status_counts', models.JSONField(blank=True, default=dict, help_text='Jobs per status: {"applied": 12}')),
+                ('first_jobs', models.JSONField(blank=True, default=list, help_text='Earliest first-job dates: [["<iso>", candidate_id], ...]')),
+                ('last_jobs', models.JSONField(blank=True, default=list, help_text='Latest last-job dates: [["<iso>", candidate_id], ...]')),
+                ('position_count', models.IntegerField(default=0)),
+                ('experience_years', models.FloatField(default=0)),
+                ('skill_counts', models.JSONField(blank=True, default=dict, help_text='Candidates per skill name: {"Python": 4}')),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['industry', 'experience_level', 'location'],
+                'unique_together': {('experience_level', 'industry', 'location')},
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0127_peercohortbenchmark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contact',
+            name='health_score',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='cadence_days',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='reciprocity_given',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='reciprocity_received',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='outstanding_follow_ups',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='latest_interaction_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='recent_interaction_dates',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='note_interests',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='next_reminder_due',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='scores_refreshed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0128_contact_relationship_scores'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('activity', models.CharField(choices=[('applications', 'Applications'), ('interview_preparation', 'Interview Preparation'), ('networking', 'Networking'), ('skill_development', 'Skill Development')], max_length=32)),
+                ('occurred_at', models.DateTimeField()),
+                ('minutes', models.FloatField()),
+                ('source', models.CharField(max_length=40)),
+                ('source_id', models.CharField(max_length=64)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activity_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['user', 'occurred_at'], name='core_activi_user_id_2acb40_idx'),
+                    models.Index(fields=['source', 'source_id'], name='core_activi_source_162b75_idx'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0129_activityevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobmatchanalysis',
+            name='candidate_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobmatchanalysis',
+            name='job_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='skillgapanalysiscache',
+            name='candidate_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='skillgapanalysiscache',
+            name='job_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,28 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0130_match_input_fingerprints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDescriptionAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('requirements', 'Extracted requirements'), ('interview_insights', 'Interview insights')], max_length=32)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('payload', models.JSONField(default=dict)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='core_jobdes_last_us_d70bd9_idx')],
+                'unique_together': {('kind', 'content_hash')},
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0132_aigeneration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scheduledsubmission',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, help_text='When a dispatcher claimed this submission for delivery (core.scheduled_submissions)', null=True),
+        ),
+        migrations.AlterField(
+            model_name='scheduledsubmission',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('scheduled', 'Scheduled'), ('processing', 'Processing'), ('submitted', 'Submitted'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='scheduledsubmission',
+            index=models.Index(fields=['status', 'claimed_at'], name='schedsub_status_claimed_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# Kept in sync with core.job_search.FIELD_WEIGHTS (A=title, B=company, C=industry/location, D=description)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}company_name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({row}industry, '') || ' ' || coalesce({row}location, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce({row}description, '')), 'D')"
+)
+
+TRIGRAM_FIELDS = ['title', 'company_name', 'industry', 'location']
+
+
+def create_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+    schema_editor.execute('ALTER TABLE core_jobentry ADD COLUMN IF NOT EXISTS search_vector tsvector;')
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION core_jobentry_search_vector_update() RETURNS trigger AS $$ "
+        "BEGIN NEW.search_vector := " + SEARCH_VECTOR_SQL.format(row='NEW.') + "; RETURN NEW; END "
+        "$$ LANGUAGE plpgsql;"
+    )
+    schema_editor.execute('DROP TRIGGER IF EXISTS core_jobentry_search_vector_trigger ON core_jobentry;')
+    schema_editor.execute(
+        "CREATE TRIGGER core_jobentry_search_vector_trigger "
+        "BEFORE INSERT OR UPDATE OF title, company_name, industry, location, description ON core_jobentry "
+        "FOR EACH ROW EXECUTE FUNCTION core_jobentry_search_vector_update();"
+    )
+    schema_editor.execute('UPDATE core_jobentry SET search_vector = ' + SEARCH_VECTOR_SQL.format(row='') + ';')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_core_jobentry_search_vector '
+        'ON core_jobentry USING gin (search_vector);'
+    )
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_core_jobentry_{field}_trgm '
+            f'ON core_jobentry USING gin ({field} gin_trgm_ops);'
+        )
+
+
+def drop_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS idx_core_jobentry_{field}_trgm;')
+    schema_editor.execute('DROP INDEX IF EXISTS idx_core_jobentry_search_vector;')
+    schema_editor.execute('DROP TRIGGER IF EXISTS core_jobentry_search_vector_trigger ON core_jobentry;')
+    schema_editor.execute('DROP FUNCTION IF EXISTS core_jobentry_search_vector_update();')
+    schema_editor.execute('ALTER TABLE core_jobentry DROP COLUMN IF EXISTS search_vector;')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0133_scheduledsubmission_claimed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_vector, drop_search_vector),
+    ]
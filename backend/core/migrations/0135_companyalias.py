@@ -0,0 +1,57 @@
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of core.utils.company_matching.normalize_name
+COMMON_SUFFIXES = [r'\binc\b', r'\bincorporated\b', r'\bcorp\b', r'\bcorporation\b', r'\bllc\b', r'\bltd\b', r'\bco\b', r'\bcompany\b']
+
+
+def normalize_name(name):
+    if not name:
+        return ''
+    s = re.sub(r'[^a-z0-9\s]', ' ', name.lower())
+    for suf in COMMON_SUFFIXES:
+        s = re.sub(suf, ' ', s)
+    return re.sub(r'\s+', ' ', s).strip()
+
+
+def renormalize_company_names(apps, schema_editor):
+    """
+    Rows backfilled by 0030 on PostgreSQL dropped upper-case letters before
+    lowercasing ("Google" -> "oogle") and kept corporate suffixes, so they never
+    matched the names core.company_resolution looks up.
+    """
+    Company = apps.get_model('core', 'Company')
+    batch = []
+    for company in Company.objects.only('id', 'name', 'normalized_name').iterator(chunk_size=2000):
+        normalized = normalize_name(company.name)
+        if normalized != company.normalized_name:
+            company.normalized_name = normalized
+            batch.append(company)
+        if len(batch) >= 2000:
+            Company.objects.bulk_update(batch, ['normalized_name'])
+            batch = []
+    if batch:
+        Company.objects.bulk_update(batch, ['normalized_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0134_jobentry_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=180)),
+                ('normalized_name', models.CharField(max_length=200, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='core.company')),
+            ],
+        ),
+        migrations.RunPython(renormalize_company_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0135_companyalias'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityBackfill',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity_backfill', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('completed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -14,6 +14,32 @@ from typing import List, Dict, Any
 import json
 import re
 
+from core import llm_gateway
+from core.api_monitoring import SERVICE_GEMINI, get_or_create_service
+
+
+def _generate_text(client, prompt: str, use_cache: bool = True) -> str:
+    """Gemini response text for ``prompt``, through the shared LLM gateway.
+
+    ``use_cache=False`` for user-initiated generation, where starting a new
+    session should produce new questions rather than the cached ones.
+    """
+    def _request():
+        response = client.models.generate_content(
+            model=settings.GEMINI_MODEL,
+            contents=prompt
+        )
+        return llm_gateway.sdk_response_text(response)
+
+    return llm_gateway.generate(
+        prompt,
+        model=settings.GEMINI_MODEL,
+        call=_request,
+        service=get_or_create_service(SERVICE_GEMINI, 'gemini'),
+        validate=llm_gateway.require_text,
+        use_cache=use_cache,
+    )
+
 
 class MockInterviewGenerator:
     """Generate tailored mock interview questions using Gemini AI."""
@@ -68,24 +94,7 @@ class MockInterviewGenerator:
         )
         
         try:
-            response = self.client.models.generate_content(
-                model=settings.GEMINI_MODEL,
-                contents=prompt
-            )
-            
-            # Extract text from response
-            content = getattr(response, 'text', None) or getattr(response, 'output_text', None)
-            if not content:
-                candidates = getattr(response, 'candidates', None) or []
-                if candidates:
-                    try:
-                        first_part = candidates[0].content.parts[0]
-                        content = getattr(first_part, 'text', '') or str(first_part)
-                    except (IndexError, AttributeError, TypeError):
-                        content = ''
-            
-            if not content:
-                raise ValueError("No content in Gemini response")
+            content = _generate_text(self.client, prompt, use_cache=False)
             
             questions = self._parse_questions_response(content)
             
@@ -328,24 +337,7 @@ class MockInterviewCoach:
         )
         
         try:
-            response = self.client.models.generate_content(
-                model=settings.GEMINI_MODEL,
-                contents=prompt
-            )
-            
-            # Extract text from response
-            content = getattr(response, 'text', None) or getattr(response, 'output_text', None)
-            if not content:
-                candidates = getattr(response, 'candidates', None) or []
-                if candidates:
-                    try:
-                        first_part = candidates[0].content.parts[0]
-                        content = getattr(first_part, 'text', '') or str(first_part)
-                    except (IndexError, AttributeError, TypeError):
-                        content = ''
-            
-            if not content:
-                raise ValueError("No content in Gemini response")
+            content = _generate_text(self.client, prompt)
             
             evaluation = self._parse_evaluation_response(content)
             
@@ -384,24 +376,7 @@ class MockInterviewCoach:
         )
         
         try:
-            response = self.client.models.generate_content(
-                model=settings.GEMINI_MODEL,
-                contents=prompt
-            )
-            
-            # Extract text from response
-            content = getattr(response, 'text', None) or getattr(response, 'output_text', None)
-            if not content:
-                candidates = getattr(response, 'candidates', None) or []
-                if candidates:
-                    try:
-                        first_part = candidates[0].content.parts[0]
-                        content = getattr(first_part, 'text', '') or str(first_part)
-                    except (IndexError, AttributeError, TypeError):
-                        content = ''
-            
-            if not content:
-                raise ValueError("No content in Gemini response")
+            content = _generate_text(self.client, prompt)
             
             summary = self._parse_summary_response(content)
             
@@ -126,6 +126,41 @@ class JobOfficeLocation(models.Model):
             models.Index(fields=['job', 'created_at']),
         ]
 
+class GeocodedLocation(models.Model):
+    """Shared cache of geocoded location strings, keyed by normalized query.
+
+    Rows are created as ``pending`` when a job references a location we have not
+    resolved yet and are filled in by the batch geocoder (core.geocoding).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('resolved', 'Resolved'),
+        ('not_found', 'Not Found'),
+        ('failed', 'Failed'),
+    ]
+
+    normalized_query = models.CharField(max_length=255, unique=True)
+    query = models.CharField(max_length=255)
+    lat = models.FloatField(null=True, blank=True)
+    lon = models.FloatField(null=True, blank=True)
+    precision = models.CharField(max_length=20, blank=True, default='unknown')
+    display_name = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True)
+    last_attempt_at = models.DateTimeField(null=True, blank=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.query} ({self.status})"
+
 class Skill(models.Model):
     name = models.CharField(max_length=120, unique=True)
     category = models.CharField(max_length=120, blank=True)
@@ -272,6 +307,17 @@ class Company(models.Model):
             pass
         return super().save(*args, **kwargs)
 
+
+class CompanyAlias(models.Model):
+    """Other spellings of a company's name seen by core.company_resolution (e.g. "Alphabet (Google)")."""
+    company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name="aliases")
+    name = models.CharField(max_length=180)
+    normalized_name = models.CharField(max_length=200, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} -> {self.company_id}"
+
 class JobOpportunity(models.Model):
     EMPLOY_TYPES = [
         ("ft", "Full-time"),
@@ -297,12 +343,8 @@ class JobOpportunity(models.Model):
         # If a company_name is provided but no company FK, try to resolve or create a Company
         try:
             if not getattr(self, 'company', None) and self.company_name:
-                company_obj = Company.objects.filter(name__iexact=self.company_name).first()
-                if not company_obj:
-                    # create a minimal Company record; domain will be a slug of the name
-                    domain = (self.company_name or '').lower().replace(' ', '-')
-                    company_obj = Company.objects.create(name=self.company_name, domain=domain)
-                self.company = company_obj
+                from core.company_resolution import get_or_create_company
+                self.company, _ = get_or_create_company(self.company_name)
         except Exception:
             # If Company model isn't available or creation fails, proceed and allow DB to raise
             pass
@@ -361,6 +403,18 @@ class Contact(models.Model):
     is_private = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Relationship maintenance scores (core.relationship_health), refreshed when the
+    # contact's interactions, notes, or reminders change
+    health_score = models.IntegerField(null=True, blank=True)
+    cadence_days = models.IntegerField(null=True, blank=True)
+    reciprocity_given = models.IntegerField(default=0)
+    reciprocity_received = models.IntegerField(default=0)
+    outstanding_follow_ups = models.IntegerField(default=0)
+    latest_interaction_at = models.DateTimeField(null=True, blank=True)
+    recent_interaction_dates = models.JSONField(default=list, blank=True)
+    note_interests = models.JSONField(default=list, blank=True)
+    next_reminder_due = models.DateTimeField(null=True, blank=True)
+    scores_refreshed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         indexes = [models.Index(fields=['owner', 'external_id']), models.Index(fields=['owner', 'updated_at'])]
@@ -1942,6 +1996,57 @@ class TechnicalPrepGeneration(models.Model):
         return f"TechnicalPrepGeneration(job={self.job_id}, status={self.status})"
 
 
+class AIGeneration(models.Model):
+    """Queued Gemini document generation (resume, cover letter, experience tailoring) polled by the client."""
+
+    KIND_RESUME = 'resume'
+    KIND_COVER_LETTER = 'cover_letter'
+    KIND_EXPERIENCE_VARIATIONS = 'experience_variations'
+    KIND_EXPERIENCE_BULLET = 'experience_bullet'
+    KIND_CHOICES = [
+        (KIND_RESUME, 'Resume'),
+        (KIND_COVER_LETTER, 'Cover letter'),
+        (KIND_EXPERIENCE_VARIATIONS, 'Experience variations'),
+        (KIND_EXPERIENCE_BULLET, 'Experience bullet'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='ai_generations')
+    job = models.ForeignKey('JobEntry', on_delete=models.CASCADE, related_name='ai_generations')
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    result = models.JSONField(null=True, blank=True)
+    error_code = models.CharField(max_length=64, blank=True)
+    error_message = models.TextField(blank=True)
+    attempt_count = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_progress_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='aigen_user_created_idx'),
+            models.Index(fields=['job', 'kind', 'status'], name='aigen_job_kind_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"AIGeneration(job={self.job_id}, kind={self.kind}, status={self.status})"
+
+
 class PreparationChecklistProgress(models.Model):
     """Track completion status for preparation checklist items per job."""
 
@@ -2460,6 +2565,121 @@ class JobStatusChange(models.Model):
         return f"{self.job_id}: {self.old_status} -> {self.new_status} @ {self.changed_at}"
 
 
+class JobStatsRollup(models.Model):
+    """Per-candidate pipeline aggregates keyed by month and stage.
+
+    Maintained incrementally by core.analytics_rollups from JobEntry and
+    JobStatusChange signals so dashboards read a few rows instead of the full
+    job history. Months are in the active timezone (first day of the month).
+    """
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name="job_stats_rollups")
+    month = models.DateField()
+    stage = models.CharField(max_length=20, choices=JobEntry.STATUS_CHOICES)
+    # Jobs created in this month that are currently in this stage
+    job_count = models.IntegerField(default=0)
+    # Finished stays in this stage that ended in this month
+    stage_seconds = models.FloatField(default=0)
+    stage_exits = models.IntegerField(default=0)
+    # Ongoing stays that began in this month (duration = now - entered)
+    open_count = models.IntegerField(default=0)
+    open_entered_total = models.FloatField(default=0, help_text="Sum of entry timestamps (epoch seconds) of ongoing stays")
+    # Offers received in this month (stage='offer' rows only)
+    offer_count = models.IntegerField(default=0)
+    offer_days_total = models.FloatField(default=0)
+    offer_days = models.JSONField(default=dict, blank=True, help_text="Histogram of days to offer: {\"12.5\": 1}")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [("candidate", "month", "stage")]
+        ordering = ['candidate', 'month', 'stage']
+
+    def __str__(self):
+        return f"{self.candidate_id} {self.month:%Y-%m} {self.stage}: {self.job_count}"
+
+
+class JobStatsContribution(models.Model):
+    """What one job last added to its candidate's JobStatsRollup rows, so edits apply as deltas."""
+    job = models.OneToOneField(JobEntry, on_delete=models.CASCADE, related_name="stats_contribution")
+    candidate = models.ForeignKey(CandidateProfile, on_delete=models.CASCADE, related_name="job_stats_contributions")
+    cells = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats contribution for job {self.job_id}"
+
+
+class PeerCohortBenchmark(models.Model):
+    """Periodic snapshot of pipeline, employment, and skill totals for a peer cohort.
+
+    Cohorts are keyed by experience level, industry, and location (upper-cased state;
+    an empty location is the all-locations cohort). Every figure is an additive total
+    so competitive analysis can subtract the requesting candidate and merge cohorts.
+    Rebuilt by core.peer_benchmarks.refresh_peer_benchmarks.
+    """
+    experience_level = models.CharField(max_length=20, blank=True)
+    industry = models.CharField(max_length=120, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+    candidate_count = models.IntegerField(default=0)
+    status_counts = models.JSONField(default=dict, blank=True, help_text='Jobs per status: {"applied": 12}')
+    first_jobs = models.JSONField(default=list, blank=True, help_text='Earliest first-job dates: [["<iso>", candidate_id], ...]')
+    last_jobs = models.JSONField(default=list, blank=True, help_text='Latest last-job dates: [["<iso>", candidate_id], ...]')
+    position_count = models.IntegerField(default=0)
+    experience_years = models.FloatField(default=0)
+    skill_counts = models.JSONField(default=dict, blank=True, help_text='Candidates per skill name: {"Python": 4}')
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = [("experience_level", "industry", "location")]
+        ordering = ["industry", "experience_level", "location"]
+
+    def __str__(self):
+        return f"Peer cohort {self.industry or '-'}/{self.experience_level or '-'}/{self.location or 'all'}"
+
+
+class ActivityEvent(models.Model):
+    """Timed job-search activity, one row per logged session, for productivity analytics.
+
+    Written by signals from the source records (jobs, interactions, prep and
+    practice sessions, networking events, skill progress); rows are never updated
+    in place, a changed source replaces its rows. See core.activity_log.
+    """
+    ACTIVITY_CHOICES = [
+        ("applications", "Applications"),
+        ("interview_preparation", "Interview Preparation"),
+        ("networking", "Networking"),
+        ("skill_development", "Skill Development"),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="activity_events")
+    activity = models.CharField(max_length=32, choices=ACTIVITY_CHOICES)
+    occurred_at = models.DateTimeField()
+    minutes = models.FloatField()
+    source = models.CharField(max_length=40)
+    source_id = models.CharField(max_length=64)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "occurred_at"]),
+            models.Index(fields=["source", "source_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.activity} {self.minutes:.0f}m at {self.occurred_at:%Y-%m-%d %H:%M}"
+
+
+class ActivityBackfill(models.Model):
+    """Marks a user whose ActivityEvent rows were rebuilt from the source records.
+
+    Users active before the event log existed are backfilled once, on their
+    first productivity read; see core.activity_log.ensure_backfilled.
+    """
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="activity_backfill")
+    completed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Activity backfill for user {self.user_id} at {self.completed_at:%Y-%m-%d %H:%M}"
+
+
 class JobMaterialsHistory(models.Model):
     """History of application materials linked to a JobEntry (UC-042).
 
@@ -2763,6 +2983,38 @@ class LearningResource(models.Model):
         return f"{self.title} ({self.provider}) - {self.skill.name}"
 
 
+class JobDescriptionAnalysis(models.Model):
+    """Candidate-independent analysis of a job posting, shared by every user who saved it.
+
+    Content-addressed: ``content_hash`` covers the normalized posting text the
+    analysis reads, so the same posting imported by many users is parsed (or
+    sent to Gemini) once. Least recently used rows are evicted past a size
+    limit. See core.job_description_cache.
+    """
+    KIND_REQUIREMENTS = 'requirements'
+    KIND_INTERVIEW_INSIGHTS = 'interview_insights'
+    KIND_CHOICES = [
+        (KIND_REQUIREMENTS, 'Extracted requirements'),
+        (KIND_INTERVIEW_INSIGHTS, 'Interview insights'),
+    ]
+
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    content_hash = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = [('kind', 'content_hash')]
+        indexes = [
+            models.Index(fields=['last_used_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.content_hash[:12]} ({self.hit_count} hits)"
+
+
 class SkillGapAnalysisCache(models.Model):
     """Cached skills gap analysis results (UC-066).
     
@@ -2797,6 +3049,9 @@ class SkillGapAnalysisCache(models.Model):
         default=True,
         help_text="Set to False to force regeneration"
     )
+    # Input fingerprints (core.match_fingerprints) the analysis was computed from
+    candidate_fingerprint = models.CharField(max_length=64, blank=True, default='')
+    job_fingerprint = models.CharField(max_length=64, blank=True, default='')
     
     class Meta:
         indexes = [
@@ -2881,6 +3136,9 @@ class JobMatchAnalysis(models.Model):
     generated_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_valid = models.BooleanField(default=True, help_text="False if analysis is outdated due to profile changes")
+    # Input fingerprints (core.match_fingerprints) the analysis was computed from
+    candidate_fingerprint = models.CharField(max_length=64, blank=True, default='')
+    job_fingerprint = models.CharField(max_length=64, blank=True, default='')
     
     class Meta:
         indexes = [
@@ -5721,7 +5979,7 @@ class APIUsageLog(models.Model):
     method = models.CharField(max_length=10, default='GET')
     
     # Timing
-    request_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    request_at = models.DateTimeField(default=timezone.now, db_index=True)
     response_time_ms = models.IntegerField(null=True, blank=True, help_text='Response time in milliseconds')
     
     # Response details
@@ -5966,6 +6224,7 @@ class ScheduledSubmission(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('scheduled', 'Scheduled'),
+        ('processing', 'Processing'),
         ('submitted', 'Submitted'),
         ('failed', 'Failed'),
         ('cancelled', 'Cancelled'),
@@ -6030,6 +6289,11 @@ class ScheduledSubmission(models.Model):
     )
     submitted_at = models.DateTimeField(null=True, blank=True)
     error_message = models.TextField(blank=True)
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When a dispatcher claimed this submission for delivery (core.scheduled_submissions)'
+    )
     
     # Timing metadata for analytics
     day_of_week = models.PositiveSmallIntegerField(
@@ -6055,6 +6319,7 @@ class ScheduledSubmission(models.Model):
             models.Index(fields=['job', 'status']),
             models.Index(fields=['candidate', 'day_of_week']),
             models.Index(fields=['candidate', 'hour_of_day']),
+            models.Index(fields=['status', 'claimed_at'], name='schedsub_status_claimed_idx'),
         ]
     
     def __str__(self):
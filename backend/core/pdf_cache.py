@@ -0,0 +1,175 @@
+"""
+Content-addressed cache for PDFs compiled from LaTeX resumes.
+
+Compiling a resume spawns a Tectonic subprocess, and shared resume links,
+live previews and exports recompile the same source over and over. Compiled
+PDFs are stored on disk under ``settings.RESUME_PDF_CACHE_DIR`` keyed by
+``sha256(compiler fingerprint + LaTeX source)``, so identical input never hits
+the compiler twice and upgrading Tectonic naturally invalidates old entries.
+The key doubles as an HTTP ETag for the compiled document.
+
+Entries are written atomically (temp file + rename), so concurrent workers
+can share the directory. The cache is pruned oldest-first once it grows past
+``RESUME_PDF_CACHE_MAX_BYTES``.
+"""
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from shutil import which
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+PRUNE_EVERY_WRITES = 100
+
+_fingerprint_lock = threading.Lock()
+_fingerprints = {}
+_writes_since_prune = 0
+
+
+def cache_dir() -> Path:
+    return Path(getattr(settings, 'RESUME_PDF_CACHE_DIR', Path(settings.BASE_DIR) / 'var' / 'pdf_cache'))
+
+
+def cache_enabled() -> bool:
+    return bool(getattr(settings, 'RESUME_PDF_CACHE_ENABLED', True))
+
+
+def compiler_fingerprint() -> str:
+    """
+    Identify the LaTeX compiler so a Tectonic upgrade invalidates cached PDFs.
+
+    The ``--version`` output is memoized per binary path and mtime.
+    """
+    binary = getattr(settings, 'TECTONIC_BINARY', 'tectonic')
+    binary_path = binary if os.path.sep in binary else (which(binary) or binary)
+    try:
+        mtime = os.stat(binary_path).st_mtime_ns
+    except OSError:
+        mtime = None
+    memo_key = (binary_path, mtime)
+    with _fingerprint_lock:
+        cached = _fingerprints.get(memo_key)
+        if cached is not None:
+            return cached
+    version = ''
+    if mtime is not None:
+        try:
+            result = subprocess.run(
+                [binary_path, '--version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=10,
+            )
+            version = result.stdout.strip()
+        except (OSError, subprocess.SubprocessError) as exc:
+            logger.debug('Could not read Tectonic version: %s', exc)
+    fingerprint = f'{version or binary_path}|{mtime}'
+    with _fingerprint_lock:
+        _fingerprints[memo_key] = fingerprint
+    return fingerprint
+
+
+def pdf_cache_key(latex_document: str) -> str:
+    """Return the content hash used as cache key and ETag for ``latex_document``."""
+    digest = hashlib.sha256()
+    digest.update(compiler_fingerprint().encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(latex_document.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return cache_dir() / key[:2] / f'{key}.pdf'
+
+
+def get_cached_pdf(key: str) -> Optional[bytes]:
+    if not cache_enabled():
+        return None
+    path = _entry_path(key)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        logger.warning('Failed to read cached PDF %s: %s', key, exc)
+        return None
+    try:
+        # Touch so pruning keeps recently served entries
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def has_cached_pdf(key: str) -> bool:
+    return cache_enabled() and _entry_path(key).exists()
+
+
+def store_pdf(key: str, pdf_bytes: bytes) -> None:
+    """Atomically write a compiled PDF into the cache (errors are logged, not raised)."""
+    global _writes_since_prune
+    if not cache_enabled():
+        return
+    path = _entry_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix='.tmp-', suffix='.pdf')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(pdf_bytes)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+    except OSError as exc:
+        logger.warning('Failed to cache compiled PDF %s: %s', key, exc)
+        return
+
+    _writes_since_prune += 1
+    if _writes_since_prune >= PRUNE_EVERY_WRITES:
+        _writes_since_prune = 0
+        prune_pdf_cache()
+
+
+def prune_pdf_cache(max_bytes: Optional[int] = None) -> int:
+    """
+    Delete least recently used entries until the cache fits in ``max_bytes``.
+
+    Returns:
+        Number of entries removed
+    """
+    limit = max_bytes if max_bytes is not None else getattr(settings, 'RESUME_PDF_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+    entries = []
+    total = 0
+    for path in cache_dir().glob('*/*.pdf'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        try:
+            path.unlink()
+            total -= size
+            removed += 1
+        except OSError:
+            continue
+    if removed:
+        logger.info('Pruned %d cached resume PDFs', removed)
+    return removed
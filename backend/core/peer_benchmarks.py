@@ -0,0 +1,346 @@
+"""
+Materialized peer-cohort benchmarks for competitive analysis.
+
+``competitive_analysis_view`` used to count every peer's jobs status by status
+and walk each peer's work history on every request, so its cost grew with the
+whole user base. Cohort totals are now snapshotted into ``PeerCohortBenchmark``
+rows keyed by (experience level, industry, location) with a few grouped
+aggregate queries, and requests read them back with a single query.
+
+Snapshot figures are additive totals ("stats" dicts below), so the view can
+subtract the requesting candidate from their own cohort and merge several
+cohorts (e.g. every higher experience level for progression benchmarks). The
+application window keeps the two earliest/latest candidates' job dates, which
+is enough to take any one candidate out of it exactly.
+Location is the candidate's upper-cased state; the empty location holds the
+all-locations cohort.
+
+Snapshots are rebuilt by the ``refresh_peer_benchmarks`` Celery task (scheduled
+in backend/celery.py) or the ``refresh_peer_benchmarks`` management command.
+Reads older than ``PEER_BENCHMARK_MAX_AGE`` kick a background refresh; before the
+first snapshot exists the requested industry is aggregated live.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import CandidateProfile, CandidateSkill, JobEntry, PeerCohortBenchmark, WorkExperience
+
+logger = logging.getLogger(__name__)
+
+ALL_LOCATIONS = ''
+REFRESH_LOCK_KEY = 'peer_benchmarks:refresh'
+# Window edges kept per cohort: one spare so any single candidate can be removed
+EDGE_JOBS = 2
+
+CohortKey = Tuple[str, str, str]
+
+
+def location_key(state: Optional[str]) -> str:
+    """Normalize a profile's state into a cohort location."""
+    return (state or '').strip().upper()[:100]
+
+
+def empty_stats() -> Dict:
+    return {
+        'candidates': 0,
+        'status_counts': {},
+        'first_jobs': [],
+        'last_jobs': [],
+        'positions': 0,
+        'years': 0.0,
+        'skills': {},
+    }
+
+
+def _add_counts(target: Dict[str, int], counts: Dict[str, int], sign: int = 1):
+    for name, value in counts.items():
+        total = target.get(name, 0) + sign * value
+        if total > 0:
+            target[name] = total
+        else:
+            target.pop(name, None)
+
+
+def _merge_into(target: Dict, stats: Dict):
+    target['candidates'] += stats['candidates']
+    target['positions'] += stats['positions']
+    target['years'] += stats['years']
+    _add_counts(target['status_counts'], stats['status_counts'])
+    _add_counts(target['skills'], stats['skills'])
+    target['first_jobs'] = _edges(target['first_jobs'] + stats['first_jobs'], latest=False)
+    target['last_jobs'] = _edges(target['last_jobs'] + stats['last_jobs'], latest=True)
+
+
+def _edges(entries, latest: bool):
+    """The EDGE_JOBS earliest (or latest) (timestamp, candidate_id) entries."""
+    return sorted(entries, key=lambda entry: entry[0], reverse=latest)[:EDGE_JOBS]
+
+
+def merge_stats(stats_list: Iterable[Dict]) -> Dict:
+    """Combine several cohorts' totals into one."""
+    merged = empty_stats()
+    for stats in stats_list:
+        _merge_into(merged, stats)
+    return merged
+
+
+def subtract_stats(stats: Dict, other: Dict) -> Dict:
+    """``stats`` without ``other``'s contribution (clamped at zero)."""
+    result = merge_stats([stats])
+    removed = {candidate_id for _, candidate_id in other['first_jobs'] + other['last_jobs']}
+    result['first_jobs'] = [entry for entry in result['first_jobs'] if entry[1] not in removed]
+    result['last_jobs'] = [entry for entry in result['last_jobs'] if entry[1] not in removed]
+    result['candidates'] = max(result['candidates'] - other['candidates'], 0)
+    result['positions'] = max(result['positions'] - other['positions'], 0)
+    result['years'] = max(result['years'] - other['years'], 0.0)
+    _add_counts(result['status_counts'], other['status_counts'], sign=-1)
+    _add_counts(result['skills'], other['skills'], sign=-1)
+    return result
+
+
+def _experience_years(start, end, today) -> float:
+    if not start:
+        return 0.0
+    return max(((end or today) - start).days, 0) / 365.0
+
+
+def collect_cohort_stats(profiles=None, now: Optional[datetime] = None) -> Dict[CohortKey, Dict]:
+    """Aggregate cohort totals for ``profiles`` (default: every candidate).
+
+    Each candidate is counted in its own location's cohort and in the
+    all-locations cohort for its level and industry.
+
+    Returns:
+        Dict mapping (experience_level, industry, location) to stats dicts
+    """
+    today = timezone.localtime(now or timezone.now()).date()
+    profiles = CandidateProfile.objects.all() if profiles is None else profiles
+    cohorts: Dict[CohortKey, Dict] = {}
+
+    def _targets(level, industry, state):
+        keys = [(level or '', industry or '', ALL_LOCATIONS)]
+        location = location_key(state)
+        if location:
+            keys.append((level or '', industry or '', location))
+        for key in keys:
+            yield cohorts.setdefault(key, empty_stats())
+
+    for row in profiles.order_by().values('experience_level', 'industry', 'state').annotate(n=Count('id')):
+        for stats in _targets(row['experience_level'], row['industry'], row['state']):
+            stats['candidates'] += row['n']
+
+    job_rows = (
+        JobEntry.objects.filter(candidate__in=profiles)
+        .order_by()
+        .values('candidate__experience_level', 'candidate__industry', 'candidate__state', 'status')
+        .annotate(n=Count('id'))
+    )
+    for row in job_rows:
+        for stats in _targets(row['candidate__experience_level'], row['candidate__industry'], row['candidate__state']):
+            _add_counts(stats['status_counts'], {row['status']: row['n']})
+
+    span_rows = (
+        JobEntry.objects.filter(candidate__in=profiles)
+        .order_by()
+        .values('candidate_id', 'candidate__experience_level', 'candidate__industry', 'candidate__state')
+        .annotate(first=Min('created_at'), last=Max('created_at'))
+    )
+    for row in span_rows.iterator(chunk_size=2000):
+        for stats in _targets(row['candidate__experience_level'], row['candidate__industry'], row['candidate__state']):
+            stats['first_jobs'] = _edges(stats['first_jobs'] + [(row['first'], row['candidate_id'])], latest=False)
+            stats['last_jobs'] = _edges(stats['last_jobs'] + [(row['last'], row['candidate_id'])], latest=True)
+
+    skill_rows = (
+        CandidateSkill.objects.filter(candidate__in=profiles)
+        .order_by()
+        .values('candidate__experience_level', 'candidate__industry', 'candidate__state', 'skill__name')
+        .annotate(n=Count('id'))
+    )
+    for row in skill_rows:
+        for stats in _targets(row['candidate__experience_level'], row['candidate__industry'], row['candidate__state']):
+            _add_counts(stats['skills'], {row['skill__name']: row['n']})
+
+    # Open-ended positions run until today and negative spans count as zero, which
+    # is awkward to express portably in SQL; sum them from one streamed pass instead.
+    experience_rows = (
+        WorkExperience.objects.filter(candidate__in=profiles)
+        .order_by()
+        .values_list('candidate__experience_level', 'candidate__industry', 'candidate__state', 'start_date', 'end_date')
+    )
+    for level, industry, state, start, end in experience_rows.iterator(chunk_size=2000):
+        years = _experience_years(start, end, today)
+        for stats in _targets(level, industry, state):
+            stats['positions'] += 1
+            stats['years'] += years
+
+    return cohorts
+
+
+def candidate_stats(profile, now: Optional[datetime] = None) -> Dict:
+    """The totals ``profile`` itself contributes to its cohorts."""
+    today = timezone.localtime(now or timezone.now()).date()
+    stats = queryset_job_stats(JobEntry.objects.filter(candidate=profile), candidate_id=profile.id)
+    stats['candidates'] = 1
+    for start, end in WorkExperience.objects.filter(candidate=profile).order_by().values_list('start_date', 'end_date'):
+        stats['positions'] += 1
+        stats['years'] += _experience_years(start, end, today)
+    for name in CandidateSkill.objects.filter(candidate=profile).values_list('skill__name', flat=True):
+        _add_counts(stats['skills'], {name: 1})
+    return stats
+
+
+def queryset_job_stats(qs, candidate_id: Optional[int] = None) -> Dict:
+    """Status counts and first/last created_at for a job queryset, in one grouped query."""
+    stats = empty_stats()
+    for row in qs.order_by().values('status').annotate(n=Count('id'), first=Min('created_at'), last=Max('created_at')):
+        partial = empty_stats()
+        partial.update(
+            status_counts={row['status']: row['n']},
+            first_jobs=[(row['first'], candidate_id)],
+            last_jobs=[(row['last'], candidate_id)],
+        )
+        _merge_into(stats, partial)
+    stats['first_jobs'] = stats['first_jobs'][:1]
+    stats['last_jobs'] = stats['last_jobs'][:1]
+    return stats
+
+
+def refresh_peer_benchmarks(now: Optional[datetime] = None) -> int:
+    """Recompute every cohort snapshot and replace the stored rows.
+
+    Returns:
+        Number of cohort rows written
+    """
+    now = now or timezone.now()
+    cohorts = collect_cohort_stats(now=now)
+    rows = [
+        PeerCohortBenchmark(
+            experience_level=level,
+            industry=industry,
+            location=location,
+            candidate_count=stats['candidates'],
+            status_counts=stats['status_counts'],
+            first_jobs=_dump_edges(stats['first_jobs']),
+            last_jobs=_dump_edges(stats['last_jobs']),
+            position_count=stats['positions'],
+            experience_years=round(stats['years'], 4),
+            skill_counts=stats['skills'],
+            computed_at=now,
+        )
+        for (level, industry, location), stats in cohorts.items()
+    ]
+    with transaction.atomic():
+        PeerCohortBenchmark.objects.all().delete()
+        PeerCohortBenchmark.objects.bulk_create(rows, batch_size=500)
+    logger.info(f"Refreshed {len(rows)} peer cohort benchmarks")
+    return len(rows)
+
+
+def _dump_edges(entries) -> List:
+    return [[at.isoformat(), candidate_id] for at, candidate_id in entries]
+
+
+def _load_edges(entries) -> List:
+    return [(parse_datetime(at), candidate_id) for at, candidate_id in (entries or [])]
+
+
+def _stats_from_row(row: PeerCohortBenchmark) -> Dict:
+    return {
+        'candidates': row.candidate_count,
+        'status_counts': dict(row.status_counts or {}),
+        'first_jobs': _load_edges(row.first_jobs),
+        'last_jobs': _load_edges(row.last_jobs),
+        'positions': row.position_count,
+        'years': row.experience_years,
+        'skills': dict(row.skill_counts or {}),
+    }
+
+
+def _request_refresh():
+    """Enqueue one background refresh, however many stale reads ask for it."""
+    try:
+        if not cache.add(REFRESH_LOCK_KEY, 1, timeout=getattr(settings, 'PEER_BENCHMARK_MAX_AGE', 21600)):
+            return
+    except Exception as exc:
+        logger.debug(f"Peer benchmark refresh lock unavailable: {exc}")
+    from core.tasks import enqueue_peer_benchmark_refresh
+    enqueue_peer_benchmark_refresh()
+
+
+def load_cohorts(industry: str, location: str = ALL_LOCATIONS) -> Tuple[Dict[str, Dict], Optional[datetime]]:
+    """Snapshot stats per experience level for one industry and location.
+
+    Returns:
+        (stats by experience level, snapshot timestamp); the timestamp is None
+        when no snapshot exists yet and the cohorts were aggregated live
+    """
+    industry = industry or ''
+    rows = list(PeerCohortBenchmark.objects.filter(industry=industry, location=location))
+    if rows:
+        computed_at = min(row.computed_at for row in rows)
+    else:
+        computed_at = PeerCohortBenchmark.objects.order_by('-computed_at').values_list('computed_at', flat=True).first()
+
+    if computed_at is None:
+        _request_refresh()
+        live = collect_cohort_stats(CandidateProfile.objects.filter(industry=industry))
+        return {level: stats for (level, _, loc), stats in live.items() if loc == location}, None
+
+    max_age = getattr(settings, 'PEER_BENCHMARK_MAX_AGE', 21600)
+    if timezone.now() - computed_at > timedelta(seconds=max_age):
+        _request_refresh()
+    return {row.experience_level: _stats_from_row(row) for row in rows}, computed_at
+
+
+def job_metrics(stats: Dict) -> Dict:
+    """Application volume, conversion rates, and funnel from a cohort's totals."""
+    counts = stats['status_counts']
+    total = sum(counts.values())
+    phone = sum(counts.get(s, 0) for s in ('phone_screen', 'interview', 'offer'))
+    interview = sum(counts.get(s, 0) for s in ('interview', 'offer'))
+    offer = counts.get('offer', 0)
+    apps_per_week = 0
+    if total and stats['first_jobs'] and stats['last_jobs']:
+        days = max((stats['last_jobs'][0][0] - stats['first_jobs'][0][0]).days + 1, 7)
+        apps_per_week = round(total / (days / 7), 1)
+    return {
+        'applications': total,
+        'response_rate': round((phone / total) * 100, 1) if total else 0,
+        'interview_rate': round((interview / total) * 100, 1) if total else 0,
+        'offer_rate': round((offer / total) * 100, 1) if total else 0,
+        'apps_per_week': apps_per_week,
+        'funnel': {
+            'interested': counts.get('interested', 0),
+            'applied': counts.get('applied', 0),
+            'phone_screen': counts.get('phone_screen', 0),
+            'interview': counts.get('interview', 0),
+            'offer': offer,
+            'rejected': counts.get('rejected', 0),
+        }
+    }
+
+
+def employment_stats(stats: Dict) -> Dict:
+    """Average positions held and years of experience per candidate."""
+    if not stats['candidates']:
+        return {'avg_positions': 0, 'avg_years': 0}
+    return {
+        'avg_positions': round(stats['positions'] / stats['candidates'], 1),
+        'avg_years': round(stats['years'] / stats['candidates'], 1),
+    }
+
+
+def skill_prevalence(stats: Dict) -> List[Dict]:
+    """Skills ordered by the share of the cohort listing them."""
+    count = max(stats['candidates'], 1)
+    ranked = [{'name': name, 'prevalence': round((n / count) * 100, 1)} for name, n in stats['skills'].items()]
+    ranked.sort(key=lambda item: (-item['prevalence'], item['name']))
+    return ranked
@@ -1,41 +1,30 @@
-"""Productivity and time investment analytics for job search activities."""
+"""Productivity and time investment analytics for job search activities.
+
+Time investment reads the ActivityEvent log (core.activity_log) grouped by
+activity, UTC day and UTC hour in a single query; weekly, daily, day-of-week
+and time-block views are all derived from those buckets.
+"""
 
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import timedelta, timezone as dt_timezone
 from typing import Dict, List
 
-from django.db.models import Count, Sum
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import ExtractHour, TruncDate
 from django.utils import timezone
 
+from core import activity_log
 from core.models import (
+    ActivityEvent,
     ApplicationGoal,
     CandidateProfile,
     EventFollowUp,
-    Interaction,
     InterviewPreparationTask,
-    InterviewPrepSession,
     JobEntry,
-    JobQuestionPractice,
-    MockInterviewSession,
-    NetworkingEvent,
-    SkillDevelopmentProgress,
 )
 
 
-def _safe_dt(dt):
-    """Normalize datetimes so downstream calculations don't choke on naive values."""
-    if not dt:
-        return None
-    if timezone.is_naive(dt):
-        try:
-            return timezone.make_aware(dt, timezone=timezone.get_current_timezone())
-        except Exception:
-            return timezone.now()
-    return dt
-
-
-def _time_block(dt):
-    hour = dt.hour
+def _time_block(hour: int) -> str:
     if 5 <= hour < 9:
         return "05-09"
     if 9 <= hour < 12:
@@ -55,14 +44,15 @@ class ProductivityAnalyzer:
     def __init__(self, candidate: CandidateProfile):
         self.candidate = candidate
         self.user = candidate.user
+        self._time_block_success = None
 
     def build(self) -> Dict:
         time_data = self._build_time_investment()
-        entries = time_data.pop("entries", [])
-        patterns = self._build_patterns(entries)
+        buckets = time_data.pop("buckets", [])
+        patterns = self._build_patterns(buckets)
         completion = self._build_completion_metrics()
         outcomes = self._build_outcome_links(time_data)
-        balance = self._build_balance(entries)
+        balance = self._build_balance(buckets)
         energy = self._build_energy_patterns()
         recommendations = self._build_recommendations(time_data, patterns, completion, balance, outcomes, energy)
 
@@ -79,77 +69,32 @@ class ProductivityAnalyzer:
     # ----------------------------
     # Time tracking
     # ----------------------------
-    def _collect_time_entries(self) -> List[Dict]:
-        entries: List[Dict] = []
-
-        # Skill development / learning time
-        for record in SkillDevelopmentProgress.objects.filter(candidate=self.candidate):
-            minutes = float(record.hours_spent or 0) * 60
-            if minutes <= 0:
-                minutes = 30  # fallback estimate
-            entries.append({"dt": _safe_dt(record.activity_date), "minutes": minutes, "activity": "skill_development"})
-
-        # Interview prep and practice
-        for prep in InterviewPrepSession.objects.filter(application__candidate=self.candidate):
-            minutes = prep.duration_minutes or 30
-            entries.append({"dt": _safe_dt(prep.session_date), "minutes": minutes, "activity": "interview_preparation"})
-
-        for practice in JobQuestionPractice.objects.filter(job__candidate=self.candidate):
-            minutes = (practice.total_duration_seconds or 0) / 60.0
-            if minutes <= 0:
-                minutes = 15
-            entries.append({"dt": _safe_dt(practice.last_practiced_at), "minutes": minutes, "activity": "interview_preparation"})
-
-        for session in MockInterviewSession.objects.filter(user=self.user):
-            minutes = (session.total_duration_seconds or 0) / 60.0
-            if minutes <= 0 and session.started_at and session.completed_at:
-                minutes = max(0, (session.completed_at - session.started_at).total_seconds() / 60.0)
-            if minutes <= 0:
-                minutes = 20
-            entries.append({"dt": _safe_dt(session.started_at), "minutes": minutes, "activity": "interview_preparation"})
-
-        # Networking and outreach
-        for interaction in Interaction.objects.filter(owner=self.user):
-            minutes = interaction.duration_minutes or 15
-            entries.append({"dt": _safe_dt(interaction.date), "minutes": minutes, "activity": "networking"})
-
-        for event in NetworkingEvent.objects.filter(owner=self.user):
-            if event.end_date and event.event_date:
-                minutes = max(0, (event.end_date - event.event_date).total_seconds() / 60.0)
-            else:
-                minutes = 90
-            entries.append({"dt": _safe_dt(event.event_date), "minutes": minutes, "activity": "networking"})
-
-        # Application time (estimate from creation timestamps)
-        for job in JobEntry.objects.filter(candidate=self.candidate):
-            dt = _safe_dt(job.created_at or job.updated_at)
-            entries.append({"dt": dt, "minutes": 25, "activity": "applications"})
-            # Count explicit application events if present
-            for item in job.application_history or []:
-                action = (item.get("action") or "").lower()
-                if "apply" in action or "submit" in action:
-                    ts = item.get("timestamp") or item.get("at")
-                    try:
-                        event_dt = _safe_dt(datetime.fromisoformat(str(ts).replace("Z", "+00:00")))
-                    except Exception:
-                        event_dt = dt
-                    entries.append({"dt": event_dt, "minutes": 25, "activity": "applications"})
-
-        # Remove entries without usable timestamps
-        return [e for e in entries if e["dt"] is not None]
+    def _collect_time_buckets(self) -> List[Dict]:
+        """Minutes, sessions, and latest timestamp per (activity, UTC day, UTC hour)."""
+        activity_log.ensure_backfilled(self.user)
+        return list(
+            ActivityEvent.objects.filter(user=self.user)
+            .annotate(
+                day=TruncDate("occurred_at", tzinfo=dt_timezone.utc),
+                hour=ExtractHour("occurred_at", tzinfo=dt_timezone.utc),
+            )
+            .values("activity", "day", "hour")
+            .annotate(minutes=Sum("minutes"), sessions=Count("id"), last_logged=Max("occurred_at"))
+            .order_by()
+        )
 
     def _build_time_investment(self) -> Dict:
-        entries = self._collect_time_entries()
+        buckets = self._collect_time_buckets()
         by_activity: Dict[str, Dict] = defaultdict(lambda: {"minutes": 0, "sessions": 0, "last_logged": None})
 
-        for entry in entries:
-            bucket = by_activity[entry["activity"]]
-            bucket["minutes"] += entry["minutes"]
-            bucket["sessions"] += 1
-            last_dt = bucket["last_logged"]
-            bucket["last_logged"] = max(last_dt, entry["dt"]) if last_dt else entry["dt"]
+        for bucket in buckets:
+            totals = by_activity[bucket["activity"]]
+            totals["minutes"] += bucket["minutes"]
+            totals["sessions"] += bucket["sessions"]
+            last_dt = totals["last_logged"]
+            totals["last_logged"] = max(last_dt, bucket["last_logged"]) if last_dt else bucket["last_logged"]
 
-        weekly_hours = self._weekly_hours(entries)
+        weekly_hours = self._weekly_hours(buckets)
         total_minutes = sum(a["minutes"] for a in by_activity.values())
 
         return {
@@ -163,17 +108,17 @@ class ProductivityAnalyzer:
                 for name, data in by_activity.items()
             },
             "weekly_hours": weekly_hours,
-            "entries": entries,
+            "buckets": buckets,
         }
 
-    def _weekly_hours(self, entries: List[Dict]) -> List[Dict]:
-        if not entries:
+    def _weekly_hours(self, buckets: List[Dict]) -> List[Dict]:
+        if not buckets:
             return []
 
         week_buckets = defaultdict(float)
-        for entry in entries:
-            week_start = entry["dt"].date() - timedelta(days=entry["dt"].weekday())
-            week_buckets[week_start] += entry["minutes"]
+        for bucket in buckets:
+            week_start = bucket["day"] - timedelta(days=bucket["day"].weekday())
+            week_buckets[week_start] += bucket["minutes"]
 
         series = []
         for week_start, minutes in sorted(week_buckets.items(), key=lambda kv: kv[0]):
@@ -183,14 +128,13 @@ class ProductivityAnalyzer:
     # ----------------------------
     # Patterns and cadence
     # ----------------------------
-    def _build_patterns(self, entries: List[Dict]) -> Dict:
+    def _build_patterns(self, buckets: List[Dict]) -> Dict:
         days = defaultdict(float)
         blocks = defaultdict(float)
 
-        for entry in entries:
-            dt = entry["dt"]
-            days[dt.strftime("%A")] += entry["minutes"]
-            blocks[_time_block(dt)] += entry["minutes"]
+        for bucket in buckets:
+            days[bucket["day"].strftime("%A")] += bucket["minutes"]
+            blocks[_time_block(bucket["hour"])] += bucket["minutes"]
 
         time_block_success = self._success_by_time_block()
 
@@ -222,23 +166,32 @@ class ProductivityAnalyzer:
         }
 
     def _success_by_time_block(self) -> Dict[str, Dict]:
-        stats = defaultdict(lambda: {"applications": 0, "responses": 0, "offers": 0})
-        qs = JobEntry.objects.filter(candidate=self.candidate)
+        if self._time_block_success is not None:
+            return self._time_block_success
 
-        for job in qs:
-            dt = _safe_dt(job.created_at or job.updated_at or timezone.now())
-            block = _time_block(dt)
-            stats[block]["applications"] += 1
-            if job.status and job.status not in ["interested", "applied"]:
-                stats[block]["responses"] += 1
-            if job.status == "offer":
-                stats[block]["offers"] += 1
+        stats = defaultdict(lambda: {"applications": 0, "responses": 0, "offers": 0})
+        rows = (
+            JobEntry.objects.filter(candidate=self.candidate)
+            .annotate(hour=ExtractHour("created_at", tzinfo=dt_timezone.utc))
+            .values("hour", "status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+
+        for row in rows:
+            block = _time_block(row["hour"])
+            stats[block]["applications"] += row["count"]
+            if row["status"] and row["status"] not in ["interested", "applied"]:
+                stats[block]["responses"] += row["count"]
+            if row["status"] == "offer":
+                stats[block]["offers"] += row["count"]
 
         for block, data in stats.items():
             applications = data["applications"] or 1
             data["response_rate"] = round((data["responses"] / applications) * 100, 2)
             data["offer_rate"] = round((data["offers"] / applications) * 100, 2)
 
+        self._time_block_success = stats
         return stats
 
     # ----------------------------
@@ -297,8 +250,8 @@ class ProductivityAnalyzer:
     # ----------------------------
     # Balance & energy
     # ----------------------------
-    def _build_balance(self, entries: List[Dict]) -> Dict:
-        if not entries:
+    def _build_balance(self, buckets: List[Dict]) -> Dict:
+        if not buckets:
             return {
                 "avg_daily_hours": 0,
                 "late_sessions": 0,
@@ -311,11 +264,11 @@ class ProductivityAnalyzer:
         now = timezone.now().date()
         window_start = now - timedelta(days=14)
 
-        for entry in entries:
-            if entry["dt"].date() >= window_start:
-                daily_minutes[entry["dt"].date()] += entry["minutes"]
-            if entry["dt"].hour >= 22 or entry["dt"].hour < 6:
-                late_sessions += 1
+        for bucket in buckets:
+            if bucket["day"] >= window_start:
+                daily_minutes[bucket["day"]] += bucket["minutes"]
+            if bucket["hour"] >= 22 or bucket["hour"] < 6:
+                late_sessions += bucket["sessions"]
 
         if daily_minutes:
             avg_daily_hours = sum(daily_minutes.values()) / (len(daily_minutes) * 60.0)
@@ -18,7 +18,7 @@ from django.conf import settings
 from django.utils import timezone
 
 from core.interview_insights import InterviewInsightsGenerator
-from core.skills_gap_analysis import SkillsGapAnalyzer
+from core.job_description_cache import interview_insights, job_requirements
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +90,7 @@ class QuestionBankBuilder:
         self.role_type = InterviewInsightsGenerator._get_role_type(job.title or "")
 
         # Use extracted job requirements to link questions to skills
-        self.required_skills = SkillsGapAnalyzer._extract_job_requirements(job)[:8]
+        self.required_skills = job_requirements(job)["skills"][:8]
 
     def build(self) -> Dict[str, Any]:
         ai_bank = self._build_from_ai()
@@ -141,7 +141,7 @@ class QuestionBankBuilder:
 
         model = getattr(settings, "GEMINI_MODEL", "gemini-2.5-flash")
         try:
-            insights = InterviewInsightsGenerator.generate_for_job(
+            insights = interview_insights(
                 job_title=self.job.title or "",
                 company_name=self.job.company_name or "",
                 api_key=api_key,
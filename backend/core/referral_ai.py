@@ -14,6 +14,9 @@ from datetime import datetime, timedelta
 from django.utils import timezone
 from django.conf import settings
 
+from core import llm_gateway
+from core.api_monitoring import SERVICE_OPENAI, get_or_create_service
+
 # OpenAI is optional — keep import lazy so missing package doesn't fail imports
 openai = None
 OPENAI_AVAILABLE = False
@@ -98,24 +101,34 @@ class ReferralRequestAI:
                 additional_context=additional_context
             )
             
-            # Call OpenAI API
-            response = openai.ChatCompletion.create(
-                model="gpt-4",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert career coach specializing in professional networking and referral requests. Generate personalized, effective, and appropriately-toned referral request messages that respect relationships and maximize success probability."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
+            # Call OpenAI API (identical requests in flight share one response)
+            messages = [
+                {
+                    "role": "system",
+                    "content": "You are an expert career coach specializing in professional networking and referral requests. Generate personalized, effective, and appropriately-toned referral request messages that respect relationships and maximize success probability."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+            config = {'temperature': 0.7, 'max_tokens': 800}
             
-            content = response.choices[0].message.content.strip()
+            def _request():
+                response = openai.ChatCompletion.create(model="gpt-4", messages=messages, **config)
+                usage = getattr(response, 'usage', None)
+                return response.choices[0].message.content, getattr(usage, 'total_tokens', 0) or 0
+            
+            content = llm_gateway.generate(
+                "\n\n".join(message['content'] for message in messages),
+                model="gpt-4",
+                config=config,
+                call=_request,
+                provider=SERVICE_OPENAI,
+                service=get_or_create_service(SERVICE_OPENAI, 'openai'),
+                validate=llm_gateway.require_text,
+                use_cache=False,
+            ).strip()
             
             # Parse the response to extract message and subject
             message, subject = self._parse_ai_response(content)
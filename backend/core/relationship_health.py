@@ -0,0 +1,197 @@
+"""
+Persisted relationship maintenance scores for contacts.
+
+``relationship_maintenance_overview`` used to reload every contact's latest
+interactions and notes on each request (two queries per contact, since the
+ordered/sliced calls bypassed the prefetch cache). The per-contact inputs are
+now kept on ``Contact``:
+
+* ``latest_interaction_at`` and ``recent_interaction_dates``: the newest
+  interaction and the dates (within the recent window) of the latest
+  ``INTERACTION_WINDOW`` interactions, so recency can be re-evaluated at read
+  time without touching interactions
+* ``reciprocity_given``/``reciprocity_received``/``outstanding_follow_ups``
+* ``note_interests``: interests from the first ``NOTE_WINDOW`` notes
+* ``next_reminder_due``: the earliest open reminder
+* ``health_score``/``cadence_days``: scores as of ``scores_refreshed_at``
+
+Signals in core.signals refresh a contact when its interactions, notes, or
+reminders change. ``refresh_contacts`` scores many contacts at once with
+windowed ``Prefetch`` querysets, streamed in chunks.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.models import Contact, ContactNote, Interaction, Reminder
+
+logger = logging.getLogger(__name__)
+
+IMPORTANT_RELATIONSHIP_TYPES = ('mentor', 'manager', 'hiring_manager', 'sponsor', 'referrer', 'recruiter')
+RECENT_WINDOW_DAYS = 30
+INTERACTION_WINDOW = 50
+NOTE_WINDOW = 20
+
+SCORE_FIELDS = [
+    'health_score', 'cadence_days', 'reciprocity_given', 'reciprocity_received', 'outstanding_follow_ups',
+    'latest_interaction_at', 'recent_interaction_dates', 'note_interests', 'next_reminder_due',
+    'scores_refreshed_at',
+]
+
+# Contact fields the scores depend on; saves touching none of them keep the scores
+TRACKED_CONTACT_FIELDS = {'relationship_strength', 'relationship_type', 'last_interaction', *SCORE_FIELDS}
+
+
+def is_important(contact: Contact) -> bool:
+    return (contact.relationship_strength or 0) >= 7 or contact.relationship_type in IMPORTANT_RELATIONSHIP_TYPES
+
+
+def cadence_days(contact: Contact) -> int:
+    """Days between check-ins: important relationships get a monthly cadence, others weekly."""
+    return 30 if is_important(contact) else 7
+
+
+def last_touch(contact: Contact) -> Optional[datetime]:
+    return contact.last_interaction or contact.latest_interaction_at or contact.created_at
+
+
+def recent_interaction_count(contact: Contact, now: datetime) -> int:
+    """Interactions in the recent window, from the dates captured at the last refresh."""
+    window_start = now - timedelta(days=RECENT_WINDOW_DAYS)
+    count = 0
+    for value in contact.recent_interaction_dates or []:
+        at = parse_datetime(value) if isinstance(value, str) else None
+        if at and at >= window_start:
+            count += 1
+    return count
+
+
+def health_score(contact: Contact, now: datetime, recent: Optional[int] = None) -> int:
+    """0-100 health from relationship strength, recent touches, and time since the last touch."""
+    recent = recent_interaction_count(contact, now) if recent is None else recent
+    touched = last_touch(contact)
+    days_since_touch = (now - touched).days if touched else None
+    score = 50
+    score += min(30, (contact.relationship_strength or 0) * 3)
+    score += min(15, recent * 2)
+    if days_since_touch:
+        score -= min(20, max(0, days_since_touch - 14) / 2)
+    return max(5, min(100, int(score)))
+
+
+def reciprocity_status(balance: int) -> str:
+    if balance > 1:
+        return "you've provided more"
+    if balance < -1:
+        return "they've provided more"
+    return "balanced"
+
+
+def _note_interests(notes: Iterable[ContactNote]) -> List[str]:
+    interests = []
+    seen = set()
+    for note in notes:
+        if not isinstance(note.interests, list):
+            continue
+        for item in note.interests:
+            if not item or str(item).lower() in seen:
+                continue
+            seen.add(str(item).lower())
+            interests.append(str(item))
+    return interests
+
+
+def apply_scores(contact: Contact, interactions: List[Interaction], notes: List[ContactNote],
+                 reminders: List[Reminder], now: datetime):
+    """Set the score fields on ``contact`` (unsaved) from its latest rows.
+
+    Args:
+        interactions: Newest first, at most INTERACTION_WINDOW
+        notes: Oldest first, at most NOTE_WINDOW
+        reminders: Open reminders, earliest due first
+    """
+    window_start = now - timedelta(days=RECENT_WINDOW_DAYS)
+    gives = asks = outstanding = 0
+    for interaction in interactions:
+        meta = interaction.metadata if isinstance(interaction.metadata, dict) else {}
+        if meta.get('direction') in ('give', 'support') or meta.get('value_provided'):
+            gives += 1
+        if meta.get('direction') == 'ask' or meta.get('request_made'):
+            asks += 1
+        if interaction.follow_up_needed:
+            outstanding += 1
+
+    contact.latest_interaction_at = interactions[0].date if interactions else None
+    contact.recent_interaction_dates = [
+        i.date.isoformat() for i in interactions if i.date and i.date >= window_start
+    ]
+    contact.reciprocity_given = gives
+    contact.reciprocity_received = asks
+    contact.outstanding_follow_ups = outstanding
+    contact.note_interests = _note_interests(notes)
+    contact.next_reminder_due = reminders[0].due_date if reminders else None
+    contact.cadence_days = cadence_days(contact)
+    contact.health_score = health_score(contact, now)
+    contact.scores_refreshed_at = now
+
+
+def score_prefetches() -> List[Prefetch]:
+    """Windowed, ordered prefetches holding exactly what ``apply_scores`` reads."""
+    return [
+        Prefetch(
+            'interactions',
+            queryset=Interaction.objects.only('id', 'contact_id', 'date', 'metadata', 'follow_up_needed')
+            .order_by('-date')[:INTERACTION_WINDOW],
+            to_attr='score_interactions',
+        ),
+        Prefetch(
+            'notes',
+            queryset=ContactNote.objects.only('id', 'contact_id', 'interests', 'created_at')
+            .order_by('created_at')[:NOTE_WINDOW],
+            to_attr='score_notes',
+        ),
+        Prefetch(
+            'reminders',
+            queryset=Reminder.objects.filter(completed=False).only('id', 'contact_id', 'due_date')
+            .order_by('due_date')[:1],
+            to_attr='score_reminders',
+        ),
+    ]
+
+
+def refresh_contacts(contacts, now: Optional[datetime] = None, chunk_size: int = 500) -> int:
+    """Recompute and save the scores of every contact in ``contacts``.
+
+    Returns:
+        Number of contacts refreshed
+    """
+    now = now or timezone.now()
+    refreshed = 0
+    batch = []
+    for contact in contacts.prefetch_related(*score_prefetches()).iterator(chunk_size=chunk_size):
+        apply_scores(contact, contact.score_interactions, contact.score_notes, contact.score_reminders, now)
+        batch.append(contact)
+        if len(batch) >= chunk_size:
+            Contact.objects.bulk_update(batch, SCORE_FIELDS)
+            refreshed += len(batch)
+            batch = []
+    if batch:
+        Contact.objects.bulk_update(batch, SCORE_FIELDS)
+        refreshed += len(batch)
+    return refreshed
+
+
+def refresh_contact_id(contact_id) -> int:
+    """Refresh one contact's scores (no-op when the contact is gone)."""
+    return refresh_contacts(Contact.objects.filter(pk=contact_id))
+
+
+def initialize_new_contact(contact: Contact, now: Optional[datetime] = None):
+    """Score a just-created contact, which has no interactions, notes, or reminders yet."""
+    now = now or timezone.now()
+    apply_scores(contact, [], [], [], now)
+    Contact.objects.filter(pk=contact.pk).update(**{field: getattr(contact, field) for field in SCORE_FIELDS})
@@ -5,6 +5,8 @@ import requests
 import yfinance as yf
 from django.utils.text import slugify
 
+from core import http
+
 logger = logging.getLogger(__name__)
 
 YAHOO_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search"
@@ -56,8 +58,9 @@ def fetch_profile_from_yfinance(company_name):
 
 def search_symbol(company_name):
     try:
-        response = requests.get(
+        response = http.get(
             YAHOO_SEARCH_URL,
+            policy="research",
             params={"q": company_name, "lang": "en-US", "region": "US"},
             headers=HEADERS,
             timeout=10,
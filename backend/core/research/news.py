@@ -9,6 +9,8 @@ from urllib.parse import quote, urlparse
 import requests
 from bs4 import BeautifulSoup
 
+from core import http
+
 logger = logging.getLogger(__name__)
 
 GOOGLE_NEWS_SEARCH = "https://news.google.com/rss/search?q={query}&hl=en-US&gl=US&ceid=US:en"
@@ -40,7 +42,7 @@ def fetch_recent_company_news(
 
     query = quote(f'"{company_name}" company news')
     url = GOOGLE_NEWS_SEARCH.format(query=query)
-    sess = session or requests.Session()
+    sess = session or http.get_session("research")
 
     try:
         response = sess.get(url, timeout=15, headers=DEFAULT_HEADERS)
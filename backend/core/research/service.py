@@ -20,18 +20,20 @@ Enhanced with multi-source data collection:
 
 import logging
 import re
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, List, Optional
 import requests
 from bs4 import BeautifulSoup
+from django.conf import settings
+from django.db import connection
 from django.utils import timezone
 import json
 
+from core import http
 from core.models import Company, CompanyResearch
 from .news import fetch_recent_company_news
-from .enrichment import (
-    fetch_profile_from_yfinance,
-    fallback_domain,
-)
+from .enrichment import fetch_profile_from_yfinance
 from .sources.wikipedia_scraper import fetch_wikipedia_data
 from .sources.wikidata_scraper import fetch_wikidata
 from .sources.linkedin_scraper import fetch_linkedin_data
@@ -50,6 +52,22 @@ SOCIAL_MEDIA_PLATFORMS = [
     "github.com",
 ]
 
+# Time budget (seconds) for each source in the concurrent fan-out; whatever has
+# not arrived by then is recorded as timed out and research continues without it.
+# Override per source with settings.COMPANY_RESEARCH_SOURCE_TIMEOUTS.
+SOURCE_TIMEOUTS = {
+    "news": 15,
+    "yfinance": 15,
+    "wikipedia": 20,
+    "wikidata": 15,
+    "linkedin": 12,
+    "website": 12,
+    "clearbit": 6,
+    "github": 15,
+}
+DEFAULT_SOURCE_TIMEOUT = 15
+RESEARCH_FANOUT_WORKERS = 8
+
 
 class CompanyResearchService:
     """
@@ -64,6 +82,9 @@ class CompanyResearchService:
         self.company = None
         self.research_data = {}
         self.max_news_items = max_news_items
+        # Raw per-source results and {'status', 'elapsed_ms'} timings from _gather_sources()
+        self._sources = {}
+        self.source_timings = {}
 
     def research_company(self, force_refresh: bool = False) -> Dict:
         """
@@ -87,6 +108,9 @@ class CompanyResearchService:
             # Perform comprehensive research
             logger.info(f"Starting automated research for {self.company_name}")
             
+            # 0. Fetch every independent source concurrently; later stages reuse the results
+            self._gather_sources()
+            
             # 1. Find recent news and press releases (FIRST - used for validation)
             self._fetch_recent_news()
             
@@ -131,17 +155,10 @@ class CompanyResearchService:
         return self.research_company(force_refresh=force_refresh)
 
     def _get_or_create_company(self) -> Company:
-        """Get existing company or create new one."""
-        company = Company.objects.filter(name__iexact=self.company_name).first()
-        
-        if not company:
-            domain = fallback_domain(self.company_name)
-            company = Company.objects.create(
-                name=self.company_name,
-                domain=domain
-            )
-            logger.info(f"Created new company: {self.company_name}")
-        
+        """Resolve the company by normalized name, alias or domain; create it if unknown."""
+        from core.company_resolution import get_or_create_company
+
+        company, _ = get_or_create_company(self.company_name)
         return company
 
     def _has_recent_research(self, hours: int = 24) -> bool:
@@ -155,11 +172,100 @@ class CompanyResearchService:
             pass
         return False
 
+    def _source_loaders(self) -> Dict[str, Callable]:
+        """Fetchers for every source that does not depend on another source's result."""
+        return {
+            'news': lambda: fetch_recent_company_news(self.company_name, max_results=self.max_news_items),
+            'yfinance': lambda: fetch_profile_from_yfinance(self.company_name),
+            'wikipedia': lambda: fetch_wikipedia_data(self.company_name),
+            'wikidata': lambda: fetch_wikidata(self.company_name),
+            'linkedin': lambda: fetch_linkedin_data(self.company_name, self.company.linkedin_url),
+            'website': self._scrape_company_website,
+            'clearbit': self._fetch_clearbit_data,
+            'github': lambda: fetch_github_data(self.company_name, None),
+        }
+
+    def _gather_sources(self, names: Optional[List[str]] = None):
+        """
+        Fetch independent sources concurrently on a bounded thread pool.
+        
+        Each source gets its own deadline (SOURCE_TIMEOUTS) measured from the
+        start of the fan-out. Results that arrive in time are kept in
+        ``self._sources``; late or failing sources are recorded as empty so later
+        stages don't refetch them. Per-source status and elapsed time are kept in
+        ``self.source_timings`` and ``research_data['source_timings']``.
+        """
+        loaders = self._source_loaders()
+        names = [name for name in (names or loaders) if name not in self._sources]
+        if not names:
+            return
+        
+        timeouts = {**SOURCE_TIMEOUTS, **getattr(settings, 'COMPANY_RESEARCH_SOURCE_TIMEOUTS', {})}
+        started = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=min(RESEARCH_FANOUT_WORKERS, len(names)),
+            thread_name_prefix='company-research',
+        )
+        try:
+            futures = {name: executor.submit(self._run_pooled_source, loaders[name]) for name in names}
+            for name in sorted(names, key=lambda n: timeouts.get(n, DEFAULT_SOURCE_TIMEOUT)):
+                remaining = started + timeouts.get(name, DEFAULT_SOURCE_TIMEOUT) - time.monotonic()
+                try:
+                    result, error, elapsed = futures[name].result(timeout=max(remaining, 0))
+                except FuturesTimeoutError:
+                    futures[name].cancel()
+                    result, error, elapsed = None, 'timeout', time.monotonic() - started
+                self._record_source(name, result, error, elapsed)
+        finally:
+            # Don't wait for sources that missed their deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        self.research_data['source_timings'] = self.source_timings
+        slowest = max(self.source_timings.items(), key=lambda item: item[1]['elapsed_ms'])
+        logger.info(
+            f"Fetched {len(names)} sources for {self.company_name} in "
+            f"{int((time.monotonic() - started) * 1000)}ms (slowest: {slowest[0]} {slowest[1]['elapsed_ms']}ms, "
+            f"timed out: {self._sources_with_status('timeout') or 'none'})"
+        )
+
+    @staticmethod
+    def _run_source(loader: Callable):
+        """Run one source fetcher, returning ``(result, error, elapsed_seconds)``."""
+        started = time.monotonic()
+        try:
+            return loader(), None, time.monotonic() - started
+        except Exception as e:
+            logger.warning(f"Research source failed: {e}")
+            return None, 'error', time.monotonic() - started
+
+    @classmethod
+    def _run_pooled_source(cls, loader: Callable):
+        try:
+            return cls._run_source(loader)
+        finally:
+            # Pool threads get their own DB connection if a fetcher touched the ORM
+            connection.close()
+
+    def _record_source(self, name: str, result, error: Optional[str], elapsed: float):
+        self._sources[name] = result
+        status = error or ('ok' if result else 'empty')
+        self.source_timings[name] = {'status': status, 'elapsed_ms': int(elapsed * 1000)}
+
+    def _source(self, name: str):
+        """Return a source's result, fetching it synchronously if the fan-out did not run."""
+        if name not in self._sources:
+            result, error, elapsed = self._run_source(self._source_loaders()[name])
+            self._record_source(name, result, error, elapsed)
+        return self._sources[name]
+
+    def _sources_with_status(self, status: str) -> List[str]:
+        return sorted(name for name, timing in self.source_timings.items() if timing['status'] == status)
+
     def _gather_basic_info(self):
         """
         Gather basic company information using multiple sources.
         
-        Sources tried in order:
+        Sources (fetched concurrently by _gather_sources):
         1. yfinance (with validation)
         2. Wikipedia + Wikidata
         3. LinkedIn
@@ -172,7 +278,7 @@ class CompanyResearchService:
             aggregated_data = {}
             
             # SOURCE 1: yfinance (validated)
-            profile = fetch_profile_from_yfinance(self.company_name)
+            profile = self._source('yfinance')
             yfinance_valid = False
             
             if profile:
@@ -184,19 +290,19 @@ class CompanyResearchService:
                     logger.warning(f"✗ yfinance data rejected for {self.company_name}")
             
             # SOURCE 2: Wikipedia
-            wiki_data = fetch_wikipedia_data(self.company_name)
+            wiki_data = self._source('wikipedia')
             if wiki_data:
                 logger.info(f"✓ Wikipedia data found for {self.company_name}")
                 aggregated_data['wikipedia'] = wiki_data
             
             # SOURCE 3: Wikidata
-            wikidata = fetch_wikidata(self.company_name)
+            wikidata = self._source('wikidata')
             if wikidata:
                 logger.info(f"✓ Wikidata found for {self.company_name}")
                 aggregated_data['wikidata'] = wikidata
             
             # SOURCE 4: LinkedIn
-            linkedin_data = fetch_linkedin_data(self.company_name, self.company.linkedin_url)
+            linkedin_data = self._source('linkedin')
             if linkedin_data:
                 logger.info(f"✓ LinkedIn data found for {self.company_name}")
                 aggregated_data['linkedin'] = linkedin_data
@@ -205,13 +311,13 @@ class CompanyResearchService:
                     self.company.linkedin_url = linkedin_data['linkedin_url']
             
             # SOURCE 5: Website scraping
-            website_data = self._scrape_company_website()
+            website_data = self._source('website')
             if website_data:
                 logger.info(f"✓ Website data scraped for {self.company_name}")
                 aggregated_data['website'] = website_data
             
             # SOURCE 6: Clearbit
-            clearbit_data = self._fetch_clearbit_data()
+            clearbit_data = self._source('clearbit')
             if clearbit_data:
                 logger.info(f"✓ Clearbit data found for {self.company_name}")
                 aggregated_data['clearbit'] = clearbit_data
@@ -231,6 +337,10 @@ class CompanyResearchService:
             
             self.company.save()
             
+            # Record which sources did not contribute (failed or missed their deadline)
+            final_data['sources_timed_out'] = self._sources_with_status('timeout')
+            final_data['sources_failed'] = self._sources_with_status('error')
+            
             # Store in research_data
             self.research_data['basic_info'] = final_data
             
@@ -414,7 +524,7 @@ class CompanyResearchService:
             url = f"https://{self.company.domain}"
             logger.info(f"Scraping company website: {url}")
             
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            response = http.get(url, policy='research', headers=HEADERS)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -493,7 +603,7 @@ class CompanyResearchService:
             # Clearbit logo API - free tier
             url = f"https://autocomplete.clearbit.com/v1/companies/suggest?query={self.company_name}"
             
-            response = requests.get(url, headers=HEADERS, timeout=5)
+            response = http.get(url, policy='research', headers=HEADERS, timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data and len(data) > 0:
@@ -519,7 +629,7 @@ class CompanyResearchService:
             search_query = f"{self.company_name} company headquarters location industry"
             search_url = f"https://www.google.com/search?q={requests.utils.quote(search_query)}"
             
-            response = requests.get(search_url, headers=HEADERS, timeout=10)
+            response = http.get(search_url, policy='research', headers=HEADERS)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Try to extract info from knowledge graph or featured snippets
@@ -540,7 +650,7 @@ class CompanyResearchService:
         """Research company mission, values, and culture."""
         try:
             # Get data from yfinance profile
-            profile = fetch_profile_from_yfinance(self.company_name)
+            profile = self._source('yfinance')
             
             if profile:
                 description = profile.get('description', '')
@@ -561,7 +671,7 @@ class CompanyResearchService:
                 # ENHANCED FALLBACK: Use website data
                 logger.info(f"Using website data for mission/culture for {self.company_name}")
                 
-                website_data = self._scrape_company_website()
+                website_data = self._source('website') or {}
                 description = website_data.get('description', '')
                 about_text = website_data.get('about', '')
                 
@@ -646,7 +756,7 @@ class CompanyResearchService:
     def _fetch_recent_news(self):
         """Fetch recent news and press releases."""
         try:
-            news_items = fetch_recent_company_news(self.company_name, max_results=self.max_news_items)
+            news_items = self._source('news') or []
             self.research_data['recent_news'] = news_items
             logger.info(f"Fetched {len(news_items)} news items for {self.company_name}")
         except Exception as e:
@@ -660,7 +770,7 @@ class CompanyResearchService:
             
             # Try to get executive data from yfinance
             try:
-                profile = fetch_profile_from_yfinance(self.company_name)
+                profile = self._source('yfinance')
                 if profile:
                     # yfinance may have some executive info in company info
                     # For now, we'll use a placeholder approach
@@ -693,7 +803,7 @@ class CompanyResearchService:
             
             # SOURCE 1: Wikipedia (often has detailed product listings)
             if 'wikipedia' in self.research_data.get('basic_info', {}).get('sources_used', []):
-                wiki_data = fetch_wikipedia_data(self.company_name)
+                wiki_data = self._source('wikipedia') or {}
                 if wiki_data.get('products'):
                     products.extend(wiki_data['products'])
                     logger.info(f"Found {len(wiki_data['products'])} products from Wikipedia")
@@ -711,7 +821,7 @@ class CompanyResearchService:
             
             # SOURCE 3: Extract from yfinance description if needed
             if len(products) < 3:
-                profile = fetch_profile_from_yfinance(self.company_name)
+                profile = self._source('yfinance')
                 if profile:
                     description = profile.get('description', '')
                     text_products = self._extract_products_from_text(description)
@@ -740,7 +850,10 @@ class CompanyResearchService:
         github_url = social_media.get('github')
         
         if github_url or self.company_name:
-            github_data = fetch_github_data(self.company_name, github_url)
+            if github_url:
+                github_data = fetch_github_data(self.company_name, github_url)
+            else:
+                github_data = self._source('github')
             if github_data:
                 # Store tech stack if found
                 if github_data.get('tech_stack'):
@@ -793,7 +906,7 @@ class CompanyResearchService:
             industry = self.research_data.get('basic_info', {}).get('industry', '')
             
             # SOURCE 1: Wikipedia
-            wiki_data = fetch_wikipedia_data(self.company_name)
+            wiki_data = self._source('wikipedia') or {}
             if wiki_data.get('competitors'):
                 competitors.extend(wiki_data['competitors'])
                 logger.info(f"Found {len(wiki_data['competitors'])} competitors from Wikipedia")
@@ -841,7 +954,7 @@ class CompanyResearchService:
             
             # If we don't have much yet, try to scrape again
             if len(social_media) < 2 and self.company.domain:
-                website_data = self._scrape_company_website()
+                website_data = self._source('website') or {}
                 if website_data.get('social_media'):
                     social_media.update(website_data['social_media'])
             
@@ -1154,7 +1267,7 @@ class CompanyResearchService:
                 research.tech_stack = research.tech_stack or []
             
             # Funding info
-            profile = fetch_profile_from_yfinance(self.company_name)
+            profile = self._source('yfinance')
             if profile:
                 research.funding_info = profile.get('funding_info', {})
             
@@ -1229,6 +1342,7 @@ class CompanyResearchService:
                 'summary': self.research_data.get('summary', research.description or ''),
                 # Include the aggregated basic_info with sources
                 'basic_info': basic_info,
+                'source_timings': self.source_timings,
             }
             
         except CompanyResearch.DoesNotExist:
@@ -11,6 +11,7 @@ Scrapes publicly available data from LinkedIn company pages (no login required):
 
 import logging
 import requests
+from core import http
 from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 import re
@@ -48,7 +49,7 @@ class LinkedInScraper:
             logger.info(f"Scraping LinkedIn: {self.linkedin_url}")
             
             # Fetch the company page
-            response = requests.get(self.linkedin_url, headers=HEADERS, timeout=10)
+            response = http.get(self.linkedin_url, policy='research', headers=HEADERS)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -80,7 +81,7 @@ class LinkedInScraper:
             search_query = f"{self.company_name} site:linkedin.com/company"
             search_url = f"https://www.google.com/search?q={requests.utils.quote(search_query)}"
             
-            response = requests.get(search_url, headers=HEADERS, timeout=10)
+            response = http.get(search_url, policy='research', headers=HEADERS)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Look for LinkedIn company URLs in search results
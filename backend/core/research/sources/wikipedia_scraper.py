@@ -14,9 +14,10 @@ import logging
 import wikipedia
 from typing import Dict, Optional, List
 import re
-import requests
 from bs4 import BeautifulSoup
 
+from core import http
+
 logger = logging.getLogger(__name__)
 
 
@@ -124,7 +125,7 @@ class WikipediaScraper:
             if not self.page:
                 return
             
-            response = requests.get(self.page.url, timeout=10)
+            response = http.get(self.page.url, policy='research')
             if response.status_code == 200:
                 self.soup = BeautifulSoup(response.content, 'html.parser')
                 logger.debug(f"Fetched HTML for {self.page.title}")
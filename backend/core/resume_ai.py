@@ -13,21 +13,18 @@ import logging
 import re
 import textwrap
 from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import date, datetime
-from pathlib import Path
-from typing import Any, Dict, List, Sequence
-import time
-import random
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
 
 import requests
 from django.conf import settings
 from django.utils import timezone
 from django.utils.text import slugify
-from shutil import which
-import subprocess
-import tempfile
-import os
-from core.api_monitoring import track_api_call, get_or_create_service, SERVICE_GEMINI
+from core import http, latex_compiler, llm_gateway, pdf_cache
+from core.json_stream import JSONStreamParser
+from core.api_monitoring import get_or_create_service, SERVICE_GEMINI
 
 from core.models import (
     CandidateSkill,
@@ -211,6 +208,32 @@ class ResumeAIError(Exception):
     """Raised when we cannot return AI-generated resume content."""
 
 
+class GeminiRetryableError(ResumeAIError):
+    """Gemini was rate limited or unavailable; the request may succeed if retried later."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+_single_attempt: ContextVar[bool] = ContextVar('gemini_single_attempt', default=False)
+
+
+@contextmanager
+def single_attempt():
+    """
+    Make one Gemini attempt per call inside the block.
+
+    Instead of sleeping between retries, ``call_gemini_api`` raises
+    ``GeminiRetryableError`` so a task queue can schedule the retry.
+    """
+    token = _single_attempt.set(True)
+    try:
+        yield
+    finally:
+        _single_attempt.reset(token)
+
+
 def _format_date_value(value: Any) -> str | None:
     if not value:
         return None
@@ -482,13 +505,8 @@ Job:
     return prompt
 
 
-def call_gemini_api(prompt: str, api_key: str, *, model: str | None = None, timeout: int = 40) -> str:
-    if not api_key:
-        raise ResumeAIError('Gemini API key is not configured.')
-    model_name = model or getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
-    endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
-    # Prepare payload
-    payload = {
+def _gemini_payload(prompt: str) -> Dict[str, Any]:
+    return {
         'contents': [
             {
                 'role': 'user',
@@ -503,89 +521,180 @@ def call_gemini_api(prompt: str, api_key: str, *, model: str | None = None, time
         },
     }
 
-    # Retry/backoff parameters for transient errors
-    max_retries = 5
-    base_backoff = 2.0
-    rate_limit_backoff = 15.0  # Longer backoff for rate limit errors (429) - Gemini free tier has strict limits
+
+def _retry_after_seconds(response) -> float | None:
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_gemini_api(
+    prompt: str,
+    api_key: str,
+    *,
+    model: str | None = None,
+    timeout: int = 40,
+    use_cache: bool = True,
+) -> str:
+    """Generate text with Gemini through the LLM gateway.
+
+    ``use_cache=False`` is for user-initiated generation, where asking again
+    should produce a new response: the cached one is skipped, but identical
+    calls already in flight are still shared.
+    """
+    if not api_key:
+        raise ResumeAIError('Gemini API key is not configured.')
+    model_name = model or getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+    endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
+    payload = _gemini_payload(prompt)
 
     # Get or create Gemini service for monitoring
     service = get_or_create_service(SERVICE_GEMINI, 'gemini')
 
-    last_exc = None
-    for attempt in range(1, max_retries + 1):
+    # Inside single_attempt() retries are left to the caller's task queue
+    queued_retries = _single_attempt.get()
+    error_class = GeminiRetryableError if queued_retries else ResumeAIError
+
+    def _request():
+        # Retries, backoff (longer for 429s - Gemini free tier has strict limits) and
+        # per-attempt tracking are handled by the pooled 'gemini' client policy.
         try:
-            # Avoid logging the API key by not including query params in logs
-            safe_endpoint = endpoint
-            with track_api_call(service, endpoint=f'/v1beta/models/{model_name}:generateContent', method='POST'):
-                response = requests.post(endpoint, params={'key': api_key}, json=payload, timeout=timeout)
-            
-            # Handle rate limiting (429) with longer backoff
-            if response.status_code == 429:
-                logger.warning('Gemini API rate limit hit (429) on attempt %s/%s', attempt, max_retries)
-                last_exc = requests.HTTPError(f'Rate limit exceeded: {response.status_code}')
-                if attempt < max_retries:
-                    # Use more aggressive exponential backoff for rate limits
-                    sleep_for = rate_limit_backoff * (2 ** (attempt - 1)) * (0.5 + random.random() * 0.5)
-                    logger.info('Backing off for %.2f seconds before retry...', sleep_for)
-                    time.sleep(sleep_for)
-                    continue
-                else:
-                    logger.error('Gemini API rate limit exceeded after %s attempts', max_retries)
-                    raise ResumeAIError('Gemini API rate limit exceeded. Please wait a moment and try again.') from last_exc
-            
-            # If we get a server error, treat as transient and retry
-            if 500 <= response.status_code < 600:
-                logger.warning('Gemini API server error (status=%s) on attempt %s/%s', response.status_code, attempt, max_retries)
-                last_exc = requests.HTTPError(f'Server error: {response.status_code}')
-                # Backoff before next attempt
-                if attempt < max_retries:
-                    sleep_for = base_backoff * (2 ** (attempt - 1)) * (0.5 + random.random() * 0.5)
-                    time.sleep(sleep_for)
-                    continue
-                else:
-                    # Exhausted retries
-                    response.raise_for_status()
-            response.raise_for_status()
-            break
+            response = http.post(
+                endpoint,
+                policy='gemini',
+                service=service,
+                endpoint=f'/v1beta/models/{model_name}:generateContent',
+                max_retries=0 if queued_retries else None,
+                params={'key': api_key},
+                json=payload,
+                timeout=timeout,
+            )
         except requests.RequestException as exc:
-            # Treat DNS/network/timeouts as transient
-            logger.warning('Gemini API request exception on attempt %s/%s: %s', attempt, max_retries, str(exc))
-            last_exc = exc
-            if attempt < max_retries:
-                sleep_for = base_backoff * (2 ** (attempt - 1)) * (0.5 + random.random() * 0.5)
-                time.sleep(sleep_for)
-                continue
-            logger.error('Gemini API request failed after %s attempts: %s', max_retries, str(last_exc))
-            raise ResumeAIError('Gemini service unavailable. Please try again later.') from exc
-
-    data = response.json()
+            # Avoid logging the API key: the exception text may contain the full URL
+            logger.error('Gemini API request failed after retries: %s', type(exc).__name__)
+            raise error_class('Gemini service unavailable. Please try again later.') from exc
+
+        if response.status_code == 429:
+            logger.error('Gemini API rate limit exceeded after retries')
+            message = 'Gemini API rate limit exceeded. Please wait a moment and try again.'
+            if queued_retries:
+                raise GeminiRetryableError(message, retry_after=_retry_after_seconds(response))
+            raise ResumeAIError(message)
+        if response.status_code >= 400:
+            logger.error('Gemini API returned status %s', response.status_code)
+            if response.status_code in http.RETRYABLE_STATUSES:
+                raise error_class('Gemini service unavailable. Please try again later.')
+            raise ResumeAIError('Gemini service unavailable. Please try again later.')
+
+        data = response.json()
     
-    # Check for content filtering or blocking
-    if 'promptFeedback' in data:
-        feedback = data['promptFeedback']
-        block_reason = feedback.get('blockReason')
-        if block_reason:
-            logger.error('Gemini blocked request. Reason: %s', block_reason)
-            raise ResumeAIError(f'Content was blocked by Gemini: {block_reason}. Please try with different job or profile data.')
+        # Check for content filtering or blocking
+        if 'promptFeedback' in data:
+            feedback = data['promptFeedback']
+            block_reason = feedback.get('blockReason')
+            if block_reason:
+                logger.error('Gemini blocked request. Reason: %s', block_reason)
+                raise ResumeAIError(f'Content was blocked by Gemini: {block_reason}. Please try with different job or profile data.')
     
-    candidates = data.get('candidates') or []
-    if not candidates:
-        logger.error('Gemini returned empty candidates. Full response: %s', data)
-        raise ResumeAIError('Gemini returned an empty result. This may be due to content filtering or API limits.')
+        candidates = data.get('candidates') or []
+        if not candidates:
+            logger.error('Gemini returned empty candidates. Full response: %s', data)
+            raise ResumeAIError('Gemini returned an empty result. This may be due to content filtering or API limits.')
     
-    # Check if candidate was blocked
-    first_candidate = candidates[0]
-    finish_reason = first_candidate.get('finishReason')
-    if finish_reason and finish_reason not in ['STOP', 'MAX_TOKENS']:
-        logger.error('Gemini stopped with reason: %s. Candidate: %s', finish_reason, first_candidate)
-        raise ResumeAIError(f'Generation stopped: {finish_reason}. Try simplifying the request.')
+        # Check if candidate was blocked
+        first_candidate = candidates[0]
+        finish_reason = first_candidate.get('finishReason')
+        if finish_reason and finish_reason not in ['STOP', 'MAX_TOKENS']:
+            logger.error('Gemini stopped with reason: %s. Candidate: %s', finish_reason, first_candidate)
+            raise ResumeAIError(f'Generation stopped: {finish_reason}. Try simplifying the request.')
     
-    parts = first_candidate.get('content', {}).get('parts', [])
-    texts = [part.get('text') for part in parts if part.get('text')]
-    if not texts:
-        logger.error('Gemini response has no text. Candidate: %s', first_candidate)
-        raise ResumeAIError('Gemini response did not include text output. Try reducing variation count or simplifying profile data.')
-    return texts[0]
+        parts = first_candidate.get('content', {}).get('parts', [])
+        texts = [part.get('text') for part in parts if part.get('text')]
+        if not texts:
+            logger.error('Gemini response has no text. Candidate: %s', first_candidate)
+            raise ResumeAIError('Gemini response did not include text output. Try reducing variation count or simplifying profile data.')
+        return texts[0], llm_gateway.rest_response_tokens(data)
+
+    # Identical prompts (retries, duplicate tabs) share one cached response
+    return llm_gateway.generate(
+        prompt, model=model_name, config=payload['generationConfig'], call=_request, use_cache=use_cache,
+    )
+
+
+def stream_gemini_api(prompt: str, api_key: str, *, model: str | None = None, timeout: int = 40) -> Iterator[str]:
+    """
+    Stream Gemini output through ``streamGenerateContent`` (server-sent events).
+
+    Yields text chunks as Gemini produces them. A single attempt is made: text
+    already handed to the caller cannot be retried, and a rate limited request
+    raises ``GeminiRetryableError`` right away so the caller can fall back to
+    the queued endpoints instead of holding a worker through the backoff.
+    Closing the generator closes the upstream connection, which stops Gemini
+    generating tokens nobody will read.
+    """
+    if not api_key:
+        raise ResumeAIError('Gemini API key is not configured.')
+    model_name = model or getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
+    endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:streamGenerateContent"
+    service = get_or_create_service(SERVICE_GEMINI, 'gemini')
+
+    try:
+        response = http.post(
+            endpoint,
+            policy='gemini',
+            service=service,
+            endpoint=f'/v1beta/models/{model_name}:streamGenerateContent',
+            max_retries=0,
+            params={'key': api_key, 'alt': 'sse'},
+            json=_gemini_payload(prompt),
+            timeout=timeout,
+            stream=True,
+        )
+    except requests.RequestException as exc:
+        logger.error('Gemini stream request failed: %s', type(exc).__name__)
+        raise GeminiRetryableError('Gemini service unavailable. Please try again later.') from exc
+
+    try:
+        if response.status_code == 429:
+            raise GeminiRetryableError(
+                'Gemini API rate limit exceeded. Please wait a moment and try again.',
+                retry_after=_retry_after_seconds(response),
+            )
+        if response.status_code >= 400:
+            logger.error('Gemini stream returned status %s', response.status_code)
+            error_class = GeminiRetryableError if response.status_code in http.RETRYABLE_STATUSES else ResumeAIError
+            raise error_class('Gemini service unavailable. Please try again later.')
+
+        response.encoding = response.encoding or 'utf-8'
+        received = False
+        # chunk_size=None hands over each network read as it arrives instead of buffering
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if not line or not line.startswith('data:'):
+                continue
+            data = json.loads(line[len('data:'):].strip())
+            block_reason = (data.get('promptFeedback') or {}).get('blockReason')
+            if block_reason:
+                logger.error('Gemini blocked request. Reason: %s', block_reason)
+                raise ResumeAIError(f'Content was blocked by Gemini: {block_reason}. Please try with different job or profile data.')
+            candidates = data.get('candidates') or []
+            if not candidates:
+                continue
+            for part in candidates[0].get('content', {}).get('parts', []):
+                if part.get('text'):
+                    received = True
+                    yield part['text']
+            finish_reason = candidates[0].get('finishReason')
+            if finish_reason and finish_reason not in ['STOP', 'MAX_TOKENS']:
+                logger.error('Gemini stream stopped with reason: %s', finish_reason)
+                raise ResumeAIError(f'Generation stopped: {finish_reason}. Try simplifying the request.')
+        if not received:
+            raise ResumeAIError('Gemini response did not include text output. Try reducing variation count or simplifying profile data.')
+    except (requests.RequestException, ValueError) as exc:
+        logger.error('Gemini stream interrupted: %s', type(exc).__name__)
+        raise ResumeAIError('Gemini stream was interrupted. Please try again.') from exc
+    finally:
+        response.close()
 
 
 def _strip_code_fence(text: str) -> str:
@@ -687,6 +796,7 @@ def generate_experience_variations(
         prompt,
         getattr(settings, 'GEMINI_API_KEY', ''),
         model=getattr(settings, 'GEMINI_MODEL', None),
+        use_cache=False,
     )
     parsed = parse_experience_variation_payload(raw)
     parsed['variations'] = _ensure_experience_variations(
@@ -762,6 +872,7 @@ def generate_experience_bullet(
         prompt,
         getattr(settings, 'GEMINI_API_KEY', ''),
         model=getattr(settings, 'GEMINI_MODEL', None),
+        use_cache=False,
     )
     parsed = parse_bullet_regeneration_payload(raw)
     return {
@@ -1384,86 +1495,86 @@ def render_jake_resume(
 
 def compile_latex_pdf(latex_document: str) -> str:
     """Compile LaTeX to PDF via Tectonic and return base64 payload."""
-    binary = getattr(settings, 'TECTONIC_BINARY', 'tectonic')
-    binary_path = binary if os.path.sep in binary else which(binary)
-    if not binary_path or not Path(binary_path).exists():
-        raise ResumeAIError(
-            'Tectonic LaTeX engine not found. Install it and set TECTONIC_BINARY or add it to PATH.'
-        )
-
-    with tempfile.TemporaryDirectory(prefix='resumerocket-tex-') as tmpdir:
-        tex_path = Path(tmpdir) / 'resume.tex'
-        tex_path.write_text(latex_document, encoding='utf-8')
-        cmd = [
-            binary_path,
-            '--chatter',
-            'minimal',
-            '--outdir',
-            tmpdir,
-            tex_path.name,
-        ]
-        try:
-            result = subprocess.run(
-                cmd,
-                cwd=tmpdir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                check=True,
-                text=True,
-            )
-            logger.debug('Tectonic output: %s', result.stdout.strip())
-        except subprocess.CalledProcessError as exc:
-            log_excerpt = _read_latex_log_excerpt(tmpdir, tex_path.stem)
-            message = log_excerpt or exc.stderr or 'Unknown LaTeX compilation error.'
-            raise ResumeAIError(f'Failed to compile LaTeX resume: {message}') from exc
-
-        pdf_path = tex_path.with_suffix('.pdf')
-        if not pdf_path.exists():
-            raise ResumeAIError('Latex compilation completed without producing a PDF.')
-        pdf_bytes = pdf_path.read_bytes()
-    return base64.b64encode(pdf_bytes).decode('ascii')
-
-
-def _read_latex_log_excerpt(tmpdir: str, stem: str) -> str | None:
-    log_path = Path(tmpdir) / f'{stem}.log'
-    if not log_path.exists():
-        return None
+    return base64.b64encode(compile_latex_pdf_bytes(latex_document)).decode('ascii')
+
+
+def compile_latex_pdf_bytes(latex_document: str, *, cache_key: str | None = None) -> bytes:
+    """
+    Return PDF bytes for ``latex_document``, compiling only on a cache miss.
+
+    Args:
+        latex_document: Full LaTeX source
+        cache_key: Precomputed ``pdf_cache.pdf_cache_key`` (e.g. when it is also the ETag)
+    """
+    key = cache_key or pdf_cache.pdf_cache_key(latex_document)
+    cached = pdf_cache.get_cached_pdf(key)
+    if cached is not None:
+        return cached
+    pdf_bytes = _run_tectonic(latex_document)
+    pdf_cache.store_pdf(key, pdf_bytes)
+    return pdf_bytes
+
+
+def compile_latex_pdfs(latex_documents: Sequence[str]) -> List[bytes]:
+    """Return PDF bytes for several documents, compiling cache misses concurrently."""
+    keys = [pdf_cache.pdf_cache_key(doc) for doc in latex_documents]
+    results: List[bytes | None] = [pdf_cache.get_cached_pdf(key) for key in keys]
+    missing = {}
+    for idx, pdf_bytes in enumerate(results):
+        if pdf_bytes is None:
+            # Identical variations only need one compile
+            missing.setdefault(keys[idx], []).append(idx)
+    if missing:
+        sources = [latex_documents[indexes[0]] for indexes in missing.values()]
+        compiled = _run_tectonic_many(sources)
+        for (key, indexes), pdf_bytes in zip(missing.items(), compiled):
+            pdf_cache.store_pdf(key, pdf_bytes)
+            for idx in indexes:
+                results[idx] = pdf_bytes
+    return results
+
+
+def _run_tectonic(latex_document: str) -> bytes:
     try:
-        lines = log_path.read_text(encoding='utf-8', errors='ignore').splitlines()
-    except Exception:
-        return None
-    tail = '\n'.join(lines[-25:])
-    return tail.strip() or None
+        return latex_compiler.compile_pdf(latex_document)
+    except latex_compiler.LatexCompileError as exc:
+        raise ResumeAIError(str(exc)) from exc
 
 
-def run_resume_generation(
-    candidate_snapshot: Dict[str, Any],
-    job_snapshot: Dict[str, Any],
-    *,
-    tone: str,
-    variation_count: int,
-    api_key: str,
-    model: str | None = None,
-) -> Dict[str, Any]:
-    logger.info(f'Starting resume generation with variation_count={variation_count}, tone={tone}')
-    prompt = build_generation_prompt(candidate_snapshot, job_snapshot, tone, variation_count)
-    logger.debug(f'Prompt length: {len(prompt)} characters')
-    raw_text = call_gemini_api(prompt, api_key, model=model)
-    logger.debug(f'Received raw response length: {len(raw_text)} characters')
-    parsed = parse_resume_payload(raw_text)
-    shared_analysis = parsed.get('shared_analysis') or {}
-    raw_variations = parsed.get('variations') or []
-    logger.info(f'Gemini returned {len(raw_variations)} raw variations')
-
-    experience_lookup = _build_experience_lookup(candidate_snapshot)
-    project_lookup = _build_project_lookup(candidate_snapshot)
-    education_lookup = _build_education_lookup(candidate_snapshot)
-
-    keywords_fallback = _derive_keywords(job_snapshot, shared_analysis)
-    skill_fallback = [skill.get('name') for skill in candidate_snapshot.get('skills', [])]
+def _run_tectonic_many(latex_documents: Sequence[str]) -> List[bytes]:
+    try:
+        return latex_compiler.compile_pdfs(latex_documents)
+    except latex_compiler.LatexCompileError as exc:
+        raise ResumeAIError(str(exc)) from exc
+
+
+class ResumeVariationBuilder:
+    """
+    Normalize Gemini's raw resume variations against the candidate's own data.
+
+    Shared by run_resume_generation and stream_resume_generation, which builds
+    each variation as soon as it has been streamed.
+    """
+
+    def __init__(self, candidate_snapshot: Dict[str, Any], job_snapshot: Dict[str, Any], tone: str,
+                 shared_analysis: Dict[str, Any] | None = None):
+        self.candidate_snapshot = candidate_snapshot
+        self.job_snapshot = job_snapshot
+        self.tone = tone
+        self.experience_lookup = _build_experience_lookup(candidate_snapshot)
+        self.project_lookup = _build_project_lookup(candidate_snapshot)
+        self.education_lookup = _build_education_lookup(candidate_snapshot)
+        self.keywords_fallback = _derive_keywords(job_snapshot, shared_analysis or {})
+        self.skill_fallback = [skill.get('name') for skill in candidate_snapshot.get('skills', [])]
+        self._ids: set = set()
+
+    def build(self, idx: int, raw: Dict[str, Any]) -> Dict[str, Any]:
+        candidate_snapshot, job_snapshot, tone = self.candidate_snapshot, self.job_snapshot, self.tone
+        experience_lookup, project_lookup, education_lookup = (
+            self.experience_lookup, self.project_lookup, self.education_lookup,
+        )
+        keywords_fallback, skill_fallback = self.keywords_fallback, self.skill_fallback
 
-    normalized_variations = []
-    for idx, raw in enumerate(raw_variations):
         label = raw.get('label') or f'Variation {idx + 1}'
         var_id = slugify(label) or f'variation-{idx + 1}'
         summary = raw.get('summary') or candidate_snapshot.get('summary')
@@ -1571,7 +1682,7 @@ def run_resume_generation(
             ats_keywords = keywords_fallback
 
         variation_payload = {
-            'id': var_id if var_id not in {v.get('id') for v in normalized_variations} else f'{var_id}-{idx}',
+            'id': var_id if var_id not in self._ids else f'{var_id}-{idx}',
             'label': label,
             'tone': raw.get('tone') or tone,
             'summary_headline': summary_headline,
@@ -1584,19 +1695,52 @@ def run_resume_generation(
             'generated_at': timezone.now().isoformat(),
         }
         variation_payload['latex_document'] = render_jake_resume(candidate_snapshot, job_snapshot, variation_payload)
-        variation_payload['pdf_document'] = compile_latex_pdf(variation_payload['latex_document'])
         base_filename = slugify(job_snapshot.get('title') or 'resume') or 'resume'
         variation_payload['download_filename'] = f"{base_filename}-{variation_payload['id']}.tex"
-        normalized_variations.append(variation_payload)
+        self._ids.add(variation_payload['id'])
+        return variation_payload
+
+    def fallback(self) -> Dict[str, Any]:
+        fallback = _build_fallback_variation(
+            self.candidate_snapshot, self.job_snapshot, self.tone, self.keywords_fallback, self.skill_fallback,
+        )
+        fallback['generated_at'] = timezone.now().isoformat()
+        fallback['latex_document'] = render_jake_resume(self.candidate_snapshot, self.job_snapshot, fallback)
+        fallback['download_filename'] = f"{slugify(self.job_snapshot.get('title') or 'resume') or 'resume'}-{fallback['id']}.tex"
+        self._ids.add(fallback['id'])
+        return fallback
+
+
+def run_resume_generation(
+    candidate_snapshot: Dict[str, Any],
+    job_snapshot: Dict[str, Any],
+    *,
+    tone: str,
+    variation_count: int,
+    api_key: str,
+    model: str | None = None,
+) -> Dict[str, Any]:
+    logger.info(f'Starting resume generation with variation_count={variation_count}, tone={tone}')
+    prompt = build_generation_prompt(candidate_snapshot, job_snapshot, tone, variation_count)
+    logger.debug(f'Prompt length: {len(prompt)} characters')
+    raw_text = call_gemini_api(prompt, api_key, model=model, use_cache=False)
+    logger.debug(f'Received raw response length: {len(raw_text)} characters')
+    parsed = parse_resume_payload(raw_text)
+    shared_analysis = parsed.get('shared_analysis') or {}
+    raw_variations = parsed.get('variations') or []
+    logger.info(f'Gemini returned {len(raw_variations)} raw variations')
+
+    builder = ResumeVariationBuilder(candidate_snapshot, job_snapshot, tone, shared_analysis)
+    normalized_variations = [builder.build(idx, raw) for idx, raw in enumerate(raw_variations)]
 
     if not normalized_variations:
         logger.warning('No variations were normalized, creating fallback')
-        fallback = _build_fallback_variation(candidate_snapshot, job_snapshot, tone, keywords_fallback, skill_fallback)
-        fallback['generated_at'] = timezone.now().isoformat()
-        fallback['latex_document'] = render_jake_resume(candidate_snapshot, job_snapshot, fallback)
-        fallback['pdf_document'] = compile_latex_pdf(fallback['latex_document'])
-        fallback['download_filename'] = f"{slugify(job_snapshot.get('title') or 'resume') or 'resume'}-{fallback['id']}.tex"
-        normalized_variations.append(fallback)
+        normalized_variations.append(builder.fallback())
+
+    # Compile every variation in one batch so the Tectonic pool runs them concurrently
+    pdfs = compile_latex_pdfs([variation['latex_document'] for variation in normalized_variations])
+    for variation, pdf_bytes in zip(normalized_variations, pdfs):
+        variation['pdf_document'] = base64.b64encode(pdf_bytes).decode('ascii')
 
     logger.info(f'Returning {len(normalized_variations)} normalized variations')
     return {
@@ -1605,3 +1749,70 @@ def run_resume_generation(
         'variation_count': len(normalized_variations),
         'raw_text': raw_text,
     }
+
+
+def stream_json_variations(chunks, error_class=None) -> Iterator[Tuple[str, Any]]:
+    """
+    Parse streamed ``{"shared_analysis": ..., "variations": [...]}`` output.
+
+    Yields ``('shared_analysis', dict)`` and then ``('variation', (index, raw))``
+    for each variation as soon as it is complete.
+    """
+    error_class = error_class or ResumeAIError
+    parser = JSONStreamParser()
+    try:
+        for chunk in chunks:
+            for event in parser.feed(chunk):
+                if event.key == 'shared_analysis' and event.kind == 'field' and isinstance(event.value, dict):
+                    yield 'shared_analysis', event.value
+                elif event.key == 'variations' and event.kind == 'item' and isinstance(event.value, dict):
+                    yield 'variation', (event.index, event.value)
+    except json.JSONDecodeError as exc:
+        logger.error('Failed to parse streamed Gemini JSON: %s', exc)
+        raise error_class('Gemini returned an unreadable response.') from exc
+    if not parser.complete:
+        # Usually MAX_TOKENS: keep the variations that did arrive
+        logger.warning('Streamed Gemini JSON ended before the closing brace')
+
+
+def stream_resume_generation(
+    candidate_snapshot: Dict[str, Any],
+    job_snapshot: Dict[str, Any],
+    *,
+    tone: str,
+    variation_count: int,
+    api_key: str,
+    model: str | None = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming counterpart of run_resume_generation.
+
+    Yields ``('shared_analysis', {...})``, then ``('variation', {...})`` for each
+    normalized variation (with its LaTeX and PDF) while Gemini is still writing
+    the rest, then ``('done', {'variation_count': n})``.
+    """
+    prompt = build_generation_prompt(candidate_snapshot, job_snapshot, tone, variation_count)
+    shared_analysis: Dict[str, Any] = {}
+    builder = None
+    count = 0
+    for kind, value in stream_json_variations(stream_gemini_api(prompt, api_key, model=model)):
+        if kind == 'shared_analysis':
+            shared_analysis = value
+            yield kind, value
+            continue
+        # shared_analysis precedes the variations in the schema, so keyword fallbacks match the batch path
+        builder = builder or ResumeVariationBuilder(candidate_snapshot, job_snapshot, tone, shared_analysis)
+        index, raw = value
+        variation = builder.build(index, raw)
+        variation['pdf_document'] = base64.b64encode(compile_latex_pdfs([variation['latex_document']])[0]).decode('ascii')
+        count += 1
+        yield 'variation', variation
+
+    if not count:
+        logger.warning('No variations were streamed, creating fallback')
+        builder = builder or ResumeVariationBuilder(candidate_snapshot, job_snapshot, tone, shared_analysis)
+        variation = builder.fallback()
+        variation['pdf_document'] = base64.b64encode(compile_latex_pdfs([variation['latex_document']])[0]).decode('ascii')
+        count = 1
+        yield 'variation', variation
+    yield 'done', {'variation_count': count}
@@ -0,0 +1,272 @@
+"""
+Dispatcher for UC-124 scheduled application submissions.
+
+Due submissions used to be processed by one loop that read every due row and
+sent the emails one by one without marking them, so two workers running the
+loop would send the same application twice. Delivery now happens in two steps:
+
+* ``claim_due_submissions`` locks a batch of due rows with
+  ``select_for_update(skip_locked=True)`` and moves them to ``processing``,
+  stamping ``claimed_at``. Concurrent dispatchers skip each other's locked
+  rows, so every submission is claimed by exactly one of them.
+* ``deliver_submissions`` sends a claimed batch, building the messages on the
+  calling thread and sending them concurrently, then marks each submission
+  submitted or reschedules it. It only touches rows still carrying the claim
+  it was given, so a batch whose claim expired and was taken over is skipped.
+
+The Celery beat task (core.tasks.process_scheduled_submissions) claims batches
+and fans each one out to ``deliver_scheduled_submissions`` on any worker, so
+delivery throughput grows with the number of workers. Failed attempts are
+retried by pushing ``scheduled_datetime`` back with exponential backoff until
+``max_retries`` is reached. A claim older than ``SCHEDULED_SUBMISSION_CLAIM_TIMEOUT``
+(a worker died mid-batch) is returned to the pool.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ScheduledSubmission
+
+logger = logging.getLogger(__name__)
+
+# Backoff between delivery attempts: 5, 10, 20... minutes, capped at 4 hours
+RETRY_BASE_MINUTES = 5
+RETRY_MAX_MINUTES = 240
+
+
+def retry_delay(retry_count: int) -> timedelta:
+    """Delay before the next attempt after ``retry_count`` failed attempts."""
+    minutes = RETRY_BASE_MINUTES * 2 ** max(retry_count - 1, 0)
+    return timedelta(minutes=min(minutes, RETRY_MAX_MINUTES))
+
+
+def claim_due_submissions(limit: Optional[int] = None, now=None) -> List[int]:
+    """
+    Claim up to ``limit`` due submissions for this dispatcher.
+
+    Returns:
+        Ids of the claimed submissions; they are now ``processing`` with
+        ``claimed_at`` set to ``now``
+    """
+    now = now or timezone.now()
+    limit = limit or getattr(settings, 'SCHEDULED_SUBMISSION_BATCH_SIZE', 20)
+    expired = now - timedelta(seconds=getattr(settings, 'SCHEDULED_SUBMISSION_CLAIM_TIMEOUT', 30 * 60))
+
+    with transaction.atomic():
+        ids = list(
+            ScheduledSubmission.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='scheduled', scheduled_datetime__lte=now)
+                | Q(status='processing', claimed_at__lt=expired)
+            )
+            .order_by('priority', 'scheduled_datetime')
+            .values_list('id', flat=True)[:limit]
+        )
+        if ids:
+            ScheduledSubmission.objects.filter(id__in=ids).update(status='processing', claimed_at=now)
+    return ids
+
+
+def _document_path(document) -> Optional[str]:
+    stored = document.file_upload or document.file
+    try:
+        return stored.path if stored else None
+    except (NotImplementedError, ValueError):
+        # Remote storage backends have no local path
+        return None
+
+
+def build_application_email(submission: ScheduledSubmission) -> EmailMessage:
+    """
+    Build the application email with resume and cover letter attachments.
+
+    Raises:
+        ValueError: if the job has no contact email to send to
+    """
+    job = submission.job
+    candidate = submission.candidate
+    package = submission.application_package
+    user = candidate.user
+
+    # Build email subject
+    subject = f"Application for {job.title} - {user.get_full_name() or user.email}"
+
+    # Build email body
+    body = f"""Dear Hiring Manager,
+
+I am writing to express my interest in the {job.title} position at {job.company_name}.
+
+{candidate.summary or 'I am excited about this opportunity and believe my skills and experience make me a strong candidate for this role.'}
+
+Please find attached my resume and cover letter for your consideration.
+
+Thank you for your time and consideration.
+
+Best regards,
+{user.get_full_name() or user.first_name or 'Applicant'}
+{candidate.phone or ''}
+{user.email}
+"""
+
+    # Get recipient email from the job's contacts, then any job metadata
+    to_email = job.recruiter_email or job.hiring_manager_email or None
+    metadata = getattr(job, 'metadata', None)
+    if not to_email and isinstance(metadata, dict):
+        to_email = metadata.get('contact_email') or metadata.get('recruiter_email')
+
+    # If no email found, we can't send - mark for manual submission
+    if not to_email:
+        raise ValueError(f"No recipient email found for job {job.id}. Please add contact email to job metadata or submit manually.")
+
+    # Create email message
+    email = EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+        reply_to=[user.email]
+    )
+
+    # Attach resume and cover letter if available
+    if package:
+        for label, document in (('Resume', package.resume_document), ('Cover letter', package.cover_letter_document)):
+            if not document:
+                continue
+            path = _document_path(document)
+            if path and os.path.exists(path):
+                email.attach_file(path)
+            else:
+                logger.warning(f"{label} file not found at {path}")
+
+    return email
+
+
+def _send_messages(messages: Dict[int, EmailMessage], max_workers: Optional[int] = None) -> Dict[int, Exception]:
+    """Send messages concurrently; returns the error for each submission whose send failed."""
+    if not messages:
+        return {}
+    workers = max_workers or getattr(settings, 'SCHEDULED_SUBMISSION_SEND_CONCURRENCY', 4)
+    workers = max(1, min(int(workers), len(messages)))
+
+    def _send(item):
+        submission_id, email = item
+        try:
+            email.send(fail_silently=False)
+            logger.info(f"Application email sent to {', '.join(email.to)} for submission {submission_id}")
+            return submission_id, None
+        except Exception as exc:
+            logger.error(f"Failed to send application email for submission {submission_id}: {exc}")
+            return submission_id, exc
+
+    # Sending does not touch the database, so the worker threads need no connection cleanup
+    if workers == 1:
+        results = [_send(item) for item in messages.items()]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='submission-send') as executor:
+            results = list(executor.map(_send, messages.items()))
+    return {submission_id: exc for submission_id, exc in results if exc is not None}
+
+
+def _record_failure(submission: ScheduledSubmission, exc: Exception, now):
+    submission.error_message = str(exc)
+    submission.retry_count += 1
+    submission.claimed_at = None
+    if submission.retry_count < submission.max_retries:
+        submission.status = 'scheduled'
+        submission.scheduled_datetime = now + retry_delay(submission.retry_count)
+        logger.info(f"Rescheduling submission {submission.id} for {submission.scheduled_datetime}")
+    else:
+        submission.status = 'failed'
+    submission.save(update_fields=['status', 'error_message', 'retry_count', 'claimed_at', 'scheduled_datetime'])
+
+
+def deliver_submissions(submission_ids, claimed_at=None, max_workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Deliver a batch of claimed submissions.
+
+    Args:
+        submission_ids: Ids returned by ``claim_due_submissions``
+        claimed_at: The claim's timestamp; rows claimed again since then are skipped
+        max_workers: Concurrent email sends (defaults to SCHEDULED_SUBMISSION_SEND_CONCURRENCY)
+
+    Returns:
+        Dict with ``processed`` and ``failed`` counts
+    """
+    submissions = ScheduledSubmission.objects.filter(id__in=list(submission_ids), status='processing')
+    if claimed_at is not None:
+        submissions = submissions.filter(claimed_at=claimed_at)
+    submissions = list(submissions.select_related(
+        'job', 'candidate__user', 'application_package__resume_document', 'application_package__cover_letter_document',
+    ))
+
+    messages: Dict[int, EmailMessage] = {}
+    errors: Dict[int, Exception] = {}
+    for submission in submissions:
+        logger.info(f"Processing scheduled submission {submission.id} for job {submission.job_id}")
+        if submission.submission_method == 'email':
+            try:
+                messages[submission.id] = build_application_email(submission)
+            except Exception as exc:
+                errors[submission.id] = exc
+        elif submission.submission_method == 'portal':
+            # For portal submissions, just mark as submitted
+            # User would have to manually submit through the portal
+            logger.info(f"Portal submission {submission.id} marked for manual completion")
+        else:
+            logger.info(f"Other submission method for {submission.id}, marking as submitted")
+
+    errors.update(_send_messages(messages, max_workers))
+
+    now = timezone.now()
+    processed_count = 0
+    failed_count = 0
+    for submission in submissions:
+        exc = errors.get(submission.id)
+        if exc is None:
+            try:
+                submission.mark_submitted()
+                processed_count += 1
+                continue
+            except Exception as mark_exc:
+                exc = mark_exc
+        logger.error(f"Failed to process submission {submission.id}: {exc}")
+        _record_failure(submission, exc, now)
+        failed_count += 1
+
+    return {'processed': processed_count, 'failed': failed_count}
+
+
+def process_due_submissions(deliver=None, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Claim due submissions batch by batch until none are left.
+
+    Each batch is passed to ``deliver(ids, claimed_at)``, which defaults to
+    delivering it in this process; the Celery task passes a function that
+    queues the batch for another worker instead.
+
+    Returns:
+        Dict with ``claimed`` and ``batches`` counts plus the summed
+        ``processed``/``failed`` counts of batches delivered here
+    """
+    deliver = deliver or deliver_submissions
+    totals = {'claimed': 0, 'batches': 0, 'processed': 0, 'failed': 0}
+    while True:
+        claimed_at = timezone.now()
+        ids = claim_due_submissions(batch_size, now=claimed_at)
+        if not ids:
+            break
+        totals['claimed'] += len(ids)
+        totals['batches'] += 1
+        result = deliver(ids, claimed_at) or {}
+        totals['processed'] += result.get('processed', 0)
+        totals['failed'] += result.get('failed', 0)
+    return totals
@@ -1554,21 +1554,13 @@ class JobEntrySerializer(serializers.ModelSerializer):
             return None
         
         try:
-            from core.models import Company, CompanyResearch
+            from core.company_resolution import get_or_create_company
+            from core.models import CompanyResearch
             
-            # Try to find existing company (case-insensitive)
-            company = Company.objects.filter(name__iexact=obj.company_name).first()
+            # Resolve by normalized name, alias or domain; create with minimal info if unknown
+            company, created = get_or_create_company(obj.company_name)
             
-            if not company:
-                # Create new company with minimal info
-                domain = obj.company_name.lower().replace(' ', '').replace(',', '').replace('.', '')
-                domain = f"{domain}.com"
-                
-                company = Company.objects.create(
-                    name=obj.company_name,
-                    domain=domain
-                )
-                
+            if created:
                 # Create empty research record
                 CompanyResearch.objects.create(company=company)
             
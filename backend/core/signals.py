@@ -1,14 +1,18 @@
 import logging
 from django.dispatch import receiver
 from django.contrib.auth.signals import user_logged_in, user_login_failed, user_logged_out
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete, pre_delete
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 
-from core.models import UserAccount, JobEntry
-import os
-import requests
+from core.models import (
+    UserAccount, JobEntry, JobStatusChange, Skill, ResumeVersion,
+    Contact, ContactNote, Interaction, Reminder,
+    InterviewPrepSession, JobQuestionPractice, MockInterviewSession, NetworkingEvent, SkillDevelopmentProgress,
+    CandidateProfile, CandidateSkill, WorkExperience, Education, Certification,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -103,7 +107,7 @@ def ensure_useraccount_exists(sender, instance, created, **kwargs):
 @receiver(post_save, sender='core.InterviewSchedule')
 def send_interview_reminder_email(sender, instance, created, **kwargs):
     """Send immediate email reminder if interview is scheduled within 24 hours."""
-    from core.models import InterviewSchedule
+    from core.bulk_mail import send_on_commit
     from django.core.mail import EmailMultiAlternatives
     from django.template.loader import render_to_string
     from django.conf import settings
@@ -159,10 +163,11 @@ def send_interview_reminder_email(sender, instance, created, **kwargs):
         
         msg = EmailMultiAlternatives(subject, plain, from_email, [user.email])
         msg.attach_alternative(html, 'text/html')
-        msg.send(fail_silently=True)
+        # Interviews created together in one transaction share one mail connection
+        send_on_commit('interview_scheduled_reminders', msg, key=instance.id)
         
         logger.info(
-            f"Sent immediate interview reminder to {user.email} for interview {instance.id} "
+            f"Queued immediate interview reminder to {user.email} for interview {instance.id} "
             f"scheduled in {time_until_interview.total_seconds() / 3600:.1f} hours"
         )
     except Exception as e:
@@ -170,72 +175,299 @@ def send_interview_reminder_email(sender, instance, created, **kwargs):
         # Don't raise - we don't want to break interview creation
 
 
+@receiver(post_save, sender=Skill)
+def refresh_skill_matcher_on_save(sender, instance: Skill, **kwargs):
+    """Keep the process-wide skill matcher in sync once the write commits."""
+    from core.skill_matcher import shared_skill_matcher
+
+    row = (instance.id, instance.name, instance.category)
+    transaction.on_commit(lambda: shared_skill_matcher().add_skills([row]))
+
+
+@receiver(post_delete, sender=Skill)
+def refresh_skill_matcher_on_delete(sender, instance: Skill, **kwargs):
+    from core.skill_matcher import shared_skill_matcher
+
+    skill_id = instance.id
+    transaction.on_commit(lambda: shared_skill_matcher().remove_skill(skill_id))
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def invalidate_skill_autocomplete(sender, instance, **kwargs):
+    """Rebuild the autocomplete index once a skill is added, renamed or removed.
+
+    Usage counts change with every ``CandidateSkill`` write and are left to the
+    periodic rebuild instead.
+    """
+    from core import skill_autocomplete
+
+    transaction.on_commit(skill_autocomplete.invalidate)
+
+
+@receiver(post_delete, sender=Skill)
+def drop_cached_job_requirements(sender, instance: Skill, **kwargs):
+    """Shared requirement entries may reference the deleted skill; they are recomputed on demand."""
+    from core.job_description_cache import REQUIREMENTS
+    from core.models import JobDescriptionAnalysis
+
+    transaction.on_commit(
+        lambda: JobDescriptionAnalysis.objects.filter(kind=REQUIREMENTS).delete(), robust=True,
+    )
+
+
+@receiver(post_save, sender=ResumeVersion)
+def warm_resume_pdf_on_save(sender, instance: ResumeVersion, update_fields=None, **kwargs):
+    """Pre-compile the saved LaTeX so shared links and exports are served from the PDF cache."""
+    from django.conf import settings
+
+    if not getattr(settings, 'RESUME_PDF_CACHE_PREWARM', True) or not instance.latex_content:
+        return
+    if update_fields is not None and 'latex_content' not in update_fields:
+        return
+    from core.tasks import enqueue_resume_pdf_warmup
+
+    version_id = instance.pk
+    transaction.on_commit(lambda: enqueue_resume_pdf_warmup(version_id))
+
+
 @receiver(post_save, sender=JobEntry)
-def geocode_job_location(sender, instance: JobEntry, created: bool, **kwargs):
-    """Best-effort geocode when a job's location is present but coordinates are missing.
+def geocode_job_location(sender, instance: JobEntry, created: bool, update_fields=None, **kwargs):
+    """Copy cached coordinates onto the job, or queue its location for the batch geocoder.
 
-    This persists lat/lon so map rendering is fast and deterministic.
-    Lightweight and resilient: timeouts are short, failures are ignored.
+    Never calls Nominatim from the save path; core.geocoding resolves queued
+    locations in the background and fills in lat/lon for every waiting job.
     """
+    if update_fields is not None and 'location' not in update_fields:
+        return
+    if not (getattr(instance, 'location', '') or '').strip():
+        return
     try:
-        city = (getattr(instance, 'location', '') or '').strip()
-        if not city:
-            return
-        # Prevent recursion when we save updated coords below
-        if getattr(instance, '_skip_geocode', False):
-            return
+        from core.geocoding import queue_job_geocode
 
-        base = os.environ.get('NOMINATIM_BASE_URL', 'https://nominatim.openstreetmap.org')
-        ua = os.environ.get('NOMINATIM_USER_AGENT', 'cs-490-project/1.0 (signals)')
-        headers = {'User-Agent': ua}
-        try:
-            resp = requests.get(
-                f"{base}/search",
-                params={'q': city, 'format': 'json', 'limit': '1'},
-                headers=headers,
-                timeout=6,
-            )
-            resp.raise_for_status()
-            data = resp.json() or []
-            if data:
-                lat = float(data[0].get('lat'))
-                lon = float(data[0].get('lon'))
-            else:
-                lat = lon = None
-        except Exception:
-            lat = lon = None
-
-        if lat is not None and lon is not None:
-            from django.utils import timezone
-            # If values are unchanged (e.g., location string edits that resolve to same coords), avoid extra save
-            cur_lat = getattr(instance, 'location_lat', None)
-            cur_lon = getattr(instance, 'location_lon', None)
-            if cur_lat is not None and cur_lon is not None:
-                try:
-                    if abs(cur_lat - lat) < 1e-5 and abs(cur_lon - lon) < 1e-5:
-                        return
-                except Exception:
-                    pass
-            instance.location_lat = lat
-            instance.location_lon = lon
-            # If we matched a house/place, mark as address; else city
-            try:
-                precision = 'city'
-                if 'data' in locals() and data:
-                    cls = data[0].get('class')
-                    typ = data[0].get('type')
-                    if cls == 'place' and typ == 'house':
-                        precision = 'address'
-                instance.location_geo_precision = precision
-            except Exception:
-                instance.location_geo_precision = 'city'
-            instance.location_geo_updated_at = timezone.now()
-            # Save only geo fields to avoid recursion issues; second post_save will be a quick no-op
-            try:
-                instance._skip_geocode = True
-                instance.save(update_fields=['location_lat', 'location_lon', 'location_geo_precision', 'location_geo_updated_at'])
-            except Exception:
-                pass
-    except Exception:
+        if queue_job_geocode(instance):
+            from core.tasks import enqueue_geocode_queue
+
+            transaction.on_commit(enqueue_geocode_queue)
+    except Exception as exc:
         # Never raise from signal
-        pass
+        logger.warning(f"Failed to queue geocoding for job {instance.pk}: {exc}")
+
+
+@receiver(post_save, sender=JobEntry)
+def update_job_stats_rollup(sender, instance: JobEntry, created: bool, update_fields=None, raw=False, **kwargs):
+    """Apply the job's change to its candidate's pipeline rollup (core.analytics_rollups)."""
+    from core.analytics_rollups import TRACKED_JOB_FIELDS, refresh_job
+
+    if raw:
+        return
+    if update_fields is not None and not (set(update_fields) & TRACKED_JOB_FIELDS):
+        return
+    try:
+        with transaction.atomic():
+            refresh_job(instance)
+    except Exception as exc:
+        # Never raise from signal; load_rollups/rebuild repair the rollup
+        logger.warning(f"Failed to update job stats rollup for job {instance.pk}: {exc}")
+
+
+@receiver(pre_delete, sender=JobEntry)
+def remove_job_from_stats_rollup(sender, instance: JobEntry, **kwargs):
+    from core.analytics_rollups import remove_job
+
+    try:
+        with transaction.atomic():
+            remove_job(instance)
+    except Exception as exc:
+        logger.warning(f"Failed to remove job {instance.pk} from stats rollup: {exc}")
+
+
+@receiver(post_save, sender=JobStatusChange)
+def record_status_change_in_rollup(sender, instance: JobStatusChange, created: bool, raw=False, **kwargs):
+    from core.analytics_rollups import refresh_job
+
+    if raw:
+        return
+    try:
+        with transaction.atomic():
+            refresh_job(instance.job)
+    except Exception as exc:
+        logger.warning(f"Failed to update job stats rollup for job {instance.job_id}: {exc}")
+
+
+@receiver(post_delete, sender=JobStatusChange)
+def forget_status_change_in_rollup(sender, instance: JobStatusChange, **kwargs):
+    from core.analytics_rollups import refresh_job_id
+
+    # Deferred: during a job delete cascade the job row is about to go away too
+    job_id = instance.job_id
+    transaction.on_commit(lambda: refresh_job_id(job_id))
+
+
+@receiver(post_save, sender=Contact)
+def update_contact_scores(sender, instance: Contact, created: bool, update_fields=None, raw=False, **kwargs):
+    """Keep relationship maintenance scores (core.relationship_health) current for the contact."""
+    from core.relationship_health import TRACKED_CONTACT_FIELDS, initialize_new_contact, refresh_contact_id
+
+    if raw:
+        return
+    if update_fields is not None and not (set(update_fields) & TRACKED_CONTACT_FIELDS):
+        return
+    try:
+        with transaction.atomic():
+            if created:
+                initialize_new_contact(instance)
+            else:
+                # Reload from the database: the saved instance may hold scores from before
+                # an interaction/note/reminder change refreshed them
+                refresh_contact_id(instance.pk)
+    except Exception as exc:
+        # Never raise from signal; the maintenance overview scores unscored contacts
+        logger.warning(f"Failed to refresh relationship scores for contact {instance.pk}: {exc}")
+
+
+@receiver(post_save, sender=Interaction)
+@receiver(post_save, sender=ContactNote)
+@receiver(post_save, sender=Reminder)
+def refresh_contact_scores_on_save(sender, instance, raw=False, **kwargs):
+    from core.relationship_health import refresh_contact_id
+
+    if raw:
+        return
+    try:
+        with transaction.atomic():
+            refresh_contact_id(instance.contact_id)
+    except Exception as exc:
+        logger.warning(f"Failed to refresh relationship scores for contact {instance.contact_id}: {exc}")
+
+
+@receiver(post_delete, sender=Interaction)
+@receiver(post_delete, sender=ContactNote)
+@receiver(post_delete, sender=Reminder)
+def refresh_contact_scores_on_delete(sender, instance, **kwargs):
+    from core.relationship_health import refresh_contact_id
+
+    # Deferred: during a contact delete cascade the contact row is about to go away too
+    contact_id = instance.contact_id
+    transaction.on_commit(lambda: refresh_contact_id(contact_id), robust=True)
+
+
+@receiver(post_save, sender=SkillDevelopmentProgress)
+@receiver(post_save, sender=InterviewPrepSession)
+@receiver(post_save, sender=JobQuestionPractice)
+@receiver(post_save, sender=MockInterviewSession)
+@receiver(post_save, sender=Interaction)
+@receiver(post_save, sender=NetworkingEvent)
+@receiver(post_save, sender=JobEntry)
+def log_activity_events(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Mirror the record's timed sessions into the activity event log (core.activity_log)."""
+    from core.activity_log import TRACKED_JOB_FIELDS, record_source
+
+    if raw:
+        return
+    if sender is JobEntry and update_fields is not None and not (set(update_fields) & TRACKED_JOB_FIELDS):
+        return
+    try:
+        with transaction.atomic():
+            record_source(instance)
+    except Exception as exc:
+        # Never raise from signal; backfill_activity_events rebuilds the log
+        logger.warning(f"Failed to log activity events for {sender.__name__} {instance.pk}: {exc}")
+
+
+@receiver(post_delete, sender=SkillDevelopmentProgress)
+@receiver(post_delete, sender=InterviewPrepSession)
+@receiver(post_delete, sender=JobQuestionPractice)
+@receiver(post_delete, sender=MockInterviewSession)
+@receiver(post_delete, sender=Interaction)
+@receiver(post_delete, sender=NetworkingEvent)
+@receiver(post_delete, sender=JobEntry)
+def forget_activity_events(sender, instance, **kwargs):
+    from core.activity_log import forget_source
+
+    try:
+        with transaction.atomic():
+            forget_source(sender, instance.pk)
+    except Exception as exc:
+        logger.warning(f"Failed to drop activity events for {sender.__name__} {instance.pk}: {exc}")
+
+
+@receiver(post_save, sender=CandidateSkill)
+@receiver(post_save, sender=WorkExperience)
+@receiver(post_save, sender=Education)
+@receiver(post_save, sender=Certification)
+def mark_match_analyses_stale_on_save(sender, instance, raw=False, **kwargs):
+    """Invalidate the candidate's match and skills gap analyses computed from other inputs."""
+    from core.match_fingerprints import mark_candidate_stale
+
+    if raw:
+        return
+    try:
+        with transaction.atomic():
+            mark_candidate_stale(instance.candidate_id)
+    except Exception as exc:
+        logger.warning(f"Failed to invalidate match analyses for candidate {instance.candidate_id}: {exc}")
+
+
+@receiver(post_delete, sender=CandidateSkill)
+@receiver(post_delete, sender=WorkExperience)
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=Certification)
+def mark_match_analyses_stale_on_delete(sender, instance, **kwargs):
+    from core.match_fingerprints import mark_candidate_stale
+
+    # Deferred: during a profile delete cascade the analyses go away too
+    candidate_id = instance.candidate_id
+    transaction.on_commit(lambda: mark_candidate_stale(candidate_id), robust=True)
+
+
+@receiver(m2m_changed, sender=WorkExperience.skills_used.through)
+def mark_match_analyses_stale_on_experience_skills(sender, instance, action, reverse, pk_set=None, **kwargs):
+    from core.match_fingerprints import mark_candidate_stale
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        candidate_ids = {instance.candidate_id}
+    elif pk_set:
+        candidate_ids = set(WorkExperience.objects.filter(pk__in=pk_set).values_list('candidate_id', flat=True))
+    else:
+        return
+    for candidate_id in candidate_ids:
+        try:
+            with transaction.atomic():
+                mark_candidate_stale(candidate_id)
+        except Exception as exc:
+            logger.warning(f"Failed to invalidate match analyses for candidate {candidate_id}: {exc}")
+
+
+@receiver(post_save, sender=CandidateProfile)
+def mark_match_analyses_stale_on_profile(sender, instance: CandidateProfile, created: bool, update_fields=None,
+                                         raw=False, **kwargs):
+    from core.match_fingerprints import PROFILE_INPUT_FIELDS, mark_candidate_stale
+
+    if raw or created:
+        return
+    if update_fields is not None and not (set(update_fields) & PROFILE_INPUT_FIELDS):
+        return
+    try:
+        with transaction.atomic():
+            mark_candidate_stale(instance.pk)
+    except Exception as exc:
+        logger.warning(f"Failed to invalidate match analyses for candidate {instance.pk}: {exc}")
+
+
+@receiver(post_save, sender=JobEntry)
+def mark_match_analyses_stale_on_job(sender, instance: JobEntry, created: bool, update_fields=None,
+                                     raw=False, **kwargs):
+    from core.match_fingerprints import JOB_INPUT_FIELDS, mark_job_stale
+
+    if raw or created:
+        return
+    if update_fields is not None and not (set(update_fields) & set(JOB_INPUT_FIELDS)):
+        return
+    try:
+        with transaction.atomic():
+            mark_job_stale(instance)
+    except Exception as exc:
+        logger.warning(f"Failed to invalidate match analyses for job {instance.pk}: {exc}")
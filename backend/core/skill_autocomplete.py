@@ -0,0 +1,192 @@
+"""
+In-memory index behind the skills autocomplete endpoint (UC-026).
+
+Every keystroke used to run ``Skill.objects.filter(name__icontains=q)`` with a
+``Count('candidates')`` annotation, i.e. a leading-wildcard scan of ``Skill``
+joined to and aggregated over ``CandidateSkill``. This module loads the
+vocabulary and the usage counts once and answers lookups from memory:
+
+* ``SkillAutocompleteIndex`` keeps every suffix of each lowercased skill name in
+  one sorted list, so a query is a ``bisect`` to the first suffix starting with
+  it. Matching every suffix returns exactly the skills ``icontains`` did.
+  Matches are ordered by a precomputed popularity rank (usage count desc, then
+  name), and answers for repeated queries are memoized.
+* Results are also cached per query in the shared cache (Redis), keyed by an
+  index version and the current refresh period. ``Skill`` writes bump the
+  version once they commit (see ``core.signals``), which expires those results
+  and makes each process rebuild its index on its next lookup. Usage counts
+  (``CandidateSkill`` writes) and writes that skip signals (``bulk_create``,
+  raw SQL) are picked up by the rebuild every
+  ``SKILL_AUTOCOMPLETE_REFRESH_SECONDS``, when cached results roll over too.
+
+Like the skill matcher, lookups inside an open transaction use a private index
+so uncommitted rows are never published to the shared one.
+"""
+import bisect
+import hashlib
+import heapq
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = 'skills_autocomplete:version'
+RESULTS_CACHE_PREFIX = 'skills_autocomplete:results'
+# Distinct (query, category, limit) answers memoized per index
+MEMO_SIZE = 2048
+
+
+def normalize(text: str) -> str:
+    return ' '.join((text or '').lower().split())
+
+
+class SkillAutocompleteIndex:
+    """Sorted suffix list over skill names with popularity-ranked lookups."""
+
+    def __init__(self, rows, version=None):
+        """``rows`` are ``(id, name, category, usage_count)`` tuples."""
+        self.version = version
+        self.built_at = time.monotonic()
+        self._skills: Dict[int, Dict] = {}
+        entries: List[Tuple[str, int]] = []
+        for skill_id, name, category, usage_count in rows:
+            self._skills[skill_id] = {
+                'id': skill_id,
+                'name': name,
+                'category': category or '',
+                'usage_count': usage_count or 0,
+            }
+            key = normalize(name)
+            entries.extend((key[start:], skill_id) for start in range(len(key)))
+        entries.sort()
+        self._suffixes = [suffix for suffix, _ in entries]
+        self._suffix_ids = [skill_id for _, skill_id in entries]
+        ordered = sorted(self._skills.values(), key=lambda skill: (-skill['usage_count'], skill['name']))
+        self._rank = {skill['id']: position for position, skill in enumerate(ordered)}
+        self._memo: 'OrderedDict[Tuple[str, str, int], List[Dict]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_database(cls, version=None) -> 'SkillAutocompleteIndex':
+        from django.db.models import Count
+        from core.models import Skill
+
+        rows = Skill.objects.annotate(usage_count=Count('candidates')).values_list(
+            'id', 'name', 'category', 'usage_count'
+        )
+        index = cls(rows.iterator(chunk_size=5000), version=version)
+        logger.debug("Skill autocomplete index built with %d skills", len(index))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    def search(self, query: str, category: str = '', limit: int = 10) -> List[Dict]:
+        """Skills whose name contains ``query``, most used first (``category`` matched case-insensitively)."""
+        query, category = normalize(query), (category or '').strip().lower()
+        memo_key = (query, category, limit)
+        with self._lock:
+            if memo_key in self._memo:
+                self._memo.move_to_end(memo_key)
+                return self._memo[memo_key]
+
+        matches = set()
+        position = bisect.bisect_left(self._suffixes, query)
+        while position < len(self._suffixes) and self._suffixes[position].startswith(query):
+            matches.add(self._suffix_ids[position])
+            position += 1
+        if category:
+            matches = {skill_id for skill_id in matches if self._skills[skill_id]['category'].lower() == category}
+        results = [dict(self._skills[skill_id]) for skill_id in heapq.nsmallest(limit, matches, key=self._rank.__getitem__)]
+
+        with self._lock:
+            self._memo[memo_key] = results
+            while len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return results
+
+
+_shared_index: Optional[SkillAutocompleteIndex] = None
+_rebuild_lock = threading.Lock()
+
+
+def current_version() -> Optional[int]:
+    """Index version shared by all processes, or None when the cache is unavailable."""
+    try:
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(VERSION_CACHE_KEY, 1, timeout=None)
+            version = cache.get(VERSION_CACHE_KEY)
+        return version
+    except Exception as exc:
+        logger.debug(f"Skill autocomplete version unavailable: {exc}")
+        return None
+
+
+def invalidate() -> None:
+    """Expire cached results everywhere and rebuild this process's index on its next lookup."""
+    global _shared_index
+    _shared_index = None
+    try:
+        if not cache.add(VERSION_CACHE_KEY, 2, timeout=None):
+            cache.incr(VERSION_CACHE_KEY)
+    except Exception as exc:
+        logger.debug(f"Could not bump skill autocomplete version: {exc}")
+
+
+def get_index(version=None) -> SkillAutocompleteIndex:
+    """Return the shared index, rebuilding it if the version moved or it is older than the refresh interval."""
+    global _shared_index
+    if connection.in_atomic_block:
+        return SkillAutocompleteIndex.from_database(version=version)
+    max_age = _refresh_seconds()
+    index = _shared_index
+    if index is None or index.version != version or time.monotonic() - index.built_at > max_age:
+        with _rebuild_lock:
+            index = _shared_index
+            if index is None or index.version != version or time.monotonic() - index.built_at > max_age:
+                index = _shared_index = SkillAutocompleteIndex.from_database(version=version)
+    return index
+
+
+def _refresh_seconds() -> int:
+    return max(1, getattr(settings, 'SKILL_AUTOCOMPLETE_REFRESH_SECONDS', 300))
+
+
+def _results_key(version, query: str, category: str, limit: int) -> str:
+    digest = hashlib.sha1(f'{normalize(query)}\x00{(category or "").strip().lower()}\x00{limit}'.encode()).hexdigest()
+    period = int(time.time() // _refresh_seconds())
+    return f'{RESULTS_CACHE_PREFIX}:{version}:{period}:{digest}'
+
+
+def suggest(query: str, category: str = '', limit: int = 10) -> List[Dict]:
+    """Autocomplete suggestions as ``{'id', 'name', 'category', 'usage_count'}`` dicts."""
+    if connection.in_atomic_block:
+        return get_index().search(query, category, limit)
+
+    version = current_version()
+    key = _results_key(version, query, category, limit) if version is not None else None
+    if key:
+        try:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        except Exception as exc:
+            logger.debug(f"Skill autocomplete cache unavailable: {exc}")
+            key = None
+
+    results = get_index(version).search(query, category, limit)
+    if key:
+        try:
+            ttl = min(getattr(settings, 'SKILL_AUTOCOMPLETE_CACHE_TTL', 3600), _refresh_seconds())
+            cache.set(key, results, ttl)
+        except Exception as exc:
+            logger.debug(f"Could not cache skill autocomplete results: {exc}")
+    return results
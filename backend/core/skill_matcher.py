@@ -0,0 +1,234 @@
+"""
+Compiled skill-vocabulary matcher used by the skills gap analysis.
+
+Scanning a job description used to mean one ``re.search`` per ``Skill`` row.
+This module keeps a process-wide trie over the lowercased skill vocabulary and
+walks it once from every word boundary in the text, which returns exactly the
+hits the old ``\\b<skill>\\b`` regex loop produced, in a single pass.
+
+The shared matcher is refreshed incrementally:
+
+* ``Skill`` saves/deletes in this process update it after the transaction
+  commits (see ``core.signals``).
+* Rows added by other processes are picked up by a cheap ``COUNT``/``MAX(id)``
+  fingerprint check and loaded with ``id > last_seen_id``.
+* A full rebuild happens every ``SKILL_MATCHER_REFRESH_SECONDS`` to pick up
+  renames made elsewhere.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Marker key for terminal trie nodes; trie keys are otherwise single characters.
+_TERMINAL = None
+
+
+def _is_word_char(ch: str) -> bool:
+    """Mirror ``re``'s ``\\w`` for str patterns."""
+    return ch.isalnum() or ch == '_'
+
+
+def _boundaries(text: str) -> List[bool]:
+    """Return ``is_boundary[i]`` for every position ``0..len(text)`` (``\\b`` semantics)."""
+    flags = [_is_word_char(ch) for ch in text]
+    result = [False] * (len(text) + 1)
+    prev = False
+    for idx, cur in enumerate(flags):
+        result[idx] = prev != cur
+        prev = cur
+    result[len(text)] = prev
+    return result
+
+
+class KeywordTrie:
+    """Character trie over lowercased terms with whole-word scanning.
+
+    Each term maps to one or more payload keys (e.g. skill ids). ``scan`` returns
+    the payload keys of every term that occurs in the text delimited by word
+    boundaries, equivalent to ``re.search(r'\\b' + re.escape(term) + r'\\b', text)``
+    for each term.
+    """
+
+    def __init__(self):
+        self._root: Dict = {}
+        self._terms = 0
+
+    def __len__(self) -> int:
+        return self._terms
+
+    def add(self, term: str, key) -> None:
+        term = (term or '').lower()
+        if not term:
+            return
+        node = self._root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        keys = node.setdefault(_TERMINAL, [])
+        if key not in keys:
+            keys.append(key)
+            self._terms += 1
+
+    def discard(self, term: str, key) -> None:
+        node = self._root
+        for ch in (term or '').lower():
+            node = node.get(ch)
+            if node is None:
+                return
+        keys = node.get(_TERMINAL)
+        if keys and key in keys:
+            keys.remove(key)
+            self._terms -= 1
+
+    def scan(self, text: str) -> List:
+        """Return payload keys found in ``text`` (already lowercased), in first-hit order."""
+        if not text or not self._terms:
+            return []
+        boundary = _boundaries(text)
+        root = self._root
+        length = len(text)
+        found = []
+        seen = set()
+        for start in range(length):
+            if not boundary[start]:
+                continue
+            node = root
+            pos = start
+            while pos < length:
+                node = node.get(text[pos])
+                if node is None:
+                    break
+                pos += 1
+                keys = node.get(_TERMINAL)
+                if keys and boundary[pos]:
+                    for key in keys:
+                        if key not in seen:
+                            seen.add(key)
+                            found.append(key)
+        return found
+
+
+class SkillMatcher:
+    """Matcher over the ``Skill`` table returning every skill mentioned in a text."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._trie = KeywordTrie()
+        self._skills: Dict[int, Tuple[str, str]] = {}
+        self._max_id = 0
+        self._built_at: Optional[float] = None
+
+    @classmethod
+    def from_database(cls) -> 'SkillMatcher':
+        matcher = cls()
+        matcher.rebuild()
+        return matcher
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+    def rebuild(self) -> None:
+        """Reload the full vocabulary from the database."""
+        from core.models import Skill
+
+        rows = Skill.objects.order_by('id').values_list('id', 'name', 'category')
+        trie = KeywordTrie()
+        skills = {}
+        for skill_id, name, category in rows.iterator(chunk_size=5000):
+            trie.add(name, skill_id)
+            skills[skill_id] = (name, category or '')
+        with self._lock:
+            self._trie = trie
+            self._skills = skills
+            self._max_id = max(skills) if skills else 0
+            self._built_at = time.monotonic()
+        logger.debug("Skill matcher rebuilt with %d skills", len(skills))
+
+    def add_skills(self, rows: Iterable[Tuple[int, str, str]]) -> None:
+        """Insert or update ``(id, name, category)`` rows."""
+        with self._lock:
+            for skill_id, name, category in rows:
+                previous = self._skills.get(skill_id)
+                if previous is not None:
+                    self._trie.discard(previous[0], skill_id)
+                self._trie.add(name, skill_id)
+                self._skills[skill_id] = (name, category or '')
+                if skill_id > self._max_id:
+                    self._max_id = skill_id
+
+    def remove_skill(self, skill_id: int) -> None:
+        with self._lock:
+            previous = self._skills.pop(skill_id, None)
+            if previous is not None:
+                self._trie.discard(previous[0], skill_id)
+
+    def refresh(self) -> None:
+        """Bring the matcher in line with the database using one aggregate query."""
+        from django.db.models import Count, Max
+        from core.models import Skill
+
+        max_age = getattr(settings, 'SKILL_MATCHER_REFRESH_SECONDS', 600)
+        if self._built_at is None or time.monotonic() - self._built_at > max_age:
+            self.rebuild()
+            return
+
+        stats = Skill.objects.aggregate(total=Count('id'), max_id=Max('id'))
+        total = stats['total'] or 0
+        max_id = stats['max_id'] or 0
+        if total == len(self._skills) and max_id == self._max_id:
+            return
+
+        if max_id > self._max_id:
+            new_rows = list(
+                Skill.objects.filter(id__gt=self._max_id)
+                .order_by('id')
+                .values_list('id', 'name', 'category')
+            )
+            self.add_skills(new_rows)
+            if total == len(self._skills):
+                return
+
+        # Rows were removed (or ids reused) elsewhere; fall back to a full reload.
+        self.rebuild()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def match(self, text: str) -> List[Dict]:
+        """Return ``{'id', 'name', 'category'}`` for every skill found in ``text``, ordered by id."""
+        lowered = (text or '').lower()
+        with self._lock:
+            ids = sorted(self._trie.scan(lowered))
+            return [
+                {'id': skill_id, 'name': self._skills[skill_id][0], 'category': self._skills[skill_id][1]}
+                for skill_id in ids
+                if skill_id in self._skills
+            ]
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+
+_shared_matcher = SkillMatcher()
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Return an up-to-date matcher for the ``Skill`` table.
+
+    Inside an open transaction the rows we can see may never be committed, so a
+    private matcher is built instead of publishing them to the shared instance.
+    """
+    if connection.in_atomic_block:
+        return SkillMatcher.from_database()
+    _shared_matcher.refresh()
+    return _shared_matcher
+
+
+def shared_skill_matcher() -> SkillMatcher:
+    """Return the process-wide matcher without refreshing it (used by signal handlers)."""
+    return _shared_matcher
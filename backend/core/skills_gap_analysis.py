@@ -4,13 +4,44 @@ Skills Gap Analysis Generator for UC-066
 Analyzes job requirements against candidate skills to identify gaps,
 prioritize learning opportunities, and suggest resources.
 """
-import re
 import logging
 from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 
+from core.skill_matcher import KeywordTrie, get_skill_matcher, shared_skill_matcher
+
 logger = logging.getLogger(__name__)
 
+# Common technical skills, frameworks, tools, and technologies
+# This is a curated list - could be expanded or moved to database
+COMMON_SKILL_KEYWORDS = [
+    # Programming Languages
+    'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Ruby', 'Go', 'Rust',
+    'TypeScript', 'PHP', 'Swift', 'Kotlin', 'R', 'Scala', 'Perl', 'MATLAB',
+    # Frontend
+    'React', 'Angular', 'Vue.js', 'Vue', 'HTML', 'CSS', 'SCSS', 'Sass',
+    'jQuery', 'Bootstrap', 'Tailwind', 'Next.js', 'Nuxt.js',
+    # Backend
+    'Node.js', 'Express', 'Django', 'Flask', 'FastAPI', 'Spring Boot',
+    'Ruby on Rails', 'ASP.NET', '.NET', 'Laravel', 'GraphQL', 'REST API',
+    # Databases
+    'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra',
+    'Oracle', 'DynamoDB', 'Elasticsearch', 'SQLite',
+    # DevOps & Cloud
+    'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'CI/CD', 'Jenkins',
+    'GitLab', 'GitHub Actions', 'Terraform', 'Ansible', 'Linux',
+    # Data Science & ML
+    'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'scikit-learn',
+    'Pandas', 'NumPy', 'Data Analysis', 'Statistics', 'NLP', 'Computer Vision',
+    # Tools & Other
+    'Git', 'Jira', 'Agile', 'Scrum', 'Excel', 'Tableau', 'Power BI',
+    'Figma', 'Adobe Photoshop', 'UI/UX', 'API', 'Microservices',
+]
+
+_COMMON_SKILL_TRIE = KeywordTrie()
+for _keyword in COMMON_SKILL_KEYWORDS:
+    _COMMON_SKILL_TRIE.add(_keyword, _keyword)
+
 
 class SkillsGapAnalyzer:
     """Generate skills gap analysis for job opportunities."""
@@ -41,19 +72,61 @@ class SkillsGapAnalyzer:
         Returns:
             Dictionary with skills gap analysis results
         """
-        from core.models import Skill, CandidateSkill, JobEntry, LearningResource
-        
-        # Extract required skills from job
-        required_skills = cls._extract_job_requirements(job)
+        # Required skills come from the shared per-posting cache (core.job_description_cache)
+        from core.job_description_cache import job_requirements
+        required_skills = job_requirements(job)['skills']
         
         # Get candidate's current skills
         candidate_skills = cls._get_candidate_skills(candidate_profile)
         
         # Compare and compute gaps
+        skills_analysis = cls._compare_skills(required_skills, candidate_skills)
+        
+        for skill in skills_analysis:
+            # Get learning resources
+            resources = cls._get_learning_resources(
+                skill_id=skill['skill_id'],
+                candidate_level=skill['candidate_level'],
+                limit=3
+            )
+            
+            # Build learning path
+            skill['recommended_resources'] = resources
+            skill['suggested_learning_path'] = cls._build_learning_path(
+                skill_name=skill['name'],
+                candidate_level=skill['candidate_level'],
+                target_level=skill['target_level'] or 'intermediate',
+                resources=resources
+            )
+        
+        summary = cls._summarize_skills(skills_analysis)
+        
+        result = {
+            'job_id': job.id,
+            'generated_at': None,  # Will be set by view
+            'source': 'parsed',  # Will be updated if AI/requirements used
+            'skills': skills_analysis,
+            'summary': summary,
+        }
+        
+        # Add trends if requested
+        if include_similar_trends:
+            trends = cls._analyze_similar_jobs(job, candidate_profile)
+            result['trends'] = trends
+        
+        return result
+    
+    @classmethod
+    def _compare_skills(cls, required_skills: List[Dict], candidate_skills: Dict[int, Dict]) -> List[Dict]:
+        """
+        Compare required skills against the candidate's skills.
+        
+        Returns entries sorted by gap severity (highest first) with importance
+        ranks reassigned, without learning resources attached.
+        """
         skills_analysis = []
         for req_skill_data in required_skills:
             skill_id = req_skill_data['skill_id']
-            skill_name = req_skill_data['name']
             
             # Find candidate's proficiency
             candidate_level = None
@@ -71,24 +144,9 @@ class SkillsGapAnalyzer:
                 job_priority=req_skill_data.get('priority', 50)
             )
             
-            # Get learning resources
-            resources = cls._get_learning_resources(
-                skill_id=skill_id,
-                candidate_level=candidate_level,
-                limit=3
-            )
-            
-            # Build learning path
-            learning_path = cls._build_learning_path(
-                skill_name=skill_name,
-                candidate_level=candidate_level,
-                target_level=req_skill_data.get('level', 'intermediate'),
-                resources=resources
-            )
-            
             skills_analysis.append({
                 'skill_id': skill_id,
-                'name': skill_name,
+                'name': req_skill_data['name'],
                 'category': req_skill_data.get('category', ''),
                 'importance_rank': req_skill_data.get('importance_rank', 0),
                 'required': req_skill_data.get('is_required', True),
@@ -97,8 +155,6 @@ class SkillsGapAnalyzer:
                 'candidate_years': float(candidate_years) if candidate_years else None,
                 'target_level': req_skill_data.get('level'),
                 'gap_severity': gap_severity,
-                'recommended_resources': resources,
-                'suggested_learning_path': learning_path,
             })
         
         # Sort by gap severity and importance
@@ -111,7 +167,11 @@ class SkillsGapAnalyzer:
         for idx, skill in enumerate(skills_analysis, 1):
             skill['importance_rank'] = idx
         
-        # Compute summary
+        return skills_analysis
+    
+    @classmethod
+    def _summarize_skills(cls, skills_analysis: List[Dict]) -> Dict:
+        """Compute the summary block for a compared skills list."""
         total_skills = len(skills_analysis)
         missing_skills = sum(1 for s in skills_analysis if s['candidate_level'] is None)
         matched_skills = total_skills - missing_skills
@@ -124,31 +184,16 @@ class SkillsGapAnalyzer:
         medium_gaps = sum(1 for s in skills_analysis if 40 < s['gap_severity'] <= 70)
         estimated_weeks = (high_gaps * 2) + (medium_gaps * 1)
         
-        summary = {
+        return {
             'top_gaps': top_gaps,
             'total_skills_required': total_skills,
             'total_skills_matched': matched_skills,
             'total_skills_missing': missing_skills,
             'recommended_time_weeks': estimated_weeks,
         }
-        
-        result = {
-            'job_id': job.id,
-            'generated_at': None,  # Will be set by view
-            'source': 'parsed',  # Will be updated if AI/requirements used
-            'skills': skills_analysis,
-            'summary': summary,
-        }
-        
-        # Add trends if requested
-        if include_similar_trends:
-            trends = cls._analyze_similar_jobs(job, candidate_profile)
-            result['trends'] = trends
-        
-        return result
     
     @classmethod
-    def _extract_job_requirements(cls, job) -> List[Dict]:
+    def _extract_job_requirements(cls, job, matcher=None) -> List[Dict]:
         """
         Extract required skills from job description and requirements.
         
@@ -157,10 +202,11 @@ class SkillsGapAnalyzer:
         2. Parse job description for skill keywords (existing skills)
         3. Extract common skill keywords from text (auto-create if needed)
         
+        Callers scoring many jobs can pass ``matcher`` to skip the per-call
+        freshness check on the shared skill matcher.
+        
         Returns list of dicts with skill info.
         """
-        from core.models import Skill, JobRequirement
-        
         skills = []
         found_skill_names = set()
         
@@ -171,47 +217,33 @@ class SkillsGapAnalyzer:
         description = (job.description or '') + ' ' + (job.title or '')
         description_lower = description.lower()
         
-        # Get all skills from database
-        all_skills = Skill.objects.all().values('id', 'name', 'category')
+        # Single pass over the description with the compiled skill vocabulary
+        matcher = matcher or get_skill_matcher()
         
         importance_rank = 1
-        for skill_data in all_skills:
+        for skill_data in matcher.match(description_lower):
             skill_name = skill_data['name']
-            skill_name_lower = skill_name.lower()
-            
-            # Simple keyword matching (case-insensitive, whole word)
-            pattern = r'\b' + re.escape(skill_name_lower) + r'\b'
-            if re.search(pattern, description_lower):
-                skills.append({
-                    'skill_id': skill_data['id'],
-                    'name': skill_name,
-                    'category': skill_data['category'] or 'Technical',
-                    'is_required': True,
-                    'priority': 50,  # Default medium priority
-                    'importance_rank': importance_rank,
-                    'level': 'intermediate',  # Default expected level
-                })
-                found_skill_names.add(skill_name_lower)
-                importance_rank += 1
+            skills.append({
+                'skill_id': skill_data['id'],
+                'name': skill_name,
+                'category': skill_data['category'] or 'Technical',
+                'is_required': True,
+                'priority': 50,  # Default medium priority
+                'importance_rank': importance_rank,
+                'level': 'intermediate',  # Default expected level
+            })
+            found_skill_names.add(skill_name.lower())
+            importance_rank += 1
         
         # Extract additional skill keywords from description that aren't in DB yet
-        extracted_keywords = cls._extract_skill_keywords(description)
-        for keyword in extracted_keywords:
-            keyword_lower = keyword.lower()
-            # Skip if already found
-            if keyword_lower in found_skill_names:
+        extracted_keywords = [
+            keyword for keyword in cls._extract_skill_keywords(description)
+            if keyword.lower() not in found_skill_names
+        ]
+        for skill in cls._resolve_keyword_skills(extracted_keywords):
+            skill_name_lower = skill.name.lower()
+            if skill_name_lower in found_skill_names:
                 continue
-            
-            # Try to find existing skill (case-insensitive)
-            skill = Skill.objects.filter(name__iexact=keyword).first()
-            
-            # Create if doesn't exist
-            if not skill:
-                skill = Skill.objects.create(
-                    name=keyword,
-                    category='Technical',
-                )
-            
             skills.append({
                 'skill_id': skill.id,
                 'name': skill.name,
@@ -222,7 +254,7 @@ class SkillsGapAnalyzer:
                 'level': 'intermediate',
                 'auto_detected': True,  # Flag to indicate this was auto-created
             })
-            found_skill_names.add(keyword_lower)
+            found_skill_names.add(skill_name_lower)
             importance_rank += 1
         
         # If no skills found, add some common ones based on job title
@@ -232,48 +264,53 @@ class SkillsGapAnalyzer:
         return skills
     
     @classmethod
-    def _extract_skill_keywords(cls, text: str) -> List[str]:
+    def _resolve_keyword_skills(cls, keywords: List[str]) -> List:
         """
-        Extract common technical skill keywords from job description text.
+        Map extracted keywords to Skill rows, creating the missing ones.
         
-        Returns list of skill names that appear in the text.
+        Uses one case-insensitive lookup for all keywords and a single
+        bulk_create for the ones that do not exist yet. Results follow the
+        order of ``keywords``.
         """
-        # Common technical skills, frameworks, tools, and technologies
-        # This is a curated list - could be expanded or moved to database
-        common_skills = [
-            # Programming Languages
-            'Python', 'JavaScript', 'Java', 'C++', 'C#', 'Ruby', 'Go', 'Rust',
-            'TypeScript', 'PHP', 'Swift', 'Kotlin', 'R', 'Scala', 'Perl', 'MATLAB',
-            # Frontend
-            'React', 'Angular', 'Vue.js', 'Vue', 'HTML', 'CSS', 'SCSS', 'Sass',
-            'jQuery', 'Bootstrap', 'Tailwind', 'Next.js', 'Nuxt.js',
-            # Backend
-            'Node.js', 'Express', 'Django', 'Flask', 'FastAPI', 'Spring Boot',
-            'Ruby on Rails', 'ASP.NET', '.NET', 'Laravel', 'GraphQL', 'REST API',
-            # Databases
-            'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra',
-            'Oracle', 'DynamoDB', 'Elasticsearch', 'SQLite',
-            # DevOps & Cloud
-            'Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'CI/CD', 'Jenkins',
-            'GitLab', 'GitHub Actions', 'Terraform', 'Ansible', 'Linux',
-            # Data Science & ML
-            'Machine Learning', 'Deep Learning', 'TensorFlow', 'PyTorch', 'scikit-learn',
-            'Pandas', 'NumPy', 'Data Analysis', 'Statistics', 'NLP', 'Computer Vision',
-            # Tools & Other
-            'Git', 'Jira', 'Agile', 'Scrum', 'Excel', 'Tableau', 'Power BI',
-            'Figma', 'Adobe Photoshop', 'UI/UX', 'API', 'Microservices',
-        ]
+        from django.db import transaction
+        from django.db.models import Q
+        from core.models import Skill
         
-        text_lower = text.lower()
-        found_skills = []
+        if not keywords:
+            return []
+        
+        def _lookup(names):
+            query = Q()
+            for name in names:
+                query |= Q(name__iexact=name)
+            by_name = {}
+            for skill in Skill.objects.filter(query).order_by('id'):
+                by_name.setdefault(skill.name.lower(), skill)
+            return by_name
+        
+        existing = _lookup(keywords)
+        missing = [kw for kw in keywords if kw.lower() not in existing]
+        if missing:
+            Skill.objects.bulk_create(
+                [Skill(name=kw, category='Technical') for kw in missing],
+                ignore_conflicts=True,
+            )
+            created = _lookup(missing)
+            existing.update(created)
+            rows = [(s.id, s.name, s.category) for s in created.values()]
+            transaction.on_commit(lambda: shared_skill_matcher().add_skills(rows))
         
-        for skill in common_skills:
-            # Case-insensitive whole word matching
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
+        return [existing[kw.lower()] for kw in keywords if kw.lower() in existing]
+    
+    @classmethod
+    def _extract_skill_keywords(cls, text: str) -> List[str]:
+        """
+        Extract common technical skill keywords from job description text.
         
-        return found_skills
+        Returns list of skill names that appear in the text.
+        """
+        found = set(_COMMON_SKILL_TRIE.scan((text or '').lower()))
+        return [skill for skill in COMMON_SKILL_KEYWORDS if skill in found]
     
     @classmethod
     def _infer_skills_from_title(cls, job_title: str) -> List[Dict]:
@@ -665,9 +702,12 @@ class SkillsGapAnalyzer:
             similar_by_title = list(similar_jobs.filter(industry=job.industry)[:10])
         
         # Extract common skills from those jobs
+        from core.job_description_cache import job_requirements_many
+        similar_by_title = similar_by_title[:10]  # Limit to 10
+        requirements = job_requirements_many(similar_by_title)
         common_skills = {}
-        for similar_job in similar_by_title[:10]:  # Limit to 10
-            job_skills = cls._extract_job_requirements(similar_job)
+        for similar_job in similar_by_title:
+            job_skills = requirements[similar_job.id]['skills']
             for skill in job_skills:
                 skill_name = skill['name']
                 if skill_name not in common_skills:
@@ -7,6 +7,7 @@ import os
 import logging
 import io
 import requests
+from core import http
 from typing import Optional, Tuple, BinaryIO, Union
 from PIL import Image
 from django.core.files.base import ContentFile
@@ -286,7 +287,7 @@ def download_file_response(file_field, filename: Optional[str] = None, as_attach
         if is_cloudinary_url(file_url):
             # Fetch file from Cloudinary URL
             try:
-                response = requests.get(file_url, stream=True, timeout=30)
+                response = http.get(file_url, policy='storage')
                 response.raise_for_status()
                 
                 # Use content-type from Cloudinary response if available
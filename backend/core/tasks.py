@@ -214,6 +214,74 @@ def enqueue_technical_prep_generation(generation_id):
         process_technical_prep_generation(generation_id)
 
 
+# Resume / cover letter / experience tailoring generations (core.ai_generation)
+
+if CELERY_AVAILABLE:
+    @shared_task(bind=True, ignore_result=True, max_retries=None)
+    def process_ai_generation(self, generation_id):
+        from core.ai_generation import run_generation
+
+        delay = run_generation(generation_id)
+        if delay is not None:
+            # Rate limited: the broker holds the retry instead of a sleeping worker
+            raise self.retry(countdown=delay)
+else:
+    def process_ai_generation(generation_id):
+        from core.ai_generation import run_generation
+
+        delay = run_generation(generation_id)
+        if delay is not None:
+            _run_ai_generation_in_thread(generation_id, delay)
+
+
+def _run_ai_generation_in_thread(generation_id, countdown=None):
+    import threading
+    from django.db import connection
+
+    from core.ai_generation import run_generation
+
+    def _run():
+        try:
+            delay = run_generation(generation_id)
+        except Exception as exc:
+            logger.warning(f"AI generation {generation_id} failed: {exc}")
+            delay = None
+        finally:
+            connection.close()
+        if delay is not None:
+            _run_ai_generation_in_thread(generation_id, delay)
+
+    timer = threading.Timer(countdown or 0, _run)
+    timer.name = 'ai-generation'
+    timer.daemon = True
+    timer.start()
+
+
+def enqueue_ai_generation(generation_id, countdown=None):
+    """Queue an AI generation; falls back to a background thread without Celery."""
+    if CELERY_AVAILABLE:
+        try:
+            process_ai_generation.apply_async(args=[generation_id], countdown=countdown)
+            return
+        except Exception as exc:
+            logger.debug(f"Celery unavailable for AI generation, using a thread: {exc}")
+    _run_ai_generation_in_thread(generation_id, countdown)
+
+
+if CELERY_AVAILABLE:
+    @shared_task(ignore_result=True)
+    def expire_stale_ai_generations():
+        """Periodic sweep failing generations whose worker or queued retry was lost."""
+        from core.ai_generation import expire_stale_generations
+
+        return expire_stale_generations()
+else:
+    def expire_stale_ai_generations():
+        from core.ai_generation import expire_stale_generations
+
+        return expire_stale_generations()
+
+
 # 
 # 
 # =
@@ -223,6 +291,21 @@ def enqueue_technical_prep_generation(generation_id):
 # =
 
 
+AUTO_LINK_JOB_STATUSES = ['interested', 'applied', 'phone', 'onsite']
+
+
+def _match_job_for_email(email_obj, jobs):
+    """Return the first job whose company name appears in the email body"""
+    body = email_obj.body_text.lower()
+    for job in jobs:
+        company_name = job.company_name.lower() if job.company_name else ''
+        
+        # Simple matching logic - check if company name appears in email
+        if company_name and len(company_name) > 3 and company_name in body:
+            return job
+    return None
+
+
 def auto_link_email_to_job(email_obj):
     """Attempt to automatically link email to a job based on content"""
     from core.models import JobEntry
@@ -235,34 +318,181 @@ def auto_link_email_to_job(email_obj):
     if not hasattr(email_obj.user, 'profile'):
         return False
     
-    # Extract company names and job titles from email
     # Match against user's JobEntry records
-    subject_words = email_obj.subject.lower().split()
-    body_words = email_obj.body_text[:1000].lower().split()  # First 1000 chars
-    
     jobs = JobEntry.objects.filter(
         candidate=email_obj.user.profile,
-        status__in=['interested', 'applied', 'phone', 'onsite']
+        status__in=AUTO_LINK_JOB_STATUSES
     )[:50]  # Limit to recent 50 jobs
     
-    for job in jobs:
-        company_name = job.company_name.lower() if job.company_name else ''
-        job_title = job.title.lower() if job.title else ''
-        
-        # Simple matching logic - check if company name appears in email
-        if company_name and len(company_name) > 3 and company_name in email_obj.body_text.lower():
+    job = _match_job_for_email(email_obj, jobs)
+    if job is None:
+        return False
+    email_obj.job = job
+    email_obj.is_linked = True
+    email_obj.save(update_fields=['job', 'is_linked', 'updated_at'])
+    logger.info(f'Auto-linked email {email_obj.id} to job {job.id}')
+    return True
+
+
+def auto_link_emails_to_jobs(user, emails):
+    """
+    Batch form of auto_link_email_to_job for a scan's new emails.
+    
+    Loads the user's active jobs once and saves all links with one bulk_update.
+    
+    Returns:
+        Number of emails linked
+    """
+    from core.models import ApplicationEmail, JobEntry
+    
+    unlinked = [email_obj for email_obj in emails if not email_obj.job_id]
+    if not unlinked or not hasattr(user, 'profile'):
+        return 0
+    
+    jobs = list(JobEntry.objects.filter(
+        candidate=user.profile,
+        status__in=AUTO_LINK_JOB_STATUSES
+    )[:50])
+    if not jobs:
+        return 0
+    
+    now = timezone.now()
+    linked = []
+    for email_obj in unlinked:
+        job = _match_job_for_email(email_obj, jobs)
+        if job is not None:
             email_obj.job = job
             email_obj.is_linked = True
-            email_obj.save(update_fields=['job', 'is_linked', 'updated_at'])
-            logger.info(f'Auto-linked email {email_obj.id} to job {job.id}')
-            return True
+            email_obj.updated_at = now
+            linked.append(email_obj)
+    if linked:
+        ApplicationEmail.objects.bulk_update(linked, ['job', 'is_linked', 'updated_at'])
+        logger.info(f'Auto-linked {len(linked)} emails to jobs for user {user.id}')
+    return len(linked)
+
+
+GMAIL_SCAN_SUBJECT_TERMS = 'subject:(job OR application OR interview OR offer OR recruiter OR hiring)'
+
+
+def _collect_gmail_message_ids(access_token, integration):
+    """
+    Return (message_ids, history_id, resume_from) for the messages a scan should consider.
+    
+    With a stored ``gmail_history_id`` only messages added since the last scan
+    are considered (Gmail history API), narrowed to job-related subjects with
+    one search request. The first scan, or one whose history has expired,
+    lists the full 90-day window and records the mailbox's current historyId
+    as the cursor for the next run.
     
-    return False
+    ``resume_from`` maps each message from the history API to the cursor that
+    still lists it, so a scan that fails to fetch it can stop the cursor there.
+    """
+    from core import gmail_utils
+    
+    if integration.gmail_history_id:
+        try:
+            added = []
+            resume_from = {}
+            history_id = integration.gmail_history_id
+            record_id = integration.gmail_history_id
+            page_token = None
+            while True:
+                data = gmail_utils.list_history(access_token, integration.gmail_history_id, page_token=page_token)
+                for record in data.get('history', []):
+                    for item in record.get('messagesAdded', []):
+                        msg_id = item.get('message', {}).get('id')
+                        if msg_id:
+                            added.append(msg_id)
+                            resume_from.setdefault(msg_id, record_id)
+                    record_id = str(record.get('id') or record_id)
+                history_id = str(data.get('historyId') or history_id)
+                page_token = data.get('nextPageToken')
+                if not page_token:
+                    break
+            if not added:
+                return [], history_id, {}
+            
+            since = (integration.last_scan_at or timezone.now() - timedelta(days=90)) - timedelta(days=1)
+            query = f'{GMAIL_SCAN_SUBJECT_TERMS} after:{int(since.timestamp())}'
+            messages_data = gmail_utils.fetch_messages(access_token, query=query, max_results=500)
+            matching = {m['id'] for m in messages_data.get('messages', [])}
+            return [msg_id for msg_id in added if msg_id in matching], history_id, resume_from
+        except gmail_utils.GmailHistoryExpiredError as e:
+            logger.info(f'Gmail history expired for integration {integration.id}, running full sync: {e}')
+    
+    # Take the cursor before listing so messages arriving mid-scan land in the next delta
+    history_id = ''
+    try:
+        history_id = str(gmail_utils.get_profile(access_token, max_retries=1).get('historyId') or '')
+    except gmail_utils.GmailAPIError as e:
+        logger.warning(f'Could not read Gmail historyId for integration {integration.id}: {e}')
+    
+    # Search query for job-related emails from last 90 days
+    query = f'{GMAIL_SCAN_SUBJECT_TERMS} newer_than:90d'
+    messages_data = gmail_utils.fetch_messages(access_token, query=query, max_results=100)
+    return [m['id'] for m in messages_data.get('messages', [])], history_id, {}
+
+
+def _build_application_email(user, msg_id, msg_detail):
+    """Parse a Gmail message into an unsaved ApplicationEmail"""
+    from core.models import ApplicationEmail
+    from core import gmail_utils
+    
+    headers = gmail_utils.parse_email_headers(msg_detail)
+    body = gmail_utils.extract_email_body(msg_detail)
+    snippet = msg_detail.get('snippet', '')
+    
+    # Parse sender
+    from_header = headers.get('from', '')
+    sender_email = gmail_utils.extract_email_from_header(from_header)
+    sender_name = gmail_utils.extract_name_from_header(from_header)
+    
+    # Classify email
+    email_type, confidence, suggested_status = gmail_utils.classify_email_type(
+        headers.get('subject', ''),
+        body,
+        sender_email
+    )
+    
+    return ApplicationEmail(
+        user=user,
+        gmail_message_id=msg_id,
+        thread_id=msg_detail.get('threadId', ''),
+        subject=headers.get('subject', '')[:500],
+        sender_email=sender_email[:254],  # Max email field length
+        sender_name=sender_name[:255],
+        received_at=gmail_utils.parse_gmail_date(headers.get('date')),
+        snippet=snippet[:1000],
+        body_text=body[:10000],  # Limit size
+        email_type=email_type,
+        confidence_score=confidence,
+        is_application_related=confidence > 0.5,
+        suggested_job_status=suggested_status,
+        labels=msg_detail.get('labelIds', []),
+    )
+
+
+def _bulk_create_application_emails(emails):
+    """Insert scanned emails in one statement, dropping any a concurrent scan stored first"""
+    from django.db import IntegrityError, transaction
+    from core.models import ApplicationEmail
+    
+    if not emails:
+        return []
+    try:
+        with transaction.atomic():
+            return ApplicationEmail.objects.bulk_create(emails)
+    except IntegrityError:
+        stored = set(ApplicationEmail.objects.filter(
+            gmail_message_id__in=[e.gmail_message_id for e in emails]
+        ).values_list('gmail_message_id', flat=True))
+        remaining = [e for e in emails if e.gmail_message_id not in stored]
+        return ApplicationEmail.objects.bulk_create(remaining)
 
 
 def _scan_gmail_sync(integration_id):
-    """Synchronous Gmail scan implementation"""
-    from core.models import GmailIntegration, ApplicationEmail, JobEntry, EmailScanLog
+    """Synchronous Gmail scan implementation (incremental once a historyId is stored)"""
+    from core.models import GmailIntegration, ApplicationEmail, EmailScanLog
     from core import gmail_utils
     
     integration = GmailIntegration.objects.get(id=integration_id)
@@ -289,69 +519,41 @@ def _scan_gmail_sync(integration_id):
         
         access_token = gmail_utils.ensure_valid_token(integration)
         
-        # Search query for job-related emails from last 90 days
-        query = 'subject:(job OR application OR interview OR offer OR recruiter OR hiring) newer_than:90d'
+        message_ids, history_id, resume_from = _collect_gmail_message_ids(access_token, integration)
+        message_ids = list(dict.fromkeys(message_ids))
         
-        messages_data = gmail_utils.fetch_messages(access_token, query=query, max_results=100)
-        message_ids = [m['id'] for m in messages_data.get('messages', [])]
+        # Skip already processed messages with a single lookup
+        existing = set(ApplicationEmail.objects.filter(
+            gmail_message_id__in=message_ids
+        ).values_list('gmail_message_id', flat=True))
+        new_ids = [msg_id for msg_id in message_ids if msg_id not in existing]
         
-        emails_processed = 0
-        emails_matched = 0
-        emails_linked = 0
+        details = gmail_utils.get_message_details(access_token, new_ids)
+        failed = [msg_id for msg_id in new_ids if msg_id not in details]
+        if failed:
+            # Stop the cursor before the first message that could not be fetched so the next scan retries it
+            history_id = min(
+                (resume_from.get(msg_id, integration.gmail_history_id) for msg_id in failed),
+                key=lambda cursor: int(cursor or 0),
+            )
         
-        for msg_id in message_ids:
+        emails = []
+        for msg_id in new_ids:
+            msg_detail = details.get(msg_id)
+            if msg_detail is None:
+                continue
             try:
-                # Skip if already processed
-                if ApplicationEmail.objects.filter(gmail_message_id=msg_id).exists():
-                    continue
-                
-                msg_detail = gmail_utils.get_message_detail(access_token, msg_id)
-                
-                headers = gmail_utils.parse_email_headers(msg_detail)
-                body = gmail_utils.extract_email_body(msg_detail)
-                snippet = msg_detail.get('snippet', '')
-                
-                # Parse sender
-                from_header = headers.get('from', '')
-                sender_email = gmail_utils.extract_email_from_header(from_header)
-                sender_name = gmail_utils.extract_name_from_header(from_header)
-                
-                # Classify email
-                email_type, confidence, suggested_status = gmail_utils.classify_email_type(
-                    headers.get('subject', ''),
-                    body,
-                    sender_email
-                )
-                
-                # Create email record
-                email_obj = ApplicationEmail.objects.create(
-                    user=integration.user,
-                    gmail_message_id=msg_id,
-                    thread_id=msg_detail.get('threadId', ''),
-                    subject=headers.get('subject', '')[:500],
-                    sender_email=sender_email[:254],  # Max email field length
-                    sender_name=sender_name[:255],
-                    received_at=gmail_utils.parse_gmail_date(headers.get('date')),
-                    snippet=snippet[:1000],
-                    body_text=body[:10000],  # Limit size
-                    email_type=email_type,
-                    confidence_score=confidence,
-                    is_application_related=confidence > 0.5,
-                    suggested_job_status=suggested_status,
-                    labels=msg_detail.get('labelIds', []),
-                )
-                
-                emails_processed += 1
-                if email_obj.is_application_related:
-                    emails_matched += 1
-                
-                # Try to auto-link to job
-                if auto_link_email_to_job(email_obj):
-                    emails_linked += 1
-                
+                emails.append(_build_application_email(integration.user, msg_id, msg_detail))
             except Exception as e:
                 logger.warning(f'Error processing message {msg_id}: {e}')
         
+        emails = _bulk_create_application_emails(emails)
+        emails_processed = len(emails)
+        emails_matched = sum(1 for email_obj in emails if email_obj.is_application_related)
+        
+        # Try to auto-link to jobs
+        emails_linked = auto_link_emails_to_jobs(integration.user, emails)
+        
         scan_log.emails_processed = emails_processed
         scan_log.emails_matched = emails_matched
         scan_log.emails_linked = emails_linked
@@ -363,7 +565,9 @@ def _scan_gmail_sync(integration_id):
         integration.last_scan_at = timezone.now()
         integration.emails_scanned_count = integration.emails_scanned_count + emails_processed
         integration.rate_limit_reset_at = None  # Clear any rate limit tracking on success
-        integration.save(update_fields=['status', 'last_scan_at', 'emails_scanned_count', 'rate_limit_reset_at', 'updated_at'])
+        if history_id:
+            integration.gmail_history_id = history_id
+        integration.save(update_fields=['status', 'last_scan_at', 'emails_scanned_count', 'rate_limit_reset_at', 'gmail_history_id', 'updated_at'])
         
         logger.info(f'Gmail scan completed: {emails_processed} processed, {emails_matched} matched, {emails_linked} linked')
     
@@ -817,159 +1021,265 @@ else:
         return _generate_weekly_api_report_sync()
 
 
-# ========================================
-# UC-124: Job Application Timing Optimizer Tasks
-# ========================================
+def _warm_resume_pdf_cache_sync(version_id):
+    """Compile a resume version's LaTeX into the PDF cache unless it is already there."""
+    from core.models import ResumeVersion
+    from core import pdf_cache, resume_ai
+    
+    latex = ResumeVersion.objects.filter(pk=version_id).values_list('latex_content', flat=True).first()
+    if not latex:
+        return {'warmed': False}
+    key = pdf_cache.pdf_cache_key(latex)
+    if pdf_cache.has_cached_pdf(key):
+        return {'warmed': False, 'cached': True}
+    try:
+        resume_ai.compile_latex_pdf_bytes(latex, cache_key=key)
+    except resume_ai.ResumeAIError as exc:
+        logger.info(f"Skipping PDF pre-warm for resume version {version_id}: {exc}")
+        return {'warmed': False, 'error': str(exc)}
+    return {'warmed': True}
 
-def _process_scheduled_submissions_sync():
-    """
-    Process scheduled submissions that are due.
-    This should be called periodically (e.g., every 15 minutes).
-    """
-    from core.models import ScheduledSubmission
-    from django.core.mail import send_mail, EmailMessage
-    from django.conf import settings
+
+if CELERY_AVAILABLE:
+    @shared_task(ignore_result=True)
+    def warm_resume_pdf_cache(version_id):
+        """Pre-compile a saved resume version so shared links and exports hit the PDF cache."""
+        return _warm_resume_pdf_cache_sync(version_id)
+else:
+    def warm_resume_pdf_cache(version_id):
+        return _warm_resume_pdf_cache_sync(version_id)
+
+
+def enqueue_resume_pdf_warmup(version_id):
+    """Queue a PDF pre-warm; falls back to a background thread so saves never wait on Tectonic."""
+    if CELERY_AVAILABLE:
+        try:
+            warm_resume_pdf_cache.delay(str(version_id))
+            return
+        except Exception as exc:
+            logger.debug(f"Celery unavailable for PDF pre-warm, using a thread: {exc}")
     
-    now = timezone.now()
+    import threading
+    from django.db import connection
     
-    # Get submissions that are due
-    due_submissions = ScheduledSubmission.objects.filter(
-        status='scheduled',
-        scheduled_datetime__lte=now
-    ).select_related('job', 'candidate', 'application_package')
+    def _run():
+        try:
+            _warm_resume_pdf_cache_sync(version_id)
+        except Exception as exc:
+            logger.warning(f"PDF pre-warm failed for resume version {version_id}: {exc}")
+        finally:
+            connection.close()
     
-    processed_count = 0
-    failed_count = 0
+    threading.Thread(target=_run, name='resume-pdf-warmup', daemon=True).start()
+
+
+def _flush_api_usage_logs_sync():
+    """Drain queued API usage records (core.api_usage_buffer) into the database."""
+    from core.api_usage_buffer import flush_usage_log_buffer
     
-    for submission in due_submissions:
-        try:
-            logger.info(f"Processing scheduled submission {submission.id} for job {submission.job.id}")
-            
-            # Perform actual submission based on method
-            if submission.submission_method == 'email':
-                _send_application_email(submission)
-            elif submission.submission_method == 'portal':
-                # For portal submissions, just mark as submitted
-                # User would have to manually submit through the portal
-                logger.info(f"Portal submission {submission.id} marked for manual completion")
-            else:
-                logger.info(f"Other submission method for {submission.id}, marking as submitted")
-            
-            # Mark as submitted
-            submission.mark_submitted()
-            processed_count += 1
-            
-            logger.info(f"Successfully processed submission {submission.id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to process submission {submission.id}: {str(e)}")
-            submission.status = 'failed'
-            submission.error_message = str(e)
-            submission.retry_count += 1
-            
-            # Retry if under max retries
-            if submission.retry_count < submission.max_retries:
-                submission.status = 'scheduled'
-                submission.scheduled_datetime = now + timedelta(minutes=15)
-                logger.info(f"Rescheduling submission {submission.id} for retry")
-            
-            submission.save()
-            failed_count += 1
+    written = flush_usage_log_buffer()
+    return {'written': written}
+
+
+if CELERY_AVAILABLE:
+    @shared_task
+    def flush_api_usage_logs():
+        """Flush the shared Redis usage-log buffer; in-memory buffers are flushed by their own process."""
+        return _flush_api_usage_logs_sync()
+else:
+    def flush_api_usage_logs():
+        return _flush_api_usage_logs_sync()
+
+
+def _process_geocode_queue_sync(limit=None):
+    """Resolve queued job locations (core.geocoding) at Nominatim's rate limit."""
+    from core.geocoding import process_geocode_queue as drain_queue
     
-    logger.info(f"Processed {processed_count} submissions, {failed_count} failed")
-    return {'processed': processed_count, 'failed': failed_count}
+    return drain_queue(limit)
 
 
-def _send_application_email(submission):
-    """
-    Send application email with resume and cover letter attachments.
-    """
-    from django.core.mail import EmailMessage
-    from django.conf import settings
-    import os
+if CELERY_AVAILABLE:
+    @shared_task(ignore_result=True)
+    def process_geocode_queue(limit=None):
+        """Drain the shared geocoding queue and copy coordinates onto waiting jobs."""
+        return _process_geocode_queue_sync(limit)
+else:
+    def process_geocode_queue(limit=None):
+        return _process_geocode_queue_sync(limit)
+
+
+def enqueue_geocode_queue():
+    """Kick the geocoder after a job save; falls back to a background thread without Celery."""
+    if CELERY_AVAILABLE:
+        try:
+            process_geocode_queue.delay()
+            return
+        except Exception as exc:
+            logger.debug(f"Celery unavailable for geocoding, using a thread: {exc}")
     
-    job = submission.job
-    candidate = submission.candidate
-    package = submission.application_package
-    user = candidate.user
+    import threading
+    from django.db import connection
     
-    # Build email subject
-    subject = f"Application for {job.title} - {user.get_full_name() or user.email}"
+    def _run():
+        try:
+            _process_geocode_queue_sync()
+        except Exception as exc:
+            logger.warning(f"Geocoding queue drain failed: {exc}")
+        finally:
+            connection.close()
     
-    # Build email body
-    body = f"""Dear Hiring Manager,
+    threading.Thread(target=_run, name='geocode-queue', daemon=True).start()
 
-I am writing to express my interest in the {job.title} position at {job.company_name}.
 
-{candidate.summary or 'I am excited about this opportunity and believe my skills and experience make me a strong candidate for this role.'}
+def _refresh_peer_benchmarks_sync():
+    """Rebuild the peer-cohort snapshots (core.peer_benchmarks) read by competitive analysis."""
+    from core.peer_benchmarks import refresh_peer_benchmarks as rebuild
 
-Please find attached my resume and cover letter for your consideration.
+    return {'cohorts': rebuild()}
 
-Thank you for your time and consideration.
 
-Best regards,
-{user.get_full_name() or user.first_name or 'Applicant'}
-{candidate.phone or ''}
-{user.email}
-"""
-    
-    # Get recipient email
-    # Try to get from job metadata
-    to_email = None
-    if hasattr(job, 'metadata') and job.metadata:
-        if isinstance(job.metadata, dict):
-            to_email = job.metadata.get('contact_email') or job.metadata.get('recruiter_email')
-    
-    # If no email found, we can't send - mark for manual submission
-    if not to_email:
-        raise ValueError(f"No recipient email found for job {job.id}. Please add contact email to job metadata or submit manually.")
-    
-    # Create email message
-    email = EmailMessage(
-        subject=subject,
-        body=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[to_email],
-        reply_to=[user.email]
-    )
+if CELERY_AVAILABLE:
+    @shared_task(ignore_result=True)
+    def refresh_peer_benchmarks():
+        """Recompute peer-cohort benchmark snapshots with grouped aggregates."""
+        return _refresh_peer_benchmarks_sync()
+else:
+    def refresh_peer_benchmarks():
+        return _refresh_peer_benchmarks_sync()
+
+
+def enqueue_peer_benchmark_refresh():
+    """Refresh stale peer benchmarks; falls back to a background thread without Celery."""
+    if CELERY_AVAILABLE:
+        try:
+            refresh_peer_benchmarks.delay()
+            return
+        except Exception as exc:
+            logger.debug(f"Celery unavailable for peer benchmarks, using a thread: {exc}")
+
+    import threading
+    from django.db import connection
+
+    def _run():
+        try:
+            _refresh_peer_benchmarks_sync()
+        except Exception as exc:
+            logger.warning(f"Peer benchmark refresh failed: {exc}")
+        finally:
+            connection.close()
+
+    threading.Thread(target=_run, name='peer-benchmarks', daemon=True).start()
+
+
+def _recompute_candidate_matches_sync(candidate_id, job_ids=None):
+    """Recompute one candidate's stale (or missing) match and skills gap analyses."""
+    from core.match_fingerprints import recompute_candidate
+
+    return recompute_candidate(candidate_id, job_ids)
+
+
+def _recompute_stale_matches_sync():
+    """Sweep stale match and skills gap analyses left by invalidation signals."""
+    from core.match_fingerprints import recompute_stale
+
+    return recompute_stale()
+
+
+if CELERY_AVAILABLE:
+    @shared_task(ignore_result=True)
+    def recompute_candidate_matches(candidate_id, job_ids=None):
+        """Rescore a candidate's jobs whose match inputs changed."""
+        return _recompute_candidate_matches_sync(candidate_id, job_ids)
+
+    @shared_task(ignore_result=True)
+    def recompute_stale_matches():
+        """Periodic sweep for stale match analyses whose queued recompute was lost."""
+        return _recompute_stale_matches_sync()
+else:
+    def recompute_candidate_matches(candidate_id, job_ids=None):
+        return _recompute_candidate_matches_sync(candidate_id, job_ids)
+
+    def recompute_stale_matches():
+        return _recompute_stale_matches_sync()
+
+
+def enqueue_match_recompute(candidate_id, job_ids=None):
+    """Queue a candidate's match recompute; falls back to a background thread without Celery."""
+    job_ids = list(job_ids or [])
+    if CELERY_AVAILABLE:
+        try:
+            recompute_candidate_matches.delay(candidate_id, job_ids)
+            return
+        except Exception as exc:
+            logger.debug(f"Celery unavailable for match recompute, using a thread: {exc}")
+
+    import threading
+    from django.db import connection
+
+    def _run():
+        try:
+            _recompute_candidate_matches_sync(candidate_id, job_ids)
+        except Exception as exc:
+            logger.warning(f"Match recompute failed for candidate {candidate_id}: {exc}")
+        finally:
+            connection.close()
+
+    threading.Thread(target=_run, name='match-recompute', daemon=True).start()
+
+
+# ========================================
+# UC-124: Job Application Timing Optimizer Tasks
+# ========================================
+
+def _process_scheduled_submissions_sync():
+    """
+    Claim due scheduled submissions and deliver them in this process.
     
-    # Attach resume and cover letter if available
-    if package:
-        # Attach resume
-        if package.resume_doc:
-            resume_path = package.resume_doc.file_path.path if hasattr(package.resume_doc.file_path, 'path') else None
-            if resume_path and os.path.exists(resume_path):
-                email.attach_file(resume_path)
-            else:
-                logger.warning(f"Resume file not found at {resume_path}")
-        
-        # Attach cover letter
-        if package.cover_letter_doc:
-            cover_letter_path = package.cover_letter_doc.file_path.path if hasattr(package.cover_letter_doc.file_path, 'path') else None
-            if cover_letter_path and os.path.exists(cover_letter_path):
-                email.attach_file(cover_letter_path)
-            else:
-                logger.warning(f"Cover letter file not found at {cover_letter_path}")
+    Safe to run on several workers at once: rows are claimed with
+    ``SKIP LOCKED`` (see core.scheduled_submissions).
+    """
+    from core.scheduled_submissions import process_due_submissions
     
-    # Send email
+    result = process_due_submissions()
+    logger.info(f"Processed {result['processed']} submissions, {result['failed']} failed")
+    return {'processed': result['processed'], 'failed': result['failed']}
+
+
+def _deliver_scheduled_submissions_sync(submission_ids, claimed_at=None):
+    """Deliver one claimed batch of scheduled submissions."""
+    from django.utils.dateparse import parse_datetime
+    from core.scheduled_submissions import deliver_submissions
+    
+    if isinstance(claimed_at, str):
+        claimed_at = parse_datetime(claimed_at)
+    return deliver_submissions(submission_ids, claimed_at)
+
+
+def _queue_scheduled_submission_batch(submission_ids, claimed_at):
+    """Hand a claimed batch to any Celery worker; delivers it here if the broker is down."""
     try:
-        email.send(fail_silently=False)
-        logger.info(f"Application email sent to {to_email} for submission {submission.id}")
-    except Exception as e:
-        logger.error(f"Failed to send application email: {str(e)}")
-        raise
+        deliver_scheduled_submissions.delay(list(submission_ids), claimed_at.isoformat())
+        return {}
+    except Exception as exc:
+        logger.warning(f"Could not queue scheduled submission batch, delivering inline: {exc}")
+        return _deliver_scheduled_submissions_sync(submission_ids, claimed_at)
 
 
 def _send_due_reminders_sync():
     """
     Send reminders that are due.
     This should be called periodically (e.g., every 15 minutes).
+    
+    All reminders go out over one mail connection (core.bulk_mail); sent and
+    failed rows are marked with one bulk update per chunk.
     """
+    from core.bulk_mail import BulkMailer
     from core.models import FollowUpReminder
-    from django.core.mail import send_mail
+    from django.core.mail import EmailMessage
     from django.conf import settings
     
     now = timezone.now()
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'no-reply@example.com')
     
     # Get reminders that are due
     due_reminders = FollowUpReminder.objects.filter(
@@ -977,47 +1287,63 @@ def _send_due_reminders_sync():
         scheduled_datetime__lte=now
     ).exclude(job__status='rejected').select_related('job', 'candidate__user')
     
-    sent_count = 0
-    failed_count = 0
+    mailer = BulkMailer('followup_reminders')
+    reminders = {}
+    skipped = []
+    for reminder in due_reminders.iterator(chunk_size=mailer.chunk_size):
+        user = reminder.candidate.user
+        if not user.email:
+            logger.warning(f"No email for reminder {reminder.id}, skipping")
+            skipped.append(reminder)
+            continue
+        
+        # Format the message
+        message = reminder.message_template
+        message = message.replace('{job_title}', reminder.job.title)
+        message = message.replace('{company_name}', reminder.job.company_name)
+        message = message.replace('{user_name}', user.get_full_name() or user.email)
+        
+        mailer.add(reminder.id, EmailMessage(reminder.subject, message, from_email, [user.email]))
+        reminders[reminder.id] = reminder
+    
+    def mark_sent(reminder_ids):
+        sent_at = timezone.now()
+        sent = [reminders.pop(reminder_id) for reminder_id in reminder_ids]
+        next_occurrences = []
+        for reminder in sent:
+            # Same changes as FollowUpReminder.mark_sent, written in one query
+            reminder.status = 'sent'
+            reminder.sent_at = reminder.completed_at = reminder.updated_at = sent_at
+            reminder.occurrence_count += 1
+            if not reminder.followup_stage:
+                reminder.followup_stage = getattr(reminder.job, 'status', None)
+            if reminder.is_recurring and reminder.occurrence_count < reminder.max_occurrences:
+                next_occurrences.append(FollowUpReminder(
+                    candidate_id=reminder.candidate_id,
+                    job_id=reminder.job_id,
+                    reminder_type=reminder.reminder_type,
+                    subject=reminder.subject,
+                    message_template=reminder.message_template,
+                    scheduled_datetime=reminder.scheduled_datetime + timedelta(days=reminder.interval_days),
+                    interval_days=reminder.interval_days,
+                    is_recurring=True,
+                    max_occurrences=reminder.max_occurrences,
+                    occurrence_count=reminder.occurrence_count,
+                ))
+        FollowUpReminder.objects.bulk_update(
+            sent, ['status', 'sent_at', 'occurrence_count', 'completed_at', 'followup_stage', 'updated_at'],
+        )
+        FollowUpReminder.objects.bulk_create(next_occurrences)
     
-    for reminder in due_reminders:
-        try:
-            user = reminder.candidate.user
-            if not user.email:
-                logger.warning(f"No email for reminder {reminder.id}, skipping")
-                reminder.status = 'failed'
-                reminder.save()
-                continue
-            
-            logger.info(f"Sending reminder {reminder.id} to {user.email}")
-            
-            # Format the message
-            message = reminder.message_template
-            message = message.replace('{job_title}', reminder.job.title)
-            message = message.replace('{company_name}', reminder.job.company_name)
-            message = message.replace('{user_name}', user.get_full_name() or user.email)
-            
-            # Send email
-            send_mail(
-                subject=reminder.subject,
-                message=message,
-                from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'no-reply@example.com'),
-                recipient_list=[user.email],
-                fail_silently=False
-            )
-            
-            # Mark as sent and potentially create next occurrence
-            reminder.mark_sent()
-            sent_count += 1
-            
-            logger.info(f"Successfully sent reminder {reminder.id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to send reminder {reminder.id}: {str(e)}")
-            reminder.status = 'failed'
-            reminder.save()
-            failed_count += 1
+    def mark_failed(reminder_ids):
+        FollowUpReminder.objects.filter(id__in=reminder_ids).update(status='failed', updated_at=timezone.now())
     
+    if skipped:
+        mark_failed([reminder.id for reminder in skipped])
+    result = mailer.send(on_sent=mark_sent, on_failed=mark_failed)
+    
+    sent_count = len(result.sent)
+    failed_count = len(result.failed) + len(skipped)
     logger.info(f"Sent {sent_count} reminders, {failed_count} failed")
     return {'sent': sent_count, 'failed': failed_count}
 
@@ -1027,43 +1353,42 @@ def _check_upcoming_deadlines_sync():
     Check for upcoming application deadlines and create reminders.
     This should be called daily.
     """
-    from core.models import JobEntry, FollowUpReminder, CandidateProfile
+    from core.models import JobEntry, FollowUpReminder
+    from django.db.models import Exists, OuterRef
     from datetime import date
     
     today = date.today()
     three_days_from_now = today + timedelta(days=3)
     
-    # Find jobs with deadlines in 3 days that don't have reminders
+    # Find jobs with deadlines in 3 days that don't have a pending reminder yet
+    pending_reminder = FollowUpReminder.objects.filter(
+        job=OuterRef('pk'),
+        reminder_type='application_deadline',
+        status='pending'
+    )
     jobs_with_deadlines = JobEntry.objects.filter(
         application_deadline=three_days_from_now,
         status='interested'
-    ).select_related('candidate')
-    
-    reminder_count = 0
+    ).exclude(Exists(pending_reminder)).only(
+        'id', 'candidate_id', 'title', 'company_name', 'application_deadline', 'status'
+    )
     
-    for job in jobs_with_deadlines:
-        # Check if reminder already exists
-        existing = FollowUpReminder.objects.filter(
-            candidate=job.candidate,
+    scheduled_datetime = timezone.now() + timedelta(hours=9)  # 9 AM next day
+    reminders = [
+        FollowUpReminder(
+            candidate_id=job.candidate_id,
             job=job,
             reminder_type='application_deadline',
-            status='pending'
-        ).exists()
-        
-        if not existing:
-            # Create reminder
-            reminder = FollowUpReminder.objects.create(
-                candidate=job.candidate,
-                job=job,
-                reminder_type='application_deadline',
-                subject=f"Deadline in 3 days: {job.title} at {job.company_name}",
-                message_template=f"Hi {{user_name}},\n\nThis is a reminder that the application deadline for {job.title} at {job.company_name} is in 3 days ({job.application_deadline}).\n\nDon't forget to submit your application!",
-                scheduled_datetime=timezone.now() + timedelta(hours=9),  # 9 AM next day
-                followup_stage=getattr(job, 'status', None),
-                auto_scheduled=True,
-            )
-            reminder_count += 1
-            logger.info(f"Created deadline reminder {reminder.id} for job {job.id}")
+            subject=f"Deadline in 3 days: {job.title} at {job.company_name}",
+            message_template=f"Hi {{user_name}},\n\nThis is a reminder that the application deadline for {job.title} at {job.company_name} is in 3 days ({job.application_deadline}).\n\nDon't forget to submit your application!",
+            scheduled_datetime=scheduled_datetime,
+            followup_stage=job.status,
+            auto_scheduled=True,
+        )
+        for job in jobs_with_deadlines.iterator(chunk_size=1000)
+    ]
+    FollowUpReminder.objects.bulk_create(reminders, batch_size=1000)
+    reminder_count = len(reminders)
     
     logger.info(f"Created {reminder_count} deadline reminders")
     return {'reminders_created': reminder_count}
@@ -1100,10 +1425,17 @@ def _refresh_salary_benchmarks_sync(limit: int = 15):
 
 # Celery task wrappers
 if CELERY_AVAILABLE:
-    @shared_task
+    @shared_task(ignore_result=True)
     def process_scheduled_submissions():
-        """Process scheduled submissions that are due."""
-        return _process_scheduled_submissions_sync()
+        """Claim due scheduled submissions and fan the batches out to deliver_scheduled_submissions."""
+        from core.scheduled_submissions import process_due_submissions
+        
+        return process_due_submissions(deliver=_queue_scheduled_submission_batch)
+    
+    @shared_task(ignore_result=True)
+    def deliver_scheduled_submissions(submission_ids, claimed_at=None):
+        """Send one claimed batch of scheduled submissions."""
+        return _deliver_scheduled_submissions_sync(submission_ids, claimed_at)
     
     @shared_task
     def send_due_reminders():
@@ -1123,6 +1455,9 @@ else:
     def process_scheduled_submissions():
         return _process_scheduled_submissions_sync()
     
+    def deliver_scheduled_submissions(submission_ids, claimed_at=None):
+        return _deliver_scheduled_submissions_sync(submission_ids, claimed_at)
+    
     def send_due_reminders():
         return _send_due_reminders_sync()
     
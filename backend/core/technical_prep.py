@@ -24,7 +24,9 @@ import requests
 from django.conf import settings
 from json import JSONDecoder, JSONDecodeError
 
-from core.skills_gap_analysis import SkillsGapAnalyzer
+from core import llm_gateway
+from core.api_monitoring import SERVICE_GEMINI, RateLimitException, get_or_create_service
+from core.job_description_cache import job_requirements
 from google.api_core import exceptions as google_exceptions
 
 try:
@@ -38,8 +40,17 @@ RECOVERABLE_GEMINI_ERRORS = (
     TimeoutError,
     google_exceptions.GoogleAPIError,
     requests.exceptions.RequestException,
+    RateLimitException,
 )
 
+# Generation settings for each technical prep section request
+GEMINI_SECTION_CONFIG = {
+    "temperature": 0.25,
+    "top_p": 0.9,
+    "top_k": 40,
+    "max_output_tokens": 4096,
+}
+
 NEETCODE_BASE_PROBLEMS = [
     {"slug": "two-sum", "title": "Two Sum", "difficulty": "entry"},
     {"slug": "contains-duplicate", "title": "Contains Duplicate", "difficulty": "entry"},
@@ -578,6 +589,22 @@ def _parse_gemini_json(content: str) -> Dict[str, Any]:
     raise ValueError("Gemini returned invalid JSON for technical prep.")
 
 
+def _parse_section_content(content: str) -> Dict[str, Any]:
+    content = (content or "").strip()
+    if content.startswith("```json"):
+        content = content[7:]
+    if content.startswith("```"):
+        content = content[3:]
+    if content.endswith("```"):
+        content = content[:-3]
+    content = content.strip()
+
+    if not content:
+        raise ValueError("Gemini response missing content")
+
+    return _parse_gemini_json(content)
+
+
 @dataclass
 class StackSummary:
     languages: List[str]
@@ -617,7 +644,7 @@ def _run_with_timeout(func: Callable[[], Any], timeout_seconds: float) -> Any:
 
 
 def _infer_stack_from_job(job) -> StackSummary:
-    required_skills = SkillsGapAnalyzer._extract_job_requirements(job)[:8]
+    required_skills = job_requirements(job)["skills"][:8]
     languages, frameworks, tooling = [], [], []
     language_keywords = {"python", "java", "javascript", "typescript", "go", "ruby", "c++", "sql"}
     framework_keywords = {"react", "angular", "vue", "django", "flask", "spring", "node", "next.js", "fastapi"}
@@ -682,7 +709,7 @@ class TechnicalPrepGenerator:
             or os.getenv("GEMINI_MODEL")
             or getattr(settings, "GEMINI_MODEL", "gemini-2.5-flash")
         )
-        self.required_skills = SkillsGapAnalyzer._extract_job_requirements(job)[:8]
+        self.required_skills = job_requirements(job)["skills"][:8]
         self.stack = _infer_stack_from_job(job)
         self.build_timeout = float(os.getenv("TECHNICAL_PREP_BUILD_TIMEOUT", "28"))
         self.deadline = time.monotonic() + self.build_timeout
@@ -926,29 +953,35 @@ class TechnicalPrepGenerator:
             raise TimeoutError("Technical prep generation exceeded time budget")
 
         client = _get_gemini_client(self.api_key)
-        generation_config = genai.types.GenerateContentConfig(
-            temperature=0.25,
-            top_p=0.9,
-            top_k=40,
-            max_output_tokens=4096,
-        )
+        generation_config = genai.types.GenerateContentConfig(**GEMINI_SECTION_CONFIG)
 
         timeout_seconds = float(os.getenv("GEMINI_REQUEST_TIMEOUT", "15"))
         timeout_seconds = min(timeout_seconds, max(1.0, remaining_budget))
 
+        def _perform_call():
+            return client.models.generate_content(
+                model=self.model,
+                contents=prompt_text,
+                config=generation_config,
+            )
+
+        def _request():
+            return llm_gateway.sdk_response_text(_run_with_timeout(_perform_call, timeout_seconds))
+
         try:
             logger.info(
                 "Requesting Gemini technical prep section (job %s)",
                 self.job.id,
             )
-            def _perform_call():
-                return client.models.generate_content(
-                    model=self.model,
-                    contents=prompt_text,
-                    config=generation_config,
-                )
-
-            response = _run_with_timeout(_perform_call, timeout_seconds)
+            # Identical section prompts (retries, other tabs) share one cached response
+            content = llm_gateway.generate(
+                prompt_text,
+                model=self.model,
+                config=GEMINI_SECTION_CONFIG,
+                call=_request,
+                service=get_or_create_service(SERVICE_GEMINI, 'gemini'),
+                validate=_parse_section_content,
+            )
         except google_exceptions.DeadlineExceeded as exc:
             logger.warning("Gemini request timed out for job %s", self.job.id)
             raise TimeoutError("Gemini request timed out") from exc
@@ -959,29 +992,7 @@ class TechnicalPrepGenerator:
             logger.error("Gemini technical prep request failed: %s", exc)
             raise
 
-        content = getattr(response, "text", None) or getattr(response, "output_text", None)
-        if not content:
-            candidates = getattr(response, "candidates", None) or []
-            if candidates:
-                try:
-                    first_part = candidates[0].content.parts[0]
-                    content = getattr(first_part, "text", "") or str(first_part)
-                except (IndexError, AttributeError, TypeError):
-                    content = ""
-
-        content = (content or "").strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-
-        if not content:
-            raise ValueError("Gemini response missing content")
-
-        return _parse_gemini_json(content)
+        return _parse_section_content(content)
 
 
     def _post_process(self, payload: Dict[str, Any]) -> Dict[str, Any]:
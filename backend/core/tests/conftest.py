@@ -0,0 +1,27 @@
+"""
+Fixtures shared across the core test modules.
+"""
+
+import pytest
+from django.core.cache import cache
+
+from core import ai_generation
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    """Empty in-process cache in place of Redis; API usage logs are written synchronously."""
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    settings.API_USAGE_LOG_BUFFER = {'BACKEND': 'sync'}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def run_generations_inline(monkeypatch):
+    """Run queued AI generations in-process so the status endpoint has a result."""
+    monkeypatch.setattr(
+        'core.tasks.enqueue_ai_generation',
+        lambda generation_id, countdown=None: ai_generation.run_generation(generation_id),
+    )
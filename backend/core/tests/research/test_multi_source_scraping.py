@@ -347,6 +347,71 @@ class CompanyResearchServiceTest(TestCase):
         assert is_valid is True
 
 
+class CompanyResearchFanOutTest(TestCase):
+    """Test concurrent source fetching in CompanyResearchService."""
+    
+    def setUp(self):
+        self.company = Company.objects.create(name='Fanout Co', domain='fanout.example')
+    
+    def _service(self):
+        service = CompanyResearchService(self.company.name)
+        service.company = self.company
+        return service
+    
+    @patch('core.research.service.CompanyResearchService._fetch_clearbit_data', return_value={})
+    @patch('core.research.service.CompanyResearchService._scrape_company_website', return_value={})
+    @patch('core.research.service.fetch_github_data', return_value={})
+    @patch('core.research.service.fetch_linkedin_data', return_value={})
+    @patch('core.research.service.fetch_wikidata')
+    @patch('core.research.service.fetch_wikipedia_data')
+    @patch('core.research.service.fetch_recent_company_news', return_value=[])
+    @patch('core.research.service.fetch_profile_from_yfinance', return_value=None)
+    def test_slow_source_times_out_without_blocking_others(self, mock_yf, mock_news, mock_wikipedia, mock_wikidata, *mocks):
+        """A source that misses its deadline is recorded and aggregation uses the rest."""
+        import threading
+        release = threading.Event()
+        
+        def slow_wikipedia(name):
+            release.wait(5)
+            return {'industry': 'Too late'}
+        
+        mock_wikipedia.side_effect = slow_wikipedia
+        mock_wikidata.return_value = {'industry': 'Financial Technology'}
+        
+        service = self._service()
+        with self.settings(COMPANY_RESEARCH_SOURCE_TIMEOUTS={'wikipedia': 0.2}):
+            service._gather_sources()
+        release.set()
+        service._gather_basic_info()
+        
+        basic_info = service.research_data['basic_info']
+        assert basic_info['industry'] == 'Financial Technology'
+        assert basic_info['sources_timed_out'] == ['wikipedia']
+        assert service.source_timings['wikipedia']['status'] == 'timeout'
+        assert service.source_timings['wikidata']['status'] == 'ok'
+        assert service.source_timings['news']['status'] == 'empty'
+        assert all('elapsed_ms' in timing for timing in service.source_timings.values())
+    
+    @patch('core.research.service.CompanyResearchService._fetch_clearbit_data', return_value={})
+    @patch('core.research.service.CompanyResearchService._scrape_company_website', return_value={})
+    @patch('core.research.service.fetch_github_data', return_value={})
+    @patch('core.research.service.fetch_linkedin_data', return_value={})
+    @patch('core.research.service.fetch_wikidata', return_value={})
+    @patch('core.research.service.fetch_wikipedia_data', return_value={'products': [{'name': 'Widget'}]})
+    @patch('core.research.service.fetch_recent_company_news', return_value=[])
+    @patch('core.research.service.fetch_profile_from_yfinance', return_value={'description': 'Makes widgets'})
+    def test_each_source_is_fetched_once_per_run(self, mock_yf, mock_news, mock_wikipedia, *mocks):
+        """Later stages reuse the fan-out results instead of refetching."""
+        result = self._service().research_company(force_refresh=True)
+        
+        assert mock_yf.call_count == 1
+        assert mock_wikipedia.call_count == 1
+        assert mock_news.call_count == 1
+        assert set(result['source_timings']) == {
+            'news', 'yfinance', 'wikipedia', 'wikidata', 'linkedin', 'website', 'clearbit', 'github',
+        }
+
+
 @pytest.mark.integration
 class IntegrationTest(TestCase):
     """Integration tests requiring external services."""
@@ -0,0 +1,149 @@
+"""
+Tests for queued Gemini generations (core.ai_generation).
+"""
+
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import ai_generation
+from core.models import AIGeneration, CandidateProfile, JobEntry
+
+User = get_user_model()
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('locmem_cache')]
+
+
+@pytest.fixture
+def job():
+    user = User.objects.create_user(username='queued', email='queued@example.com', password='pass1234')
+    profile = CandidateProfile.objects.create(user=user)
+    return JobEntry.objects.create(candidate=profile, title='Backend Engineer', company_name='Acme')
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    calls = []
+    monkeypatch.setattr('core.tasks.enqueue_ai_generation', lambda generation_id, countdown=None: calls.append(generation_id))
+    return calls
+
+
+def _rate_limited(status_code=429, headers=None):
+    return mock.Mock(status_code=status_code, headers=headers or {})
+
+
+def test_rate_limited_attempt_is_rescheduled_without_sleeping(job, enqueued, settings):
+    settings.GEMINI_API_KEY = 'test-key'
+    settings.AI_GENERATION_MAX_ATTEMPTS = 2
+    generation = ai_generation.start_generation(
+        job.candidate.user, job, AIGeneration.KIND_RESUME, {'tone': 'impact', 'variation_count': 1},
+    )
+    assert enqueued == [generation.id]
+
+    with mock.patch('core.resume_ai.http.post', return_value=_rate_limited(headers={'Retry-After': '30'})) as post:
+        delay = ai_generation.run_generation(generation.id)
+
+    # One attempt, no in-process retries, and the queue is told when to try again
+    assert post.call_count == 1
+    assert post.call_args.kwargs['max_retries'] == 0
+    assert delay == 30
+    generation.refresh_from_db()
+    assert generation.status == AIGeneration.STATUS_PENDING
+    assert generation.attempt_count == 1
+    assert generation.next_attempt_at is not None
+
+    with mock.patch('core.resume_ai.http.post', return_value=_rate_limited(status_code=503)):
+        assert ai_generation.run_generation(generation.id) is None
+    generation.refresh_from_db()
+    assert generation.status == AIGeneration.STATUS_FAILED
+    assert generation.attempt_count == 2
+    assert generation.error_code == 'ai_generation_failed'
+
+
+def test_retry_delay_backs_off_and_honors_retry_after():
+    assert [ai_generation.retry_delay(attempt) for attempt in (1, 2, 3, 5)] == [15, 30, 60, 120]
+    assert ai_generation.retry_delay(1, retry_after=7) == 7
+    assert ai_generation.retry_delay(1, retry_after=900) == ai_generation.RETRY_MAX_SECONDS
+
+
+def test_identical_active_request_reuses_the_generation(job, enqueued):
+    user = job.candidate.user
+    params = {'tone': 'impact', 'variation_count': 2}
+    first = ai_generation.start_generation(user, job, AIGeneration.KIND_RESUME, params)
+    again = ai_generation.start_generation(user, job, AIGeneration.KIND_RESUME, params)
+    other = ai_generation.start_generation(user, job, AIGeneration.KIND_RESUME, {'tone': 'concise', 'variation_count': 2})
+
+    assert again.id == first.id
+    assert other.id != first.id
+    assert enqueued == [first.id, other.id]
+
+    AIGeneration.objects.filter(id=first.id).update(status=AIGeneration.STATUS_SUCCEEDED)
+    assert ai_generation.start_generation(user, job, AIGeneration.KIND_RESUME, params).id != first.id
+
+
+def test_orphaned_generations_expire_instead_of_being_reused(job, enqueued, settings):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    settings.AI_GENERATION_STALE_SECONDS = 60
+    user = job.candidate.user
+    params = {'tone': 'impact', 'variation_count': 1}
+    orphaned = ai_generation.start_generation(user, job, AIGeneration.KIND_RESUME, params)
+    AIGeneration.objects.filter(id=orphaned.id).update(
+        status=AIGeneration.STATUS_RUNNING, last_progress_at=timezone.now() - timedelta(minutes=5),
+    )
+
+    fresh = ai_generation.start_generation(user, job, AIGeneration.KIND_RESUME, params)
+
+    assert fresh.id != orphaned.id
+    orphaned.refresh_from_db()
+    assert orphaned.status == AIGeneration.STATUS_FAILED
+    assert orphaned.error_code == 'ai_generation_expired'
+
+    AIGeneration.objects.filter(id=fresh.id).update(created_at=timezone.now() - timedelta(minutes=5))
+    client = APIClient()
+    client.force_authenticate(user=user)
+    resp = client.get(reverse('ai-generation-status', kwargs={'generation_id': fresh.id}))
+    assert resp.json()['state'] == 'failed'
+    assert ai_generation.expire_stale_generations() == 0
+
+
+def test_generation_runs_once_even_if_delivered_twice(job, enqueued, monkeypatch):
+    generation = ai_generation.start_generation(
+        job.candidate.user, job, AIGeneration.KIND_EXPERIENCE_BULLET,
+        {'experience_id': 1, 'bullet_index': 0, 'tone': 'impact', 'variant_id': None},
+    )
+    calls = []
+    monkeypatch.setattr(
+        'core.resume_ai.generate_experience_bullet',
+        lambda *args, **kwargs: calls.append(1) or {'bullet_index': 0, 'bullet': 'Rewritten'},
+    )
+
+    assert ai_generation.run_generation(generation.id) is None
+    assert ai_generation.run_generation(generation.id) is None
+    generation.refresh_from_db()
+    assert calls == [1]
+    assert generation.status == AIGeneration.STATUS_SUCCEEDED
+    assert generation.result['bullet'] == 'Rewritten'
+
+
+def test_status_endpoint_is_scoped_to_the_owner(job, enqueued):
+    generation = ai_generation.start_generation(
+        job.candidate.user, job, AIGeneration.KIND_RESUME, {'tone': 'impact', 'variation_count': 1},
+    )
+    url = reverse('ai-generation-status', kwargs={'generation_id': generation.id})
+    client = APIClient()
+
+    client.force_authenticate(user=job.candidate.user)
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.json()['state'] == 'pending'
+    assert 'result' not in resp.json()
+
+    stranger = User.objects.create_user(username='stranger', email='stranger@example.com', password='pass1234')
+    client.force_authenticate(user=stranger)
+    assert client.get(url).status_code == 404
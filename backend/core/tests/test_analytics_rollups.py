@@ -0,0 +1,127 @@
+"""
+Tests for the incrementally maintained job pipeline rollups (core.analytics_rollups).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import analytics_rollups
+from core.models import CandidateProfile, JobEntry, JobStatsRollup, JobStatusChange
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile(django_user_model):
+    user = django_user_model.objects.create_user(username='rollup', email='rollup@example.com', password='pass')
+    return CandidateProfile.objects.create(user=user)
+
+
+@pytest.fixture
+def client(profile):
+    api = APIClient()
+    api.force_authenticate(user=profile.user)
+    return api
+
+
+def _snapshot(profile):
+    rows = JobStatsRollup.objects.filter(candidate=profile)
+    return {
+        (row.month, row.stage): (row.job_count, round(row.stage_seconds, 3), row.stage_exits, row.open_count,
+                                 round(row.open_entered_total, 3), row.offer_count, row.offer_days)
+        for row in rows
+        if row.job_count or row.stage_exits or row.open_count or row.offer_count
+    }
+
+
+def _move(job, new_status, at):
+    old = job.status
+    job.status = new_status
+    job.last_status_change = at
+    job.save(update_fields=['status', 'last_status_change', 'updated_at'])
+    change = JobStatusChange.objects.create(job=job, old_status=old, new_status=new_status)
+    JobStatusChange.objects.filter(pk=change.pk).update(changed_at=at)
+    # Queryset updates bypass signals; re-save the change like an edit would
+    change.refresh_from_db()
+    change.save()
+
+
+def test_status_changes_update_rollup_incrementally(profile):
+    created = timezone.now() - timedelta(days=10)
+    job = JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme')
+    JobEntry.objects.filter(pk=job.pk).update(created_at=created)
+    job.refresh_from_db()
+    job.save()
+
+    _move(job, 'applied', created + timedelta(days=2))
+    _move(job, 'offer', created + timedelta(days=6))
+
+    rows = analytics_rollups.load_rollups(profile)
+    assert analytics_rollups.status_counts(rows)['offer'] == 1
+    stages = analytics_rollups.avg_time_in_stage(rows, now=created + timedelta(days=10))
+    assert stages == {'interested': 2.0, 'applied': 4.0, 'offer': 4.0}
+    assert analytics_rollups.time_to_offer(rows)['avg_days'] == 6.0
+
+    incremental = _snapshot(profile)
+    call_command('rebuild_job_stats_rollups', '--candidate', str(profile.pk))
+    assert _snapshot(profile) == incremental
+
+
+def test_deleting_a_job_removes_its_contribution(profile):
+    keep = JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', status='applied')
+    gone = JobEntry.objects.create(candidate=profile, title='Ops', company_name='Beta', status='offer')
+
+    gone.delete()
+
+    rows = analytics_rollups.load_rollups(profile)
+    counts = analytics_rollups.status_counts(rows)
+    assert counts['applied'] == 1 and counts['offer'] == 0
+    assert analytics_rollups.time_to_offer(rows) is None
+    assert keep.stats_contribution.cells
+
+
+def test_bulk_created_jobs_trigger_a_rebuild(profile):
+    JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme')
+    JobEntry.objects.bulk_create([
+        JobEntry(candidate=profile, title=f'Job {i}', company_name='Bulk', status='applied') for i in range(3)
+    ])
+
+    rows = analytics_rollups.load_rollups(profile)
+
+    assert sum(row.job_count for row in rows) == 4
+    assert analytics_rollups.status_counts(rows)['applied'] == 3
+
+
+def test_jobs_stats_reads_rollup(profile, client, django_assert_max_num_queries):
+    for idx in range(5):
+        job = JobEntry.objects.create(candidate=profile, title=f'Dev {idx}', company_name='Acme')
+        _move(job, 'applied', timezone.now())
+    analytics_rollups.load_rollups(profile)
+
+    with django_assert_max_num_queries(8):
+        response = client.get('/api/jobs/stats')
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['counts']['applied'] == 5
+    assert data['monthly_applications'][-1]['count'] == 5
+    assert set(data['avg_time_in_stage_days']) == {'interested', 'applied'}
+
+
+def test_analytics_funnel_matches_with_and_without_filters(profile, client):
+    statuses = ['interested', 'applied', 'phone_screen', 'offer', 'rejected']
+    for idx, status in enumerate(statuses):
+        JobEntry.objects.create(candidate=profile, title=f'Dev {idx}', company_name='Acme', status=status)
+
+    rolled = client.get('/api/jobs/analytics').json()
+    filtered = client.get('/api/jobs/analytics', {'start_date': '2000-01-01'}).json()
+
+    assert rolled['funnel_analytics'] == filtered['funnel_analytics']
+    assert rolled['funnel_analytics']['status_breakdown']['offer'] == 1
+    assert rolled['response_trends'] == filtered['response_trends']
+    assert rolled['volume_patterns'] == filtered['volume_patterns']
+    assert rolled['volume_patterns']['weekly_volume'][-1]['count'] == 5
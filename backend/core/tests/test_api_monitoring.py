@@ -489,3 +489,226 @@ class TestAPIQuotaAggregation:
             alert_type='quota_warning'
         )
         assert alerts.exists()
+
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'api-rate-limit-tests'}}
+
+
+@pytest.fixture
+def counter_cache(settings, monkeypatch):
+    """Use an in-process cache so the counter-based limiter is exercised."""
+    from django.core.cache import cache
+    import core.api_monitoring as api_monitoring
+
+    settings.CACHES = LOCMEM_CACHES
+    cache.clear()
+    monkeypatch.setattr(api_monitoring, '_rate_limit_cache_down_until', 0.0)
+    yield cache
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestCounterRateLimiter:
+    """Test the cache-backed sliding window limiter."""
+
+    def test_limit_enforced_without_counting_logs(self, api_service, counter_cache, django_assert_num_queries):
+        for _ in range(10):
+            with track_api_call(api_service, '/test', 'GET'):
+                pass
+
+        with django_assert_num_queries(0):
+            allowed, message = check_rate_limit(api_service)
+        assert not allowed
+        assert message == 'Rate limit exceeded: 10 requests/minute'
+
+    def test_previous_bucket_is_weighted(self, counter_cache):
+        from core.api_monitoring import SlidingWindowRateLimiter
+
+        limiter = SlidingWindowRateLimiter()
+        limits = {'minute': 10}
+        for _ in range(10):
+            limiter.hit('scope', limits, now=120.0)
+
+        # Half way through the next bucket, half of the previous bucket still counts
+        assert limiter.counts('scope', limits, now=210.0)['minute'] == pytest.approx(5)
+        assert limiter.exceeded('scope', limits, now=210.0) is None
+        assert limiter.exceeded('scope', limits, now=180.0) == 'minute'
+
+    def test_per_user_limit(self, api_service, regular_user, counter_cache, settings):
+        settings.API_USER_RATE_LIMITS = {api_service.name: {'minute': 2}}
+        for _ in range(2):
+            with track_api_call(api_service, '/test', 'GET', user=regular_user):
+                pass
+
+        allowed, message = check_rate_limit(api_service, user=regular_user)
+        assert not allowed
+        assert 'per user' in message
+        assert check_rate_limit(api_service)[0]
+
+    def test_falls_back_to_database_when_cache_fails(self, api_service, monkeypatch):
+        from unittest.mock import MagicMock
+        import core.api_monitoring as api_monitoring
+
+        broken = MagicMock()
+        broken.get_many.side_effect = ConnectionError('redis down')
+        monkeypatch.setattr(api_monitoring, 'cache', broken)
+        monkeypatch.setattr(api_monitoring, '_rate_limit_cache_down_until', 0.0)
+        for _ in range(11):
+            APIUsageLog.objects.create(service=api_service, endpoint='/test', method='GET')
+
+        allowed, message = check_rate_limit(api_service)
+        assert not allowed
+        assert 'minute' in message
+
+
+@pytest.mark.django_db
+class TestIncrementalQuotaUsage:
+    """Test incremental quota maintenance from track_api_call."""
+
+    def test_counters_and_timings_updated_incrementally(self, api_service):
+        from core.api_monitoring import record_quota_usage
+
+        record_quota_usage(api_service, success=True, response_time_ms=100)
+        record_quota_usage(api_service, success=True, response_time_ms=300)
+        record_quota_usage(api_service, success=False, response_time_ms=200)
+
+        quota = APIQuotaUsage.objects.get(service=api_service, period_type='day')
+        assert quota.total_requests == 3
+        assert quota.successful_requests == 2
+        assert quota.failed_requests == 1
+        assert quota.avg_response_time_ms == pytest.approx(200)
+        assert quota.max_response_time_ms == 300
+        assert quota.min_response_time_ms == 100
+        assert quota.quota_remaining == 997
+        assert quota.quota_percentage_used == pytest.approx(0.3)
+
+    def test_quota_limits_use_total_after_concurrent_updates(self, api_service, monkeypatch):
+        from django.db.models import F
+        from core.api_monitoring import record_quota_usage
+
+        record_quota_usage(api_service, success=True, response_time_ms=100)
+        stale = APIQuotaUsage.objects.get(service=api_service, period_type='day')
+        # Another worker's batch lands after this one read the row
+        APIQuotaUsage.objects.filter(pk=stale.pk).update(total_requests=F('total_requests') + 9)
+        get_or_create = APIQuotaUsage.objects.get_or_create
+        monkeypatch.setattr(APIQuotaUsage.objects, 'get_or_create', lambda **kwargs: (
+            (stale, False) if kwargs['period_type'] == 'day' else get_or_create(**kwargs)))
+
+        record_quota_usage(api_service, success=True, response_time_ms=100)
+
+        quota = APIQuotaUsage.objects.get(pk=stale.pk)
+        assert quota.total_requests == 11
+        assert quota.quota_remaining == 989
+        assert quota.quota_percentage_used == pytest.approx(1.1)
+
+    def test_track_api_call_does_not_reaggregate_logs(self, api_service, counter_cache):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for _ in range(20):
+            APIUsageLog.objects.create(service=api_service, endpoint='/test', method='GET')
+
+        with CaptureQueriesContext(connection) as ctx:
+            with track_api_call(api_service, '/test', 'GET'):
+                pass
+
+        assert not any('COUNT(' in q['sql'].upper() for q in ctx.captured_queries)
+
+        quota = APIQuotaUsage.objects.get(service=api_service, period_type='hour')
+        assert quota.total_requests == 1
+
+
+@pytest.fixture
+def memory_usage_buffer(settings, monkeypatch):
+    """Queue usage logs in memory without starting the background flusher."""
+    import core.api_usage_buffer as api_usage_buffer
+
+    settings.API_USAGE_LOG_BUFFER = {'BACKEND': 'memory', 'BATCH_SIZE': 50, 'MAX_BUFFERED': 100}
+    monkeypatch.setattr(api_usage_buffer, '_buffer', None)
+    monkeypatch.setattr(api_usage_buffer._flusher, 'notify', lambda buffered: None)
+    yield api_usage_buffer
+
+
+@pytest.mark.django_db
+class TestBufferedUsageLogs:
+    """Test batched APIUsageLog writes through core.api_usage_buffer."""
+
+    def test_calls_are_queued_and_flushed_in_bulk(self, api_service, memory_usage_buffer, counter_cache):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        for _ in range(5):
+            with track_api_call(api_service, '/test', 'GET'):
+                pass
+        assert APIUsageLog.objects.filter(service=api_service).count() == 0
+
+        with CaptureQueriesContext(connection) as ctx:
+            written = memory_usage_buffer.flush_usage_log_buffer()
+
+        assert written == 5
+        inserts = [q for q in ctx.captured_queries if 'INSERT INTO "core_apiusagelog"' in q['sql']]
+        assert len(inserts) == 1
+        assert APIUsageLog.objects.filter(service=api_service, success=True).count() == 5
+        quota = APIQuotaUsage.objects.get(service=api_service, period_type='hour')
+        assert quota.total_requests == 5
+        assert quota.successful_requests == 5
+
+    def test_error_records_link_api_error(self, api_service, memory_usage_buffer, counter_cache):
+        with pytest.raises(ValueError):
+            with track_api_call(api_service, '/test', 'POST'):
+                raise ValueError('Test error')
+        assert not APIError.objects.exists()
+
+        memory_usage_buffer.flush_usage_log_buffer()
+
+        log = APIUsageLog.objects.get(service=api_service)
+        error = APIError.objects.get(service=api_service)
+        assert error.usage_log_id == log.id
+        assert error.error_type == 'ValueError'
+        assert 'ValueError' in error.stack_trace
+        api_service.refresh_from_db()
+        assert api_service.last_error_at == log.request_at
+
+    def test_full_buffer_falls_back_to_direct_write(self, api_service, memory_usage_buffer, settings):
+        settings.API_USAGE_LOG_BUFFER = {'BACKEND': 'memory', 'MAX_BUFFERED': 0}
+        memory_usage_buffer._buffer = None
+
+        log = memory_usage_buffer.record_api_usage({
+            'service': api_service, 'endpoint': '/test', 'method': 'GET', 'success': True,
+        })
+
+        assert log is not None and log.pk
+        assert APIUsageLog.objects.filter(service=api_service).count() == 1
+
+    def test_failed_batch_is_requeued(self, api_service, memory_usage_buffer, counter_cache, monkeypatch):
+        for _ in range(3):
+            with track_api_call(api_service, '/test', 'GET'):
+                pass
+
+        write = memory_usage_buffer.write_usage_records
+        failures = []
+
+        def fail_once(records):
+            if not failures:
+                failures.append(records)
+                raise RuntimeError('database unavailable')
+            return write(records)
+
+        monkeypatch.setattr(memory_usage_buffer, 'write_usage_records', fail_once)
+        assert memory_usage_buffer.flush_usage_log_buffer() == 0
+        assert len(memory_usage_buffer.get_usage_log_buffer()) == 3
+
+        assert memory_usage_buffer.flush_usage_log_buffer() == 3
+        assert APIUsageLog.objects.filter(service=api_service).count() == 3
+
+    def test_db_rate_limit_fallback_counts_buffered_calls(self, api_service, memory_usage_buffer):
+        from core.api_monitoring import _check_rate_limit_db
+
+        for _ in range(api_service.requests_per_minute):
+            with track_api_call(api_service, '/test', 'GET'):
+                pass
+        assert not APIUsageLog.objects.filter(service=api_service).exists()
+
+        allowed, reason = _check_rate_limit_db(api_service)
+        assert not allowed
+        assert 'minute' in reason
@@ -0,0 +1,130 @@
+"""
+Tests for the frame-based application success analyzer (UC-097).
+"""
+
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.application_analytics import ApplicationSuccessAnalyzer
+from core.models import CandidateProfile, CandidateSkill, JobEntry, JobStatusChange, Skill
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile(django_user_model):
+    user = django_user_model.objects.create_user(username='uc097', email='uc097@example.com', password='pass')
+    return CandidateProfile.objects.create(user=user)
+
+
+def _job(profile, status, **fields):
+    defaults = {'title': 'Backend Engineer', 'company_name': 'Acme'}
+    defaults.update(fields)
+    return JobEntry.objects.create(candidate=profile, status=status, **defaults)
+
+
+def _create_jobs(profile, count):
+    statuses = ['interested', 'applied', 'rejected', 'phone_screen', 'interview', 'offer']
+    industries = ['Software', 'Finance', 'Healthcare']
+    jobs = [
+        JobEntry(
+            candidate=profile,
+            title=f'Engineer {idx % 4}',
+            company_name=f'Company {idx}',
+            description='Python and SQL',
+            industry=industries[idx % 3],
+            company_size='medium' if idx % 2 else 'large',
+            application_source='linkedin' if idx % 2 else 'referral',
+            status=statuses[idx % len(statuses)],
+        )
+        for idx in range(count)
+    ]
+    return JobEntry.objects.bulk_create(jobs)
+
+
+def test_overall_and_breakdowns(profile):
+    _job(profile, 'interested', industry='Software')
+    _job(profile, 'applied', industry='Software', days_to_response=None)
+    _job(profile, 'offer', industry='Software', company_size='large', days_to_response=4)
+    _job(profile, 'rejected', industry='Finance', company_size='large', days_to_response=10)
+    _job(profile, 'offer', industry='', is_archived=True)
+
+    analyzer = ApplicationSuccessAnalyzer(profile)
+    overall = analyzer.get_overall_metrics()
+
+    assert overall['total_applications'] == 4
+    assert overall['applied_count'] == 3
+    assert overall['response_rate'] == 66.67
+    assert overall['offer_rate'] == 33.33
+    assert overall['avg_days_to_response'] == 7.0
+    assert overall['success_stages']['offer'] == 1
+
+    industries = analyzer.analyze_by_industry()
+    assert [row['industry'] for row in industries] == ['Software', 'Finance']
+    assert industries[0]['offer_rate'] == 50.0
+    assert industries[0]['avg_days_to_response'] == 4.0
+
+    sizes = analyzer.analyze_by_company_size()
+    assert [(row['company_size_code'], row['applied_count']) for row in sizes] == [('large', 2)]
+
+
+def test_speed_buckets_use_status_history(profile):
+    job = _job(profile, 'phone_screen')
+    created = timezone.now() - timedelta(days=20)
+    JobEntry.objects.filter(pk=job.pk).update(created_at=created)
+    JobStatusChange.objects.filter(job=job).delete()
+    for status, days in (('applied', 2), ('phone_screen', 12)):
+        change = JobStatusChange.objects.create(job=job, old_status='interested', new_status=status)
+        JobStatusChange.objects.filter(pk=change.pk).update(changed_at=created + timedelta(days=days))
+
+    patterns = ApplicationSuccessAnalyzer(profile).analyze_apply_and_response_speed()
+
+    assert patterns['apply_speed'] == [{'bucket': '2-3 days', 'count': 1, 'success_rate': 1.0}]
+    assert patterns['response_speed'] == [{'bucket': '8-14 days', 'count': 1, 'success_rate': 1.0}]
+    assert patterns['medians'] == {'apply_to_response_days': 10}
+
+
+def test_keyword_signals_parse_each_posting_once(profile, monkeypatch):
+    from core.skills_gap_analysis import SkillsGapAnalyzer
+
+    python = Skill.objects.create(name='Python', category='Technical')
+    CandidateSkill.objects.create(candidate=profile, skill=python)
+    for _ in range(3):
+        _job(profile, 'interview', description='Python services')
+    _job(profile, 'applied', description='Python services')
+    calls = []
+    original = SkillsGapAnalyzer._extract_job_requirements.__func__
+
+    def counting(cls, job, matcher=None):
+        calls.append(job.pk)
+        return original(cls, job, matcher=matcher)
+
+    monkeypatch.setattr(SkillsGapAnalyzer, '_extract_job_requirements', classmethod(counting))
+
+    signals = ApplicationSuccessAnalyzer(profile).analyze_keyword_signals()
+
+    assert signals == [{'keyword': 'Python', 'count': 3, 'success_rate': 2.0}]
+    assert len(calls) == 1
+
+
+def test_complete_analysis_query_count_does_not_grow_with_jobs(profile, settings):
+    settings.GEMINI_API_KEY = ''
+
+    def count_queries():
+        with CaptureQueriesContext(connection) as ctx:
+            result = ApplicationSuccessAnalyzer(profile).get_complete_analysis()
+        json.dumps(result)
+        return len(ctx.captured_queries)
+
+    _create_jobs(profile, 12)
+    small = count_queries()
+    _create_jobs(profile, 120)
+    large = count_queries()
+
+    assert large == small
+    assert large <= 20
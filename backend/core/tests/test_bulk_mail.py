@@ -0,0 +1,83 @@
+"""
+Tests for batched reminder email delivery (core.bulk_mail).
+"""
+
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import transaction
+
+import pytest
+
+from core import bulk_mail
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('locmem_cache')]
+
+
+class CountingBackend(EmailBackend):
+    """locmem backend that counts connections and refuses one recipient."""
+
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if any('refused@example.com' in message.to for message in messages):
+            raise ConnectionError('550 mailbox unavailable')
+        return super().send_messages(messages)
+
+
+def _message(to):
+    return EmailMessage('Reminder', 'Body', 'from@example.com', [to])
+
+
+def test_sends_in_chunks_over_one_connection_and_reports_failures():
+    CountingBackend.opened = 0
+    mailer = bulk_mail.BulkMailer('test_reminders', chunk_size=2, connection=CountingBackend())
+    for i, to in enumerate(['a@example.com', 'refused@example.com', 'b@example.com']):
+        mailer.add(i, _message(to))
+    marked = []
+
+    result = mailer.send(on_sent=marked.append, on_failed=lambda keys: marked.append(('failed', keys)))
+
+    assert [m.to[0] for m in mail.outbox] == ['a@example.com', 'b@example.com']
+    assert result.sent == [0, 2]
+    assert result.failed == [1]
+    assert marked == [[0], ('failed', [1]), [2]]
+    assert [(batch['size'], batch['sent'], batch['failed']) for batch in result.batches] == [(2, 1, 1), (1, 1, 0)]
+    # One connection for the run, reopened once after the refused recipient
+    assert CountingBackend.opened == 2
+
+    stats = bulk_mail.bulk_mail_stats()['test_reminders']
+    assert stats['sent'] == 2 and stats['failed'] == 1 and stats['batches'] == 2
+
+
+def test_render_reuses_output_for_identical_contexts(monkeypatch):
+    mailer = bulk_mail.BulkMailer('render_test')
+    context = {'brand': 'ResumeRocket', 'job_title': 'Engineer', 'company_name': 'Acme',
+               'deadline': None, 'job_url': 'https://example.com/jobs', 'urgency': 'day_of'}
+    plain, html = mailer.render('emails/deadline_reminder', context)
+    assert 'Engineer' in plain and 'ResumeRocket' in html
+
+    template = mailer._template('emails/deadline_reminder.txt')
+    monkeypatch.setattr(template, 'render', lambda *args, **kwargs: pytest.fail('rendered twice'))
+    assert mailer.render('emails/deadline_reminder', dict(context)) == (plain, html)
+
+
+def test_send_on_commit_shares_a_mailer_and_drops_rolled_back_messages(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        bulk_mail.send_on_commit('commit_test', _message('one@example.com'))
+        bulk_mail.send_on_commit('commit_test', _message('two@example.com'))
+    assert len(callbacks) == 1
+    assert sorted(m.to[0] for m in mail.outbox) == ['one@example.com', 'two@example.com']
+
+    mail.outbox.clear()
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            bulk_mail.send_on_commit('commit_test', _message('lost@example.com'))
+            raise RuntimeError('rollback')
+    with django_capture_on_commit_callbacks(execute=True):
+        bulk_mail.send_on_commit('commit_test', _message('three@example.com'))
+    assert [m.to[0] for m in mail.outbox] == ['three@example.com']
@@ -0,0 +1,73 @@
+"""
+Tests for company name resolution (core.company_resolution).
+"""
+
+import pytest
+
+from core import company_resolution
+from core.models import Company, CompanyAlias
+from core.research.service import CompanyResearchService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def empty_lru():
+    company_resolution.resolved_names.clear()
+    yield
+    company_resolution.resolved_names.clear()
+
+
+def test_spelling_variants_resolve_to_one_company():
+    google = Company.objects.create(name='Google', domain='google.com')
+
+    company, created = company_resolution.get_or_create_company('Google, LLC')
+    assert (company, created) == (google, False)
+    assert CompanyResearchService('google inc')._get_or_create_company() == google
+    assert Company.objects.count() == 1
+
+
+def test_domain_match_is_remembered_as_alias():
+    google = Company.objects.create(name='Google', domain='google.com')
+
+    assert company_resolution.get_or_create_company('Alphabet', domain='google.com') == (google, False)
+    assert CompanyAlias.objects.get(normalized_name='alphabet').company == google
+    company_resolution.resolved_names.clear()
+    assert company_resolution.resolve_company('ALPHABET') == google
+
+
+def test_resolve_many_creates_each_company_once(django_assert_max_num_queries):
+    existing = Company.objects.create(name='Datadog', domain='datadoghq.com')
+
+    with django_assert_max_num_queries(8):
+        resolved = company_resolution.resolve_many(['Stripe', 'stripe, inc.', 'Datadog Inc', '  '])
+
+    assert set(resolved) == {'Stripe', 'stripe, inc.', 'Datadog Inc'}
+    assert resolved['Stripe'] == resolved['stripe, inc.']
+    assert resolved['Datadog Inc'] == existing
+    assert Company.objects.filter(normalized_name='stripe').count() == 1
+
+
+def test_oldest_duplicate_wins_and_stale_cache_entries_are_ignored():
+    first = Company.objects.create(name='Acme', domain='acme.com')
+    Company.objects.create(name='ACME Corp', domain='acmecorp.com')
+
+    assert company_resolution.resolve_company('acme') == first
+    first.delete()
+    assert company_resolution.resolve_company('acme').domain == 'acmecorp.com'
+
+
+def test_resolve_without_create_returns_none():
+    assert company_resolution.resolve_company('Nobody Knows Inc') is None
+    assert not Company.objects.exists()
+
+
+def test_names_without_ascii_slug_skip_the_guessed_domain():
+    placeholder = Company.objects.create(name='Company', domain='company.com')
+
+    tencent, created = company_resolution.get_or_create_company('腾讯')
+    alibaba, _ = company_resolution.get_or_create_company('阿里巴巴')
+
+    assert created and tencent != placeholder
+    assert alibaba not in (tencent, placeholder)
+    assert company_resolution.resolve_company('腾讯') == tencent
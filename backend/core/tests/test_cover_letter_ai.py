@@ -11,7 +11,12 @@ User = get_user_model()
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures('run_generations_inline')
 class TestAICoverLetterEndpoint:
+    def _generation_result(self, resp):
+        assert resp.status_code == 202
+        return self.client.get(resp.json()['status_url'])
+
     def setup_method(self):
         self.client = APIClient()
         self.user = User.objects.create_user(
@@ -86,9 +91,11 @@ class TestAICoverLetterEndpoint:
             lambda prompt, api_key, **kwargs: json.dumps(payload),
         )
 
-        resp = self.client.post(self.url, {'tone': 'warm', 'variation_count': 1}, format='json')
+        resp = self._generation_result(
+            self.client.post(self.url, {'tone': 'warm', 'variation_count': 1}, format='json')
+        )
         assert resp.status_code == 200
-        data = resp.json()
+        data = resp.json()['result']
         assert data['job']['id'] == self.job.id
         assert data['tone'] == 'warm'
         assert data['variation_count'] == 1
@@ -106,8 +113,8 @@ class TestAICoverLetterEndpoint:
             raise CoverLetterAIError('synthetic failure')
 
         monkeypatch.setattr('core.cover_letter_ai.resume_ai.call_gemini_api', _boom)
-        resp = self.client.post(self.url, {'tone': 'balanced'}, format='json')
-        assert resp.status_code == 502
+        resp = self._generation_result(self.client.post(self.url, {'tone': 'balanced'}, format='json'))
+        assert resp.json()['state'] == 'failed'
         assert resp.json()['error']['code'] == 'ai_generation_failed'
 
     def test_ai_cover_letter_job_not_found(self, settings):
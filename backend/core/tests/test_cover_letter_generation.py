@@ -2,6 +2,7 @@ from django.test import override_settings
 from rest_framework.test import APITestCase, APIClient
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from core import ai_generation
 from core.models import CandidateProfile, JobEntry
 from unittest.mock import patch
 
@@ -19,8 +20,9 @@ class CoverLetterGenerationTests(APITestCase):
         self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
+    @patch('core.tasks.enqueue_ai_generation', side_effect=lambda generation_id, countdown=None: ai_generation.run_generation(generation_id))
     @patch('core.cover_letter_ai.run_cover_letter_generation')
-    def test_generate_with_valid_customization(self, mock_run):
+    def test_generate_with_valid_customization(self, mock_run, _mock_enqueue):
         # Mock AI generation result
         mock_run.return_value = {
             'variation_count': 1,
@@ -49,8 +51,10 @@ class CoverLetterGenerationTests(APITestCase):
         }
 
         resp = self.client.post(url, payload, format='json')
+        self.assertEqual(resp.status_code, 202)
+        resp = self.client.get(resp.json()['status_url'])
         self.assertEqual(resp.status_code, 200)
-        data = resp.json()
+        data = resp.json()['result']
         # Basic sanity checks on returned shape
         self.assertIn('variations', data)
         self.assertEqual(len(data['variations']), 1)
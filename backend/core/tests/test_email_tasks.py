@@ -363,10 +363,9 @@ class TestScanGmailEmails:
             ]
         }
         
-        # First message fails, second succeeds
-        mock_get_detail.side_effect = [
-            GmailAPIError('Message not found'),
-            {
+        # First message fails, second succeeds (details are fetched concurrently)
+        details = {
+            'msg2': {
                 'id': 'msg2',
                 'threadId': 'thread2',
                 'snippet': 'Success',
@@ -380,7 +379,14 @@ class TestScanGmailEmails:
                     'body': {}
                 }
             }
-        ]
+        }
+        
+        def get_detail(token, msg_id):
+            if msg_id not in details:
+                raise GmailAPIError('Message not found')
+            return details[msg_id]
+        
+        mock_get_detail.side_effect = get_detail
         
         scan_gmail_emails(gmail_integration.id)
         
@@ -407,3 +413,147 @@ class TestScanGmailEmailsDateFiltering:
         query = call_args[1]['query']
         assert 'newer_than:' in query or 'after:' in query
         assert 'application' in query.lower() or 'interview' in query.lower()
+
+
+@pytest.mark.django_db
+class TestIncrementalGmailScan:
+    """Tests for historyId-based incremental scanning"""
+    
+    @staticmethod
+    def _detail(msg_id):
+        return {
+            'id': msg_id,
+            'threadId': f'thread-{msg_id}',
+            'snippet': 'Snippet',
+            'payload': {
+                'headers': [
+                    {'name': 'From', 'value': 'HR <hr@techcorp.com>'},
+                    {'name': 'Subject', 'value': 'Interview for Software Engineer'},
+                    {'name': 'Date', 'value': 'Mon, 1 Jan 2024 12:00:00 +0000'}
+                ],
+                'body': {}
+            }
+        }
+    
+    @patch('core.gmail_utils.ensure_valid_token', return_value='valid_token')
+    @patch('core.gmail_utils.get_profile')
+    @patch('core.gmail_utils.fetch_messages')
+    @patch('core.gmail_utils.get_message_detail')
+    def test_first_scan_records_history_cursor(self, mock_get_detail, mock_fetch, mock_profile,
+                                              mock_ensure_token, gmail_integration, user):
+        mock_profile.return_value = {'historyId': '500'}
+        mock_fetch.return_value = {'messages': [{'id': 'msg1'}, {'id': 'msg2'}]}
+        mock_get_detail.side_effect = lambda token, msg_id: self._detail(msg_id)
+        
+        scan_gmail_emails(gmail_integration.id)
+        
+        gmail_integration.refresh_from_db()
+        assert gmail_integration.gmail_history_id == '500'
+        assert set(ApplicationEmail.objects.values_list('gmail_message_id', flat=True)) == {'msg1', 'msg2'}
+    
+    @patch('core.gmail_utils.ensure_valid_token', return_value='valid_token')
+    @patch('core.gmail_utils.list_history')
+    @patch('core.gmail_utils.fetch_messages')
+    @patch('core.gmail_utils.get_message_detail')
+    def test_incremental_scan_fetches_only_new_job_messages(self, mock_get_detail, mock_fetch, mock_history,
+                                                            mock_ensure_token, gmail_integration, user,
+                                                            job_entry):
+        gmail_integration.gmail_history_id = '500'
+        gmail_integration.last_scan_at = timezone.now() - timedelta(hours=1)
+        gmail_integration.save()
+        mock_history.side_effect = [
+            {'history': [{'messagesAdded': [{'message': {'id': 'msg7'}}]}], 'nextPageToken': 'p2', 'historyId': '510'},
+            {'history': [{'messagesAdded': [{'message': {'id': 'msg8'}}, {'message': {'id': 'msg9'}}]}], 'historyId': '520'},
+        ]
+        # msg8 is not job related; msg3 is older than the delta
+        mock_fetch.return_value = {'messages': [{'id': 'msg7'}, {'id': 'msg9'}, {'id': 'msg3'}]}
+        mock_get_detail.side_effect = lambda token, msg_id: dict(self._detail(msg_id), snippet='TechCorp')
+        
+        scan_gmail_emails(gmail_integration.id)
+        
+        assert mock_history.call_args_list[1].kwargs['page_token'] == 'p2'
+        assert 'after:' in mock_fetch.call_args.kwargs['query']
+        assert sorted(c.args[1] for c in mock_get_detail.call_args_list) == ['msg7', 'msg9']
+        gmail_integration.refresh_from_db()
+        assert gmail_integration.gmail_history_id == '520'
+        log = EmailScanLog.objects.get(integration=gmail_integration)
+        assert log.emails_processed == 2
+    
+    @patch('core.gmail_utils.ensure_valid_token', return_value='valid_token')
+    @patch('core.gmail_utils.list_history')
+    @patch('core.gmail_utils.fetch_messages')
+    def test_empty_history_skips_search(self, mock_fetch, mock_history, mock_ensure_token, gmail_integration, user):
+        gmail_integration.gmail_history_id = '500'
+        gmail_integration.save()
+        mock_history.return_value = {'historyId': '505'}
+        
+        scan_gmail_emails(gmail_integration.id)
+        
+        mock_fetch.assert_not_called()
+        gmail_integration.refresh_from_db()
+        assert gmail_integration.gmail_history_id == '505'
+    
+    @patch('core.gmail_utils.ensure_valid_token', return_value='valid_token')
+    @patch('core.gmail_utils.list_history')
+    @patch('core.gmail_utils.fetch_messages')
+    @patch('core.gmail_utils.get_message_detail')
+    def test_failed_fetch_holds_cursor_before_message(self, mock_get_detail, mock_fetch, mock_history,
+                                                      mock_ensure_token, gmail_integration, user):
+        from core.gmail_utils import GmailAPIError
+        
+        gmail_integration.gmail_history_id = '500'
+        gmail_integration.save()
+        mock_history.return_value = {
+            'history': [
+                {'id': '503', 'messagesAdded': [{'message': {'id': 'msg7'}}]},
+                {'id': '507', 'messagesAdded': [{'message': {'id': 'msg8'}}]},
+                {'id': '509', 'messagesAdded': [{'message': {'id': 'msg9'}}]},
+            ],
+            'historyId': '520',
+        }
+        mock_fetch.return_value = {'messages': [{'id': 'msg7'}, {'id': 'msg8'}, {'id': 'msg9'}]}
+        
+        def detail(token, msg_id):
+            if msg_id == 'msg8':
+                raise GmailAPIError('backend error')
+            return self._detail(msg_id)
+        mock_get_detail.side_effect = detail
+        
+        scan_gmail_emails(gmail_integration.id)
+        
+        gmail_integration.refresh_from_db()
+        assert gmail_integration.gmail_history_id == '503'
+        assert set(ApplicationEmail.objects.values_list('gmail_message_id', flat=True)) == {'msg7', 'msg9'}
+
+    @patch('core.gmail_utils.ensure_valid_token', return_value='valid_token')
+    @patch('core.gmail_utils.list_history')
+    @patch('core.gmail_utils.get_profile', return_value={'historyId': '900'})
+    @patch('core.gmail_utils.fetch_messages', return_value={})
+    def test_expired_history_falls_back_to_full_sync(self, mock_fetch, mock_profile, mock_history,
+                                                     mock_ensure_token, gmail_integration, user):
+        from core.gmail_utils import GmailHistoryExpiredError
+        
+        gmail_integration.gmail_history_id = '1'
+        gmail_integration.save()
+        mock_history.side_effect = GmailHistoryExpiredError('expired')
+        
+        scan_gmail_emails(gmail_integration.id)
+        
+        assert 'newer_than:90d' in mock_fetch.call_args.kwargs['query']
+        gmail_integration.refresh_from_db()
+        assert gmail_integration.gmail_history_id == '900'
+    
+    def test_auto_link_batch_links_matching_emails(self, user, job_entry):
+        emails = [
+            ApplicationEmail.objects.create(
+                user=user, gmail_message_id=f'batch{i}', subject='Update', sender_email='hr@example.com',
+                received_at=timezone.now(), email_type='other', body_text=body,
+            )
+            for i, body in enumerate(['News from TechCorp', 'Unrelated'])
+        ]
+        
+        from core.tasks import auto_link_emails_to_jobs
+        assert auto_link_emails_to_jobs(user, emails) == 1
+        
+        emails[0].refresh_from_db()
+        assert emails[0].job == job_entry and emails[0].is_linked
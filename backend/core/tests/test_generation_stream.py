@@ -0,0 +1,151 @@
+"""
+Tests for streamed resume / cover letter generation (server-sent events).
+"""
+
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.json_stream import JSONStreamParser
+from core.models import CandidateProfile, JobEntry, WorkExperience
+
+User = get_user_model()
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('locmem_cache')]
+
+
+class FakeGeminiStream:
+    """Stands in for a streamed ``requests`` response from streamGenerateContent."""
+
+    def __init__(self, text, status_code=200, piece=40):
+        self.status_code = status_code
+        self.headers = {}
+        self.encoding = None
+        self.closed = False
+        self.sent = 0
+        self.lines = []
+        for start in range(0, len(text), piece):
+            chunk = {'candidates': [{'content': {'parts': [{'text': text[start:start + piece]}]}}]}
+            self.lines += [f'data: {json.dumps(chunk)}', '']
+
+    def iter_lines(self, chunk_size=None, decode_unicode=False):
+        for line in self.lines:
+            self.sent += 1
+            yield line
+
+    def close(self):
+        self.closed = True
+
+
+def _events(response):
+    """Parse the SSE frames of a streamed response lazily."""
+    for frame in response.streaming_content:
+        lines = frame.decode('utf-8').strip().split('\n')
+        yield lines[0][len('event: '):], json.loads(lines[1][len('data: '):])
+
+
+@pytest.fixture
+def client_and_job(settings, monkeypatch):
+    settings.GEMINI_API_KEY = 'test-key'
+    monkeypatch.setattr('core.resume_ai.compile_latex_pdfs', lambda documents: [b'%PDF' for _ in documents])
+    user = User.objects.create_user(username='streamer', email='streamer@example.com', password='pass1234')
+    profile = CandidateProfile.objects.create(user=user, headline='Engineer')
+    work = WorkExperience.objects.create(
+        candidate=profile, company_name='Tech Corp', job_title='Software Engineer',
+        start_date='2022-01-01', is_current=True, achievements=['Increased reliability by 30%'],
+    )
+    job = JobEntry.objects.create(candidate=profile, title='Backend Engineer', company_name='Acme Corp')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, job, work
+
+
+def _resume_output(work):
+    variation = {
+        'label': 'Impact', 'summary': 'Delivers APIs.',
+        'experience_sections': [{'source_experience_id': work.id, 'bullets': ['Scaled APIs to 2M req/day.']}],
+    }
+    return '```json\n' + json.dumps({
+        'shared_analysis': {'keyword_strategy': ['Python']},
+        'variations': [variation, dict(variation, label='Concise')],
+    }) + '\n```'
+
+
+def test_parser_reports_fields_and_items_as_they_complete():
+    parser = JSONStreamParser()
+    doc = '```json\n{"shared_analysis": {"note": "a } in \\"text\\""}, "variations": [{"id": 1}, {"id": 2}], "n": 2}'
+    events = []
+    for start in range(0, len(doc), 3):
+        events += [(e.kind, e.key, e.index, e.value) for e in parser.feed(doc[start:start + 3])]
+
+    assert events == [
+        ('field', 'shared_analysis', None, {'note': 'a } in "text"'}),
+        ('item', 'variations', 0, {'id': 1}),
+        ('item', 'variations', 1, {'id': 2}),
+        ('field', 'variations', None, [{'id': 1}, {'id': 2}]),
+        ('field', 'n', None, 2),
+    ]
+    assert parser.complete
+
+
+def test_resume_variations_stream_before_gemini_finishes(client_and_job, monkeypatch):
+    client, job, work = client_and_job
+    upstream = FakeGeminiStream(_resume_output(work))
+    monkeypatch.setattr('core.resume_ai.http.post', lambda *args, **kwargs: upstream)
+
+    response = client.post(
+        reverse('job-resume-generate-stream', kwargs={'job_id': job.id}),
+        {'tone': 'impact', 'variation_count': 2}, format='json', HTTP_ACCEPT='text/event-stream',
+    )
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+
+    received = []
+    for event, data in _events(response):
+        received.append(event)
+        if event == 'variation' and received.count('variation') == 1:
+            # The first variation arrives while the second is still being generated
+            assert upstream.sent < len(upstream.lines)
+            assert data['experience_sections'][0]['bullets'] == ['Scaled APIs to 2M req/day.']
+            assert data['pdf_document']
+        if event == 'done':
+            assert data == {'variation_count': 2}
+    assert received == ['meta', 'shared_analysis', 'variation', 'variation', 'done']
+    assert upstream.closed
+
+
+def test_client_disconnect_closes_the_upstream_stream(client_and_job, monkeypatch):
+    client, job, work = client_and_job
+    upstream = FakeGeminiStream(_resume_output(work))
+    monkeypatch.setattr('core.resume_ai.http.post', lambda *args, **kwargs: upstream)
+
+    response = client.post(reverse('job-cover-letter-generate-stream', kwargs={'job_id': job.id}), {}, format='json')
+    events = _events(response)
+    assert next(events)[0] == 'meta'
+    assert next(events)[0] == 'shared_analysis'
+    response.close()
+
+    assert upstream.closed
+    assert upstream.sent < len(upstream.lines)
+
+
+def test_rate_limited_stream_reports_an_error_event(client_and_job, monkeypatch):
+    client, job, _ = client_and_job
+    upstream = FakeGeminiStream('', status_code=429)
+    upstream.headers = {'Retry-After': '12'}
+    monkeypatch.setattr('core.resume_ai.http.post', lambda *args, **kwargs: upstream)
+
+    response = client.post(reverse('job-resume-generate-stream', kwargs={'job_id': job.id}), {}, format='json')
+    events = list(_events(response))
+
+    assert [event for event, _ in events] == ['meta', 'error']
+    assert events[1][1]['code'] == 'service_busy'
+    assert events[1][1]['retry_after'] == 12
+    assert upstream.closed
+
+    missing = client.post(reverse('job-resume-generate-stream', kwargs={'job_id': job.id + 100}), {}, format='json')
+    assert missing.status_code == 404
+    assert b'event: error' in missing.content
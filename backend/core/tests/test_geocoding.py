@@ -0,0 +1,143 @@
+"""
+Tests for the cached batch geocoder (core.geocoding).
+"""
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from core import geocoding
+from core.models import CandidateProfile, GeocodedLocation, JobEntry
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile(django_user_model):
+    user = django_user_model.objects.create_user(username='geo', email='geo@example.com', password='pass')
+    return CandidateProfile.objects.create(user=user)
+
+
+@pytest.fixture
+def fake_nominatim(monkeypatch, settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'geocoding-tests'}}
+    settings.GEOCODING_MIN_INTERVAL = 0
+    cache.delete(geocoding.DRAIN_LOCK_KEY)
+    calls = []
+    results = {'new york, ny': {'lat': 40.71, 'lon': -74.0, 'precision': 'city', 'display_name': 'New York'}}
+
+    def lookup(query):
+        calls.append(query)
+        if 'fail' in query.lower():
+            raise geocoding.GeocodingError('boom')
+        return results.get(geocoding.normalize_location(query))
+
+    monkeypatch.setattr(geocoding, 'geocode_query', lookup)
+    return calls
+
+
+def test_normalize_location_ignores_case_spacing_and_commas():
+    assert geocoding.normalize_location('  New York ,NY ') == 'new york, ny'
+    assert geocoding.normalize_location('new   york,  ny.') == 'new york, ny'
+
+
+def test_job_save_queues_location_without_network(profile, fake_nominatim):
+    job = JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', location='New York, NY')
+
+    entry = GeocodedLocation.objects.get(normalized_query='new york, ny')
+    assert entry.status == 'pending'
+    assert fake_nominatim == []
+    job.refresh_from_db()
+    assert job.location_lat is None
+
+
+def test_queue_drain_resolves_once_for_all_users(profile, fake_nominatim, django_user_model):
+    other_user = django_user_model.objects.create_user(username='geo2', email='geo2@example.com', password='pass')
+    other = CandidateProfile.objects.create(user=other_user)
+    first = JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', location='New York, NY')
+    second = JobEntry.objects.create(candidate=other, title='Dev', company_name='Beta', location='new york,  ny')
+
+    result = geocoding.process_geocode_queue()
+
+    assert fake_nominatim == ['New York, NY']
+    assert result['resolved'] == 1
+    assert result['jobs_updated'] == 2
+    for job in (first, second):
+        job.refresh_from_db()
+        assert job.location_lat == 40.71
+        assert job.location_geo_updated_at is not None
+
+    # Later saves are served from the cache
+    third = JobEntry.objects.create(candidate=profile, title='Ops', company_name='Gamma', location='NEW YORK, NY')
+    third.refresh_from_db()
+    assert third.location_lon == -74.0
+    assert fake_nominatim == ['New York, NY']
+
+
+def test_failed_lookups_are_retried_later(profile, fake_nominatim):
+    JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', location='Failville')
+
+    result = geocoding.process_geocode_queue()
+
+    entry = GeocodedLocation.objects.get(normalized_query='failville')
+    assert result['failed'] == 1
+    assert entry.status == 'failed' and entry.attempts == 1
+    # Not due again until GEOCODING_RETRY_AFTER has passed
+    assert geocoding.process_geocode_queue()['failed'] == 0
+
+
+def test_unresolvable_locations_stop_waiting(profile, fake_nominatim, settings):
+    settings.GEOCODING_MAX_ATTEMPTS = 1
+    remote = JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', location='Remote')
+    failing = JobEntry.objects.create(candidate=profile, title='Ops', company_name='Beta', location='Failville')
+
+    result = geocoding.process_geocode_queue()
+
+    assert result['not_found'] == 1 and result['failed'] == 1
+    assert result['jobs_updated'] == 2
+    for job in (remote, failing):
+        job.refresh_from_db()
+        assert job.location_lat is None
+        assert job.location_geo_updated_at is not None
+    assert geocoding.apply_cached_coordinates() == 0
+
+
+def test_drain_is_single_flight(fake_nominatim):
+    cache.add(geocoding.DRAIN_LOCK_KEY, 1, 60)
+    try:
+        assert geocoding.process_geocode_queue() == {'skipped': True}
+    finally:
+        cache.delete(geocoding.DRAIN_LOCK_KEY)
+
+
+def test_management_command_drains_queue(profile, fake_nominatim):
+    job = JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', location='New York, NY')
+
+    call_command('geocode_jobs', '--limit', '10')
+
+    job.refresh_from_db()
+    assert job.location_lat == 40.71
+    assert fake_nominatim == ['New York, NY']
+
+
+def test_jobs_geo_uses_cache_only(profile, fake_nominatim, monkeypatch):
+    from rest_framework.test import APIClient
+    from core import tasks
+
+    kicks = []
+    monkeypatch.setattr(tasks, 'enqueue_geocode_queue', lambda: kicks.append(True))
+    GeocodedLocation.objects.create(
+        normalized_query='new york, ny', query='New York, NY', lat=1.0, lon=2.0, status='resolved', precision='city',
+    )
+    JobEntry.objects.create(candidate=profile, title='Dev', company_name='Acme', location='New York, NY')
+    JobEntry.objects.create(candidate=profile, title='Ops', company_name='Beta', location='Nowhere Town')
+    client = APIClient()
+    client.force_authenticate(user=profile.user)
+
+    response = client.get('/api/jobs/geo')
+
+    assert response.status_code == 200
+    jobs = response.json()['jobs']
+    assert [(j['company'], j['lat'], j['lon']) for j in jobs] == [('Acme', 1.0, 2.0)]
+    assert kicks == [True]
+    assert fake_nominatim == []
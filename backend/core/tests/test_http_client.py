@@ -0,0 +1,109 @@
+"""
+Tests for the shared outbound HTTP client (core.http).
+"""
+
+import io
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from core import http
+from core.models import APIService, APIUsageLog
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b'{}'
+    response.raw = io.BytesIO()
+    return response
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    session = MagicMock()
+    monkeypatch.setattr(http, 'get_session', lambda policy='default': session)
+    sleeps = []
+    monkeypatch.setattr(http.time, 'sleep', sleeps.append)
+    session.sleeps = sleeps
+    return session
+
+
+def test_sessions_are_reused_per_policy():
+    http.close_sessions()
+    gmail = http.get_session('gmail')
+    assert http.get_session('gmail') is gmail
+    assert http.get_session('research') is not gmail
+    adapter = gmail.get_adapter('https://gmail.googleapis.com')
+    assert adapter._pool_maxsize == http.get_policy('gmail').pool_maxsize
+    http.close_sessions()
+
+
+def test_policy_overrides_from_settings(settings):
+    settings.HTTP_CLIENT_POLICIES = {'gmail': {'timeout': 3}}
+    policy = http.get_policy('gmail')
+    assert policy.timeout == 3
+    assert policy.max_retries == http.DEFAULT_POLICIES['gmail'].max_retries
+
+
+def test_retries_server_errors_then_returns_success(fake_session):
+    fake_session.request.side_effect = [_response(503), _response(200)]
+
+    response = http.get('https://example.com/x', policy='research')
+
+    assert response.status_code == 200
+    assert fake_session.request.call_count == 2
+    assert fake_session.request.call_args.kwargs['timeout'] == http.get_policy('research').timeout
+    assert len(fake_session.sleeps) == 1
+
+
+def test_honors_retry_after_and_returns_last_response(fake_session):
+    fake_session.request.side_effect = [_response(429, {'Retry-After': '7'})] * 3
+
+    response = http.get('https://example.com/x', policy='gmail')
+
+    assert response.status_code == 429
+    assert fake_session.request.call_count == 3
+    assert fake_session.sleeps == [7.0, 7.0]
+
+
+def test_client_errors_are_not_retried(fake_session):
+    fake_session.request.return_value = _response(404)
+
+    assert http.get('https://example.com/x', policy='gmail').status_code == 404
+    assert fake_session.request.call_count == 1
+
+
+def test_connection_errors_raise_after_retries(fake_session):
+    fake_session.request.side_effect = requests.ConnectionError('boom')
+
+    with pytest.raises(requests.ConnectionError):
+        http.get('https://example.com/x', policy='storage', max_retries=1)
+    assert fake_session.request.call_count == 2
+
+
+@pytest.mark.django_db
+def test_each_attempt_is_tracked(fake_session):
+    service = APIService.objects.create(name='http_test', service_type='other')
+    fake_session.request.side_effect = [_response(500), _response(200)]
+
+    http.post('https://example.com/api', policy='research', service=service, endpoint='/api')
+
+    logs = APIUsageLog.objects.filter(service=service).order_by('id')
+    assert [log.success for log in logs] == [False, True]
+    assert logs[0].error_type == 'RetryableStatusError'
+
+
+@pytest.mark.django_db
+def test_client_errors_are_tracked_as_failures(fake_session):
+    service = APIService.objects.create(name='http_test', service_type='other')
+    fake_session.request.return_value = _response(404)
+
+    response = http.get('https://example.com/missing', policy='research', service=service)
+
+    assert response.status_code == 404
+    log = APIUsageLog.objects.get(service=service)
+    assert log.success is False
+    assert log.error_type == 'FailedStatusError'
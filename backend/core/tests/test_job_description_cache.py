@@ -0,0 +1,104 @@
+"""
+Tests for the shared, content-addressed job description analysis cache.
+"""
+
+import pytest
+from django.test import override_settings
+
+from core import job_description_cache
+from core.interview_insights import InterviewInsightsGenerator
+from core.job_description_cache import cache_stats, evict, interview_insights, job_requirements_many
+from core.job_matching import JobMatchingEngine
+from core.models import CandidateProfile, JobDescriptionAnalysis, JobEntry, Skill
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('locmem_cache')]
+
+
+def _job(django_user_model, username, description='Python and Django services, 3+ years experience'):
+    user = django_user_model.objects.create_user(username=username, email=f'{username}@example.com', password='pass')
+    profile = CandidateProfile.objects.create(user=user)
+    return JobEntry.objects.create(candidate=profile, title='Backend Engineer', company_name='Acme',
+                                   description=description)
+
+
+def test_identical_postings_share_one_analysis(django_user_model, monkeypatch):
+    Skill.objects.get_or_create(name='Python', defaults={'category': 'Technical'})
+    first = _job(django_user_model, 'alice')
+    second = _job(django_user_model, 'bob', description='  PYTHON and Django services,\n3+ years experience ')
+    calls = []
+    compute = job_description_cache._compute_requirements
+    monkeypatch.setattr(job_description_cache, '_compute_requirements',
+                        lambda job, matcher=None: calls.append(job.id) or compute(job, matcher))
+
+    results = job_requirements_many([first])
+    results.update(job_requirements_many([second]))
+
+    assert calls == [first.id]
+    assert results[first.id] == results[second.id]
+    assert results[first.id]['experience_years'] == '3'
+    assert JobDescriptionAnalysis.objects.get().hit_count == 1
+    stats = cache_stats()['requirements']
+    assert (stats['hits'], stats['misses'], stats['hit_rate'], stats['entries']) == (1, 1, 0.5, 1)
+
+
+def test_score_many_reuses_requirements_across_candidates(django_user_model, monkeypatch):
+    first = _job(django_user_model, 'carol')
+    second = _job(django_user_model, 'dave')
+    JobMatchingEngine.score_many([first], first.candidate)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('requirements parsed again')
+
+    monkeypatch.setattr(job_description_cache, '_compute_requirements', fail)
+    result = JobMatchingEngine.score_many([second], second.candidate)[0]
+
+    assert result['cached'] is False
+    assert JobDescriptionAnalysis.objects.get().hit_count == 1
+
+
+def test_least_recently_used_entries_are_evicted(django_user_model):
+    jobs = [_job(django_user_model, f'user{i}', description=f'Posting {i}') for i in range(3)]
+    job_requirements_many([jobs[0]])
+    job_requirements_many([jobs[1]])
+    job_requirements_many([jobs[0]])  # jobs[1] is now least recently used
+
+    with override_settings(JOB_DESCRIPTION_CACHE_MAX_ENTRIES=2):
+        job_requirements_many([jobs[2]])
+
+    remaining = set(JobDescriptionAnalysis.objects.values_list('content_hash', flat=True))
+    assert remaining == {job_description_cache.requirements_hash(jobs[0]),
+                         job_description_cache.requirements_hash(jobs[2])}
+    assert evict(max_entries=1) == 1
+
+
+def test_only_ai_interview_insights_are_cached(monkeypatch):
+    generated = []
+
+    def generate(job_title, company_name, api_key=None, model=None):
+        generated.append(job_title)
+        return {'generated_by': 'ai' if api_key else 'template', 'title': job_title}
+
+    monkeypatch.setattr(InterviewInsightsGenerator, 'generate_for_job', classmethod(
+        lambda cls, **kwargs: generate(**kwargs)))
+
+    interview_insights('Data Analyst', 'Acme')
+    assert not JobDescriptionAnalysis.objects.exists()
+
+    first = interview_insights('Data Analyst', 'Acme', api_key='key', model='m')
+    again = interview_insights('data analyst ', 'ACME', api_key='key', model='m')
+    assert first == again
+    assert len(generated) == 2
+
+    interview_insights('Data Analyst', 'Acme', api_key='key', model='m', refresh=True)
+    assert len(generated) == 3
+    assert JobDescriptionAnalysis.objects.filter(kind='interview_insights').count() == 1
+
+
+def test_deleting_a_skill_drops_cached_requirements(django_user_model, django_capture_on_commit_callbacks):
+    skill, _ = Skill.objects.get_or_create(name='Python', defaults={'category': 'Technical'})
+    job_requirements_many([_job(django_user_model, 'erin')])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        skill.delete()
+
+    assert not JobDescriptionAnalysis.objects.filter(kind='requirements').exists()
@@ -58,3 +58,78 @@ def test_calculate_match_score_integration(monkeypatch):
     assert 'skills_score' in result
     assert result['overall_score'] >= 0
     assert result['overall_score'] <= 100
+
+
+def _make_candidate_with_jobs(django_user_model, job_count):
+    from core.models import CandidateProfile, CandidateSkill, JobEntry, Skill, WorkExperience, Education
+    from datetime import date
+
+    user = django_user_model.objects.create_user(username='bulk', email='bulk@example.com', password='pass')
+    profile = CandidateProfile.objects.create(user=user, experience_level='mid')
+    python = Skill.objects.create(name='Python', category='Technical')
+    Skill.objects.create(name='Django', category='Technical')
+    CandidateSkill.objects.create(candidate=profile, skill=python, level='advanced', years=Decimal('3'))
+    exp = WorkExperience.objects.create(
+        candidate=profile, company_name='Acme', job_title='Engineer',
+        start_date=date(2019, 1, 1), end_date=date(2023, 1, 1),
+    )
+    exp.skills_used.add(python)
+    Education.objects.create(candidate=profile, institution='State U', degree_type='ba', field_of_study='Computer Science')
+    jobs = [
+        JobEntry.objects.create(
+            candidate=profile,
+            title=f'Software Engineer {i}',
+            company_name=f'Company {i}',
+            description='Python and Django services with 3 years of experience',
+        )
+        for i in range(job_count)
+    ]
+    return profile, jobs
+
+
+@pytest.mark.django_db
+def test_score_many_matches_single_job_scoring(django_user_model):
+    profile, jobs = _make_candidate_with_jobs(django_user_model, 3)
+
+    results = JobMatchingEngine.score_many(jobs, profile)
+    single = JobMatchingEngine.calculate_match_score(jobs[0], profile)
+
+    assert [r['job_id'] for r in results] == [j.id for j in jobs]
+    assert results[0]['overall_score'] == single['overall_score']
+    assert results[0]['skills_score'] == single['skills_score']
+    assert results[0]['breakdown']['strengths'] == single['breakdown']['strengths']
+    assert all(r['cached'] is False for r in results)
+
+
+@pytest.mark.django_db
+def test_score_many_query_count_is_independent_of_job_count(django_user_model):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from core.models import JobMatchAnalysis
+
+    profile, jobs = _make_candidate_with_jobs(django_user_model, 12)
+    # Warm the skill vocabulary so auto-detected keywords are not created mid-measurement
+    JobMatchingEngine.score_many(jobs[:1], profile, use_cache=False)
+
+    with CaptureQueriesContext(connection) as small:
+        JobMatchingEngine.score_many(jobs[:2], profile, use_cache=False)
+    with CaptureQueriesContext(connection) as large:
+        JobMatchingEngine.score_many(jobs, profile, use_cache=False)
+
+    assert len(large.captured_queries) == len(small.captured_queries)
+    assert JobMatchAnalysis.objects.filter(candidate=profile, is_valid=True).count() == len(jobs)
+
+
+@pytest.mark.django_db
+def test_score_many_reuses_valid_cache_and_refreshes_stale_rows(django_user_model):
+    from core.models import JobMatchAnalysis
+
+    profile, jobs = _make_candidate_with_jobs(django_user_model, 2)
+    JobMatchingEngine.score_many(jobs, profile)
+    JobMatchAnalysis.objects.filter(job=jobs[1]).update(is_valid=False)
+
+    results = JobMatchingEngine.score_many(jobs, profile)
+
+    assert results[0]['cached'] is True
+    assert results[1]['cached'] is False
+    assert JobMatchAnalysis.objects.get(job=jobs[1]).is_valid is True
@@ -0,0 +1,86 @@
+"""
+Tests for ranked job search (core.job_search) and its use by the jobs list.
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core import job_search
+from core.models import CandidateProfile, JobEntry
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile(django_user_model):
+    user = django_user_model.objects.create_user(username='searcher', email='search@example.com', password='pass')
+    return CandidateProfile.objects.create(user=user)
+
+
+@pytest.fixture
+def jobs(profile):
+    def create(title, company, **kwargs):
+        return JobEntry.objects.create(candidate=profile, title=title, company_name=company, **kwargs)
+    return {
+        'backend': create('Backend Engineer', 'Stripe', location='San Francisco, CA', industry='Fintech',
+                          description='Python, Django and Postgres'),
+        'data': create('Data Scientist', 'Google', location='New York, NY', industry='Software',
+                       description='Experiments and backend pipelines'),
+        'pm': create('Product Manager', 'Shopify', location='Remote', industry='Retail',
+                     description='Roadmaps'),
+    }
+
+
+def _ids(qs):
+    return set(qs.values_list('id', flat=True))
+
+
+def test_prefix_tsquery_drops_punctuation():
+    assert job_search.search_terms("C++ back-end dev's") == ['c', 'back', 'end', 'dev', 's']
+    assert job_search.prefix_tsquery(['backend', 'eng']) == 'backend:* & eng:*'
+
+
+def test_word_similarity_tolerates_typos():
+    assert job_search.word_similarity('Gogle', 'Google LLC') >= job_search.WORD_SIMILARITY_THRESHOLD
+    assert job_search.word_similarity('Gogle', 'Shopify') < job_search.WORD_SIMILARITY_THRESHOLD
+
+
+def test_search_matches_prefixes_and_ranks_title_above_description(profile, jobs):
+    qs = job_search.apply_job_search(JobEntry.objects.filter(candidate=profile), profile, query='backe')
+
+    ranked = list(qs.order_by('-search_rank').values_list('id', flat=True))
+    assert ranked == [jobs['backend'].id, jobs['data'].id]
+
+
+def test_every_term_must_match(profile, jobs):
+    qs = job_search.apply_job_search(JobEntry.objects.filter(candidate=profile), profile, query='backend python')
+    assert _ids(qs) == {jobs['backend'].id}
+
+
+def test_fuzzy_company_and_location(profile, jobs):
+    base = JobEntry.objects.filter(candidate=profile)
+    assert _ids(job_search.apply_job_search(base, profile, query='Gogle')) == {jobs['data'].id}
+    assert _ids(job_search.apply_job_search(base, profile, location='San Fransisco')) == {jobs['backend'].id}
+    assert _ids(job_search.apply_job_search(base, profile, industry='soft')) == {jobs['data'].id}
+
+
+def test_fallback_index_is_rebuilt_when_jobs_change(profile, jobs):
+    index = job_search.get_search_index(profile)
+    assert job_search.get_search_index(profile) is index
+
+    JobEntry.objects.create(candidate=profile, title='Platform Engineer', company_name='Datadog')
+    rebuilt = job_search.get_search_index(profile)
+    assert rebuilt is not index and len(rebuilt) == 4
+
+
+def test_jobs_list_orders_search_results_by_rank(profile, jobs):
+    client = APIClient()
+    client.force_authenticate(user=profile.user)
+    # Touch the weaker match last so updated_at order would put it first
+    jobs['data'].save()
+
+    resp = client.get(reverse('jobs-list-create'), {'q': 'backend'})
+
+    assert resp.status_code == 200
+    assert [item['title'] for item in resp.json()['results']] == ['Backend Engineer', 'Data Scientist']
@@ -0,0 +1,77 @@
+"""
+Tests for the Tectonic worker pool (core.latex_compiler).
+"""
+
+import threading
+import time
+
+import pytest
+
+from core import latex_compiler, pdf_cache, resume_ai
+
+
+@pytest.fixture
+def fake_tectonic(monkeypatch):
+    state = {'active': 0, 'peak': 0, 'calls': []}
+    lock = threading.Lock()
+
+    def run(latex):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['calls'].append(latex)
+        time.sleep(0.05)
+        with lock:
+            state['active'] -= 1
+        if 'broken' in latex:
+            raise latex_compiler.LatexCompileError('Failed to compile LaTeX resume: broken')
+        return f'%PDF {latex}'.encode('utf-8')
+
+    monkeypatch.setattr(latex_compiler, 'run_tectonic', run)
+    return state
+
+
+def test_pool_bounds_concurrency_and_preserves_order(fake_tectonic):
+    pool = latex_compiler.TectonicPool(max_workers=2)
+    docs = [f'doc{i}' for i in range(5)]
+
+    results = pool.compile_many(docs)
+
+    assert results == [f'%PDF doc{i}'.encode('utf-8') for i in range(5)]
+    assert fake_tectonic['peak'] == 2
+    stats = pool.stats()
+    assert stats['compiled'] == 5
+    assert stats['queue_depth'] == 0
+    assert stats['running'] == 0
+    assert stats['avg_compile_ms'] >= 40
+    pool.shutdown()
+
+
+def test_pool_counts_failures(fake_tectonic):
+    pool = latex_compiler.TectonicPool(max_workers=1)
+
+    with pytest.raises(latex_compiler.LatexCompileError):
+        pool.compile('broken')
+
+    assert pool.stats()['failed'] == 1
+    pool.shutdown()
+
+
+def test_batch_compile_skips_cached_and_duplicate_documents(fake_tectonic, settings, tmp_path, monkeypatch):
+    settings.RESUME_PDF_CACHE_DIR = str(tmp_path)
+    monkeypatch.setattr(pdf_cache, 'compiler_fingerprint', lambda: 'tectonic-test')
+    resume_ai.compile_latex_pdf_bytes('cached')
+    fake_tectonic['calls'].clear()
+
+    results = resume_ai.compile_latex_pdfs(['cached', 'fresh', 'fresh'])
+
+    assert results == [b'%PDF cached', b'%PDF fresh', b'%PDF fresh']
+    assert fake_tectonic['calls'] == ['fresh']
+
+
+def test_compile_errors_surface_as_resume_ai_errors(fake_tectonic, settings, tmp_path, monkeypatch):
+    settings.RESUME_PDF_CACHE_DIR = str(tmp_path)
+    monkeypatch.setattr(pdf_cache, 'compiler_fingerprint', lambda: 'tectonic-test')
+
+    with pytest.raises(resume_ai.ResumeAIError):
+        resume_ai.compile_latex_pdf_bytes('broken')
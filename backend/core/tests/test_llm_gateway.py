@@ -0,0 +1,102 @@
+"""
+Tests for the LLM response cache and request coalescing gateway (core.llm_gateway).
+"""
+
+import threading
+
+import pytest
+from django.core.cache import cache
+
+from core import llm_gateway
+from core.api_monitoring import get_or_create_service
+from core.models import APIQuotaUsage, APIUsageLog
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('locmem_cache')]
+
+
+def _counting_call(text='answer', tokens=120):
+    calls = []
+
+    def call():
+        calls.append(1)
+        return text, tokens
+
+    call.calls = calls
+    return call
+
+
+def test_identical_requests_are_served_from_cache():
+    service = get_or_create_service('gemini', 'gemini')
+    call = _counting_call()
+
+    first = llm_gateway.generate('prompt', model='m', config={'temperature': 0.2}, call=call, service=service)
+    again = llm_gateway.generate('prompt', model='m', config={'temperature': 0.2}, call=call, service=service)
+    llm_gateway.generate('prompt', model='m', config={'temperature': 0.9}, call=call, service=service)
+
+    assert first == again == 'answer'
+    assert len(call.calls) == 2
+    hit = APIUsageLog.objects.get(metadata__served_from_cache='hit')
+    assert hit.metadata['tokens_saved'] == 120
+    assert llm_gateway.usage_summary()['gemini'] == {
+        'hits': 1, 'coalesced': 0, 'misses': 2, 'hit_rate': 0.3333, 'tokens_saved': 120,
+    }
+    # Only the two upstream calls count against the quota
+    assert APIQuotaUsage.objects.get(service=service, period_type='day').total_requests == 2
+
+
+def test_refresh_failures_and_rejected_output_are_not_cached():
+    llm_gateway.generate('prompt', model='m', call=_counting_call('old'))
+    assert llm_gateway.generate('prompt', model='m', call=_counting_call('new'), use_cache=False) == 'new'
+    assert llm_gateway.generate('prompt', model='m', call=_counting_call('unused')) == 'new'
+
+    def fail():
+        raise RuntimeError('upstream down')
+
+    with pytest.raises(RuntimeError):
+        llm_gateway.generate('other', model='m', call=fail)
+    with pytest.raises(ValueError):
+        llm_gateway.generate('other', model='m', call=_counting_call(''), validate=llm_gateway.require_text)
+    call = _counting_call('fine')
+    assert llm_gateway.generate('other', model='m', call=call) == 'fine'
+    assert len(call.calls) == 1
+
+
+def test_concurrent_identical_requests_share_one_call(monkeypatch):
+    served = []
+    monkeypatch.setattr(llm_gateway, '_record_served', lambda served_as, *args, **kwargs: served.append(served_as))
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'shared', 50
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(llm_gateway.generate('p', model='m', call=slow_call)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(llm_gateway.generate('p', model='m', call=slow_call)))
+    follower.start()
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == ['shared', 'shared']
+    assert len(calls) == 1
+    assert served == ['coalesced']
+
+
+def test_waits_for_an_identical_call_in_another_process(monkeypatch):
+    monkeypatch.setattr(llm_gateway, 'POLL_INTERVAL', 0.01)
+    key = llm_gateway.request_key('m', 'p')
+    cache.add(f'{llm_gateway.INFLIGHT_PREFIX}{key}', 1)
+    timer = threading.Timer(0.1, lambda: llm_gateway._store(key, 'from elsewhere', 30))
+    timer.start()
+    call = _counting_call()
+
+    assert llm_gateway.generate('p', model='m', call=call) == 'from elsewhere'
+    timer.join()
+    assert call.calls == []
+    assert APIUsageLog.objects.get(metadata__served_from_cache='coalesced').metadata['tokens_saved'] == 30
@@ -0,0 +1,158 @@
+"""
+Tests for fingerprint-based invalidation and background recompute of match analyses.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from core import tasks
+from core.job_matching import JobMatchingEngine
+from core.match_fingerprints import (
+    RECOMPUTE_PENDING_PREFIX, recompute_candidate, recompute_stale, skills_fingerprint, store_skills_gap,
+)
+from core.models import (
+    CandidateProfile, CandidateSkill, Education, JobEntry, JobMatchAnalysis, Skill, SkillGapAnalysisCache,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures('locmem_cache')]
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tasks, 'enqueue_match_recompute', lambda candidate_id, job_ids=None: calls.append(
+        (candidate_id, list(job_ids or []))))
+    return calls
+
+
+def _candidate(django_user_model, username):
+    user = django_user_model.objects.create_user(username=username, email=f'{username}@example.com', password='pass')
+    profile = CandidateProfile.objects.create(user=user, experience_level='mid')
+    python, _ = Skill.objects.get_or_create(name='Python', defaults={'category': 'Technical'})
+    CandidateSkill.objects.create(candidate=profile, skill=python, level='advanced', years=Decimal('3'))
+    Education.objects.create(candidate=profile, institution='State U', degree_type='ba', field_of_study='CS')
+    jobs = [
+        JobEntry.objects.create(candidate=profile, title=f'Engineer {i}', company_name=f'Co {i}',
+                                description='Python and Django services')
+        for i in range(2)
+    ]
+    JobMatchingEngine.score_many(jobs, profile)
+    store_skills_gap(jobs[0], {'skills': [], 'summary': {}}, skills_fingerprint(profile.id))
+    return user, profile, jobs
+
+
+def _valid(model, **filters):
+    return list(model.objects.filter(**filters).order_by('id').values_list('is_valid', flat=True))
+
+
+def test_candidate_changes_mark_only_affected_rows_stale(django_user_model, queued,
+                                                         django_capture_on_commit_callbacks):
+    _, profile, jobs = _candidate(django_user_model, 'alice')
+    _, other, _ = _candidate(django_user_model, 'bob')
+
+    skill = CandidateSkill.objects.get(candidate=profile)
+    skill.save()  # no input changed
+    assert _valid(JobMatchAnalysis, candidate=profile) == [True, True]
+
+    education = Education.objects.get(candidate=profile)
+    education.degree_type = 'ms'
+    with django_capture_on_commit_callbacks(execute=True):
+        education.save()
+    assert _valid(JobMatchAnalysis, candidate=profile) == [False, False]
+    assert _valid(SkillGapAnalysisCache, job=jobs[0]) == [True]  # skills gap ignores education
+    assert queued == [(profile.id, [])]
+
+    skill.level = 'expert'
+    skill.save()
+    assert _valid(SkillGapAnalysisCache, job=jobs[0]) == [False]
+    assert _valid(JobMatchAnalysis, candidate=other) == [True, True]
+    assert _valid(SkillGapAnalysisCache, job__candidate=other) == [True]
+
+
+def test_job_changes_mark_only_that_job_stale(django_user_model, queued):
+    _, profile, jobs = _candidate(django_user_model, 'carol')
+
+    jobs[0].status = 'applied'
+    jobs[0].save()
+    assert _valid(JobMatchAnalysis, candidate=profile) == [True, True]
+
+    jobs[0].description = 'Rust and Kubernetes'
+    jobs[0].save(update_fields=['description'])
+    analyses = JobMatchAnalysis.objects.filter(candidate=profile)
+    assert {a.job_id: a.is_valid for a in analyses} == {jobs[0].id: False, jobs[1].id: True}
+    assert _valid(SkillGapAnalysisCache, job=jobs[0]) == [False]
+
+
+def test_worker_recomputes_stale_rows_with_current_fingerprints(django_user_model, queued):
+    _, profile, jobs = _candidate(django_user_model, 'dave')
+    JobEntry.objects.filter(pk=jobs[1].pk).update(description='Go and Postgres')  # bypasses signals
+    CandidateSkill.objects.filter(candidate=profile).update(level='beginner')
+    JobMatchAnalysis.objects.filter(job=jobs[0]).update(is_valid=False, user_weights={'skills': 1, 'experience': 0,
+                                                                                         'education': 0})
+    SkillGapAnalysisCache.objects.filter(job=jobs[0]).update(is_valid=False)
+
+    counts = recompute_candidate(profile.id, [jobs[1].id])
+
+    assert counts == {'matches': 2, 'skills_gaps': 1}
+    first = JobMatchAnalysis.objects.get(job=jobs[0])
+    assert first.is_valid and first.candidate_fingerprint
+    assert first.user_weights == {'skills': 1.0, 'experience': 0.0, 'education': 0.0}
+    assert first.overall_score == first.skills_score
+    assert SkillGapAnalysisCache.objects.filter(job=jobs[0], is_valid=True).count() == 1
+    assert recompute_stale() == {'candidates': 0, 'matches': 0, 'skills_gaps': 0}
+
+
+def test_match_views_never_score_on_the_request_thread(django_user_model, queued, monkeypatch,
+                                                       django_capture_on_commit_callbacks):
+    user, profile, jobs = _candidate(django_user_model, 'erin')
+    fresh_job = JobEntry.objects.create(candidate=profile, title='Analyst', company_name='New Co')
+    jobs[1].title = 'Staff Engineer'
+    jobs[1].save()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('scored on the request thread')
+
+    monkeypatch.setattr(JobMatchingEngine, '_score_with_snapshot', fail)
+    monkeypatch.setattr(JobMatchingEngine, 'calculate_match_score', fail)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    queued.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        pending = client.get(f'/api/jobs/{fresh_job.id}/match-score/')
+        stale = client.get(f'/api/jobs/{jobs[1].id}/match-score/')
+        bulk = client.get('/api/jobs/match-scores/', {'sort_by': 'title', 'order': 'asc'})
+
+    assert pending.status_code == 202 and pending.data['status'] == 'pending'
+    assert stale.status_code == 200 and stale.data['stale'] is True
+    body = bulk.json()
+    assert body['pending_job_ids'] == [fresh_job.id]
+    assert [(j['job_id'], j['stale']) for j in body['jobs']] == [(jobs[0].id, False), (jobs[1].id, True)]
+    # One queued recompute for the candidate; later requests add their jobs to it
+    assert queued == [(profile.id, [fresh_job.id])]
+    assert cache.get(f'{RECOMPUTE_PENDING_PREFIX}{profile.id}') == sorted([fresh_job.id, jobs[1].id])
+
+
+def test_polling_queues_one_recompute_per_candidate(django_user_model, queued,
+                                                    django_capture_on_commit_callbacks):
+    user, profile, jobs = _candidate(django_user_model, 'frank')
+    fresh_job = JobEntry.objects.create(candidate=profile, title='Analyst', company_name='New Co')
+    client = APIClient()
+    client.force_authenticate(user=user)
+    queued.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(5):
+            assert client.get(f'/api/jobs/{fresh_job.id}/match-score/').status_code == 202
+            client.get('/api/jobs/match-scores/')
+    assert queued == [(profile.id, [fresh_job.id])]
+
+    # The queued run releases the lock and scores every job requested meanwhile
+    assert recompute_candidate(profile.id)['matches'] == 1
+    assert client.get(f'/api/jobs/{fresh_job.id}/match-score/').status_code == 200
+    with django_capture_on_commit_callbacks(execute=True):
+        client.get(f'/api/jobs/{JobEntry.objects.create(candidate=profile, title="Lead").id}/match-score/')
+    assert len(queued) == 2
@@ -376,6 +376,28 @@ class TestMockInterviewService:
         assert questions[0]['framework'] == 'STAR'
         assert len(questions[0]['ideal_points']) == 3
 
+    @pytest.mark.usefixtures('locmem_cache')
+    def test_generate_questions_skips_cached_response(self):
+        """Starting another session asks Gemini again instead of reusing the cached questions."""
+        from core.mock_interview import MockInterviewGenerator
+
+        mock_response = Mock()
+        mock_response.text = '[{"question": "Why this role?", "category": "motivation", "framework": "STAR", "ideal_points": []}]'
+        mock_client = Mock()
+        mock_client.models.generate_content.return_value = mock_response
+
+        generator = MockInterviewGenerator(client=mock_client)
+        for _ in range(2):
+            questions = generator.generate_questions(
+                interview_type='behavioral',
+                difficulty_level='mid',
+                focus_areas=['motivation'],
+                count=1
+            )
+            assert questions[0]['question'] == 'Why this role?'
+
+        assert mock_client.models.generate_content.call_count == 2
+
     def test_evaluate_answer(self):
         """Test AI answer evaluation."""
         from core.mock_interview import MockInterviewCoach
@@ -0,0 +1,80 @@
+"""
+Tests for the content-addressed resume PDF cache (core.pdf_cache).
+"""
+
+import os
+
+import pytest
+from rest_framework.test import APIClient
+
+from core import pdf_cache, resume_ai
+
+LATEX = '\\documentclass{article}\\begin{document}Hello\\end{document}'
+
+
+@pytest.fixture
+def pdf_cache_dir(settings, tmp_path, monkeypatch):
+    settings.RESUME_PDF_CACHE_DIR = str(tmp_path)
+    monkeypatch.setattr(pdf_cache, 'compiler_fingerprint', lambda: 'tectonic 0.15.0')
+    compiled = []
+
+    def fake_tectonic(latex):
+        compiled.append(latex)
+        return b'%PDF-1.5 ' + latex.encode('utf-8')
+
+    monkeypatch.setattr(resume_ai, '_run_tectonic', fake_tectonic)
+    return compiled
+
+
+def test_second_compile_is_served_from_cache(pdf_cache_dir):
+    first = resume_ai.compile_latex_pdf_bytes(LATEX)
+    second = resume_ai.compile_latex_pdf_bytes(LATEX)
+
+    assert first == second
+    assert pdf_cache_dir == [LATEX]
+    assert resume_ai.compile_latex_pdf(LATEX)
+    assert pdf_cache_dir == [LATEX]
+
+
+def test_key_depends_on_compiler_version(pdf_cache_dir, monkeypatch):
+    key = pdf_cache.pdf_cache_key(LATEX)
+    monkeypatch.setattr(pdf_cache, 'compiler_fingerprint', lambda: 'tectonic 0.16.0')
+
+    assert pdf_cache.pdf_cache_key(LATEX) != key
+    assert pdf_cache.pdf_cache_key(LATEX + ' ') != pdf_cache.pdf_cache_key(LATEX)
+
+
+def test_prune_removes_least_recently_used(pdf_cache_dir):
+    keys = [pdf_cache.pdf_cache_key(f'{LATEX}{i}') for i in range(3)]
+    for offset, key in enumerate(keys):
+        pdf_cache.store_pdf(key, b'x' * 100)
+        path = pdf_cache._entry_path(key)
+        os.utime(path, (1000 + offset, 1000 + offset))
+
+    removed = pdf_cache.prune_pdf_cache(max_bytes=250)
+
+    assert removed == 1
+    assert not pdf_cache.has_cached_pdf(keys[0])
+    assert pdf_cache.has_cached_pdf(keys[1]) and pdf_cache.has_cached_pdf(keys[2])
+
+
+@pytest.mark.django_db
+def test_shared_resume_pdf_supports_etag(pdf_cache_dir, django_user_model):
+    from core.models import CandidateProfile, ResumeShare, ResumeVersion
+
+    user = django_user_model.objects.create_user(username='pdfshare', email='pdfshare@example.com', password='pass')
+    profile = CandidateProfile.objects.create(user=user)
+    version = ResumeVersion.objects.create(candidate=profile, version_name='Shared', content={}, latex_content=LATEX)
+    share = ResumeShare.objects.create(resume_version=version)
+    client = APIClient()
+    url = f'/api/shared-resume/{share.share_token}/pdf/?reviewer_name=Rita&reviewer_email=rita@example.com'
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content.startswith(b'%PDF')
+    etag = response['ETag']
+
+    cached = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+    assert cached['ETag'] == etag
+    assert pdf_cache_dir == [LATEX]
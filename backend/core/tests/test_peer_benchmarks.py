@@ -0,0 +1,128 @@
+"""
+Tests for the materialized peer-cohort benchmarks (core.peer_benchmarks).
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import peer_benchmarks, tasks
+from core.models import CandidateProfile, CandidateSkill, JobEntry, PeerCohortBenchmark, Skill, WorkExperience
+
+pytestmark = pytest.mark.django_db
+
+URL = '/api/jobs/competitive-analysis'
+
+
+@pytest.fixture(autouse=True)
+def _settings(settings):
+    settings.GEMINI_API_KEY = ''
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tasks, 'enqueue_peer_benchmark_refresh', lambda: calls.append(True))
+    return calls
+
+
+def _candidate(django_user_model, name, level='mid', industry='Tech', state='NY', statuses=(), skills=(), days_ago=0):
+    user = django_user_model.objects.create_user(username=name, email=f'{name}@example.com', password='pass')
+    profile = CandidateProfile.objects.create(user=user, experience_level=level, industry=industry, state=state)
+    for idx, status in enumerate(statuses):
+        job = JobEntry.objects.create(candidate=profile, title=f'Role {idx}', company_name='Acme', status=status)
+        JobEntry.objects.filter(pk=job.pk).update(created_at=timezone.now() - timedelta(days=days_ago + idx * 7))
+    for skill_name in skills:
+        skill, _ = Skill.objects.get_or_create(name=skill_name)
+        CandidateSkill.objects.create(candidate=profile, skill=skill)
+    return profile
+
+
+def _client(profile):
+    api = APIClient()
+    api.force_authenticate(user=profile.user)
+    return api
+
+
+def test_view_reads_snapshot_without_the_requesting_user(django_user_model, refreshes):
+    me = _candidate(django_user_model, 'me', statuses=['applied'], skills=['Python', 'Go'])
+    _candidate(django_user_model, 'peer1', statuses=['applied', 'offer'], skills=['Python', 'SQL'])
+    _candidate(django_user_model, 'peer2', state='CA', statuses=['phone_screen', 'rejected', 'interview', 'applied'], skills=['SQL'])
+    _candidate(django_user_model, 'senior', level='senior', statuses=['offer'], skills=['Kubernetes'])
+    _candidate(django_user_model, 'other', industry='Finance', statuses=['offer'])
+    WorkExperience.objects.create(candidate=me, company_name='A', job_title='Dev', start_date=date(2020, 1, 1), end_date=date(2022, 1, 1))
+
+    call_command('refresh_peer_benchmarks')
+    data = _client(me).get(URL).json()
+
+    assert data['cohort']['sample_size'] == 2
+    assert data['cohort']['location'] == 'all'
+    assert data['cohort']['computed_at'] is not None
+    peers = data['peer_benchmarks']
+    assert peers['applications'] == 6
+    assert peers['funnel'] == {'interested': 0, 'applied': 2, 'phone_screen': 1, 'interview': 1, 'offer': 1, 'rejected': 1}
+    # Six applications across peer2's three-week window; the user's own job is not part of it
+    assert peers['apps_per_week'] == 2.0
+    assert data['employment'] == {
+        'user': {'avg_positions': 1.0, 'avg_years': 2.0},
+        'peers': {'avg_positions': 0, 'avg_years': 0},
+    }
+    assert [gap['name'] for gap in data['skill_gaps']] == ['SQL']
+    assert data['progression']['sample_size'] == 1
+    assert data['progression']['metrics']['offer_rate'] == 100.0
+    assert [gap['name'] for gap in data['progression']['skill_gaps']] == ['Kubernetes']
+    assert refreshes == []
+
+    local = _client(me).get(URL, {'peer_scope': 'local'}).json()
+    assert local['cohort']['location'] == 'NY'
+    assert local['cohort']['sample_size'] == 1
+    assert local['peer_benchmarks']['applications'] == 2
+
+
+def test_view_queries_do_not_grow_with_peers(django_user_model, refreshes, django_assert_max_num_queries):
+    me = _candidate(django_user_model, 'me', statuses=['applied'])
+    for idx in range(15):
+        _candidate(django_user_model, f'peer{idx}', statuses=['applied', 'interview'], skills=['Python'])
+    peer_benchmarks.refresh_peer_benchmarks()
+
+    with django_assert_max_num_queries(12):
+        response = _client(me).get(URL)
+
+    assert response.status_code == 200
+    assert response.json()['peer_benchmarks']['applications'] == 30
+
+
+def test_filters_and_missing_snapshot_fall_back_to_live_queries(django_user_model, refreshes):
+    me = _candidate(django_user_model, 'me', statuses=['applied'])
+    _candidate(django_user_model, 'recent', statuses=['offer'])
+    _candidate(django_user_model, 'old', statuses=['rejected'], days_ago=400)
+
+    data = _client(me).get(URL).json()
+    assert data['cohort']['computed_at'] is None
+    assert data['peer_benchmarks']['applications'] == 2
+    assert refreshes == [True]
+
+    peer_benchmarks.refresh_peer_benchmarks()
+    since = (timezone.localdate() - timedelta(days=30)).isoformat()
+    filtered = _client(me).get(URL, {'start_date': since}).json()
+    assert filtered['peer_benchmarks']['applications'] == 1
+    assert filtered['peer_benchmarks']['offer_rate'] == 100.0
+    assert filtered['cohort']['sample_size'] == 2
+
+
+def test_stale_snapshot_requests_a_single_refresh(django_user_model, refreshes, settings):
+    me = _candidate(django_user_model, 'me', statuses=['applied'])
+    peer_benchmarks.refresh_peer_benchmarks(now=timezone.now() - timedelta(days=2))
+    settings.PEER_BENCHMARK_MAX_AGE = 3600
+
+    _client(me).get(URL)
+    _client(me).get(URL)
+
+    assert refreshes == [True]
+    assert PeerCohortBenchmark.objects.filter(industry='Tech', location='NY').exists()
@@ -190,3 +190,63 @@ class TestProductivityAnalytics:
         
         recs = data['recommendations']
         assert any("networking" in r.lower() for r in recs)
+
+    def test_activity_events_follow_source_records(self):
+        """Source saves and deletes keep the activity event log in step."""
+        from core.models import ActivityEvent, Contact
+
+        contact = Contact.objects.create(owner=self.user, first_name="Mentor")
+        interaction = Interaction.objects.create(
+            owner=self.user, contact=contact, type="call", date=timezone.now(), duration_minutes=40
+        )
+        job = JobEntry.objects.create(candidate=self.profile, title='Engineer', company_name='ACME')
+        job.application_history = [{'action': 'Submitted', 'timestamp': timezone.now().isoformat()}]
+        job.save(update_fields=['application_history'])
+
+        events = ActivityEvent.objects.filter(user=self.user)
+        assert sorted(events.values_list('activity', 'minutes')) == [
+            ('applications', 25.0), ('applications', 25.0), ('networking', 40.0),
+        ]
+
+        interaction.duration_minutes = 10
+        interaction.save()
+        job.delete()
+        assert list(events.values_list('activity', 'minutes')) == [('networking', 10.0)]
+
+    def test_backfill_rebuilds_log_and_queries_do_not_scale(self, django_assert_max_num_queries):
+        from django.core.management import call_command
+        from core.models import ActivityEvent, Contact
+
+        contact = Contact.objects.create(owner=self.user, first_name="Peer")
+        skill = Skill.objects.create(name='Go')
+        for day in range(20):
+            when = timezone.now() - timedelta(days=day)
+            Interaction.objects.create(owner=self.user, contact=contact, date=when, duration_minutes=30)
+            SkillDevelopmentProgress.objects.create(candidate=self.profile, skill=skill, hours_spent=1, activity_date=when)
+        live = ProductivityAnalyzer(self.profile).build()
+
+        ActivityEvent.objects.filter(user=self.user).delete()
+        call_command('backfill_activity_events', '--user', str(self.user.pk))
+        assert ActivityEvent.objects.filter(user=self.user).count() == 40
+
+        with django_assert_max_num_queries(14):
+            rebuilt = ProductivityAnalyzer(self.profile).build()
+        assert rebuilt == live
+        assert rebuilt['time_investment']['activities']['skill_development']['hours'] == 20.0
+
+    def test_backfill_runs_once_even_after_new_activity(self):
+        from core import activity_log
+        from core.models import ActivityEvent, Contact
+
+        contact = Contact.objects.create(owner=self.user, first_name="Old")
+        Interaction.objects.create(owner=self.user, contact=contact, date=timezone.now(), duration_minutes=30)
+        ActivityEvent.objects.filter(user=self.user).delete()  # activity from before the event log
+        MockInterviewSession.objects.create(user=self.user, interview_type='behavioral', total_duration_seconds=600)
+
+        assert activity_log.ensure_backfilled(self.user) is True
+        assert sorted(ActivityEvent.objects.filter(user=self.user).values_list('minutes', flat=True)) == [10.0, 30.0]
+        assert activity_log.ensure_backfilled(self.user) is False
+
+        quiet = User.objects.create_user(username='quiet', email='quiet@example.com', password='pass')
+        assert activity_log.ensure_backfilled(quiet) is True
+        assert activity_log.ensure_backfilled(quiet) is False
@@ -0,0 +1,96 @@
+"""
+Tests for persisted relationship maintenance scores (core.relationship_health).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import Contact, ContactNote, Interaction, Reminder
+
+pytestmark = pytest.mark.django_db
+
+URL = '/api/contacts/maintenance/overview'
+
+
+@pytest.fixture
+def user(django_user_model):
+    return django_user_model.objects.create_user(username='networker', email='net@example.com', password='pass')
+
+
+@pytest.fixture
+def client(user):
+    api = APIClient()
+    api.force_authenticate(user=user)
+    return api
+
+
+def _by_contact(items, contact):
+    return next(item for item in items if item['contact_id'] == str(contact.id))
+
+
+def test_interactions_notes_and_reminders_refresh_contact_scores(user, django_capture_on_commit_callbacks):
+    now = timezone.now()
+    contact = Contact.objects.create(owner=user, first_name='Ada', email='ada@example.com', relationship_strength=5)
+    contact.refresh_from_db()
+    assert contact.scores_refreshed_at is not None
+    assert contact.cadence_days == 7
+
+    Interaction.objects.create(contact=contact, owner=user, date=now - timedelta(days=3), metadata={'direction': 'give'})
+    ask = Interaction.objects.create(contact=contact, owner=user, date=now - timedelta(days=40),
+                                     metadata={'direction': 'ask'}, follow_up_needed=True)
+    ContactNote.objects.create(contact=contact, author=user, interests=['Robotics', 'golf'])
+    Reminder.objects.create(contact=contact, owner=user, message='Ping', due_date=now + timedelta(days=2))
+
+    contact.refresh_from_db()
+    assert contact.reciprocity_given == 1
+    assert contact.reciprocity_received == 1
+    assert contact.outstanding_follow_ups == 1
+    assert len(contact.recent_interaction_dates) == 1
+    assert contact.note_interests == ['Robotics', 'golf']
+    assert contact.next_reminder_due is not None
+    assert contact.health_score == 50 + 15 + 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ask.delete()
+    contact.refresh_from_db()
+    assert contact.reciprocity_received == 0
+    assert contact.outstanding_follow_ups == 0
+
+
+def test_overview_reads_persisted_scores_in_constant_queries(user, client, django_assert_max_num_queries):
+    now = timezone.now()
+    for idx in range(12):
+        contact = Contact.objects.create(owner=user, first_name=f'C{idx}', email=f'c{idx}@example.com',
+                                         relationship_type='mentor' if idx % 2 else 'friend')
+        for day in range(6):
+            Interaction.objects.create(contact=contact, owner=user, date=now - timedelta(days=day * 10),
+                                       metadata={'request_made': True})
+        ContactNote.objects.create(contact=contact, author=user, interests=['data'])
+
+    with django_assert_max_num_queries(6):
+        response = client.get(URL)
+
+    assert response.status_code == 200
+    data = response.json()
+    first = Contact.objects.get(owner=user, first_name='C1')
+    health = _by_contact(data['relationship_health'], first)
+    assert health['engagement_frequency_per_month'] == 3
+    assert health['health_score'] == 50 + 6
+    assert _by_contact(data['reciprocity'], first)['received'] == 6
+    assert _by_contact(data['personalized_outreach'], first)['interest'] == 'data'
+    assert _by_contact(data['check_in_suggestions'], first)['recurrence'] == 'monthly'
+
+
+def test_overview_scores_contacts_missing_persisted_scores(user, client):
+    contact = Contact.objects.create(owner=user, first_name='Grace', email='grace@example.com')
+    Interaction.objects.create(contact=contact, owner=user, metadata={'direction': 'support'})
+    Contact.objects.filter(pk=contact.pk).update(scores_refreshed_at=None, reciprocity_given=0)
+
+    data = client.get(URL).json()
+
+    assert _by_contact(data['reciprocity'], contact)['given'] == 1
+    contact.refresh_from_db()
+    assert contact.scores_refreshed_at is not None
@@ -1,4 +1,3 @@
-import base64
 import json
 
 import pytest
@@ -20,7 +19,12 @@ User = get_user_model()
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures('run_generations_inline')
 class TestAIResumeEndpoint:
+    def _generation_result(self, resp):
+        assert resp.status_code == 202
+        return self.client.get(resp.json()['status_url'])
+
     def setup_method(self):
         self.client = APIClient()
         self.user = User.objects.create_user(
@@ -118,13 +122,15 @@ class TestAIResumeEndpoint:
             lambda prompt, api_key, **kwargs: json.dumps(payload),
         )
         monkeypatch.setattr(
-            'core.resume_ai.compile_latex_pdf',
-            lambda latex: base64.b64encode(b'%PDF').decode('ascii'),
+            'core.resume_ai.compile_latex_pdfs',
+            lambda documents: [b'%PDF' for _ in documents],
         )
 
-        resp = self.client.post(self.url, {'tone': 'impact', 'variation_count': 1}, format='json')
+        resp = self._generation_result(
+            self.client.post(self.url, {'tone': 'impact', 'variation_count': 1}, format='json')
+        )
         assert resp.status_code == 200
-        data = resp.json()
+        data = resp.json()['result']
         assert data['job']['id'] == self.job.id
         assert data['tone'] == 'impact'
         assert data['variation_count'] == 1
@@ -140,8 +146,8 @@ class TestAIResumeEndpoint:
             raise resume_ai.ResumeAIError('synthetic failure')
 
         monkeypatch.setattr('core.resume_ai.call_gemini_api', _boom)
-        resp = self.client.post(self.url, {'tone': 'impact'}, format='json')
-        assert resp.status_code == 502
+        resp = self._generation_result(self.client.post(self.url, {'tone': 'impact'}, format='json'))
+        assert resp.json()['state'] == 'failed'
         assert resp.json()['error']['code'] == 'ai_generation_failed'
 
     def test_ai_resume_job_not_found(self, settings):
@@ -165,9 +171,11 @@ class TestAIResumeEndpoint:
         }
         monkeypatch.setattr('core.resume_ai.generate_experience_variations', lambda *args, **kwargs: payload)
 
-        resp = self.client.post(self.tailor_url, {'tone': 'impact', 'variation_count': 2}, format='json')
+        resp = self._generation_result(
+            self.client.post(self.tailor_url, {'tone': 'impact', 'variation_count': 2}, format='json')
+        )
         assert resp.status_code == 200
-        assert resp.json()['variations'][0]['bullets'][0] == 'Gemini bullet text'
+        assert resp.json()['result']['variations'][0]['bullets'][0] == 'Gemini bullet text'
 
     def test_tailor_experience_bullet_endpoint(self, monkeypatch, settings):
         settings.GEMINI_API_KEY = 'test-key'
@@ -178,6 +186,34 @@ class TestAIResumeEndpoint:
         }
         monkeypatch.setattr('core.resume_ai.generate_experience_bullet', lambda *args, **kwargs: payload)
 
-        resp = self.client.post(self.tailor_bullet_url, {'tone': 'impact', 'bullet_index': 0}, format='json')
+        resp = self._generation_result(
+            self.client.post(self.tailor_bullet_url, {'tone': 'impact', 'bullet_index': 0}, format='json')
+        )
         assert resp.status_code == 200
-        assert resp.json()['bullet'] == 'Regenerated bullet text'
+        assert resp.json()['result']['bullet'] == 'Regenerated bullet text'
+
+
+@pytest.mark.django_db
+def test_bullet_regeneration_skips_the_llm_response_cache(monkeypatch, settings):
+    from unittest.mock import Mock
+
+    from django.core.cache import cache
+
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    settings.GEMINI_API_KEY = 'test-key'
+    cache.clear()
+    replies = iter(['First rewrite', 'Second rewrite'])
+
+    def fake_post(*args, **kwargs):
+        text = json.dumps({'bullet': next(replies)})
+        return Mock(status_code=200, json=lambda: {'candidates': [{'content': {'parts': [{'text': text}]}, 'finishReason': 'STOP'}]})
+
+    monkeypatch.setattr('core.resume_ai.http.post', fake_post)
+    candidate = {'experiences': [{'id': 1, 'title': 'Engineer', 'company': 'Acme', 'achievements': ['Built things']}]}
+    job = {'title': 'Engineer', 'company_name': 'Acme'}
+
+    first = resume_ai.generate_experience_bullet(candidate, job, 1, 0)
+    second = resume_ai.generate_experience_bullet(candidate, job, 1, 0)
+
+    assert (first['bullet'], second['bullet']) == ('First rewrite', 'Second rewrite')
+    cache.clear()
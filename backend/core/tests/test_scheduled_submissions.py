@@ -0,0 +1,98 @@
+"""
+Tests for the claiming scheduled-submission dispatcher (core.scheduled_submissions).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from core import scheduled_submissions
+from core.models import CandidateProfile, JobEntry, ScheduledSubmission
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def profile(django_user_model):
+    user = django_user_model.objects.create_user(username='sched', email='sched@example.com', password='pass')
+    return CandidateProfile.objects.create(user=user)
+
+
+def _submission(profile, minutes_ago=5, method='email', contact='recruiter@example.com', **kwargs):
+    job = JobEntry.objects.create(
+        candidate=profile, title='Engineer', company_name='Acme', status='interested',
+        recruiter_email=contact or '',
+    )
+    return ScheduledSubmission.objects.create(
+        candidate=profile, job=job, status='scheduled', submission_method=method,
+        scheduled_datetime=timezone.now() - timedelta(minutes=minutes_ago), **kwargs,
+    )
+
+
+def test_claim_takes_due_rows_once(profile):
+    due = _submission(profile)
+    _submission(profile, minutes_ago=-60)  # not due yet
+
+    assert scheduled_submissions.claim_due_submissions() == [due.id]
+    assert scheduled_submissions.claim_due_submissions() == []
+
+    due.refresh_from_db()
+    assert due.status == 'processing'
+    assert due.claimed_at is not None
+
+
+def test_expired_claim_is_taken_over_and_fences_the_old_batch(profile, settings):
+    settings.SCHEDULED_SUBMISSION_CLAIM_TIMEOUT = 60
+    submission = _submission(profile, minutes_ago=30)
+    first_claim = timezone.now() - timedelta(minutes=10)
+    assert scheduled_submissions.claim_due_submissions(now=first_claim) == [submission.id]
+
+    assert scheduled_submissions.claim_due_submissions() == [submission.id]
+    # The crashed worker's batch no longer owns the row
+    assert scheduled_submissions.deliver_submissions([submission.id], first_claim) == {'processed': 0, 'failed': 0}
+    assert mail.outbox == []
+
+
+def test_batches_are_sent_concurrently_and_marked_submitted(profile, settings):
+    settings.SCHEDULED_SUBMISSION_BATCH_SIZE = 2
+    submissions = [_submission(profile, contact=f'r{i}@example.com') for i in range(3)]
+    batches = []
+
+    def deliver(ids, claimed_at):
+        batches.append(ids)
+        return scheduled_submissions.deliver_submissions(ids, claimed_at, max_workers=2)
+
+    result = scheduled_submissions.process_due_submissions(deliver=deliver)
+
+    assert result == {'claimed': 3, 'batches': 2, 'processed': 3, 'failed': 0}
+    assert [len(ids) for ids in batches] == [2, 1]
+    assert sorted(m.to[0] for m in mail.outbox) == ['r0@example.com', 'r1@example.com', 'r2@example.com']
+    for submission in submissions:
+        submission.refresh_from_db()
+        assert submission.status == 'submitted'
+        assert submission.job.status == 'applied'
+
+
+def test_failed_delivery_backs_off_exponentially(profile):
+    submission = _submission(profile, contact=None, max_retries=3)
+
+    before = timezone.now()
+    assert scheduled_submissions.process_due_submissions()['failed'] == 1
+    submission.refresh_from_db()
+    assert submission.status == 'scheduled'
+    assert submission.retry_count == 1
+    assert submission.claimed_at is None
+    assert submission.scheduled_datetime >= before + timedelta(minutes=5)
+    assert 'No recipient email' in submission.error_message
+
+    assert scheduled_submissions.retry_delay(2) == timedelta(minutes=10)
+    assert scheduled_submissions.retry_delay(10) == timedelta(minutes=scheduled_submissions.RETRY_MAX_MINUTES)
+
+    submission.retry_count = 2
+    submission.scheduled_datetime = timezone.now() - timedelta(minutes=1)
+    submission.save()
+    scheduled_submissions.process_due_submissions()
+    submission.refresh_from_db()
+    assert submission.status == 'failed'
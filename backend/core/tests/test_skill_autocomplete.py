@@ -0,0 +1,82 @@
+"""
+Tests for the in-memory skills autocomplete index (core.skill_autocomplete).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from rest_framework.test import APIClient
+
+from core import skill_autocomplete
+from core.models import CandidateProfile, CandidateSkill, Skill
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(locmem_cache):
+    skill_autocomplete._shared_index = None
+    yield
+    skill_autocomplete._shared_index = None
+
+
+def _candidates(django_user_model, count):
+    return [
+        CandidateProfile.objects.create(user=django_user_model.objects.create_user(
+            username=f'ac{idx}', email=f'ac{idx}@example.com', password='pass'))
+        for idx in range(count)
+    ]
+
+
+def test_index_matches_substrings_and_ranks_by_usage():
+    index = skill_autocomplete.SkillAutocompleteIndex([
+        (1, 'Python', 'Programming Languages', 3),
+        (2, 'PyTorch', 'Frameworks', 5),
+        (3, 'JavaScript', 'Programming Languages', 9),
+        (4, 'TypeScript', 'Programming Languages', 9),
+        (5, 'Java', 'Programming Languages', 0),
+    ])
+
+    assert [s['name'] for s in index.search('py')] == ['PyTorch', 'Python']
+    assert [s['name'] for s in index.search('SCRIPT')] == ['JavaScript', 'TypeScript']
+    assert [s['name'] for s in index.search('java', category='programming languages', limit=1)] == ['JavaScript']
+    assert index.search('ruby') == []
+
+
+def test_endpoint_orders_by_popularity(django_user_model):
+    python = Skill.objects.create(name='Python', category='Programming Languages')
+    pytorch = Skill.objects.create(name='PyTorch', category='Frameworks')
+    for profile in _candidates(django_user_model, 2):
+        CandidateSkill.objects.create(candidate=profile, skill=pytorch)
+    client = APIClient()
+    client.force_authenticate(user=django_user_model.objects.create_user(username='viewer', password='pass'))
+
+    resp = client.get('/api/skills/autocomplete', {'q': 'py'})
+
+    assert resp.status_code == 200
+    assert [(s['id'], s['usage_count']) for s in resp.json()] == [(pytorch.id, 2), (python.id, 0)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_shared_index_picks_up_usage_on_refresh(django_user_model, django_assert_num_queries, monkeypatch, settings):
+    settings.SKILL_AUTOCOMPLETE_REFRESH_SECONDS = 300
+    now = [10_000.0]
+    monkeypatch.setattr(skill_autocomplete, 'time', SimpleNamespace(time=lambda: now[0], monotonic=lambda: now[0]))
+    skill = Skill.objects.create(name='Kubernetes', category='DevOps')
+    Skill.objects.create(name='Kafka', category='Data')
+    profile = _candidates(django_user_model, 1)[0]
+
+    assert [s['name'] for s in skill_autocomplete.suggest('k')] == ['Kafka', 'Kubernetes']
+    with django_assert_num_queries(0):
+        assert [s['name'] for s in skill_autocomplete.suggest('ka')] == ['Kafka']
+        assert [s['name'] for s in skill_autocomplete.suggest('k')] == ['Kafka', 'Kubernetes']
+
+    # New usage waits for the periodic rebuild; new skills show up straight away
+    CandidateSkill.objects.create(candidate=profile, skill=skill)
+    with django_assert_num_queries(0):
+        assert [s['name'] for s in skill_autocomplete.suggest('k')] == ['Kafka', 'Kubernetes']
+    Skill.objects.create(name='Kotlin', category='Programming Languages')
+    assert [s['name'] for s in skill_autocomplete.suggest('k')] == ['Kafka', 'Kotlin', 'Kubernetes']
+
+    now[0] += 301
+    assert [s['name'] for s in skill_autocomplete.suggest('k')] == ['Kubernetes', 'Kafka', 'Kotlin']
@@ -212,6 +212,66 @@ class SkillsGapAnalyzerTestCase(TestCase):
         self.assertIsNone(docker_skill['candidate_level'])
         self.assertGreater(docker_skill['gap_severity'], 80)  # High severity for missing
 
+    def test_auto_created_skills_use_bulk_queries(self):
+        """Unknown keywords are resolved with a constant number of queries."""
+        job = JobEntry.objects.create(
+            candidate=self.profile,
+            title='Platform Engineer',
+            company_name='CloudCo',
+            description='Docker, Kubernetes, Terraform, Ansible, Jenkins, Linux and AWS.',
+        )
+        
+        with self.assertNumQueries(4):
+            required = SkillsGapAnalyzer._extract_job_requirements(job)
+        
+        names = {s['name'] for s in required if s.get('auto_detected')}
+        self.assertTrue({'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Jenkins', 'Linux', 'AWS'} <= names)
+        self.assertEqual(Skill.objects.filter(name__in=names).count(), len(names))
+
+
+class SkillMatcherTestCase(TestCase):
+    """Test the compiled skill vocabulary matcher."""
+    
+    def test_trie_matches_regex_word_boundaries(self):
+        """Trie scan agrees with the per-skill \\b regex it replaces."""
+        import re
+        from core.skill_matcher import KeywordTrie
+        
+        terms = ['Go', 'C++', 'C#', '.NET', 'ASP.NET', 'Vue', 'Vue.js', 'R', 'Machine Learning', 'CI/CD', 'SQL']
+        text = ('Experience with Vue.js, ASP.NET and golang; machine learning in R. '
+                'C++ and C# devs welcome. CI/CD pipelines, NoSQL, SQL').lower()
+        trie = KeywordTrie()
+        for term in terms:
+            trie.add(term, term)
+        
+        expected = {t for t in terms if re.search(r'\b' + re.escape(t.lower()) + r'\b', text)}
+        self.assertEqual(set(trie.scan(text)), expected)
+    
+    def test_matcher_refresh_picks_up_new_skills(self):
+        """New rows are loaded incrementally and deleted rows trigger a rebuild."""
+        from core.skill_matcher import SkillMatcher
+        
+        Skill.objects.create(name='Python', category='Technical')
+        matcher = SkillMatcher.from_database()
+        self.assertEqual([m['name'] for m in matcher.match('Python and Rust')], ['Python'])
+        
+        rust = Skill.objects.create(name='Rust', category='Technical')
+        with self.assertNumQueries(2):
+            matcher.refresh()
+        self.assertEqual([m['name'] for m in matcher.match('Python and Rust')], ['Python', 'Rust'])
+        
+        rust.delete()
+        matcher.refresh()
+        self.assertEqual([m['name'] for m in matcher.match('Python and Rust')], ['Python'])
+    
+    def test_matcher_refresh_is_one_query_when_unchanged(self):
+        from core.skill_matcher import SkillMatcher
+        
+        Skill.objects.create(name='Python', category='Technical')
+        matcher = SkillMatcher.from_database()
+        with self.assertNumQueries(1):
+            matcher.refresh()
+
 
 class SkillsGapAPITestCase(TestCase):
     """Test the skills gap API endpoints."""
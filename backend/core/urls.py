@@ -247,12 +247,15 @@ urlpatterns = [
     path('jobs/<int:job_id>/company', views.job_company_info, name='job-company-info'),
     # UC-047: AI resume generation
     path('jobs/<int:job_id>/resume/generate', views.generate_resume_for_job, name='job-resume-generate'),
+    path('jobs/<int:job_id>/resume/generate/stream', views.stream_resume_for_job, name='job-resume-generate-stream'),
     path('jobs/<int:job_id>/resume/tailor-experience/<int:experience_id>', views.tailor_experience_variations, name='tailor-experience'),
     path('jobs/<int:job_id>/resume/tailor-experience/<int:experience_id>/bullet', views.tailor_experience_bullet, name='tailor-experience-bullet'),
     path('resume/compile-latex/', views.compile_latex_to_pdf, name='compile-latex-to-pdf'),
     # UC-056: AI cover letter generation
     path('jobs/<int:job_id>/cover-letter/generate', views.generate_cover_letter_for_job, name='job-cover-letter-generate'),
+    path('jobs/<int:job_id>/cover-letter/generate/stream', views.stream_cover_letter_for_job, name='job-cover-letter-generate-stream'),
     path('cover-letter/compile-latex/', views.compile_latex_to_pdf, name='cover-letter-compile-latex-to-pdf'),
+    path('ai-generations/<int:generation_id>', views.ai_generation_status, name='ai-generation-status'),
     # UC-069: Application package generation
     path('jobs/<int:job_id>/generate-package/', views.generate_application_package, name='job-generate-package'),
     # UC-061: Cover letter export
@@ -10,7 +10,6 @@ from typing import Any, Dict, List, Optional
 
 from datetime import timezone as datetime_timezone, timedelta
 
-import base64
 import copy
 import hashlib
 import logging
@@ -20,7 +19,8 @@ logger = logging.getLogger(__name__)
 
 from rest_framework import status, serializers
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.decorators import api_view, permission_classes, parser_classes, authentication_classes
+from rest_framework.decorators import api_view, permission_classes, parser_classes, authentication_classes, renderer_classes
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.response import Response
 from rest_framework.authentication import SessionAuthentication
@@ -30,7 +30,8 @@ from django.utils.dateparse import parse_datetime
 from django.db.models import Min, Q
 from django.core.management import call_command
 from django.core.mail import send_mail
-from django.http import HttpResponse, JsonResponse, HttpResponseRedirect
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.utils.text import slugify
 from django.conf import settings
 from core.authentication import FirebaseAuthentication
@@ -135,7 +136,6 @@ from core.serializers import (
 )
 from core.models import (
     CandidateProfile,
-    Skill,
     CandidateSkill,
     Education,
     Certification,
@@ -166,11 +166,11 @@ from core.models import (
     QuestionBankCache,
     TechnicalPrepCache,
     TechnicalPrepGeneration,
+    AIGeneration,
     TechnicalPrepPractice,
     PreparationChecklistProgress,
     Contact,
     Interaction,
-    ContactNote,
     Reminder,
     ImportJob,
     Tag,
@@ -210,12 +210,14 @@ from core.models import (
 from core import google_import, tasks, response_coach, interview_followup, calendar_sync, resume_ai
 from core.tasks import CELERY_AVAILABLE
 from core.interview_checklist import build_checklist_tasks
+from core.job_search import apply_job_search
+from core.company_resolution import get_or_create_company, resolve_company
+from core import skill_autocomplete
 from core.interview_success import InterviewSuccessForecastService, InterviewSuccessScorer
 from core.interview_performance_tracking import (
     InterviewPerformanceTracker,
     build_interview_performance_analytics,
 )
-from core.research.enrichment import fallback_domain
 from core.question_bank import build_question_bank
 from core.technical_prep import (
     build_technical_prep,
@@ -360,6 +362,26 @@ def health_check(request):
             'error': str(e),
         }
     
+    # LaTeX compiler pool (queue depth and compile timings)
+    try:
+        from core.latex_compiler import compiler_stats
+        services['latex_compiler'] = compiler_stats()
+    except Exception as e:
+        services['latex_compiler'] = {
+            'status': 'unhealthy',
+            'error': str(e),
+        }
+
+    # Batched reminder email runs (last run per mailer: throughput and failures)
+    try:
+        from core.bulk_mail import bulk_mail_stats
+        services['bulk_mail'] = {'status': 'available', 'mailers': bulk_mail_stats()}
+    except Exception as e:
+        services['bulk_mail'] = {
+            'status': 'unhealthy',
+            'error': str(e),
+        }
+
     # ===================
     # EXTERNAL APIS
     # ===================
@@ -646,7 +668,6 @@ CITY_COORDS = {
     'jersey city, nj': (40.7178, -74.0431),
     'newark, nj': (40.7357, -74.1724),
 }
-_CITY_CACHE: Dict[str, tuple] = {}
 
 def _haversine_km(lat1, lon1, lat2, lon2):
     R = 6371.0
@@ -925,9 +946,14 @@ def jobs_geo(request):
         # Unauthenticated or no profile: return empty list by default
         return JsonResponse({'jobs': []})
 
-    jobs = qs.exclude(location__isnull=True).exclude(location__exact='')[:50]
+    jobs = list(qs.exclude(location__isnull=True).exclude(location__exact='').prefetch_related('office_locations')[:50])
 
-    headers = {'User-Agent': NOMINATIM_USER_AGENT}
+    # Coordinates come from the job row or the shared geocoding cache only; locations
+    # not resolved yet are queued for the batch geocoder instead of fetched inline.
+    from core import geocoding
+    missing = [j for j in jobs if j.location_lat is None or j.location_lon is None]
+    cached = geocoding.lookup_cached(j.location for j in missing)
+    queued = False
     out = []
     temp = []
     for j in jobs:
@@ -935,31 +961,18 @@ def jobs_geo(request):
         lon = getattr(j, 'location_lon', None)
         precision = (getattr(j, 'location_geo_precision', None) or '').strip().lower() or 'city'
         city = (getattr(j, 'location', '') or '').strip()
-        # If stored coords missing, attempt lightweight geocode/fallback on the job's city text
         if (lat is None or lon is None) and city:
-            q = city
-            try:
-                resp = requests.get(
-                    f"{NOMINATIM_BASE_URL}/search",
-                    params={'q': q, 'format': 'json', 'limit': '1'},
-                    headers=headers,
-                    timeout=6,
-                )
-                resp.raise_for_status()
-                data = resp.json() or []
-                if data:
-                    lat = float(data[0].get('lat'))
-                    lon = float(data[0].get('lon'))
-                    # Do not promote precision to 'address' from ad-hoc request-time geocode; treat as approx
-                    if not precision:
-                        precision = 'city'
-            except Exception:
-                key = q.lower().strip()
-                if key in _CITY_CACHE:
-                    lat, lon = _CITY_CACHE[key]
-                elif key in CITY_COORDS:
+            key = geocoding.normalize_location(city)
+            entry = cached.get(key)
+            if entry is not None:
+                lat, lon = entry.lat, entry.lon
+            else:
+                if key in CITY_COORDS:
                     lat, lon = CITY_COORDS[key]
-                    _CITY_CACHE[key] = CITY_COORDS[key]
+                try:
+                    queued = geocoding.queue_job_geocode(j) or queued
+                except Exception:
+                    pass
 
         # Include any manually added office locations for this job
         try:
@@ -1005,6 +1018,9 @@ def jobs_geo(request):
             continue
         out.append(item)
 
+    if queued:
+        from core.tasks import enqueue_geocode_queue
+        enqueue_geocode_queue()
     return JsonResponse({'jobs': out})
 
 @api_view(['GET'])
@@ -1273,28 +1289,19 @@ def job_regeocode(request, job_id: int):
     if not location:
         return JsonResponse({'error': 'no_location'}, status=400)
 
-    headers = {'User-Agent': NOMINATIM_USER_AGENT}
+    # Explicit user action: refresh the shared cache entry synchronously
+    from core import geocoding
     try:
-        resp = requests.get(
-            f"{NOMINATIM_BASE_URL}/search",
-            params={'q': location, 'format': 'json', 'limit': '1'},
-            headers=headers,
-            timeout=8,
-        )
-        resp.raise_for_status()
-        data = resp.json() or []
-        if not data:
-            return JsonResponse({'error': 'geocode_failed'}, status=502)
-        lat = float(data[0].get('lat'))
-        lon = float(data[0].get('lon'))
-        precision = 'address' if data[0].get('class') == 'place' and data[0].get('type') == 'house' else 'approx'
+        entry = geocoding.resolve_entry(geocoding.request_geocode(location, refresh=True))
     except Exception:
         return JsonResponse({'error': 'geocode_failed'}, status=502)
+    if entry.status != 'resolved':
+        return JsonResponse({'error': 'geocode_failed'}, status=502)
 
     from django.utils import timezone as dj_tz
-    job.location_lat = lat
-    job.location_lon = lon
-    job.location_geo_precision = precision
+    job.location_lat = entry.lat
+    job.location_lon = entry.lon
+    job.location_geo_precision = entry.precision
     job.location_geo_updated_at = dj_tz.now()
     job.save(update_fields=['location_lat', 'location_lon', 'location_geo_precision', 'location_geo_updated_at'])
 
@@ -2020,10 +2027,7 @@ def referrals_list_create(request):
         try:
             job_entry = JobEntry.objects.get(pk=job_id)
             # Find or create a Company for this job entry
-            company = Company.objects.filter(name__iexact=job_entry.company_name).first()
-            if not company:
-                domain = (job_entry.company_name or '').lower().replace(' ', '-')
-                company = Company.objects.create(name=job_entry.company_name, domain=domain)
+            company, _ = get_or_create_company(job_entry.company_name)
             # Find or create a JobOpportunity matching this job entry
             job, _ = JobOpportunity.objects.get_or_create(
                 company=company,
@@ -4026,8 +4030,8 @@ def _contact_display_name(contact: Contact) -> str:
     return contact.display_name or f"{contact.first_name} {contact.last_name}".strip() or contact.email or "Contact"
 
 
-def _collect_contact_interests(contact: Contact, notes: List[ContactNote]) -> List[str]:
-    """Merge interests from contact metadata and note entries."""
+def _collect_contact_interests(contact: Contact) -> List[str]:
+    """Merge interests from contact metadata and its recent notes (persisted on the contact)."""
     interests = []
     try:
         meta_interests = contact.metadata.get('interests', []) if isinstance(contact.metadata, dict) else []
@@ -4035,12 +4039,8 @@ def _collect_contact_interests(contact: Contact, notes: List[ContactNote]) -> Li
             interests.extend([str(x) for x in meta_interests if x])
     except Exception:
         pass
-    for note in notes:
-        try:
-            if isinstance(note.interests, list):
-                interests.extend([str(x) for x in note.interests if x])
-        except Exception:
-            continue
+    if isinstance(contact.note_interests, list):
+        interests.extend([str(x) for x in contact.note_interests if x])
     # Return unique interests preserving order
     seen = set()
     deduped = []
@@ -4055,15 +4055,27 @@ def _collect_contact_interests(contact: Contact, notes: List[ContactNote]) -> Li
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def relationship_maintenance_overview(request):
-    """Provide AI-lite relationship maintenance guidance and templates."""
+    """Provide AI-lite relationship maintenance guidance and templates.
+
+    Per-contact recency, reciprocity, and interests are persisted on Contact by
+    core.relationship_health, so contacts are streamed without loading their
+    interactions or notes.
+    """
+    from django.db.models import Count
+    from core import relationship_health
+
     now = timezone.now()
-    recent_window = now - timedelta(days=30)
-    contacts = Contact.objects.filter(owner=request.user).prefetch_related(
-        'interactions',
-        'notes',
-        'reminders',
-        'job_links__job',
-    ).select_related('company')
+    # Contacts created before scores were persisted (or via bulk paths) are scored once here
+    relationship_health.refresh_contacts(
+        Contact.objects.filter(owner=request.user, scores_refreshed_at__isnull=True), now=now,
+    )
+    contacts = Contact.objects.filter(owner=request.user).select_related('company')
+    job_link_counts = dict(
+        ContactJobLink.objects.filter(contact__owner=request.user)
+        .values('contact_id')
+        .annotate(count=Count('id'))
+        .values_list('contact_id', 'count')
+    )
 
     industry_news_bank = {
         'technology': [
@@ -4104,20 +4116,16 @@ def relationship_maintenance_overview(request):
     opportunity_contacts = []
     total_job_links = 0
 
-    for contact in contacts:
+    for contact in contacts.iterator(chunk_size=500):
         name = _contact_display_name(contact)
-        interactions = list(contact.interactions.all().order_by('-date')[:50])
-        notes = list(contact.notes.all()[:20])
-        interests = _collect_contact_interests(contact, notes)
-        last_touch = contact.last_interaction or (interactions[0].date if interactions else contact.created_at)
+        interests = _collect_contact_interests(contact)
+        last_touch = relationship_health.last_touch(contact)
         days_since_touch = (now - last_touch).days if last_touch else None
-        recent_interactions = [i for i in interactions if i.date and i.date >= recent_window]
-        engagement_freq = len(recent_interactions)  # touches in the last 30 days
+        recent_interactions = relationship_health.recent_interaction_count(contact, now)
+        engagement_freq = recent_interactions  # touches in the last 30 days
 
-        importance = (contact.relationship_strength or 0) >= 7 or contact.relationship_type in (
-            'mentor', 'manager', 'hiring_manager', 'sponsor', 'referrer', 'recruiter'
-        )
-        cadence_days = 30 if importance else 7
+        importance = relationship_health.is_important(contact)
+        cadence_days = relationship_health.cadence_days(contact)
         next_due = now + timedelta(days=7)
         if last_touch:
             candidate = last_touch + timedelta(days=cadence_days)
@@ -4131,6 +4139,7 @@ def relationship_maintenance_overview(request):
                 "recurrence": "monthly" if importance else "weekly",
                 "message": f"Check in with {name} to keep the relationship warm.",
                 "reason": "High-priority relationship" if importance else "Due for a light touchpoint",
+                "existing_reminder_due": contact.next_reminder_due.isoformat() if contact.next_reminder_due else None,
             })
 
         interest_topic = interests[0] if interests else (contact.industry or contact.company_name or "something relevant")
@@ -4156,12 +4165,7 @@ def relationship_maintenance_overview(request):
             "last_interaction": last_touch.isoformat() if last_touch else None,
         })
 
-        health_score = 50
-        health_score += min(30, (contact.relationship_strength or 0) * 3)
-        health_score += min(15, len(recent_interactions) * 2)
-        if days_since_touch:
-            health_score -= min(20, max(0, days_since_touch - 14) / 2)
-        health_score = max(5, min(100, int(health_score)))
+        health_score = relationship_health.health_score(contact, now, recent=recent_interactions)
         engagement_status = "high" if engagement_freq >= 2 else "steady" if engagement_freq >= 1 else "at-risk"
         health_summaries.append({
             "contact_id": str(contact.id),
@@ -4172,29 +4176,15 @@ def relationship_maintenance_overview(request):
             "status": engagement_status,
         })
 
-        gives = 0
-        asks = 0
-        for interaction in interactions:
-            meta = interaction.metadata if isinstance(interaction.metadata, dict) else {}
-            if meta.get('direction') in ('give', 'support') or meta.get('value_provided'):
-                gives += 1
-            if meta.get('direction') == 'ask' or meta.get('request_made'):
-                asks += 1
-        outstanding = sum(1 for i in interactions if i.follow_up_needed)
-        balance = gives - asks
-        reciprocity_status = "balanced"
-        if balance > 1:
-            reciprocity_status = "you've provided more"
-        elif balance < -1:
-            reciprocity_status = "they've provided more"
+        balance = contact.reciprocity_given - contact.reciprocity_received
         reciprocity.append({
             "contact_id": str(contact.id),
             "contact_name": name,
-            "given": gives,
-            "received": asks,
-            "outstanding_follow_ups": outstanding,
+            "given": contact.reciprocity_given,
+            "received": contact.reciprocity_received,
+            "outstanding_follow_ups": contact.outstanding_follow_ups,
             "balance": balance,
-            "status": reciprocity_status,
+            "status": relationship_health.reciprocity_status(balance),
         })
 
         industry_key = (contact.industry or getattr(contact.company, 'industry', '') or '').lower()
@@ -4235,14 +4225,14 @@ def relationship_maintenance_overview(request):
             "why": "Keeps reciprocity balanced" if balance < 0 else "Reinforces momentum",
         })
 
-        job_links_count = contact.job_links.count()
+        job_links_count = job_link_counts.get(contact.id, 0)
         if job_links_count:
             total_job_links += job_links_count
             opportunity_contacts.append({
                 "contact_id": str(contact.id),
                 "contact_name": name,
                 "linked_jobs": job_links_count,
-                "recent_interactions": len(recent_interactions),
+                "recent_interactions": recent_interactions,
                 "health_score": health_score,
             })
 
@@ -5961,28 +5951,8 @@ def skills_autocomplete(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Search skills by name
-        skills_query = Skill.objects.filter(name__icontains=query)
-        
-        # Filter by category if provided
-        if category:
-            skills_query = skills_query.filter(category__iexact=category)
-        
-        # Annotate with usage count and order by popularity
-        from django.db.models import Count
-        skills_query = skills_query.annotate(
-            usage_count=Count('candidates')
-        ).order_by('-usage_count', 'name')[:limit]
-        
-        # Serialize results
-        results = []
-        for skill in skills_query:
-            results.append({
-                'id': skill.id,
-                'name': skill.name,
-                'category': skill.category,
-                'usage_count': skill.usage_count
-            })
+        # Served from the in-memory autocomplete index (core.skill_autocomplete)
+        results = skill_autocomplete.suggest(query, category=category, limit=limit)
         
         return Response(results, status=status.HTTP_200_OK)
     
@@ -6473,22 +6443,11 @@ def jobs_list_create(request):
             if status_param:
                 qs = qs.filter(status=status_param)
 
-            # UC-039: Advanced search and filters
+            # UC-039: Advanced search and filters (ranked full-text + fuzzy matching)
             search_query = (request.GET.get('q') or '').strip()
-            if search_query:
-                qs = qs.filter(
-                    Q(title__icontains=search_query) |
-                    Q(company_name__icontains=search_query) |
-                    Q(description__icontains=search_query)
-                )
-
             industry = (request.GET.get('industry') or '').strip()
-            if industry:
-                qs = qs.filter(industry__icontains=industry)
-
             location = (request.GET.get('location') or '').strip()
-            if location:
-                qs = qs.filter(location__icontains=location)
+            qs = apply_job_search(qs, profile, query=search_query, industry=industry, location=location)
 
             job_type = (request.GET.get('job_type') or '').strip()
             if job_type:
@@ -6538,6 +6497,8 @@ def jobs_list_create(request):
                 )
             elif sort_by == 'company_name':
                 qs = qs.order_by('company_name', '-updated_at')
+            elif search_query:
+                qs = qs.order_by('-search_rank', '-updated_at', '-id')
             else:
                 qs = qs.order_by('-updated_at', '-id')
             
@@ -6597,12 +6558,7 @@ def jobs_list_create(request):
         new_company = None
         if company_name:
             try:
-                company_obj = Company.objects.filter(name__iexact=company_name).first()
-                created_company = False
-                if not company_obj:
-                    company_defaults = {'domain': fallback_domain(company_name)}
-                    company_obj = Company.objects.create(name=company_name, **company_defaults)
-                    created_company = True
+                company_obj, created_company = get_or_create_company(company_name)
                 if created_company:
                     CompanyResearch.objects.get_or_create(company=company_obj)
                 new_company = company_obj
@@ -6617,7 +6573,7 @@ def jobs_list_create(request):
                 from datetime import timedelta
                 
                 # Check if company exists and has recent research
-                company = new_company or Company.objects.filter(name__iexact=company_name).first()
+                company = new_company or resolve_company(company_name)
                 should_research = False
                 
                 if not company:
@@ -6652,7 +6608,7 @@ def jobs_list_create(request):
                             except Exception as e:
                                 logger.error(f"Error researching company {company_name}: {e}")
                             try:
-                                company_record = Company.objects.filter(name__iexact=company_name).first()
+                                company_record = resolve_company(company_name)
                                 if company_record:
                                     try:
                                         call_command('populate_company_research', company_id=company_record.id, force=True)
@@ -6713,74 +6669,30 @@ def jobs_stats(request):
         profile = CandidateProfile.objects.get(user=request.user)
         qs = JobEntry.objects.filter(candidate=profile)
 
+        # Status counts, stage durations, monthly volume and time-to-offer come
+        # from the incrementally maintained per-candidate rollup (core.analytics_rollups)
+        from core.models import JobStatusChange
+        from core import analytics_rollups
+        from django.utils import timezone as dj_timezone
+        rollups = analytics_rollups.load_rollups(profile)
+
         # 1) Counts per status
-        statuses = [s for (s, _label) in JobEntry.STATUS_CHOICES]
-        counts = {s: 0 for s in statuses}
-        for row in qs.values('status').annotate(c=models.Count('id')):
-            counts[row['status']] = row['c']
+        counts = analytics_rollups.status_counts(rollups)
 
         # 2) Application response rate
         # Consider "applied" pipeline as statuses where user has applied (applied + later stages)
         applied_statuses = ['applied', 'phone_screen', 'interview', 'offer', 'rejected']
         responded_statuses = ['phone_screen', 'interview', 'offer', 'rejected']
-        applied_count = qs.filter(status__in=applied_statuses).count()
-        responded_count = qs.filter(status__in=responded_statuses).count()
+        applied_count = sum(counts.get(s, 0) for s in applied_statuses)
+        responded_count = sum(counts.get(s, 0) for s in responded_statuses)
         response_rate = round((responded_count / applied_count) * 100, 2) if applied_count > 0 else None
 
-        # 3) Average time in each pipeline stage (use JobStatusChange history where available)
-        from core.models import JobStatusChange
-        from django.utils import timezone as dj_timezone
-        import statistics
-        durations = {}  # seconds per status sum
-        occurrences = {}  # how many times status was accounted for
-        now = dj_timezone.now()
-
-        for job in qs.select_related().prefetch_related('status_changes'):
-            # Collect status changes in chronological order
-            changes = list(job.status_changes.all().order_by('changed_at'))
-            prev_time = job.created_at or job.updated_at or now
-            # If there are no status changes, attribute duration from created_at to now to current status
-            if not changes:
-                st = job.status or 'interested'
-                delta = (now - prev_time).total_seconds()
-                durations[st] = durations.get(st, 0) + delta
-                occurrences[st] = occurrences.get(st, 0) + 1
-                continue
-
-            for ch in changes:
-                old = ch.old_status
-                # duration for old status is from prev_time until this change
-                try:
-                    delta = (ch.changed_at - prev_time).total_seconds()
-                except Exception:
-                    delta = 0
-                durations[old] = durations.get(old, 0) + max(0, delta)
-                occurrences[old] = occurrences.get(old, 0) + 1
-                prev_time = ch.changed_at
-
-            # final segment: current status from last change until now
-            cur = job.status or (changes[-1].new_status if changes else 'interested')
-            try:
-                delta = (now - prev_time).total_seconds()
-            except Exception:
-                delta = 0
-            durations[cur] = durations.get(cur, 0) + max(0, delta)
-            occurrences[cur] = occurrences.get(cur, 0) + 1
-
-        avg_time_in_stage = {}
-        for st, total_seconds in durations.items():
-            cnt = occurrences.get(st, 1)
-            # convert to days with two decimals
-            avg_days = round((total_seconds / cnt) / 86400, 2)
-            avg_time_in_stage[st] = avg_days
+        # 3) Average time in each pipeline stage (JobStatusChange history, ongoing stays up to now)
+        avg_time_in_stage = analytics_rollups.avg_time_in_stage(rollups)
 
         # 4) Monthly application volume (last 12 months)
-        from django.db.models.functions import TruncMonth
-        from django.db.models import Count
         import datetime
         today = dj_timezone.now().date()
-        first_month = (today.replace(day=1) - datetime.timedelta(days=365)).replace(day=1)
-        monthly_qs = qs.filter(created_at__date__gte=first_month).annotate(month=TruncMonth('created_at')).values('month').annotate(count=Count('id')).order_by('month')
         monthly = []
         # build a 12-month series ending with current month
         months = []
@@ -6789,8 +6701,7 @@ def jobs_stats(request):
             mm = (m - datetime.timedelta(days=30 * i)).replace(day=1)
             # normalize to first of month
             months.append(mm)
-        # convert query results to dict
-        month_map = {row['month'].date(): row['count'] for row in monthly_qs}
+        month_map = analytics_rollups.monthly_counts(rollups)
         for mm in months:
             c = month_map.get(mm, 0)
             monthly.append({'month': mm.isoformat(), 'count': c})
@@ -6800,31 +6711,9 @@ def jobs_stats(request):
         missed = 0
         total_with_deadline = 0
 
-        def _parse_applied_date_from_history(job):
-            # application_history format: list of dicts with keys 'action' and 'timestamp'
-            try:
-                hist = job.application_history or []
-                for item in hist:
-                    a = (item.get('action') or '').lower()
-                    if 'apply' in a:
-                        ts = item.get('timestamp') or item.get('at')
-                        if ts:
-                            try:
-                                return dj_timezone.datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                            except Exception:
-                                try:
-                                    # fallback to created_at
-                                    return dj_timezone.make_aware(dj_timezone.datetime.fromtimestamp(float(ts)))
-                                except Exception:
-                                    continue
-                # fallback to created_at
-                return job.created_at
-            except Exception:
-                return job.created_at
-
         for job in qs.filter(application_deadline__isnull=False):
             total_with_deadline += 1
-            applied_dt = _parse_applied_date_from_history(job) or job.created_at
+            applied_dt = analytics_rollups.applied_at_from_history(job) or job.created_at
             try:
                 applied_date = applied_dt.date()
             except Exception:
@@ -6838,38 +6727,7 @@ def jobs_stats(request):
         adherence_pct = round((adhered / total_with_deadline) * 100, 2) if total_with_deadline > 0 else None
 
         # 6) Time-to-offer analytics
-        tto_days = []
-        for job in qs:
-            # find offer change
-            offer_change = JobStatusChange.objects.filter(job=job, new_status='offer').order_by('changed_at').first()
-            if not offer_change:
-                # skip if job not offered
-                if job.status != 'offer':
-                    continue
-                # else use job.updated_at as offer time
-                offer_at = job.last_status_change or job.updated_at
-            else:
-                offer_at = offer_change.changed_at
-
-            applied_dt = _parse_applied_date_from_history(job) or job.created_at
-            if not applied_dt or not offer_at:
-                continue
-            try:
-                delta_days = (offer_at - applied_dt).total_seconds() / 86400
-                if delta_days >= 0:
-                    tto_days.append(round(delta_days, 2))
-            except Exception:
-                continue
-
-        tto_summary = None
-        if tto_days:
-            tto_summary = {
-                'count': len(tto_days),
-                'avg_days': round(statistics.mean(tto_days), 2),
-                'median_days': round(statistics.median(tto_days), 2),
-                'min_days': min(tto_days),
-                'max_days': max(tto_days),
-            }
+        tto_summary = analytics_rollups.time_to_offer(rollups)
 
         payload = {
             'counts': counts,
@@ -6966,7 +6824,7 @@ def jobs_stats(request):
                     pass
 
             for job in csv_qs:
-                applied_dt = _parse_applied_date_from_history(job)
+                applied_dt = analytics_rollups.applied_at_from_history(job)
                 offer_change = JobStatusChange.objects.filter(job=job, new_status='offer').order_by('changed_at').first()
                 offer_at = None
                 if offer_change:
@@ -8930,29 +8788,17 @@ def company_info(request, company_name):
     }
     """
     try:
-        from core.models import Company, CompanyResearch
+        from core.models import CompanyResearch
         from core.serializers import CompanySerializer
         
         # URL-decode company name
         import urllib.parse
         decoded_name = urllib.parse.unquote(company_name)
         
-        # Try to find existing company (case-insensitive)
-        company = Company.objects.filter(name__iexact=decoded_name).first()
+        # Resolve by normalized name, alias or domain; create with minimal info if unknown
+        company, created = get_or_create_company(decoded_name)
         
-        if not company:
-            # Create new company with minimal info
-            # Extract domain from company name (simple heuristic)
-            domain = decoded_name.lower().replace(' ', '').replace(',', '').replace('.', '')
-            # Add .com as default - this would be enhanced with actual domain lookup in production
-            domain = f"{domain}.com"
-            
-            company = Company.objects.create(
-                name=decoded_name,
-                domain=domain
-            )
-            logger.info(f"Created new company: {decoded_name}")
-            
+        if created:
             # Create empty research record for future enrichment
             CompanyResearch.objects.create(company=company)
         
@@ -8976,7 +8822,7 @@ def company_info(request, company_name):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def company_search(request):
-    """Search companies by name (fuzzy) or domain using PostgreSQL trigram similarity.
+    """Search companies by name (fuzzy) or domain using PostgreSQL trigram similarity (core.company_resolution).
 
     Query params:
       - q or name: search string
@@ -8994,32 +8840,13 @@ def company_search(request):
         if not q and not domain:
             return Response({'error': {'code': 'missing_parameters', 'message': 'Provide q (name) or domain.'}}, status=status.HTTP_400_BAD_REQUEST)
 
-        from core.models import Company
-        from core.utils.company_matching import normalize_name
-        try:
-            from django.contrib.postgres.search import TrigramSimilarity
-            pg_trgm_available = True
-        except Exception:
-            pg_trgm_available = False
+        from core.company_resolution import search_companies
 
-        qs = Company.objects.all()
-        if domain:
-            qs = qs.filter(domain__icontains=domain)
-
-        results = []
-        if q and pg_trgm_available:
-            normalized_q = normalize_name(q)
-            qs = qs.annotate(similarity=TrigramSimilarity('normalized_name', normalized_q)).filter(similarity__gt=0.0).order_by('-similarity')
-            for c in qs[:limit]:
-                sim = getattr(c, 'similarity', None)
-                results.append({'id': c.id, 'name': c.name, 'domain': c.domain, 'similarity': float(sim) if sim is not None else None})
-        else:
-            # Fallback: simple icontains name search
-            if q:
-                qs = qs.filter(name__icontains=q)
-            qs = qs.order_by('name')
-            for c in qs[:limit]:
-                results.append({'id': c.id, 'name': c.name, 'domain': c.domain, 'similarity': None})
+        # Bounded by pg_trgm's % operator on PostgreSQL; name icontains elsewhere
+        results = [
+            {'id': c.id, 'name': c.name, 'domain': c.domain, 'similarity': similarity}
+            for c, similarity in search_companies(q, limit=limit, domain=domain)
+        ]
 
         return Response({'results': results}, status=status.HTTP_200_OK)
     except Exception as e:
@@ -9039,7 +8866,7 @@ def job_company_info(request, job_id):
     but automatically derived from the job's company_name field.
     """
     try:
-        from core.models import JobEntry, Company, CompanyResearch
+        from core.models import JobEntry, CompanyResearch
         from core.serializers import CompanySerializer
         
         # Get the job entry
@@ -9076,18 +8903,10 @@ def job_company_info(request, job_id):
                 'recent_news': []
             }, status=status.HTTP_200_OK)
         
-        # Try to find existing company (case-insensitive)
-        company = Company.objects.filter(name__iexact=company_name).first()
+        # Resolve by normalized name, alias or domain; create with minimal info if unknown
+        company, created = get_or_create_company(company_name)
         
-        if not company:
-            # Create new company with minimal info
-            domain = company_name.lower().replace(' ', '').replace(',', '').replace('.', '')
-            domain = f"{domain}.com"
-            
-            company = Company.objects.create(
-                name=company_name,
-                domain=domain
-            )
+        if created:
             logger.info(f"Created new company for job {job_id}: {company_name}")
             
             # Create empty research record
@@ -9118,24 +8937,74 @@ def job_company_info(request, job_id):
 # 
 # =
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def generate_resume_for_job(request, job_id):
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n".encode('utf-8')
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF negotiate ``Accept: text/event-stream``; error responses become an ``error`` event."""
+    media_type = 'text/event-stream'
+    format = 'sse'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            return _sse_event('error', data.get('error', data))
+        return data
+
+
+def _event_stream_response(meta, events, unexpected_message):
     """
-    UC-047: Generate AI-tailored resume content for a specific job using Gemini.
+    Serve ``(event, data)`` pairs from a streaming generation as server-sent events.
+
+    When the client disconnects the server closes the response, which closes
+    ``events`` and with it the upstream Gemini stream.
+    """
+    def stream():
+        from core import cover_letter_ai
+
+        try:
+            yield _sse_event('meta', meta)
+            for event, data in events:
+                yield _sse_event(event, data)
+        except resume_ai.GeminiRetryableError as exc:
+            # The client can fall back to the queued endpoint, which retries with backoff
+            yield _sse_event('error', {'code': 'service_busy', 'message': str(exc), 'retry_after': exc.retry_after})
+        except (resume_ai.ResumeAIError, cover_letter_ai.CoverLetterAIError) as exc:
+            logger.warning('Streaming AI generation failed: %s', exc)
+            yield _sse_event('error', {'code': 'ai_generation_failed', 'message': str(exc)})
+        except Exception as exc:
+            logger.exception('Unexpected streaming AI generation failure: %s', exc)
+            yield _sse_event('error', {'code': 'ai_generation_failed', 'message': unexpected_message})
+        finally:
+            events.close()
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _resume_generation_request(request, job_id):
+    """
+    Validate a UC-047 generation request.
+
+    Returns:
+        (job, params, None), or (None, None, error response)
     """
     profile, _ = CandidateProfile.objects.get_or_create(user=request.user)
     try:
         job = JobEntry.objects.get(id=job_id, candidate=profile)
     except JobEntry.DoesNotExist:
-        return Response(
+        return None, None, Response(
             {'error': {'code': 'job_not_found', 'message': 'Job not found.'}},
             status=status.HTTP_404_NOT_FOUND
         )
 
     api_key = getattr(settings, 'GEMINI_API_KEY', '')
     if not api_key:
-        return Response(
+        return None, None, Response(
             {
                 'error': {
                     'code': 'service_unavailable',
@@ -9156,46 +9025,56 @@ def generate_resume_for_job(request, job_id):
         variation_count = 2
     variation_count = max(1, min(variation_count, 3))
 
-    candidate_snapshot = resume_ai.collect_candidate_snapshot(profile)
-    job_snapshot = resume_ai.build_job_snapshot(job)
+    return job, {'tone': tone, 'variation_count': variation_count}, None
 
-    try:
-        generation = resume_ai.run_resume_generation(
-            candidate_snapshot,
-            job_snapshot,
-            tone=tone,
-            variation_count=variation_count,
-            api_key=api_key,
-            model=getattr(settings, 'GEMINI_MODEL', None),
-        )
-    except resume_ai.ResumeAIError as exc:
-        logger.warning('AI resume generation failed for job %s: %s', job_id, exc)
-        return Response(
-            {'error': {'code': 'ai_generation_failed', 'message': str(exc)}},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-    except Exception as exc:
-        logger.exception('Unexpected AI resume failure for job %s: %s', job_id, exc)
-        return Response(
-            {
-                'error': {
-                    'code': 'ai_generation_failed',
-                    'message': 'Unexpected error while generating resume content.',
-                }
-            },
-            status=status.HTTP_502_BAD_GATEWAY
-        )
 
-    payload = {
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def generate_resume_for_job(request, job_id):
+    """
+    UC-047: Generate AI-tailored resume content for a specific job using Gemini.
+
+    Runs as a queued job: responds 202 with a ``generation_id`` and a
+    ``status_url`` (see ai_generation_status) that returns the content.
+    """
+    job, params, error = _resume_generation_request(request, job_id)
+    if error:
+        return error
+    return _queue_ai_generation(request, job, AIGeneration.KIND_RESUME, params)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def stream_resume_for_job(request, job_id):
+    """
+    UC-047: Stream AI resume generation as server-sent events.
+
+    Same body as generate_resume_for_job. Events: ``meta`` (job, profile, tone),
+    ``shared_analysis``, one ``variation`` per variation as soon as Gemini has
+    written it, then ``done`` or ``error``.
+    """
+    job, params, error = _resume_generation_request(request, job_id)
+    if error:
+        return error
+
+    candidate_snapshot = resume_ai.collect_candidate_snapshot(job.candidate)
+    job_snapshot = resume_ai.build_job_snapshot(job)
+    meta = {
         'job': job_snapshot,
         'profile': resume_ai.build_profile_preview(candidate_snapshot),
         'generated_at': timezone.now().isoformat(),
-        'tone': tone,
-        'variation_count': generation.get('variation_count'),
-        'shared_analysis': generation.get('shared_analysis'),
-        'variations': generation.get('variations'),
+        'tone': params['tone'],
     }
-    return Response(payload, status=status.HTTP_200_OK)
+    events = resume_ai.stream_resume_generation(
+        candidate_snapshot,
+        job_snapshot,
+        tone=params['tone'],
+        variation_count=params['variation_count'],
+        api_key=settings.GEMINI_API_KEY,
+        model=getattr(settings, 'GEMINI_MODEL', None),
+    )
+    return _event_stream_response(meta, events, 'Unexpected error while generating resume content.')
 
 
 @api_view(['POST'])
@@ -9247,13 +9126,12 @@ def compile_latex_to_pdf(request):
 # 
 # =
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def generate_cover_letter_for_job(request, job_id):
+def _cover_letter_generation_request(request, job_id):
     """
-    UC-056: Generate AI-tailored cover letter content for a specific job using Gemini.
+    Validate a UC-056 generation request, including the UC-058 customization options.
 
-    Body: { "tone": "professional|warm|innovative|customer_centric|data_driven|concise|balanced", "variation_count": 1-3 }
+    Returns:
+        (job, params, None), or (None, None, error response)
     """
     from core import cover_letter_ai
 
@@ -9261,14 +9139,14 @@ def generate_cover_letter_for_job(request, job_id):
     try:
         job = JobEntry.objects.get(id=job_id, candidate=profile)
     except JobEntry.DoesNotExist:
-        return Response(
+        return None, None, Response(
             {'error': {'code': 'job_not_found', 'message': 'Job not found.'}},
             status=status.HTTP_404_NOT_FOUND
         )
 
     api_key = getattr(settings, 'GEMINI_API_KEY', '')
     if not api_key:
-        return Response(
+        return None, None, Response(
             {
                 'error': {
                     'code': 'service_unavailable',
@@ -9289,10 +9167,6 @@ def generate_cover_letter_for_job(request, job_id):
         variation_count = 2
     variation_count = max(1, min(variation_count, 3))
 
-    candidate_snapshot = resume_ai.collect_candidate_snapshot(profile)
-    job_snapshot = resume_ai.build_job_snapshot(job)
-    research_snapshot = cover_letter_ai.build_company_research_snapshot(job.company_name)
-
     # UC-058: cover letter customization options
     length = (request.data.get('length') or '').strip().lower() or None
     writing_style = (request.data.get('writing_style') or '').strip().lower() or None
@@ -9315,7 +9189,7 @@ def generate_cover_letter_for_job(request, job_id):
         invalid_params.append(f"company_culture must be one of: {', '.join(sorted(allowed_company_cultures))}")
 
     if invalid_params:
-        return Response(
+        return None, None, Response(
             {
                 'error': {
                     'code': 'invalid_parameter',
@@ -9332,57 +9206,81 @@ def generate_cover_letter_for_job(request, job_id):
     if custom_instructions and len(custom_instructions) > 500:
         custom_instructions = custom_instructions[:500]
 
-    try:
-        generation = cover_letter_ai.run_cover_letter_generation(
-            candidate_snapshot,
-            job_snapshot,
-            research_snapshot,
-            tone=tone,
-            variation_count=variation_count,
-            api_key=api_key,
-            model=getattr(settings, 'GEMINI_MODEL', None),
-            length=length,
-            writing_style=writing_style,
-            company_culture=company_culture,
-            industry=industry,
-            custom_instructions=custom_instructions,
-        )
-    except cover_letter_ai.CoverLetterAIError as exc:
-        logger.warning('AI cover letter generation failed for job %s: %s', job_id, exc)
-        return Response(
-            {'error': {'code': 'ai_generation_failed', 'message': str(exc)}},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-    except Exception as exc:
-        logger.exception('Unexpected AI cover letter failure for job %s: %s', job_id, exc)
-        return Response(
-            {
-                'error': {
-                    'code': 'ai_generation_failed',
-                    'message': 'Unexpected error while generating cover letter content.',
-                }
-            },
-            status=status.HTTP_502_BAD_GATEWAY
-        )
+    params = {
+        'tone': tone,
+        'variation_count': variation_count,
+        'length': length,
+        'writing_style': writing_style,
+        'company_culture': company_culture,
+        'industry': industry,
+        'custom_instructions': custom_instructions,
+    }
+    return job, params, None
 
-    payload = {
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def generate_cover_letter_for_job(request, job_id):
+    """
+    UC-056: Generate AI-tailored cover letter content for a specific job using Gemini.
+
+    Body: { "tone": "professional|warm|innovative|customer_centric|data_driven|concise|balanced", "variation_count": 1-3 }
+
+    Runs as a queued job: responds 202 with a ``generation_id`` and a ``status_url``.
+    """
+    job, params, error = _cover_letter_generation_request(request, job_id)
+    if error:
+        return error
+    return _queue_ai_generation(request, job, AIGeneration.KIND_COVER_LETTER, params)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([EventStreamRenderer, JSONRenderer])
+def stream_cover_letter_for_job(request, job_id):
+    """
+    UC-056: Stream AI cover letter generation as server-sent events.
+
+    Same body and events as stream_resume_for_job; ``meta`` also carries the
+    company research used in the prompt.
+    """
+    from core import cover_letter_ai
+
+    job, params, error = _cover_letter_generation_request(request, job_id)
+    if error:
+        return error
+
+    options = dict(params)
+    tone = options.pop('tone')
+    variation_count = options.pop('variation_count')
+    candidate_snapshot = resume_ai.collect_candidate_snapshot(job.candidate)
+    job_snapshot = resume_ai.build_job_snapshot(job)
+    research_snapshot = cover_letter_ai.build_company_research_snapshot(job.company_name)
+    meta = {
         'job': job_snapshot,
         'profile': resume_ai.build_profile_preview(candidate_snapshot),
         'research': research_snapshot,
         'generated_at': timezone.now().isoformat(),
         'tone': tone,
-        'variation_count': generation.get('variation_count'),
-        'shared_analysis': generation.get('shared_analysis'),
-        'variations': generation.get('variations'),
     }
-    return Response(payload, status=status.HTTP_200_OK)
+    events = cover_letter_ai.stream_cover_letter_generation(
+        candidate_snapshot,
+        job_snapshot,
+        research_snapshot,
+        tone=tone,
+        variation_count=variation_count,
+        api_key=settings.GEMINI_API_KEY,
+        model=getattr(settings, 'GEMINI_MODEL', None),
+        **options,
+    )
+    return _event_stream_response(meta, events, 'Unexpected error while generating cover letter content.')
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def tailor_experience_variations(request, job_id, experience_id):
     """
-    Generate Gemini-powered variations for a single work experience.
+    Generate Gemini-powered variations for a single work experience (queued, responds 202).
     """
     profile, _ = CandidateProfile.objects.get_or_create(user=request.user)
     try:
@@ -9422,31 +9320,15 @@ def tailor_experience_variations(request, job_id, experience_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-    candidate_snapshot = resume_ai.collect_candidate_snapshot(profile)
-    job_snapshot = resume_ai.build_job_snapshot(job)
-
-    try:
-        payload = resume_ai.generate_experience_variations(
-            candidate_snapshot,
-            job_snapshot,
-            experience_id,
-            tone=tone,
-            variation_count=variation_count,
-            bullet_index=bullet_index,
-        )
-        return Response(payload, status=status.HTTP_200_OK)
-    except resume_ai.ResumeAIError as exc:
-        logger.warning('Experience tailoring failed for job %s experience %s: %s', job_id, experience_id, exc)
-        return Response(
-            {'error': {'code': 'ai_generation_failed', 'message': str(exc)}},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-    except Exception as exc:
-        logger.exception('Unexpected experience tailoring failure: %s', exc)
-        return Response(
-            {'error': {'code': 'ai_generation_failed', 'message': 'Unexpected error while tailoring experience.'}},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    return _queue_ai_generation(
+        request, job, AIGeneration.KIND_EXPERIENCE_VARIATIONS,
+        {
+            'experience_id': experience_id,
+            'tone': tone,
+            'variation_count': variation_count,
+            'bullet_index': bullet_index,
+        },
+    )
 
 
 @api_view(['POST'])
@@ -9492,37 +9374,45 @@ def tailor_experience_bullet(request, job_id, experience_id):
 
     variant_id = request.data.get('variant_id')
 
-    candidate_snapshot = resume_ai.collect_candidate_snapshot(profile)
-    job_snapshot = resume_ai.build_job_snapshot(job)
+    return _queue_ai_generation(
+        request, job, AIGeneration.KIND_EXPERIENCE_BULLET,
+        {
+            'experience_id': experience_id,
+            'bullet_index': bullet_index,
+            'tone': tone,
+            'variant_id': variant_id,
+        },
+    )
+
+
+def _queue_ai_generation(request, job, kind, params):
+    """Queue a Gemini generation (core.ai_generation) and return its status payload."""
+    from core import ai_generation
+
+    generation = ai_generation.start_generation(request.user, job, kind, params)
+    return Response(ai_generation.serialize_generation(generation), status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def ai_generation_status(request, generation_id):
+    """
+    Poll a queued resume / cover letter / experience generation.
+
+    ``state`` is pending, running, succeeded (with ``result``) or failed (with ``error``).
+    """
+    from core import ai_generation
 
     try:
-        payload = resume_ai.generate_experience_bullet(
-            candidate_snapshot,
-            job_snapshot,
-            experience_id,
-            bullet_index,
-            tone,
-        )
+        generation = AIGeneration.objects.get(id=generation_id, user=request.user)
+    except AIGeneration.DoesNotExist:
         return Response(
-            {
-                'experience_id': experience_id,
-                'variant_id': variant_id,
-                'bullet_index': payload.get('bullet_index', bullet_index),
-                'bullet': payload.get('bullet'),
-            },
-            status=status.HTTP_200_OK,
-        )
-    except resume_ai.ResumeAIError as exc:
-        logger.warning('Bullet regeneration failed for job %s experience %s: %s', job_id, experience_id, exc)
-        return Response(
-            {'error': {'code': 'ai_generation_failed', 'message': str(exc)}},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
-    except Exception as exc:
-        logger.exception('Unexpected bullet regeneration failure: %s', exc)
-        return Response(
-            {'error': {'code': 'ai_generation_failed', 'message': 'Unexpected error while regenerating bullet.'}},
+            {'error': {'code': 'generation_not_found', 'message': 'Generation not found.'}},
+            status=status.HTTP_404_NOT_FOUND
         )
+    if generation.status in ai_generation.ACTIVE_STATUSES and ai_generation.expire_stale_generations(id=generation.id):
+        generation.refresh_from_db()
+    return Response(ai_generation.serialize_generation(generation), status=status.HTTP_200_OK)
 
 def export_cover_letter_docx(request):
     """
@@ -9611,7 +9501,6 @@ def export_cover_letter_docx(request):
 @permission_classes([IsAuthenticated])
 def export_ai_cover_letter(request):
     """Export AI-generated cover letter content in multiple formats."""
-    import base64
     import re
     from django.http import HttpResponse
 
@@ -9687,8 +9576,7 @@ def export_ai_cover_letter(request):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            pdf_base64 = resume_ai.compile_latex_pdf(latex_content)
-            pdf_bytes = base64.b64decode(pdf_base64)
+            pdf_bytes = resume_ai.compile_latex_pdf_bytes(latex_content)
             output_name = _build_filename('Cover_Letter')
 
             response = HttpResponse(pdf_bytes, content_type='application/pdf')
@@ -9844,7 +9732,7 @@ def save_ai_cover_letter_document(request):
         document_name = f"{document_name} Cover Letter"
 
     try:
-        pdf_base64 = resume_ai.compile_latex_pdf(latex_content)
+        pdf_bytes = resume_ai.compile_latex_pdf_bytes(latex_content)
     except resume_ai.ResumeAIError as exc:
         return Response(
             {'error': {'code': 'compilation_failed', 'message': str(exc)}},
@@ -9857,7 +9745,6 @@ def save_ai_cover_letter_document(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    pdf_bytes = base64.b64decode(pdf_base64)
     filename_slug = slugify(document_name) or 'cover-letter'
     timestamp = timezone.now().strftime('%Y%m%d_%H%M')
     filename = f'{filename_slug}_{timestamp}.pdf'
@@ -10016,7 +9903,7 @@ def company_research_report(request, company_name):
     """
     try:
         import urllib.parse
-        from core.models import Company, CompanyResearch
+        from core.models import CompanyResearch
         from core.research import CompanyResearchService
         
         # URL-decode company name
@@ -10027,7 +9914,7 @@ def company_research_report(request, company_name):
         news_limit = int(request.query_params.get('news_limit', 10))
         
         # Find company
-        company = Company.objects.filter(name__iexact=decoded_name).first()
+        company = resolve_company(decoded_name)
         
         if not company:
             return Response(
@@ -11211,7 +11098,7 @@ def job_interview_insights(request, job_id):
     Falls back to template-based insights if AI generation fails.
     Results are cached to reduce API costs.
     """
-    from core.interview_insights import InterviewInsightsGenerator
+    from core.job_description_cache import interview_insights
     from core.models import InterviewInsightsCache
     
     try:
@@ -11240,12 +11127,14 @@ def job_interview_insights(request, job_id):
         model = getattr(settings, 'GEMINI_MODEL', 'gemini-2.5-flash')
         
         # Generate insights based on job title and company
-        # Will use AI if api_key is available, otherwise falls back to templates
-        insights = InterviewInsightsGenerator.generate_for_job(
+        # Will use AI if api_key is available, otherwise falls back to templates;
+        # AI insights are shared across users saving the same posting
+        insights = interview_insights(
             job_title=job.title,
             company_name=job.company_name,
             api_key=api_key if api_key else None,
-            model=model
+            model=model,
+            refresh=force_refresh,
         )
         
         _ensure_checklist_ids(insights.get('preparation_checklist'))
@@ -12466,10 +12355,13 @@ def job_skills_gap(request, job_id):
     - Learning resources and personalized learning paths
     - Summary statistics and recommendations
     - Optional: Skill gap trends across similar jobs
+    - stale: True when the cached analysis predates a change to the job or the
+      candidate's skills; it is recomputed in the background
     
     Results are cached to improve performance.
     """
     from core.skills_gap_analysis import SkillsGapAnalyzer
+    from core.match_fingerprints import is_fresh, request_recompute, skills_fingerprint, store_skills_gap
     from core.models import SkillGapAnalysisCache
     from django.utils import timezone
     
@@ -12484,10 +12376,7 @@ def job_skills_gap(request, job_id):
         
         # Try to get cached analysis first (unless force refresh)
         if not force_refresh:
-            cached = SkillGapAnalysisCache.objects.filter(
-                job=job,
-                is_valid=True
-            ).first()
+            cached = SkillGapAnalysisCache.objects.filter(job=job).first()
             
             if cached:
                 analysis = cached.analysis_data
@@ -12496,11 +12385,17 @@ def job_skills_gap(request, job_id):
                     trends = SkillsGapAnalyzer._analyze_similar_jobs(job, profile)
                     analysis['trends'] = trends
                 
+                # Outdated analyses are served flagged while the worker recomputes them
+                stale = not is_fresh(cached, job)
+                if stale:
+                    request_recompute(profile.id, [job.id])
+                
                 logger.info(f"Returning cached skills gap analysis for job {job_id}")
-                return Response(analysis, status=status.HTTP_200_OK)
+                return Response({**analysis, 'stale': stale}, status=status.HTTP_200_OK)
         
-        # Generate new analysis
+        # Generate new analysis (fingerprinted before the skills are read)
         logger.info(f"Generating skills gap analysis for job {job_id}")
+        fingerprint = skills_fingerprint(profile.id)
         analysis = SkillsGapAnalyzer.analyze_job(
             job=job,
             candidate_profile=profile,
@@ -12510,25 +12405,15 @@ def job_skills_gap(request, job_id):
         # Add timestamp
         analysis['generated_at'] = timezone.now().isoformat()
         
-        # Cache the results
+        # Cache the results, superseding older entries for this job
         try:
-            # Invalidate old cache entries for this job
-            SkillGapAnalysisCache.objects.filter(job=job).update(is_valid=False)
-            
-            # Create new cache entry
-            SkillGapAnalysisCache.objects.create(
-                job=job,
-                job_title=job.title,
-                company_name=job.company_name,
-                analysis_data=analysis,
-                source=analysis.get('source', 'parsed')
-            )
+            store_skills_gap(job, analysis, fingerprint)
             logger.info(f"Cached skills gap analysis for job {job_id}")
         except Exception as cache_error:
             logger.warning(f"Failed to cache skills gap analysis: {cache_error}")
             # Continue anyway - caching failure shouldn't break the response
         
-        return Response(analysis, status=status.HTTP_200_OK)
+        return Response({**analysis, 'stale': False}, status=status.HTTP_200_OK)
         
     except CandidateProfile.DoesNotExist:
         return Response(
@@ -12707,11 +12592,15 @@ def job_match_score(request, job_id):
     """
     UC-065: Job Matching Algorithm
     
-    GET: Calculate comprehensive match score for a specific job
+    GET: Return the stored match score for a specific job
     POST: Update user weights and recalculate match score
     
     GET Query Parameters:
-    - refresh: Set to 'true' to force regeneration (bypasses cache)
+    - refresh: Set to 'true' to queue a regeneration
+    
+    GET never scores on the request thread: stale analyses are returned with
+    ``stale: true`` and missing ones with 202 ``status: pending`` while the
+    background worker (core.match_fingerprints) recomputes them.
     
     POST Body:
     {
@@ -12732,6 +12621,7 @@ def job_match_score(request, job_id):
     Results are cached for performance optimization.
     """
     from core.job_matching import JobMatchingEngine
+    from core.match_fingerprints import candidate_fingerprint, is_fresh, job_fingerprint, request_recompute
     from core.models import JobMatchAnalysis
     from django.utils import timezone
     
@@ -12744,65 +12634,26 @@ def job_match_score(request, job_id):
             # Check if user wants to force refresh
             force_refresh = request.query_params.get('refresh', '').lower() == 'true'
             
-            # Try to get cached analysis first (unless force refresh)
-            if not force_refresh:
-                cached_analysis = JobMatchAnalysis.objects.filter(
-                    job=job,
-                    candidate=profile,
-                    is_valid=True
-                ).first()
-                
-                if cached_analysis:
-                    response_data = {
-                        'overall_score': float(cached_analysis.overall_score),
-                        'skills_score': float(cached_analysis.skills_score),
-                        'experience_score': float(cached_analysis.experience_score),
-                        'education_score': float(cached_analysis.education_score),
-                        'weights_used': cached_analysis.user_weights or JobMatchingEngine.DEFAULT_WEIGHTS,
-                        'breakdown': cached_analysis.match_data.get('breakdown', {}),
-                        'match_grade': cached_analysis.match_grade,
-                        'generated_at': cached_analysis.generated_at.isoformat(),
-                        'cached': True
-                    }
-                    
-                    logger.info(f"Returning cached match analysis for job {job_id}")
-                    return Response(response_data, status=status.HTTP_200_OK)
+            cached_analysis = JobMatchAnalysis.objects.filter(job=job, candidate=profile).first()
+            if cached_analysis is None:
+                request_recompute(profile.id, [job.id])
+                logger.info(f"Queued match score analysis for job {job_id}")
+                return Response(
+                    {'job_id': job.id, 'status': 'pending', 'cached': False, 'stale': True},
+                    status=status.HTTP_202_ACCEPTED,
+                )
             
-            # Generate new analysis
-            logger.info(f"Generating match score analysis for job {job_id}")
-            analysis = JobMatchingEngine.calculate_match_score(job, profile)
+            if force_refresh and cached_analysis.is_valid:
+                cached_analysis.invalidate()
+            stale = not is_fresh(cached_analysis, job)
+            if stale:
+                request_recompute(profile.id, [job.id])
             
-            # Cache the results
-            try:
-                # Invalidate old analysis for this job/candidate pair
-                JobMatchAnalysis.objects.filter(
-                    job=job, 
-                    candidate=profile
-                ).update(is_valid=False)
-                
-                # Create new analysis entry
-                match_analysis = JobMatchAnalysis.objects.create(
-                    job=job,
-                    candidate=profile,
-                    overall_score=analysis['overall_score'],
-                    skills_score=analysis['skills_score'],
-                    experience_score=analysis['experience_score'],
-                    education_score=analysis['education_score'],
-                    match_data={'breakdown': analysis['breakdown']},
-                    user_weights=analysis['weights_used']
-                )
-                
-                analysis['match_grade'] = match_analysis.match_grade
-                analysis['cached'] = False
-                
-                logger.info(f"Cached match analysis for job {job_id}")
-            except Exception as cache_error:
-                logger.warning(f"Failed to cache match analysis: {cache_error}")
-                # Continue anyway - caching failure shouldn't break the response
-                analysis['match_grade'] = 'N/A'
-                analysis['cached'] = False
+            response_data = JobMatchingEngine.stored_result(cached_analysis)
+            response_data['stale'] = stale
             
-            return Response(analysis, status=status.HTTP_200_OK)
+            logger.info(f"Returning cached match analysis for job {job_id}")
+            return Response(response_data, status=status.HTTP_200_OK)
         
         elif request.method == 'POST':
             # Update user weights and recalculate
@@ -12823,28 +12674,28 @@ def job_match_score(request, job_id):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Generate analysis with custom weights
+            # Generate analysis with custom weights (fingerprinted before the inputs are read)
             logger.info(f"Generating custom weighted match analysis for job {job_id}")
+            fingerprint = candidate_fingerprint(profile.id)
             analysis = JobMatchingEngine.calculate_match_score(job, profile, user_weights)
             
-            # Update cached analysis with new weights
+            # Replace the cached analysis with the custom-weighted one
             try:
-                # Invalidate old analysis
-                JobMatchAnalysis.objects.filter(
-                    job=job, 
-                    candidate=profile
-                ).update(is_valid=False)
-                
-                # Create new analysis with custom weights
-                match_analysis = JobMatchAnalysis.objects.create(
+                match_analysis, _ = JobMatchAnalysis.objects.update_or_create(
                     job=job,
                     candidate=profile,
-                    overall_score=analysis['overall_score'],
-                    skills_score=analysis['skills_score'],
-                    experience_score=analysis['experience_score'],
-                    education_score=analysis['education_score'],
-                    match_data={'breakdown': analysis['breakdown']},
-                    user_weights=user_weights
+                    defaults={
+                        'overall_score': analysis['overall_score'],
+                        'skills_score': analysis['skills_score'],
+                        'experience_score': analysis['experience_score'],
+                        'education_score': analysis['education_score'],
+                        'match_data': {'breakdown': analysis['breakdown']},
+                        'user_weights': user_weights,
+                        'candidate_fingerprint': fingerprint,
+                        'job_fingerprint': job_fingerprint(job),
+                        'is_valid': True,
+                        'generated_at': timezone.now(),
+                    },
                 )
                 
                 analysis['match_grade'] = match_analysis.match_grade
@@ -13350,7 +13201,7 @@ def bulk_job_match_scores(request):
     """
     UC-065: Bulk Job Matching Analysis
     
-    GET: Calculate match scores for multiple jobs
+    GET: Return stored match scores for multiple jobs
     
     Query Parameters:
     - job_ids: Comma-separated list of job IDs (optional, defaults to all user jobs)
@@ -13364,17 +13215,22 @@ def bulk_job_match_scores(request):
     - Summary statistics
     - Top matched jobs
     - Performance metrics
+    - pending_job_ids: Jobs not scored yet
+    
+    Scores are never computed on the request thread: stale scores are returned
+    with ``stale: true`` and missing or stale ones are queued for the
+    background worker (core.match_fingerprints).
     """
     from core.job_matching import JobMatchingEngine
+    from core.match_fingerprints import is_fresh, request_recompute
     from core.models import JobMatchAnalysis
-    from django.db.models import Q
     
     try:
         profile = CandidateProfile.objects.get(user=request.user)
         
         # Parse query parameters
         job_ids_param = request.query_params.get('job_ids', '')
-        limit = min(int(request.query_params.get('limit', 20)), 50)  # Cap at 50
+        limit = min(int(request.query_params.get('limit', 20)), 500)  # Cap at 500
         min_score = float(request.query_params.get('min_score', 0))
         sort_by = request.query_params.get('sort_by', 'score')
         order = request.query_params.get('order', 'desc')
@@ -13392,7 +13248,7 @@ def bulk_job_match_scores(request):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        jobs = job_query[:limit]
+        jobs = list(job_query[:limit])
         
         if not jobs:
             return Response({
@@ -13402,82 +13258,50 @@ def bulk_job_match_scores(request):
                     'average_score': 0,
                     'top_score': 0,
                     'jobs_above_threshold': 0
-                }
+                },
+                'pending_job_ids': [],
             }, status=status.HTTP_200_OK)
         
-        # Calculate match scores for all jobs
-        logger.info(f"Analyzing {len(jobs)} jobs for bulk match scoring")
+        logger.info(f"Reading stored match scores for {len(jobs)} jobs")
         
         job_scores = []
         total_score = 0
         top_score = 0
         above_threshold = 0
         
+        stored = {
+            analysis.job_id: analysis
+            for analysis in JobMatchAnalysis.objects.filter(candidate=profile, job__in=jobs)
+        }
+        pending_job_ids = [job.id for job in jobs if job.id not in stored]
+        stale_job_ids = [job.id for job in jobs if job.id in stored and not is_fresh(stored[job.id], job)]
+        if pending_job_ids or stale_job_ids:
+            request_recompute(profile.id, pending_job_ids + stale_job_ids)
+        
         for job in jobs:
-            try:
-                # Try to get cached analysis first
-                cached_analysis = JobMatchAnalysis.objects.filter(
-                    job=job,
-                    candidate=profile,
-                    is_valid=True
-                ).first()
-                
-                if cached_analysis:
-                    score_data = {
-                        'job_id': job.id,
-                        'title': job.title,
-                        'company_name': job.company_name,
-                        'overall_score': float(cached_analysis.overall_score),
-                        'skills_score': float(cached_analysis.skills_score),
-                        'experience_score': float(cached_analysis.experience_score),
-                        'education_score': float(cached_analysis.education_score),
-                        'match_grade': cached_analysis.match_grade,
-                        'generated_at': cached_analysis.generated_at.isoformat(),
-                        'cached': True
-                    }
-                else:
-                    # Generate new analysis
-                    analysis = JobMatchingEngine.calculate_match_score(job, profile)
-                    
-                    score_data = {
-                        'job_id': job.id,
-                        'title': job.title,
-                        'company_name': job.company_name,
-                        'overall_score': analysis['overall_score'],
-                        'skills_score': analysis['skills_score'],
-                        'experience_score': analysis['experience_score'],
-                        'education_score': analysis['education_score'],
-                        'match_grade': 'N/A',  # Will be set if cached
-                        'generated_at': analysis['generated_at'],
-                        'cached': False
-                    }
-                    
-                    # Try to cache the result
-                    try:
-                        match_analysis = JobMatchAnalysis.objects.create(
-                            job=job,
-                            candidate=profile,
-                            overall_score=analysis['overall_score'],
-                            skills_score=analysis['skills_score'],
-                            experience_score=analysis['experience_score'],
-                            education_score=analysis['education_score'],
-                            match_data={'breakdown': analysis['breakdown']},
-                            user_weights=analysis['weights_used']
-                        )
-                        score_data['match_grade'] = match_analysis.match_grade
-                    except:
-                        pass  # Don't fail on cache errors
-                
-                # Apply minimum score filter
-                if score_data['overall_score'] >= min_score:
-                    job_scores.append(score_data)
-                    total_score += score_data['overall_score']
-                    top_score = max(top_score, score_data['overall_score'])
-                    above_threshold += 1
-                
-            except Exception as job_error:
-                logger.warning(f"Failed to analyze job {job.id}: {job_error}")
+            if job.id not in stored:
                 continue
+            analysis = JobMatchingEngine.stored_result(stored[job.id])
+            score_data = {
+                'job_id': job.id,
+                'title': job.title,
+                'company_name': job.company_name,
+                'overall_score': analysis['overall_score'],
+                'skills_score': analysis['skills_score'],
+                'experience_score': analysis['experience_score'],
+                'education_score': analysis['education_score'],
+                'match_grade': analysis['match_grade'],
+                'generated_at': analysis['generated_at'],
+                'cached': analysis['cached'],
+                'stale': job.id in stale_job_ids,
+            }
+            
+            # Apply minimum score filter
+            if score_data['overall_score'] >= min_score:
+                job_scores.append(score_data)
+                total_score += score_data['overall_score']
+                top_score = max(top_score, score_data['overall_score'])
+                above_threshold += 1
         
         # Sort results
         reverse_order = (order.lower() == 'desc')
@@ -13500,6 +13324,7 @@ def bulk_job_match_scores(request):
         return Response({
             'jobs': job_scores,
             'summary': summary,
+            'pending_job_ids': pending_job_ids,
             'filters_applied': {
                 'min_score': min_score,
                 'limit': limit,
@@ -13705,7 +13530,6 @@ def resume_export_wrapper(request):
 @permission_classes([IsAuthenticated])
 def export_ai_resume(request):
     """Export AI-generated resume content in multiple formats."""
-    import base64
     import re
     from django.http import HttpResponse
 
@@ -13781,8 +13605,7 @@ def export_ai_resume(request):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            pdf_base64 = resume_ai.compile_latex_pdf(latex_content)
-            pdf_bytes = base64.b64decode(pdf_base64)
+            pdf_bytes = resume_ai.compile_latex_pdf_bytes(latex_content)
             output_name = _build_filename('AI_Generated_Resume')
 
             response = HttpResponse(pdf_bytes, content_type='application/pdf')
@@ -15550,21 +15373,29 @@ def shared_resume_pdf(request, share_token):
             status=status.HTTP_404_NOT_FOUND
         )
 
-    try:
-        pdf_base64 = resume_ai.compile_latex_pdf(latex)
-    except resume_ai.ResumeAIError as exc:
-        return Response(
-            {'error': {'code': 'compilation_failed', 'message': str(exc)}},
-            status=status.HTTP_422_UNPROCESSABLE_ENTITY
-        )
-    except Exception as exc:
-        logger.exception('Unexpected error compiling shared resume PDF: %s', exc)
-        return Response(
-            {'error': {'code': 'compilation_failed', 'message': 'Unexpected compilation error.'}},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    from core.pdf_cache import pdf_cache_key
+
+    # The PDF is content-addressed, so its cache key doubles as a strong ETag
+    cache_key = pdf_cache_key(latex)
+    etag = f'"{cache_key}"'
+    not_modified = etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]
+
+    pdf_bytes = None
+    if not not_modified:
+        try:
+            pdf_bytes = resume_ai.compile_latex_pdf_bytes(latex, cache_key=cache_key)
+        except resume_ai.ResumeAIError as exc:
+            return Response(
+                {'error': {'code': 'compilation_failed', 'message': str(exc)}},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        except Exception as exc:
+            logger.exception('Unexpected error compiling shared resume PDF: %s', exc)
+            return Response(
+                {'error': {'code': 'compilation_failed', 'message': 'Unexpected compilation error.'}},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-    pdf_bytes = base64.b64decode(pdf_base64)
     ShareAccessLog.objects.create(
         share=share,
         reviewer_name=reviewer_name or reviewer_email or 'Reviewer',
@@ -15574,8 +15405,14 @@ def shared_resume_pdf(request, share_token):
     )
     share.increment_view_count()
 
-    response = HttpResponse(pdf_bytes, content_type='application/pdf')
-    response['Content-Disposition'] = 'inline; filename=shared_resume.pdf'
+    if not_modified:
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = HttpResponse(pdf_bytes, content_type='application/pdf')
+        response['Content-Disposition'] = 'inline; filename=shared_resume.pdf'
+    response['ETag'] = etag
+    # Access checks run on every request, so clients must always revalidate
+    response['Cache-Control'] = 'private, no-cache'
     response['X-Frame-Options'] = 'ALLOWALL'
     return response
 
@@ -45,9 +45,14 @@ const AIResumeGenerator = ({ jobId, jobTitle, companyName }) => {
     setResumeData(null);
 
     try {
-      const result = await resumeAIAPI.generateForJob(jobId, {
+      const result = await resumeAIAPI.streamForJob(jobId, {
         tone,
         variation_count: variationCount,
+      }, {
+        // Show each variation as soon as it is generated
+        onEvent: (event, _data, partial) => {
+          if (event === 'variation') setResumeData({ ...partial, variations: [...partial.variations] });
+        },
       });
 
       setResumeData(result);
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { jobsAPI } from '../../services/api';
 import Icon from '../common/Icon';
 
@@ -10,26 +10,49 @@ const JobMatchAnalysis = ({ job, onError }) => {
     experience: 0.3,
     education: 0.2
   });
+  // Job whose analysis is on screen; results arriving for another job are dropped
+  const currentJobId = useRef(null);
 
   useEffect(() => {
+    currentJobId.current = job?.id ?? null;
     if (job?.id) {
       loadMatchAnalysis();
     }
+    return () => {
+      currentJobId.current = null;
+    };
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [job?.id]);
 
+  // Stale scores are shown right away while the background rescore is polled
+  const awaitFreshAnalysis = async (jobId) => {
+    try {
+      const response = await jobsAPI.getJobMatchScore(jobId, { waitForFresh: true });
+      if (currentJobId.current === jobId) {
+        setMatchData(response.data);
+      }
+    } catch (error) {
+      console.error('Error refreshing match analysis:', error);
+    }
+  };
+
   const loadMatchAnalysis = async (refresh = false) => {
+    const jobId = job.id;
     try {
       setLoading(true);
-      // Load match data
-      const response = await jobsAPI.getJobMatchScore(job.id, { refresh });
+      // Load match data (a pending analysis is polled until it has been scored)
+      const response = await jobsAPI.getJobMatchScore(jobId, { refresh });
+      if (currentJobId.current !== jobId) return;
       setMatchData(response.data);
+      if (response.data?.stale) {
+        awaitFreshAnalysis(jobId);
+      }
       
       // Note: Custom weights functionality has been disabled
       // Backend no longer returns weights_used in response
     } catch (error) {
       console.error('Error loading match analysis:', error);
-      onError?.('Failed to load match analysis');
+      onError?.(error?.message || 'Failed to load match analysis');
     } finally {
       setLoading(false);
     }
@@ -134,7 +157,16 @@ const JobMatchAnalysis = ({ job, onError }) => {
           }}>
             Overall Match Score
           </div>
-          {matchData.cached && (
+          {matchData.stale && (
+            <div style={{
+              marginTop: '12px',
+              fontSize: '12px',
+              color: '#6b7280'
+            }}>
+              <Icon name="spinner" size="sm" className="spin" /> Updating with your latest profile...
+            </div>
+          )}
+          {matchData.cached && !matchData.stale && (
             <div style={{
               marginTop: '12px',
               padding: '4px 8px',
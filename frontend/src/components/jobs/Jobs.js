@@ -734,10 +734,12 @@ const companyDropdownRef = useRef(null);
     setLoadingMatchScores(true);
     try {
       console.log('Calling getBulkJobMatchScores API...');
+      // Jobs that have never been scored are polled until the background worker scores them
       const response = await jobsAPI.getBulkJobMatchScores({
         sort_by: 'score',
         order: 'desc',
-        limit: 50
+        limit: 50,
+        waitForPending: true
       });
       console.log('API response:', response);
       console.log('API response.data:', response.data);
@@ -2073,7 +2073,7 @@ const AiCoverLetterGenerator = () => {
     setLinkSuccessMessage('');
     resetComparisonState();
     try {
-      const data = await coverLetterAIAPI.generateForJob(selectedJobId, {
+      const data = await coverLetterAIAPI.streamForJob(selectedJobId, {
         tone,
         variation_count: variationCount,
         // UC-058 customization options
@@ -2082,6 +2082,13 @@ const AiCoverLetterGenerator = () => {
         company_culture: companyCulture,
         industry: industryInput,
         custom_instructions: customInstructions,
+      }, {
+        // Show each variation as soon as it is generated
+        onEvent: (event, variation, partial) => {
+          if (event !== 'variation') return;
+          setResult({ ...partial, variations: [...partial.variations] });
+          if (partial.variations.length === 1) setActiveVariationId(variation.id || '');
+        },
       });
       console.log('Received cover letter data:', {
         variation_count: data?.variation_count,
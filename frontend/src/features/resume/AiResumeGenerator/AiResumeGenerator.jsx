@@ -2345,9 +2345,16 @@ const AiResumeGenerator = () => {
     setStatusMessage('Generating a tailored resume for this role…');
     setHintIndex(0);
     try {
-      const data = await resumeAIAPI.generateForJob(selectedJobId, {
+      const data = await resumeAIAPI.streamForJob(selectedJobId, {
         tone,
         variation_count: variationCount,
+      }, {
+        // Show each variation as soon as it is generated
+        onEvent: (event, variation, partial) => {
+          if (event !== 'variation') return;
+          setResult({ ...partial, variations: [...partial.variations] });
+          if (partial.variations.length === 1) setActiveVariationId(variation.id || '');
+        },
       });
       // Received resume data
       setResult(data);
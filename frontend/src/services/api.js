@@ -652,6 +652,21 @@ authAPI.getEmploymentHistory = async () => {
   }
 };
 
+// Match scores are computed by a background worker: a job with no analysis yet answers
+// 202 (status: pending) and a stale one is served with stale: true while it is rescored.
+const MATCH_SCORE_POLL_MS = 2000;
+const MATCH_SCORE_TIMEOUT_MS = 2 * 60 * 1000;
+
+const pollMatchScores = async (path, settled) => {
+  const deadline = Date.now() + MATCH_SCORE_TIMEOUT_MS;
+  let response;
+  do {
+    await new Promise((r) => setTimeout(r, MATCH_SCORE_POLL_MS));
+    response = await api.get(path);
+  } while (!settled(response) && Date.now() < deadline);
+  return response;
+};
+
 // UC-036: Jobs API calls
 // UC-039: Enhanced with search/filter params support
 export const jobsAPI = {
@@ -912,13 +927,18 @@ export const jobsAPI = {
   },
 
   // UC-065: Job Matching Algorithm
+  // Pending (202) analyses are polled until scored; with waitForFresh, stale ones are
+  // polled until rescored too (the last stale result is returned if that takes too long).
   getJobMatchScore: async (id, options = {}) => {
     try {
-      const params = new URLSearchParams();
-      if (options.refresh) params.append('refresh', 'true');
-      const path = params.toString() ? `/jobs/${id}/match-score/?${params.toString()}` : `/jobs/${id}/match-score/`;
-      const response = await api.get(path);
-      return response;
+      const path = `/jobs/${id}/match-score/`;
+      const response = await api.get(options.refresh ? `${path}?refresh=true` : path);
+      const settled = (r) => r.status !== 202 && !(options.waitForFresh && r.data?.stale);
+      const result = settled(response) ? response : await pollMatchScores(path, settled);
+      if (result.status === 202) {
+        throw { response: { data: { error: { code: 'match_score_pending', message: 'Match analysis is still being calculated. Please try again shortly.' } } } };
+      }
+      return result;
     } catch (error) {
       throw error.response?.data?.error || { message: 'Failed to fetch job match score' };
     }
@@ -933,6 +953,7 @@ export const jobsAPI = {
     }
   },
 
+  // With waitForPending, jobs listed in pending_job_ids are polled until they are scored.
   getBulkJobMatchScores: async (options = {}) => {
     try {
       const params = new URLSearchParams();
@@ -943,7 +964,8 @@ export const jobsAPI = {
       if (options.order) params.append('order', options.order);
       const path = params.toString() ? `/jobs/match-scores/?${params.toString()}` : `/jobs/match-scores/`;
       const response = await api.get(path);
-      return response;
+      const settled = (r) => !options.waitForPending || !r.data?.pending_job_ids?.length;
+      return settled(response) ? response : await pollMatchScores(path, settled);
     } catch (error) {
       throw error.response?.data?.error || { message: 'Failed to fetch bulk job match scores' };
     }
@@ -1432,6 +1454,78 @@ export const offerAPI = {
   },
 };
 
+// Resume / cover letter generation runs as a queued job: the POST answers 202 with a
+// generation_id, then the status endpoint is polled until the result (or error) is ready.
+const AI_GENERATION_POLL_MS = 1500;
+const AI_GENERATION_TIMEOUT_MS = 10 * 60 * 1000;
+
+const awaitAIGeneration = async (response) => {
+  if (response.status !== 202 || !response.data?.generation_id) {
+    return response.data;
+  }
+  const deadline = Date.now() + AI_GENERATION_TIMEOUT_MS;
+  let generation = response.data;
+  while (generation.state !== 'succeeded') {
+    if (generation.state === 'failed') {
+      throw { response: { data: { error: generation.error } } };
+    }
+    if (Date.now() > deadline) {
+      throw { response: { data: { error: { code: 'ai_generation_timeout', message: 'AI generation is taking longer than expected. Please try again.' } } } };
+    }
+    await new Promise((r) => setTimeout(r, AI_GENERATION_POLL_MS));
+    const status = await api.get(`/ai-generations/${generation.generation_id}`);
+    generation = status.data;
+  }
+  return generation.result;
+};
+
+// Streamed generation: the server sends server-sent events (meta, shared_analysis, one
+// variation per variation as soon as it is written, then done or error) so the first
+// variation renders while the rest are still generating. Aborting `signal` closes the
+// connection, which also stops the upstream Gemini request.
+const streamAIGeneration = async (path, body, { onEvent, signal } = {}) => {
+  const token = await ensureFirebaseToken(false);
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      Accept: 'text/event-stream',
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    credentials: 'include',
+    body: JSON.stringify(body),
+    signal,
+  });
+  if (!response.body) {
+    throw { code: 'stream_unsupported', message: 'Streaming is not supported by this browser.' };
+  }
+
+  const result = { variations: [] };
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+      const event = (frame.match(/^event: (.*)$/m) || [])[1];
+      const data = JSON.parse((frame.match(/^data: (.*)$/m) || [])[1] || 'null');
+      if (event === 'error') throw data;
+      if (event === 'meta') Object.assign(result, data);
+      if (event === 'shared_analysis') result.shared_analysis = data;
+      if (event === 'variation') result.variations.push(data);
+      if (event === 'done') result.variation_count = data.variation_count;
+      if (onEvent) onEvent(event, data, result);
+    }
+  }
+  return result;
+};
+
 // UC-047: AI Resume Generation API calls
 export const resumeAIAPI = {
   generateForJob: async (jobId, options = {}) => {
@@ -1440,11 +1534,23 @@ export const resumeAIAPI = {
         tone: options.tone,
         variation_count: options.variation_count,
       });
-      return response.data;
+      return await awaitAIGeneration(response);
     } catch (error) {
       throw error.response?.data?.error || { message: 'Failed to generate AI resume content' };
     }
   },
+  // Streams variations as they are generated; falls back to the queued endpoint when Gemini is busy
+  streamForJob: async (jobId, options = {}, handlers = {}) => {
+    const body = { tone: options.tone, variation_count: options.variation_count };
+    try {
+      return await streamAIGeneration(`/jobs/${jobId}/resume/generate/stream`, body, handlers);
+    } catch (error) {
+      if (error?.code === 'service_busy' || error?.code === 'stream_unsupported') {
+        return resumeAIAPI.generateForJob(jobId, options);
+      }
+      throw error?.name === 'AbortError' ? error : (error?.message ? error : { message: 'Failed to generate AI resume content' });
+    }
+  },
   generateExperienceVariations: async (jobId, experienceId, options = {}) => {
     try {
       const response = await api.post(`/jobs/${jobId}/resume/tailor-experience/${experienceId}`, {
@@ -1452,7 +1558,7 @@ export const resumeAIAPI = {
         variation_count: options.variation_count,
         bullet_index: options.bullet_index,
       });
-      return response.data;
+      return await awaitAIGeneration(response);
     } catch (error) {
       throw error.response?.data?.error || { message: 'Failed to generate experience variations' };
     }
@@ -1464,7 +1570,7 @@ export const resumeAIAPI = {
         bullet_index: options.bullet_index,
         variant_id: options.variant_id,
       });
-      return response.data;
+      return await awaitAIGeneration(response);
     } catch (error) {
       throw error.response?.data?.error || { message: 'Failed to regenerate bullet' };
     }
@@ -1767,11 +1873,31 @@ export const coverLetterAIAPI = {
         industry: options.industry,
         custom_instructions: options.custom_instructions,
       });
-      return response.data;
+      return await awaitAIGeneration(response);
     } catch (error) {
       throw error.response?.data?.error || { message: 'Failed to generate AI cover letter content' };
     }
   },
+  // Streams variations as they are generated; falls back to the queued endpoint when Gemini is busy
+  streamForJob: async (jobId, options = {}, handlers = {}) => {
+    const body = {
+      tone: options.tone,
+      variation_count: options.variation_count,
+      length: options.length,
+      writing_style: options.writing_style,
+      company_culture: options.company_culture,
+      industry: options.industry,
+      custom_instructions: options.custom_instructions,
+    };
+    try {
+      return await streamAIGeneration(`/jobs/${jobId}/cover-letter/generate/stream`, body, handlers);
+    } catch (error) {
+      if (error?.code === 'service_busy' || error?.code === 'stream_unsupported') {
+        return coverLetterAIAPI.generateForJob(jobId, options);
+      }
+      throw error?.name === 'AbortError' ? error : (error?.message ? error : { message: 'Failed to generate AI cover letter content' });
+    }
+  },
   
   compileLatex: async (latexContent) => {
     try {